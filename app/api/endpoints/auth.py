@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 from typing import Any, Dict
-import traceback
+import logging
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
@@ -13,6 +13,8 @@ from app.db.database import get_db
 from app.db.models import User, Lawyer
 from app.schemas.user import UserCreate, UserInDB, Token, TokenData, LawyerCreate
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(
     prefix="/auth",  # 명시적으로 /auth 경로 설정
     tags=["auth"]
@@ -95,7 +97,8 @@ async def register_user(
     user_in: UserCreate, db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     try:
-        print("\n\n회원가입 요청 데이터:", user_in.dict())
+        # 비밀번호는 로그 포맷에서 가림
+        logger.debug("회원가입 요청 데이터", extra={"fields": user_in.dict()})
         
         # 이메일 중복 확인
         db_user = db.query(User).filter(User.email == user_in.email).first()
@@ -105,7 +108,6 @@ async def register_user(
                 detail="Email already registered",
             )
         
-        print("비밀번호 해시 작업")
         hashed_password = get_password_hash(user_in.password)
         
         # 사용자 생성 - 데이터베이스 필드에 맞게 매핑
@@ -119,16 +121,11 @@ async def register_user(
         # 데이터베이스에 필드가 없는 추가 데이터(nickname, phone, address 등)는 저장하지 않음
         # 필요한 경우 별도의 테이블에 저장하거나 테이블 구조를 변경해야 함
         
-        print("사용자 데이터:", {
-            "email": user_in.email,
-            "name": user_in.full_name,
-            "is_lawyer": False
-        })
         db.add(db_user)
         db.commit()
         db.refresh(db_user)
         
-        print("사용자 생성 완료, ID:", db_user.user_id)
+        logger.info("사용자 생성 완료, ID: %s", db_user.user_id)
         
         # 토큰 생성
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -136,12 +133,10 @@ async def register_user(
             data={"sub": db_user.email}, expires_delta=access_token_expires
         )
         
-        print("토큰 생성 완료")
         return {"access_token": access_token, "token_type": "bearer"}
     except Exception as e:
         db.rollback()  # 오류 발생 시 트랜잭션 롤백
-        print("회원가입 처리 중 오류:", str(e))
-        print(traceback.format_exc())
+        logger.exception("회원가입 처리 중 오류: %s", e)
         raise
 
 @router.get("/test", summary="API 테스트")
@@ -153,7 +148,8 @@ async def register_lawyer(
     lawyer_in: LawyerCreate, db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     try:
-        print("\n\n변호사 회원가입 요청 데이터:", lawyer_in.dict())
+        # 비밀번호는 로그 포맷에서 가림
+        logger.debug("변호사 회원가입 요청 데이터", extra={"fields": lawyer_in.dict()})
         
         # 이메일 중복 확인
         db_user = db.query(User).filter(User.email == lawyer_in.email).first()
@@ -171,7 +167,6 @@ async def register_lawyer(
                 detail="License number already registered",
             )
         
-        print("비밀번호 해시 작업")
         hashed_password = get_password_hash(lawyer_in.password)
         
         # 사용자 생성
@@ -185,7 +180,7 @@ async def register_lawyer(
         db.commit()
         db.refresh(db_user)
         
-        print("변호사 사용자 생성 완료, ID:", db_user.user_id)
+        logger.info("변호사 사용자 생성 완료, ID: %s", db_user.user_id)
         
         # 변호사 정보 생성
         db_lawyer = Lawyer(
@@ -199,7 +194,7 @@ async def register_lawyer(
         db.commit()
         db.refresh(db_lawyer)
         
-        print("변호사 정보 생성 완료")
+        logger.info("변호사 정보 생성 완료")
         
         # 토큰 생성
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -207,10 +202,8 @@ async def register_lawyer(
             data={"sub": db_user.email}, expires_delta=access_token_expires
         )
         
-        print("토큰 생성 완료")
         return {"access_token": access_token, "token_type": "bearer"}
     except Exception as e:
         db.rollback()  # 오류 발생 시 트랜잭션 롤백
-        print("변호사 회원가입 처리 중 오류:", str(e))
-        print(traceback.format_exc())
+        logger.exception("변호사 회원가입 처리 중 오류: %s", e)
         raise
@@ -1,17 +1,21 @@
 from typing import List, Dict, Any, Optional
+import logging
 import json
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
-from app.db.models import ACase, User, Document, Law, LawArticle, Precedent
+from app.db.models import ACase, ACaseLaw, ACasePrecedent, User, Document, Law, LawArticle, Precedent
 from app.schemas.case import CaseCreate, CaseUpdate, CaseResponse, CaseWithDocuments
 from app.schemas.document import DocumentResponse
 from app.services.claude_service import ClaudeService
 from app.services.law_data_service import LawDataService
 from app.services.legal_consultation_service import LegalConsultationService
+from app.services.near_duplicate_index import get_near_duplicate_index
 from app.api.endpoints.auth import get_current_user
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 claudeService = ClaudeService()
 law_data_service = LawDataService()
@@ -48,7 +52,7 @@ async def create_case(
         description=case_in.description,
         aCase_type=case_in.category or "일반",  # category를 aCase_type으로 맵핑
         status="open",  # 초기 상태
-        user_id=current_user.id,
+        user_id=current_user.user_id,
         claude_analysis=claude_analysis_json,  # Claude API 분석 결과 저장
         legal_category=legal_category,  # 법률 분야 저장
         keywords=keywords  # 키워드 저장
@@ -68,7 +72,7 @@ async def create_case(
                 description=case_in.description
             )
         except Exception as e:
-            print(f"법령/판례 처리 중 오류 발생: {e}")
+            logger.warning("법령/판례 처리 중 오류 발생: %s", e)
             # 오류가 발생해도 사례 생성은 성공으로 처리
     
     return db_case
@@ -81,7 +85,7 @@ async def read_cases(
     current_user: User = Depends(get_current_user)
 ) -> Any:
     """사용자의 법률 사례 목록 조회"""
-    cases = db.query(ACase).filter(ACase.user_id == current_user.id).offset(skip).limit(limit).all()
+    cases = db.query(ACase).filter(ACase.user_id == current_user.user_id).offset(skip).limit(limit).all()
     
     # ACase 모델에서 CaseResponse 스키마로 변환
     result = []
@@ -107,7 +111,7 @@ async def read_case(
     current_user: User = Depends(get_current_user)
 ) -> Any:
     """특정 법률 사례 상세 조회"""
-    case = db.query(ACase).filter(ACase.aCase_id == case_id, ACase.user_id == current_user.id).first()
+    case = db.query(ACase).filter(ACase.aCase_id == case_id, ACase.user_id == current_user.user_id).first()
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
     
@@ -120,12 +124,14 @@ async def read_case(
                   .join(ACaseLaw, ACaseLaw.law_id == Law.law_id)\
                   .join(LawArticle, LawArticle.law_id == Law.law_id)\
                   .filter(ACaseLaw.aCase_id == case_id)\
+                  .order_by(ACaseLaw.relevance_score.desc())\
                   .all()
     
     # 관련 판례 조회
     precedents = db.query(Precedent)\
                   .join(ACasePrecedent, ACasePrecedent.precedent_id == Precedent.precedent_id)\
                   .filter(ACasePrecedent.aCase_id == case_id)\
+                  .order_by(ACasePrecedent.relevance_score.desc())\
                   .all()
     
     # 응답 포맷 구성
@@ -153,30 +159,46 @@ async def update_case(
     current_user: User = Depends(get_current_user)
 ) -> Any:
     """법률 사례 정보 업데이트"""
-    case = db.query(ACase).filter(ACase.aCase_id == case_id, ACase.user_id == current_user.id).first()
+    case = db.query(ACase).filter(ACase.aCase_id == case_id, ACase.user_id == current_user.user_id).first()
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
     
     # 업데이트할 필드 설정
     update_data = case_in.dict(exclude_unset=True)
+    description_changed = "description" in update_data and update_data["description"] != case.description
     for field, value in update_data.items():
         setattr(case, field, value)
     
     db.commit()
     db.refresh(case)
+    
+    # 설명이 바뀐 사례의 분석 결과는 비슷한 사례에 재사용하지 않음 (다음 분석 요청 시 다시 분석)
+    if description_changed:
+        index = get_near_duplicate_index()
+        if index is not None:
+            index.remove(case_id)
     return case
 
 @router.post("/{case_id}/analyze", response_model=Dict[str, Any])
 async def analyze_case(
     case_id: int,
+    force: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> Any:
-    """법률 사례 분석 및 관련 법령/판례 조회"""
-    case = db.query(ACase).filter(ACase.aCase_id == case_id, ACase.user_id == current_user.id).first()
+    """
+    법률 사례 분석 및 관련 법령/판례 조회
+    설명이 바뀌지 않았으면 저장된 분석 결과를 바로 반환 (force=true이면 다시 분석)
+    """
+    case = db.query(ACase).filter(ACase.aCase_id == case_id, ACase.user_id == current_user.user_id).first()
     if not case:
         raise HTTPException(status_code=404, detail="Case not found")
     
+    if not force:
+        stored_result = legal_consultation_service.get_stored_consultation(case)
+        if stored_result is not None:
+            return stored_result
+    
     # 법률 상담 처리
     try:
         consultation_result = await legal_consultation_service.process_consultation(
@@ -21,7 +21,7 @@ async def create_document(
     """법률 문서 초안 생성"""
     
     # 사례가 사용자의 것인지 확인
-    case = db.query(ACase).filter(ACase.aCase_id == document_in.aCase_id, ACase.user_id == current_user.id).first()
+    case = db.query(ACase).filter(ACase.aCase_id == document_in.aCase_id, ACase.user_id == current_user.user_id).first()
     if not case:
         raise HTTPException(status_code=404, detail="Case not found or not owned by current user")
     
@@ -46,7 +46,7 @@ async def read_documents(
     """문서 목록 조회"""
     
     # 쿼리 기본 설정 - 사용자의 사례에 속한 문서만 조회
-    query = db.query(Document).join(ACase).filter(ACase.user_id == current_user.id)
+    query = db.query(Document).join(ACase).filter(ACase.user_id == current_user.user_id)
     
     # 특정 사례의 문서만 조회
     if case_id:
@@ -78,7 +78,7 @@ async def read_document(
     """특정 문서 조회"""
     document = db.query(Document).join(ACase).filter(
         Document.id == document_id,
-        ACase.user_id == current_user.id
+        ACase.user_id == current_user.user_id
     ).first()
     
     if not document:
@@ -105,7 +105,7 @@ async def download_document(
     """문서 다운로드"""
     document = db.query(Document).join(ACase).filter(
         Document.id == document_id,
-        ACase.user_id == current_user.id
+        ACase.user_id == current_user.user_id
     ).first()
     
     if not document:
@@ -1,5 +1,9 @@
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
 from typing import List, Dict, Any, Optional
+from sqlalchemy.orm import Session
+from app.db.database import get_db
+from app.db.models import Precedent
 from app.services.law_data_service import LawDataService
 from app.api.dependencies import get_current_user, get_law_data_service
 
@@ -18,14 +22,23 @@ async def search_precedents(
     reference_law: Optional[str] = Query(None, description="참조법령명 (예: 형법, 민법)"),
     page: int = Query(1, description="검색 결과 페이지"),
     display: int = Query(20, description="검색 결과 개수 (최대 100)"),
+    source: str = Query("api", description="검색 대상 (api: 국가법령정보 API, local: 로컬 판례 DB 검색)"),
     current_user = Depends(get_current_user),
-    law_service: LawDataService = Depends(get_law_data_service)
+    law_service: LawDataService = Depends(get_law_data_service),
+    db: Session = Depends(get_db)
 ):
     """
     키워드, 법원명, 사건번호 등으로 판례 검색
+    source=local 인 경우 로컬에 저장된 판례를 관련도 점수 순으로 검색 (LOCAL_SEARCH_BACKEND에 따라 BM25F 또는 DB FULLTEXT)
     """
     keywords = q.split() if q else None
     
+    if source == "local":
+        if not keywords:
+            raise HTTPException(status_code=400, detail="로컬 판례 검색에는 검색 키워드가 필요합니다")
+        # 검색기 점수 계산과 DB 조회는 동기 작업이므로 스레드에서 실행
+        return await asyncio.to_thread(search_local_precedents, db, law_service, keywords, page, min(display, 100))
+    
     if not keywords and not court and not case_number and not reference_law:
         raise HTTPException(status_code=400, detail="최소한 하나 이상의 검색 조건이 필요합니다")
     
@@ -41,6 +54,33 @@ async def search_precedents(
     
     return {"precedents": precedents}
 
+def search_local_precedents(db: Session, law_service: LawDataService, keywords: List[str], page: int, display: int) -> Dict[str, Any]:
+    """
+    로컬 판례 검색 결과를 판례 API 응답과 같은 형식으로 변환 (점수 순서 유지)
+    """
+    ranked = law_service.search_local_precedents(db, keywords, page=page, display=display)
+    precedent_ids = [precedent_id for precedent_id, _ in ranked["results"]]
+    rows = db.query(Precedent).filter(Precedent.precedent_id.in_(precedent_ids)).all() if precedent_ids else []
+    rows_by_id = {row.precedent_id: row for row in rows}
+    
+    precedents = []
+    for precedent_id, score in ranked["results"]:
+        row = rows_by_id.get(precedent_id)
+        if not row:
+            continue
+        precedents.append({
+            "precedentId": row.precedent_serial or str(row.precedent_id),
+            "caseName": row.case_name,
+            "caseNumber": row.case_number,
+            "decisionDate": row.decision_date,
+            "court": row.court,
+            "link": row.link,
+            "score": round(score, 4),
+            "source": "local"
+        })
+    
+    return {"precedents": precedents, "total": ranked["total"], "page": ranked["page"]}
+
 @router.get("/{precedent_id}")
 async def get_precedent_detail(
     precedent_id: str = Path(..., description="판례 일련번호"),
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi.responses import PlainTextResponse
+import os
+
+from app.api.dependencies import get_admin_user
+from app.core.profiling import list_profiles, profile_path
+
+router = APIRouter()
+
+@router.get("/")
+async def get_profiles(admin_user = Depends(get_admin_user)):
+    """
+    저장된 프로파일 목록 (요청별 프로파일 request-*.folded, 백그라운드 샘플링 aggregate-*.folded)
+    """
+    return {"profiles": list_profiles()}
+
+@router.get("/{name}", response_class=PlainTextResponse)
+def get_profile(
+    name: str = Path(..., description="프로파일 파일 이름 (X-Profile-Id 헤더 값)"),
+    admin_user = Depends(get_admin_user)
+):
+    """
+    프로파일 조회 (접힌 스택 형식: 한 줄에 "바깥 함수;...;안쪽 함수 샘플 수")
+    flamegraph.pl 또는 https://www.speedscope.app 에서 바로 열 수 있음
+    (파일 읽기가 이벤트 루프를 막지 않도록 동기 엔드포인트로 두어 스레드풀에서 실행)
+    """
+    try:
+        path = profile_path(name)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 프로파일 이름입니다")
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다")
+
+    with open(path, encoding="utf-8") as file:
+        return file.read()
@@ -0,0 +1,54 @@
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class JsonCheckpoint:
+    """
+    배치 작업의 진행 상태를 JSON 파일에 저장하는 체크포인트
+    작업이 중간에 중단되더라도 마지막으로 저장된 상태부터 이어서 실행할 수 있도록 사용
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.state: Dict[str, Any] = {}
+
+    def load(self) -> Dict[str, Any]:
+        """체크포인트 파일을 읽어 상태를 복원 (파일이 없거나 손상된 경우 빈 상태)"""
+        if not os.path.exists(self.path):
+            self.state = {}
+            return self.state
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                self.state = json.load(file)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("체크포인트 파일을 읽을 수 없습니다. 처음부터 다시 시작합니다: %s", e)
+            self.state = {}
+
+        return self.state
+
+    def save(self) -> None:
+        """현재 상태를 임시 파일에 쓴 뒤 교체하여 저장 (쓰기 도중 중단되어도 파일이 손상되지 않음)"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(self.state, file, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def clear(self) -> None:
+        """체크포인트 삭제 (작업이 모두 완료된 경우)"""
+        self.state = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
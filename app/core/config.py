@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import Any, Dict, List
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -21,10 +21,121 @@ class Settings(BaseSettings):
     
     # Claude API
     CLAUDE_API_KEY: str = os.getenv("CLAUDE_API_KEY", "")
+    CLAUDE_API_URL: str = os.getenv("CLAUDE_API_URL", "https://api.anthropic.com/v1/messages")  # 테스트/부하 테스트 시 로컬 대역 서버(mock_claude_server.py) 주소로 변경
+    CLAUDE_TIMEOUT_SECONDS: float = float(os.getenv("CLAUDE_TIMEOUT_SECONDS", "60"))  # 요청 1회 응답 대기 시간
+    CLAUDE_PROMPT_CACHE: bool = True  # 고정 지시문(system 프롬프트)에 cache_control 지정
+    
+    # Claude 요청 스케줄러 (프로세스당 동시 요청 수를 429 응답과 지연 시간에 따라 조절, AIMD)
+    CLAUDE_CONCURRENCY_INITIAL: int = 4  # 시작 동시 요청 한도
+    CLAUDE_CONCURRENCY_MIN: int = 1
+    CLAUDE_CONCURRENCY_MAX: int = 16
+    CLAUDE_LATENCY_TARGET_SECONDS: float = 20.0  # 응답이 이보다 느리면 동시 요청 한도를 조금 줄임
+    CLAUDE_QUEUE_MAX: int = 100  # 대기열이 가득 차면 바로 실패
+    CLAUDE_QUEUE_TIMEOUT_SECONDS: float = 60.0  # 대기열(재시도 대기 포함) 최대 대기 시간
+    CLAUDE_MAX_RETRIES: int = 3  # 429/529 응답 시 재시도 횟수
+    CLAUDE_BATCH_CALL_TYPES: List[str] = ["document"]  # 대화형 상담보다 나중에 처리할 호출 종류
     
     # 법률 API
     LAW_API_KEY: str = os.getenv("LAW_API_KEY", "")
     CASE_API_KEY: str = os.getenv("CASE_API_KEY", "")
+    LAW_API_BASE_URL: str = os.getenv("LAW_API_BASE_URL", "https://www.law.go.kr")  # 로컬 대역 서버 사용 시 변경
+    LAW_API_TIMEOUT_SECONDS: float = float(os.getenv("LAW_API_TIMEOUT_SECONDS", "30"))  # 요청 1회 응답 대기 시간
+    
+    # 현행법령 로컬 동기화
+    LAW_SYNC_CONCURRENCY: int = 4  # 동시에 조문을 조회할 법령 수
+    LAW_SYNC_CHECKPOINT_PATH: str = os.getenv("LAW_SYNC_CHECKPOINT_PATH", ".sync/law_sync.json")
+    
+    # 로컬 법령 조문 검색 색인
+    LAW_LOCAL_SEARCH: bool = True  # 로컬 색인에 결과가 있으면 국가법령정보 API를 호출하지 않음
+    LAW_INDEX_PATH: str = os.getenv("LAW_INDEX_PATH", ".sync/law_article_index.pkl")
+    
+    # 로컬 검색 방식 (memory: 프로세스 내 바이그램 색인 / BM25F 검색기, fulltext: DB FULLTEXT ngram 색인)
+    LOCAL_SEARCH_BACKEND: str = os.getenv("LOCAL_SEARCH_BACKEND", "memory")
+    
+    # 로컬 판례 검색 (BM25F)
+    PRECEDENT_LOCAL_SEARCH: bool = True  # 로컬 판례 DB에 결과가 있으면 상담 처리 시 판례 API를 호출하지 않음
+    PRECEDENT_RANK_CACHE_SIZE: int = 256  # 검색어별 순위 캐시 크기
+    
+    # 의미 검색 색인 (해싱 TF-IDF + SVD 임베딩, 법령 선택 및 조문/판례 순위에 사용)
+    SEMANTIC_SEARCH: bool = True
+    SEMANTIC_INDEX_DIR: str = os.getenv("SEMANTIC_INDEX_DIR", ".sync/semantic")
+    SEMANTIC_HASH_DIM: int = 2048  # 해시 버킷 수 (TF-IDF 벡터 차원)
+    SEMANTIC_DIM: int = 128  # 임베딩 차원 (SVD 주성분 수)
+    
+    # 사례-조문 / 사례-판례 관련성 점수
+    RELEVANCE_MIN_SCORE: int = 20  # 이 점수(0-100) 미만인 조문/판례는 사례와 연결하지 않고 답변 생성에서도 제외
+    RELEVANCE_KEYWORD_WEIGHT: float = 0.5  # 키워드 일치도 비중 (나머지는 의미 유사도, 의미 검색 색인이 없으면 키워드 일치도만 사용)
+    
+    # 답변 생성 프롬프트에 넣을 조문 선택 (재정렬 후 점수 순)
+    PROMPT_ARTICLE_TOP_K: int = 5  # 최대 조문 수
+    PROMPT_ARTICLE_TOKEN_BUDGET: int = 1500  # 조문 텍스트 추정 토큰 합계 상한
+    
+    # Claude 프롬프트 토큰 예산 (추정 토큰 기준)
+    PROMPT_FIELD_TOKEN_BUDGET: int = 400  # 조문 내용/판결요지 항목당 상한 (넘으면 앞 문장만 남김)
+    PROMPT_CONTEXT_TOKEN_BUDGET: int = 3000  # 프롬프트에 넣는 법령/판례 텍스트 전체 상한
+    
+    # 호출 종류별 모델 라우팅
+    # model: 기본 모델, max_tokens: 응답 최대 토큰 수
+    # fallback_model: 최근 p95 지연 시간이 slo_p95_seconds를 넘으면 대신 사용할 더 빠른 모델 (없으면 None)
+    CLAUDE_MODEL_ROUTES: Dict[str, Dict[str, Any]] = {
+        "analyze": {"model": "claude-3-5-haiku-20241022", "max_tokens": 800, "fallback_model": None, "slo_p95_seconds": 10.0},
+        "summarize": {"model": "claude-3-7-sonnet-20250219", "max_tokens": 1500, "fallback_model": "claude-3-5-haiku-20241022", "slo_p95_seconds": 30.0},
+        "document": {"model": "claude-3-7-sonnet-20250219", "max_tokens": 2500, "fallback_model": "claude-3-5-haiku-20241022", "slo_p95_seconds": 60.0},
+        "consultation": {"model": "claude-3-7-sonnet-20250219", "max_tokens": 3000, "fallback_model": "claude-3-5-haiku-20241022", "slo_p95_seconds": 45.0},
+        "default": {"model": "claude-3-7-sonnet-20250219", "max_tokens": 4000, "fallback_model": None, "slo_p95_seconds": None}
+    }
+    CLAUDE_ROUTE_LATENCY_WINDOW: int = 50  # p95 계산에 사용할 최근 응답 수
+    CLAUDE_ROUTE_MIN_SAMPLES: int = 20  # 최근 응답이 이보다 적으면 SLO를 판단하지 않음
+    CLAUDE_ROUTE_FALLBACK_SECONDS: int = 300  # 대체 모델로 전환한 후 기본 모델을 다시 시도하기까지의 시간
+    
+    # 법률 문제 분석 결과 캐시 (정규화한 사례 설명 기준)
+    ANALYSIS_CACHE: bool = True
+    ANALYSIS_CACHE_PATH: str = os.getenv("ANALYSIS_CACHE_PATH", ".sync/analysis_cache.sqlite3")
+    ANALYSIS_CACHE_TTL_HOURS: int = 24 * 7  # 이 시간이 지난 결과는 다시 분석
+    ANALYSIS_CACHE_MAX_ENTRIES: int = 10000  # 넘으면 오래 사용하지 않은 결과부터 삭제
+    ANALYSIS_CACHE_MEMORY_ENTRIES: int = 1024  # 메모리에 함께 보관할 결과 수
+    
+    # 비슷한 사례 분석 결과 재사용 (MinHash LSH, 글자 shingle Jaccard 유사도)
+    NEAR_DUPLICATE_REUSE: bool = True
+    NEAR_DUPLICATE_THRESHOLD: float = 0.8  # 이 유사도 이상이면 키워드/법률 분야 재사용 (bench_near_duplicate.py로 오재사용률 측정)
+    NEAR_DUPLICATE_REUSE_RETRIEVAL: bool = False  # 검색된 법령 조문/판례 목록도 재사용 (외부 API 검색 생략)
+    NEAR_DUPLICATE_NUM_PERM: int = 128  # MinHash 해시 함수 수
+    NEAR_DUPLICATE_BANDS: int = 32  # LSH 구간 수 (구간당 행 수 = NUM_PERM / BANDS)
+    NEAR_DUPLICATE_SHINGLE_SIZE: int = 3  # shingle 글자 수
+    
+    # 판례 수집
+    PRECEDENT_INGEST_CONCURRENCY: int = 4  # 동시에 조회할 판례 목록 페이지 수
+    PRECEDENT_INGEST_CHECKPOINT_PATH: str = os.getenv("PRECEDENT_INGEST_CHECKPOINT_PATH", ".sync/precedent_ingest.json")
+    PRECEDENT_INGEST_INTERVAL_MINUTES: int = int(os.getenv("PRECEDENT_INGEST_INTERVAL_MINUTES", "0"))  # 0이면 서버 내 백그라운드 수집 비활성화
+    PRECEDENT_INGEST_LOOKBACK_DAYS: int = 30  # 늦게 등록되는 판례를 놓치지 않기 위해 워터마크 이전까지 다시 확인할 기간
+    PRECEDENT_INGEST_FETCH_DETAILS: bool = True  # 새 판례마다 판례 본문 API로 판시사항/판결요지 조회 (목록 API에는 없음)
+    PRECEDENT_INGEST_BACKFILL_LIMIT: int = 200  # 수집 1회마다 판시사항/판결요지가 비어 있는 기존 판례를 다시 조회할 최대 건수
+    
+    # 기존 사례 일괄 재분석 (Claude Message Batches API, 프롬프트 변경 후 실행)
+    BATCH_REANALYSIS_CHUNK_SIZE: int = 2000  # 배치 하나에 넣을 사례 수 (사례당 분석/상담 요청 2건, 배치당 최대 100,000건)
+    BATCH_REANALYSIS_POLL_SECONDS: float = 60.0  # 배치 처리 상태 조회 간격
+    BATCH_REANALYSIS_CHECKPOINT_PATH: str = os.getenv("BATCH_REANALYSIS_CHECKPOINT_PATH", ".sync/batch_reanalysis.json")
+    
+    # 운영 지표 (/metrics, Prometheus 텍스트 형식)
+    METRICS_ENABLED: bool = True
+    EVENT_LOOP_LAG_INTERVAL_SECONDS: float = 0.5  # 이벤트 루프 지연 측정 간격 (0이면 측정하지 않음)
+    EVENT_LOOP_BLOCK_THRESHOLD_MS: float = float(os.getenv("EVENT_LOOP_BLOCK_THRESHOLD_MS", "100"))  # 이보다 오래 루프를 막은 호출을 위치별로 기록 (0이면 감시하지 않음)
+    EVENT_LOOP_BLOCK_DEBUG: bool = os.getenv("EVENT_LOOP_BLOCK_DEBUG", "false").lower() == "true"  # 루프를 막은 호출의 스택을 WARNING 로그로 기록
+    
+    # 로그 (대기열을 거쳐 별도 스레드에서 출력, 민감한 값은 가림)
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")  # json 또는 text
+    LOG_SAMPLE_RATE: float = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))  # INFO 이하 로그를 남길 요청 비율 (오류/느린 요청은 항상 기록)
+    LOG_SLOW_REQUEST_MS: float = 1000.0  # 이보다 오래 걸린 요청은 WARNING으로 기록
+    LOG_QUEUE_SIZE: int = 10000  # 출력 대기 로그 수 (가득 차면 버리고 lawmate_log_records_dropped_total 증가)
+    
+    # 프로파일링 (관리자가 X-Profile: 1 헤더 / _profile=1 쿼리로 요청한 요청 한 건, 백그라운드 샘플링)
+    PROFILING_ENABLED: bool = True  # False면 요청별 프로파일링 미들웨어를 등록하지 않음
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", ".sync/profiles")
+    PROFILE_INTERVAL_MS: float = 5.0  # 요청별 프로파일링 샘플 간격
+    PROFILE_MAX_SECONDS: float = 60.0  # 요청이 이보다 오래 걸리면 이후는 샘플링하지 않음
+    PROFILE_BACKGROUND_INTERVAL_MS: float = float(os.getenv("PROFILE_BACKGROUND_INTERVAL_MS", "0"))  # 0이면 백그라운드 샘플링 비활성화
+    PROFILE_FLUSH_SECONDS: float = 60.0  # 백그라운드 샘플링 결과를 파일에 합산하는 간격
     
     class Config:
         env_file = ".env"
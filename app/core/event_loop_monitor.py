@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from types import FrameType
+from typing import Any, Dict, Optional
+
+from app.core.metrics import get_counter, get_gauge, get_histogram
+from app.core.profiling import fold_stack, frame_label
+
+logger = logging.getLogger(__name__)
+
+# 이벤트 루프 지연 구간 (초)
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# 이 디렉터리(app 패키지) 안의 가장 안쪽 함수를 루프를 막은 위치로 봄
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+
+async def monitor_event_loop_lag(interval: float) -> None:
+    """
+    interval초마다 깨어나 예정 시각보다 늦게 깨어난 시간(이벤트 루프 지연)을 기록
+    async 함수 안의 동기 DB 호출, 비밀번호 해시, XML 파싱처럼 루프를 막는 작업이 있으면 지연이 커짐
+    """
+    histogram = get_histogram("lawmate_event_loop_lag_seconds", "이벤트 루프 지연 시간", buckets=LAG_BUCKETS)
+    last_lag = get_gauge("lawmate_event_loop_lag_last_seconds", "마지막으로 측정한 이벤트 루프 지연 시간")
+
+    while True:
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lag = max(time.perf_counter() - expected, 0.0)
+        histogram.observe(lag)
+        last_lag.set(lag)
+
+def blocking_site(frame: Optional[FrameType]) -> str:
+    """루프를 막은 위치 - 스택에서 가장 안쪽의 app 패키지 함수 (없으면 가장 안쪽 함수)"""
+    innermost = frame
+    while frame is not None:
+        if frame.f_code.co_filename.startswith(APP_DIR):
+            return frame_label(frame.f_code)
+        frame = frame.f_back
+    return frame_label(innermost.f_code) if innermost is not None else "unknown"
+
+
+class BlockingCallDetector:
+    """
+    이벤트 루프를 threshold초 이상 막은 호출을 찾는 감시 스레드
+    - 주기적으로 루프에 빈 콜백을 넣고, threshold초 안에 실행되지 않으면 그 순간 루프 스레드의 스택을 읽어
+      막은 위치(app 패키지의 가장 안쪽 함수)를 lawmate_event_loop_blocked_total{site}에 기록
+    - 막힌 시간(콜백을 넣은 후 실행될 때까지)은 lawmate_event_loop_blocked_seconds에 기록
+    - log_stacks면 막은 호출의 전체 스택을 WARNING 로그로 남김 (EVENT_LOOP_BLOCK_DEBUG)
+    - 확인 간격이 threshold/2이므로 threshold의 1.5배 이상 막은 호출은 항상 찾음
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, threshold: float, log_stacks: bool = False,
+                 loop_thread_id: Optional[int] = None):
+        self.loop = loop
+        self.threshold = threshold
+        self.log_stacks = log_stacks
+        self.loop_thread_id = loop_thread_id or threading.get_ident()
+        self.durations = get_histogram(
+            "lawmate_event_loop_blocked_seconds", "이벤트 루프를 막은 호출의 실행 시간", buckets=LAG_BUCKETS
+        )
+        self._counters: Dict[str, Any] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="lawmate-loop-watchdog", daemon=True)
+
+    def start(self) -> "BlockingCallDetector":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.threshold / 2):
+            ping = threading.Event()
+            sent = time.perf_counter()
+            try:
+                self.loop.call_soon_threadsafe(ping.set)
+            except RuntimeError:  # 루프가 닫힘
+                return
+            if ping.wait(self.threshold):
+                continue
+
+            frame = sys._current_frames().get(self.loop_thread_id)
+            site = blocking_site(frame)
+            stack = fold_stack(frame, "event-loop") if self.log_stacks else ""
+            while not ping.wait(self.threshold):
+                if self._stop.is_set() or self.loop.is_closed():
+                    return
+            self.record(site, time.perf_counter() - sent, stack)
+
+    def record(self, site: str, duration: float, stack: str = "") -> None:
+        counter = self._counters.get(site)
+        if counter is None:
+            counter = get_counter(
+                "lawmate_event_loop_blocked_total", "이벤트 루프를 막은 호출 수 (막은 위치별)", {"site": site}
+            )
+            self._counters[site] = counter
+        counter.inc()
+        self.durations.observe(duration)
+        if self.log_stacks:
+            logger.warning(
+                "이벤트 루프가 %.0fms 동안 막힘: %s", duration * 1000, site,
+                extra={"fields": {"site": site, "duration_ms": round(duration * 1000, 1), "stack": stack.split(";")}}
+            )
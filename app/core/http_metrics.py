@@ -0,0 +1,164 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.core.metrics import Counter, Gauge, Histogram, get_counter, get_gauge, get_histogram
+from app.core.timing import record_stage
+
+# 상태 코드 구간 레이블 (status_code // 100)
+STATUS_CLASSES = ("1xx", "1xx", "2xx", "3xx", "4xx", "5xx")
+
+
+class RouteMetrics:
+    """
+    경로(라우트 템플릿) + 메서드 하나의 지표 객체 묶음
+    처음 요청될 때 한 번만 만들어 두므로 이후 요청에서는 레이블 dict/문자열을 만들지 않음
+    """
+    __slots__ = ("latency", "statuses")
+
+    def __init__(self, method: str, route: str):
+        labels = {"method": method, "route": route}
+        self.latency = get_histogram("lawmate_http_request_seconds", "경로별 요청 처리 시간", labels)
+        self.statuses: List[Counter] = [
+            get_counter("lawmate_http_requests_total", "경로별 요청 수", {**labels, "status": status})
+            for status in STATUS_CLASSES
+        ]
+
+
+class RequestMetricsMiddleware:
+    """
+    경로별 요청 수(상태 코드 구간별)와 처리 시간을 기록하는 ASGI 미들웨어
+    BaseHTTPMiddleware와 달리 요청/응답 객체를 새로 만들지 않고 ASGI 메시지만 확인
+    경로 레이블은 URL이 아니라 라우트 템플릿(/api/v1/cases/{case_id})을 사용해 시계열 수가 늘어나지 않음
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+        # 라우트 템플릿 -> 메서드 -> RouteMetrics (템플릿 문자열은 라우트 객체가 가진 값을 그대로 사용)
+        self._routes: Dict[str, Dict[str, RouteMetrics]] = {}
+        self.in_flight: Gauge = get_gauge("lawmate_http_requests_in_flight", "처리 중인 요청 수")
+
+    def _route_metrics(self, path: str, method: str) -> RouteMetrics:
+        methods = self._routes.get(path)
+        if methods is None:
+            methods = self._routes.setdefault(path, {})
+        metrics = methods.get(method)
+        if metrics is None:
+            metrics = methods.setdefault(method, RouteMetrics(method, path))
+        return metrics
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.in_flight.value += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.in_flight.value -= 1
+            # 라우터가 일치한 라우트를 scope["route"]에 남김 (FastAPI APIRoute, 일치하는 라우트가 없으면 unmatched)
+            route = scope.get("route")
+            metrics = self._route_metrics(route.path if route is not None else "unmatched", scope["method"])
+            metrics.latency.observe(time.perf_counter() - started)
+            metrics.statuses[min(status_code // 100, 5)].inc()
+
+
+class UpstreamMetrics:
+    """외부 API(서비스 + 엔드포인트) 하나의 호출 지표 객체 묶음 (결과 분류별 카운터는 처음 나올 때 생성)"""
+    __slots__ = ("service", "endpoint", "latency", "outcomes")
+
+    def __init__(self, service: str, endpoint: str):
+        self.service = service
+        self.endpoint = endpoint
+        self.latency: Histogram = get_histogram(
+            "lawmate_upstream_request_seconds", "외부 API 호출 시간 (실패 포함)", {"service": service, "endpoint": endpoint}
+        )
+        self.outcomes: Dict[str, Counter] = {}
+
+    def count(self, outcome: str) -> None:
+        counter = self.outcomes.get(outcome)
+        if counter is None:
+            counter = self.outcomes.setdefault(outcome, get_counter(
+                "lawmate_upstream_requests_total", "외부 API 호출 수 (결과 분류별)",
+                {"service": self.service, "endpoint": self.endpoint, "outcome": outcome}
+            ))
+        counter.inc()
+
+
+_upstreams: Dict[str, Dict[str, UpstreamMetrics]] = {}
+
+def classify_response(response: httpx.Response) -> str:
+    """
+    외부 API 응답 결과 분류
+    ok, html_error(200이지만 HTML 오류 페이지), rate_limited(429/529), client_error(4xx), server_error(5xx)
+    """
+    status_code = response.status_code
+    if status_code in (429, 529):
+        return "rate_limited"
+    if status_code >= 500:
+        return "server_error"
+    if status_code >= 400:
+        return "client_error"
+    if "html" in response.headers.get("content-type", "").lower():
+        return "html_error"
+    return "ok"
+
+def classify_exception(exc: BaseException) -> str:
+    """외부 API 호출 예외 분류 (timeout, network, cancelled, error)"""
+    if isinstance(exc, asyncio.CancelledError):
+        return "cancelled"
+    if isinstance(exc, httpx.TimeoutException):
+        return "timeout"
+    if isinstance(exc, httpx.TransportError):
+        return "network"
+    return "error"
+
+
+class UpstreamCall:
+    """
+    외부 API 호출 한 건의 시간/결과 기록 (단계 시간도 함께 기록)
+
+    with UpstreamCall("law_api", "lawSearch") as call:
+        response = await client.get(...)
+        call.response(response)
+    """
+    __slots__ = ("metrics", "started", "outcome")
+
+    def __init__(self, service: str, endpoint: str):
+        endpoints = _upstreams.get(service)
+        if endpoints is None:
+            endpoints = _upstreams.setdefault(service, {})
+        metrics = endpoints.get(endpoint)
+        if metrics is None:
+            metrics = endpoints.setdefault(endpoint, UpstreamMetrics(service, endpoint))
+        self.metrics = metrics
+        self.started = 0.0
+        self.outcome: Optional[str] = None
+
+    def response(self, response: httpx.Response) -> httpx.Response:
+        self.outcome = classify_response(response)
+        return response
+
+    def __enter__(self) -> "UpstreamCall":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        elapsed = time.perf_counter() - self.started
+        if exc is not None:
+            self.outcome = classify_exception(exc)
+        self.metrics.latency.observe(elapsed)
+        self.metrics.count(self.outcome or "ok")
+        record_stage(self.metrics.service, elapsed)
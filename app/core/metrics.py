@@ -0,0 +1,241 @@
+import bisect
+import logging
+import math
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 기본 지연 시간 구간 (초)
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """
+    고정 구간 히스토그램 (지연 시간 등 측정값 분포 기록)
+    구간별 개수와 합계만 저장하므로 관측 비용이 일정하고 메모리 사용량이 늘지 않음
+    """
+
+    def __init__(self, name: str, description: str = "", buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf 구간
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """측정값 기록"""
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[position] += 1
+            self.sum += value
+            self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """구간 경계 기준 분위수 추정값 (기록이 없으면 None, +Inf 구간이면 마지막 경계값)"""
+        with self._lock:
+            counts = list(self.counts)
+            total = self.count
+        if total == 0:
+            return None
+
+        target = q * total
+        cumulative = 0
+        for position, count in enumerate(counts):
+            cumulative += count
+            if cumulative >= target and count:
+                return self.buckets[min(position, len(self.buckets) - 1)]
+        return self.buckets[-1]
+
+    def snapshot(self) -> Dict[str, object]:
+        """현재 누적 값 (구간별 누적 개수, 합계, 전체 개수)"""
+        with self._lock:
+            counts = list(self.counts)
+            total_sum = self.sum
+            total = self.count
+
+        cumulative = []
+        running = 0
+        for bound, count in zip(list(self.buckets) + [float("inf")], counts):
+            running += count
+            cumulative.append((bound, running))
+        return {"buckets": cumulative, "sum": total_sum, "count": total}
+
+
+class Counter:
+    """누적 카운터 (캐시 적중/미적중 횟수 등)"""
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Gauge:
+    """현재 값 (대기열 길이, 동시 실행 한도 등)"""
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+_histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Histogram] = {}
+_gauges: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Gauge] = {}
+_counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Counter] = {}
+_registry_lock = threading.Lock()
+
+def get_histogram(
+    name: str,
+    description: str = "",
+    labels: Optional[Dict[str, str]] = None,
+    buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+) -> Histogram:
+    """이름과 레이블로 히스토그램 조회 (없으면 생성)"""
+    key = (name, tuple(sorted((labels or {}).items())))
+    histogram = _histograms.get(key)
+    if histogram is None:
+        with _registry_lock:
+            histogram = _histograms.get(key)
+            if histogram is None:
+                histogram = Histogram(name, description, buckets)
+                _histograms[key] = histogram
+    return histogram
+
+def observe(name: str, value: float, labels: Optional[Dict[str, str]] = None, description: str = "") -> None:
+    """측정값 기록 (히스토그램이 없으면 기본 지연 시간 구간으로 생성)"""
+    get_histogram(name, description, labels).observe(value)
+
+def all_histograms() -> List[Tuple[str, Dict[str, str], Histogram]]:
+    """등록된 전체 히스토그램 (이름, 레이블, 히스토그램)"""
+    with _registry_lock:
+        items = list(_histograms.items())
+    return [(name, dict(labels), histogram) for (name, labels), histogram in items]
+
+def get_counter(name: str, description: str = "", labels: Optional[Dict[str, str]] = None) -> Counter:
+    """이름과 레이블로 카운터 조회 (없으면 생성)"""
+    key = (name, tuple(sorted((labels or {}).items())))
+    counter = _counters.get(key)
+    if counter is None:
+        with _registry_lock:
+            counter = _counters.get(key)
+            if counter is None:
+                counter = Counter(name, description)
+                _counters[key] = counter
+    return counter
+
+def increment(name: str, labels: Optional[Dict[str, str]] = None, description: str = "", amount: int = 1) -> None:
+    """카운터 증가 (없으면 생성)"""
+    get_counter(name, description, labels).inc(amount)
+
+def all_counters() -> List[Tuple[str, Dict[str, str], Counter]]:
+    """등록된 전체 카운터 (이름, 레이블, 카운터)"""
+    with _registry_lock:
+        items = list(_counters.items())
+    return [(name, dict(labels), counter) for (name, labels), counter in items]
+
+def get_gauge(name: str, description: str = "", labels: Optional[Dict[str, str]] = None) -> Gauge:
+    """이름과 레이블로 게이지 조회 (없으면 생성)"""
+    key = (name, tuple(sorted((labels or {}).items())))
+    gauge = _gauges.get(key)
+    if gauge is None:
+        with _registry_lock:
+            gauge = _gauges.get(key)
+            if gauge is None:
+                gauge = Gauge(name, description)
+                _gauges[key] = gauge
+    return gauge
+
+def set_gauge(name: str, value: float, labels: Optional[Dict[str, str]] = None, description: str = "") -> None:
+    """게이지 값 설정 (없으면 생성)"""
+    get_gauge(name, description, labels).set(value)
+
+def all_gauges() -> List[Tuple[str, Dict[str, str], Gauge]]:
+    """등록된 전체 게이지 (이름, 레이블, 게이지)"""
+    with _registry_lock:
+        items = list(_gauges.items())
+    return [(name, dict(labels), gauge) for (name, labels), gauge in items]
+
+
+_collectors: List[Callable[[], None]] = []
+
+def register_collector(collector: Callable[[], None]) -> None:
+    """
+    지표를 내보내기 직전에 호출할 함수 등록 (DB 연결 풀 상태, 캐시 적중률처럼 조회 시점에 계산하는 값)
+    요청 처리 중에는 호출되지 않으므로 값을 구하는 비용이 요청 처리 시간에 더해지지 않음
+    """
+    if collector not in _collectors:
+        _collectors.append(collector)
+
+def set_hit_ratio(cache: str, hits: float, total: float) -> None:
+    """캐시 적중률 게이지 설정 (조회 기록이 없으면 설정하지 않음)"""
+    if total:
+        set_gauge("lawmate_cache_hit_ratio", hits / total, {"cache": cache}, "캐시 적중률 (프로세스 시작 이후)")
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def _escape(value: str, quote: bool = True) -> str:
+    value = value.replace("\\", "\\\\").replace("\n", "\\n")
+    return value.replace('"', '\\"') if quote else value
+
+def _format_labels(labels: Dict[str, str], extra: Optional[Tuple[str, str]] = None) -> str:
+    items = sorted(labels.items())
+    if extra:
+        items.append(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in items) + "}"
+
+def render_prometheus() -> str:
+    """
+    등록된 전체 지표를 Prometheus 텍스트 형식(0.0.4)으로 변환
+    같은 이름의 지표는 레이블만 다른 시계열로 묶어 HELP/TYPE을 한 번만 출력
+    """
+    for collector in list(_collectors):
+        try:
+            collector()
+        except Exception as e:
+            logger.warning("지표 수집 실패 (%s): %s", getattr(collector, "__name__", collector), e)
+
+    families: Dict[str, Tuple[str, str, List[str]]] = {}
+
+    def family(name: str, kind: str, description: str) -> List[str]:
+        if name not in families:
+            families[name] = (kind, description, [])
+        return families[name][2]
+
+    for name, labels, counter in all_counters():
+        family(name, "counter", counter.description).append(f"{name}{_format_labels(labels)} {_format_value(counter.value)}")
+    for name, labels, gauge in all_gauges():
+        family(name, "gauge", gauge.description).append(f"{name}{_format_labels(labels)} {_format_value(gauge.value)}")
+    for name, labels, histogram in all_histograms():
+        lines = family(name, "histogram", histogram.description)
+        snapshot = histogram.snapshot()
+        for bound, count in snapshot["buckets"]:
+            lines.append(f"{name}_bucket{_format_labels(labels, ('le', _format_value(bound)))} {count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(snapshot['sum'])}")
+        lines.append(f"{name}_count{_format_labels(labels)} {snapshot['count']}")
+
+    output = []
+    for name in sorted(families):
+        kind, description, lines = families[name]
+        if description:
+            output.append(f"# HELP {name} {_escape(description, quote=False)}")
+        output.append(f"# TYPE {name} {kind}")
+        output.extend(lines)
+    return "\n".join(output) + "\n"
@@ -0,0 +1,296 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.structured_logging import get_request_id
+
+logger = logging.getLogger(__name__)
+
+# 이 파일에서 멈춰 있는 스레드는 대기 중으로 보고 샘플에서 제외 (작업 대기열, 이벤트 루프 select 등)
+IDLE_FILES = ("threading.py", "queue.py", "selectors.py", os.path.join("concurrent", "futures", "thread.py"))
+MAX_STACK_DEPTH = 128
+
+# 저장된 프로파일 파일 이름 형식
+PROFILE_NAME_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,100}\.folded$")
+
+# 이벤트 루프별 현재 실행 중인 태스크 (다른 스레드에서 읽기만 함)
+_current_tasks: Optional[Dict[Any, Any]] = getattr(asyncio.tasks, "_current_tasks", None)
+
+_labels: Dict[CodeType, str] = {}
+_root = os.getcwd() + os.sep
+
+def frame_label(code: CodeType) -> str:
+    """함수 이름 (파일:함수 시작 줄) - 코드 객체별로 한 번만 생성"""
+    label = _labels.get(code)
+    if label is None:
+        path = code.co_filename
+        if path.startswith(_root):
+            path = path[len(_root):]
+        else:
+            path = os.sep.join(path.split(os.sep)[-2:])
+        label = f"{code.co_name} ({path}:{code.co_firstlineno})"
+        _labels[code] = label
+    return label
+
+def fold_stack(frame: Optional[FrameType], root: str) -> str:
+    """프레임 스택을 flame graph용 접힌 스택 한 줄로 변환 (root;바깥 함수;...;안쪽 함수)"""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.append(root)
+    labels.reverse()
+    return ";".join(labels)
+
+def is_idle(frame: FrameType) -> bool:
+    return frame.f_code.co_filename.endswith(IDLE_FILES)
+
+
+class StackSampler:
+    """
+    일정 간격으로 다른 스레드의 파이썬 스택을 수집하는 샘플링 프로파일러 (별도 스레드에서 실행)
+    - loop/task를 지정하면 이벤트 루프 스레드에서는 그 태스크가 실행 중일 때만 수집 (같은 루프의 다른 요청 제외)
+    - 다른 스레드(스레드 풀에서 실행되는 동기 엔드포인트/DB 호출 등)는 대기 중이 아닐 때만 수집
+    - 결과는 접힌 스택별 샘플 수 (flamegraph.pl, speedscope 등에서 바로 열 수 있음)
+    """
+
+    def __init__(self, interval: float, loop: Optional[asyncio.AbstractEventLoop] = None,
+                 task: Optional["asyncio.Task"] = None, loop_thread_id: Optional[int] = None,
+                 max_seconds: Optional[float] = None):
+        self.interval = interval
+        self.loop = loop
+        self.task = task
+        self.loop_thread_id = loop_thread_id
+        self.max_seconds = max_seconds
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="lawmate-profiler", daemon=True)
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> "StackSampler":
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        return self
+
+    def take(self) -> Counter:
+        """지금까지 모은 샘플을 꺼내고 비움"""
+        with self._lock:
+            counts, self.counts = self.counts, Counter()
+        return counts
+
+    def folded(self) -> str:
+        with self._lock:
+            return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        deadline = time.monotonic() + self.max_seconds if self.max_seconds else None
+        while not self._stop.wait(self.interval):
+            if deadline and time.monotonic() > deadline:
+                break
+            self._sample(own_id)
+
+    def _sample(self, own_id: int) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        stacks = []
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            if thread_id == self.loop_thread_id and self.task is not None and _current_tasks is not None:
+                if _current_tasks.get(self.loop) is not self.task:
+                    continue
+            elif is_idle(frame):
+                continue
+            stacks.append(fold_stack(frame, names.get(thread_id, str(thread_id))))
+        with self._lock:
+            self.samples += 1
+            self.counts.update(stacks)
+
+
+def write_folded(path: str, counts: Counter, merge: bool = False) -> None:
+    """접힌 스택 파일 저장 (merge면 기존 파일의 샘플 수에 더함, 임시 파일에 쓴 후 교체)"""
+    if merge and os.path.exists(path):
+        counts = counts + read_folded(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        for stack, count in counts.most_common():
+            file.write(f"{stack} {count}\n")
+    os.replace(temporary, path)
+
+def read_folded(path: str) -> Counter:
+    counts: Counter = Counter()
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack and count.isdigit():
+                counts[stack] += int(count)
+    return counts
+
+def profile_path(name: str) -> str:
+    """저장된 프로파일 파일 경로 (이름 형식이 맞지 않으면 ValueError)"""
+    if not PROFILE_NAME_PATTERN.match(name):
+        raise ValueError(f"잘못된 프로파일 이름: {name}")
+    return os.path.join(settings.PROFILE_DIR, name)
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """저장된 프로파일 목록 (최근 수정 순)"""
+    if not os.path.isdir(settings.PROFILE_DIR):
+        return []
+    profiles = []
+    for name in os.listdir(settings.PROFILE_DIR):
+        if PROFILE_NAME_PATTERN.match(name):
+            stat = os.stat(os.path.join(settings.PROFILE_DIR, name))
+            profiles.append({"name": name, "size": stat.st_size, "modified": stat.st_mtime})
+    return sorted(profiles, key=lambda profile: profile["modified"], reverse=True)
+
+
+class RequestProfilingMiddleware:
+    """
+    관리자가 요청한 요청 한 건만 샘플링 프로파일러로 실행 (X-Profile: 1 헤더 또는 _profile=1 쿼리)
+    - 관리자 확인은 get_admin_user 의존성 사용 (관리자가 아니면 403)
+    - 결과는 PROFILE_DIR/request-<요청 ID>.folded로 저장하고 파일 이름을 X-Profile-Id 헤더로 알려줌
+      (GET /api/v1/admin/profiles/{이름}으로 조회)
+    - 프로파일 요청이 아니면 헤더/쿼리 문자열 확인만 하고 그대로 전달
+    """
+
+    def __init__(self, app: Any, dependency_overrides_provider: Any = None):
+        self.app = app
+        self.dependency_overrides_provider = dependency_overrides_provider
+
+    @staticmethod
+    def requested(scope: Dict[str, Any]) -> bool:
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        if "1" in query.get("_profile", ()):
+            return True
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                return value in (b"1", b"true")
+        return False
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or not self.requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.authorize(scope)
+        except HTTPException as e:
+            body = json.dumps({"detail": e.detail}).encode("utf-8")
+            headers = [(b"content-type", b"application/json")]
+            headers += [(key.lower().encode("latin-1"), value.encode("latin-1")) for key, value in (e.headers or {}).items()]
+            await send({"type": "http.response.start", "status": e.status_code, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        profile_name = f"request-{get_request_id() or os.urandom(8).hex()}.folded"
+        sampler = StackSampler(
+            settings.PROFILE_INTERVAL_MS / 1000,
+            loop=asyncio.get_running_loop(),
+            task=asyncio.current_task(),
+            loop_thread_id=threading.get_ident(),
+            max_seconds=settings.PROFILE_MAX_SECONDS
+        ).start()
+
+        async def send_with_profile(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", ())) + [
+                    (b"x-profile-id", profile_name.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            sampler.stop()
+            counts = sampler.take()
+            await asyncio.to_thread(write_folded, profile_path(profile_name), counts)
+            logger.info("요청 프로파일 저장: %s (샘플 %d회, 스택 %d개)", profile_name, sampler.samples, len(counts))
+
+    async def authorize(self, scope: Dict[str, Any]) -> Any:
+        """Authorization 헤더의 토큰으로 get_current_user -> get_admin_user 확인 (테스트용 의존성 재정의 반영)"""
+        from app.api.dependencies import get_admin_user
+        from app.api.endpoints.auth import get_current_user
+        from app.db.database import get_db
+
+        overrides = getattr(self.dependency_overrides_provider, "dependency_overrides", {})
+        if get_admin_user in overrides:
+            return overrides[get_admin_user]()
+        if get_current_user in overrides:
+            return get_admin_user(overrides[get_current_user]())
+
+        token = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, credentials = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer":
+                    token = credentials
+                break
+        if not token:
+            raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+
+        sessions = overrides.get(get_db, get_db)()
+        db = next(sessions)
+        try:
+            return get_admin_user(await get_current_user(token, db))
+        finally:
+            sessions.close()
+
+
+class BackgroundProfiler:
+    """
+    서버 전체를 낮은 빈도로 계속 샘플링해 PROFILE_DIR/aggregate-<날짜시간>.folded에 시간 단위로 합산 저장
+    PROFILE_BACKGROUND_INTERVAL_MS가 0이면 시작하지 않음 (프로파일러 스레드 없음)
+    """
+
+    def __init__(self, interval: float, flush_seconds: float, directory: Optional[str] = None):
+        self.flush_seconds = flush_seconds
+        self.directory = directory or settings.PROFILE_DIR
+        self.sampler = StackSampler(interval)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="lawmate-profile-writer", daemon=True)
+
+    def start(self) -> "BackgroundProfiler":
+        self.sampler.start()
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.sampler.stop()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.flush()
+
+    def flush(self) -> Optional[str]:
+        counts = self.sampler.take()
+        if not counts:
+            return None
+        path = os.path.join(self.directory, time.strftime("aggregate-%Y%m%d%H.folded"))
+        write_folded(path, counts, merge=True)
+        return path
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_seconds):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning("백그라운드 프로파일 저장 실패: %s", e)
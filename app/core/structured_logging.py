@@ -0,0 +1,244 @@
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import sys
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.metrics import get_counter
+
+# 값을 가리는 키 (대소문자 무시, 포함 여부로 판단)
+SENSITIVE_KEY_PARTS = ("password", "token", "secret", "api_key", "apikey", "authorization", "cookie")
+SENSITIVE_KEYS = {"oc", "x-api-key"}  # 국가법령정보 API 기관코드(OC), Claude API 키 헤더
+REDACTED = "[REDACTED]"
+
+# 메시지 문자열 안의 비밀 값 (URL 쿼리의 OC=, Bearer 토큰, Claude API 키, key: value 형태) - 한 번의 탐색으로 처리
+SECRET_PATTERN = re.compile(
+    r"(?i)(\bOC=|\bbearer\s+|['\"]?\b(?:x-api-key|authorization|password|api_key|OC)['\"]?\s*[:=]\s*['\"]?)"
+    r"(?:bearer\s+)?[^&\s'\",}]+"
+    r"|()sk-ant-[A-Za-z0-9_-]+"
+)
+# 비밀 값이 있을 수 있는 문자열에만 정규식 탐색 (소문자 기준)
+SECRET_HINTS = ("oc", "bearer", "sk-ant", "api_key", "api-key", "authorization", "password")
+
+# 요청에 들어온 X-Request-ID는 이 형식일 때만 그대로 사용
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+_request_id: ContextVar[Optional[str]] = ContextVar("lawmate_request_id", default=None)
+_sampled: ContextVar[bool] = ContextVar("lawmate_log_sampled", default=True)
+
+_dropped_counter = get_counter("lawmate_log_records_dropped_total", "로그 대기열이 가득 차서 버린 로그 수")
+
+def get_request_id() -> Optional[str]:
+    """현재 요청의 상관관계 ID (요청 처리 중이 아니면 None)"""
+    return _request_id.get()
+
+_sensitive_keys: Dict[str, bool] = {}
+
+def is_sensitive_key(key: str) -> bool:
+    sensitive = _sensitive_keys.get(key)
+    if sensitive is None:
+        lowered = key.lower()
+        sensitive = lowered in SENSITIVE_KEYS or any(part in lowered for part in SENSITIVE_KEY_PARTS)
+        if len(_sensitive_keys) < 4096:
+            _sensitive_keys[key] = sensitive
+    return sensitive
+
+def redact_text(text: str) -> str:
+    """문자열 안의 API 키, 토큰, 비밀번호 값을 가림"""
+    lowered = text.lower()
+    if not any(hint in lowered for hint in SECRET_HINTS):
+        return text
+    return SECRET_PATTERN.sub(_redacted_match, text)
+
+def _redacted_match(match: "re.Match") -> str:
+    return (match.group(1) or "") + REDACTED
+
+def redact(value: Any) -> Any:
+    """dict/list 안의 민감한 키 값과 문자열 안의 비밀 값을 가린 복사본"""
+    if isinstance(value, dict):
+        return {key: REDACTED if is_sensitive_key(str(key)) else redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value]
+    if isinstance(value, str):
+        return redact_text(value)
+    return value
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    로그 한 건을 JSON 한 줄로 변환 (대기열 처리 스레드에서 실행되므로 요청 처리 시간에 포함되지 않음)
+    extra={"fields": {...}}로 넘긴 값은 fields에 그대로 포함 (민감한 값은 가림)
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": redact_text(record.getMessage()),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry["fields"] = redact(fields)
+        if record.exc_info:
+            entry["exception"] = redact_text(self.formatException(record.exc_info))
+        elif record.exc_text:
+            entry["exception"] = redact_text(record.exc_text)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """개발용 한 줄 텍스트 형식 (민감한 값은 가림)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = f"{self.formatTime(record)} {record.levelname} [{getattr(record, 'request_id', None) or '-'}] {record.name}: {record.getMessage()}"
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + json.dumps(redact(fields), ensure_ascii=False, default=str)
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return redact_text(line)
+
+
+class ContextFilter(logging.Filter):
+    """
+    요청 ID 기록 + 샘플링
+    WARNING 이상은 항상 남기고, 그 아래는 샘플링에서 빠진 요청이면 버림 (요청 밖의 로그는 항상 남김)
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get()
+        return record.levelno >= logging.WARNING or _sampled.get()
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    로그를 대기열에만 넣고 바로 반환하는 핸들러 (출력은 QueueListener 스레드에서 처리)
+    메시지 포맷/JSON 변환/출력을 이벤트 루프에서 하지 않고, 대기열이 가득 차면 기다리지 않고 버림
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 기본 구현은 여기서 포맷하므로 예외 정보만 문자열로 바꾸고 나머지는 출력 스레드로 넘김
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _dropped_counter.inc()
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def setup_logging(stream: Any = None) -> logging.handlers.QueueListener:
+    """
+    app 로거(app.* 전체)에 대기열 핸들러 연결 후 출력 스레드 시작 (여러 번 호출해도 한 번만 설정)
+    stream: 출력 대상 (기본 sys.stderr)
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else TextFormatter())
+
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    handler.addFilter(ContextFilter())
+
+    logger = logging.getLogger("app")
+    logger.setLevel(settings.LOG_LEVEL.upper())
+    logger.addHandler(handler)
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+def shutdown_logging() -> None:
+    """대기열에 남은 로그를 모두 출력하고 출력 스레드 종료"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    logger = logging.getLogger("app")
+    for handler in list(logger.handlers):
+        if isinstance(handler, NonBlockingQueueHandler):
+            logger.removeHandler(handler)
+    _listener = None
+
+
+access_logger = logging.getLogger("app.access")
+
+class RequestLoggingMiddleware:
+    """
+    요청마다 상관관계 ID를 정하고(X-Request-ID 헤더가 있으면 사용) 응답 헤더로 돌려준 뒤 접근 로그 한 줄 기록
+    - 헤더 전체나 쿼리 문자열은 기록하지 않음 (API 키/토큰 노출 방지)
+    - 샘플링: LOG_SAMPLE_RATE 비율의 요청만 INFO 이하 로그를 남김
+      5xx 응답은 ERROR, LOG_SLOW_REQUEST_MS보다 느린 요청은 WARNING으로 항상 기록
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                value = value.decode("latin-1")
+                if REQUEST_ID_PATTERN.match(value):
+                    request_id = value
+                break
+        if not request_id:
+            request_id = os.urandom(8).hex()
+
+        sampled = settings.LOG_SAMPLE_RATE >= 1.0 or random.random() < settings.LOG_SAMPLE_RATE
+        id_token = _request_id.set(request_id)
+        sampled_token = _sampled.set(sampled)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_request_id(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", ())) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if status_code >= 500:
+                level = logging.ERROR
+            elif elapsed_ms >= settings.LOG_SLOW_REQUEST_MS:
+                level = logging.WARNING
+            else:
+                level = logging.INFO
+            if (sampled or level > logging.INFO) and access_logger.isEnabledFor(level):
+                route = scope.get("route")
+                access_logger.log(level, "%s %s %d %.1fms", scope["method"], scope["path"], status_code, elapsed_ms, extra={"fields": {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": route.path if route is not None else None,
+                    "status": status_code,
+                    "duration_ms": round(elapsed_ms, 1),
+                }})
+            _sampled.reset(sampled_token)
+            _request_id.reset(id_token)
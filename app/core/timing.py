@@ -0,0 +1,130 @@
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.core.metrics import Histogram, get_histogram
+
+STAGE_HISTOGRAM = "lawmate_stage_seconds"
+
+
+class StageTimings:
+    """
+    요청(또는 상담 처리) 한 건에서 단계별로 걸린 시간 모음
+    parent가 있으면 기록한 시간을 바깥 모음에도 함께 기록 (상담 처리 단계가 요청 전체의 Server-Timing에도 나타나도록)
+    """
+
+    def __init__(self, parent: Optional["StageTimings"] = None):
+        self.parent = parent
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float]] = []  # (단계, 초)
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.spans.append((stage, seconds))
+
+    def totals(self) -> Dict[str, Tuple[int, float]]:
+        """단계별 (횟수, 합계 초) - 처음 기록된 순서"""
+        totals: Dict[str, Tuple[int, float]] = {}
+        for stage, seconds in self.spans:
+            count, total = totals.get(stage, (0, 0.0))
+            totals[stage] = (count + 1, total + seconds)
+        return totals
+
+    def summary(self) -> Dict[str, Any]:
+        """저장/응답용 요약 (단계별 횟수와 합계 ms, 시작부터 지금까지의 전체 ms)"""
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "stages": {stage: {"count": count, "ms": round(total * 1000, 1)}
+                       for stage, (count, total) in self.totals().items()}
+        }
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값 (예: claude;dur=812.4, law_api;dur=120.3)"""
+        entries = [f"{stage};dur={total * 1000:.1f}" for stage, (_, total) in self.totals().items()]
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(entries)
+
+
+_current_timings: ContextVar[Optional[StageTimings]] = ContextVar("lawmate_stage_timings", default=None)
+
+def current_timings() -> Optional[StageTimings]:
+    return _current_timings.get()
+
+@contextmanager
+def collect_stages() -> Iterator[StageTimings]:
+    """이 블록 안에서 기록한 단계 시간을 모음 (바깥에 모음이 있으면 함께 기록)"""
+    timings = StageTimings(parent=_current_timings.get())
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+# 단계 이름 -> 히스토그램 (기록할 때마다 레이블을 만들지 않도록 처음 한 번만 조회)
+_stage_histograms: Dict[str, Histogram] = {}
+
+def record_stage(stage: str, seconds: float) -> None:
+    """단계 시간 기록 (단계별 히스토그램 + 진행 중인 모음)"""
+    histogram = _stage_histograms.get(stage)
+    if histogram is None:
+        histogram = _stage_histograms.setdefault(
+            stage, get_histogram(STAGE_HISTOGRAM, "상담 처리 단계별 소요 시간(초)", labels={"stage": stage})
+        )
+    histogram.observe(seconds)
+    timings = _current_timings.get()
+    while timings is not None:
+        timings.add(stage, seconds)
+        timings = timings.parent
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """블록 실행 시간을 단계 시간으로 기록 (예외가 발생해도 기록)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - started)
+
+def timed(name: str) -> Callable:
+    """함수(동기/비동기) 실행 시간을 단계 시간으로 기록하는 데코레이터"""
+    def decorator(function: Callable) -> Callable:
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                with stage(name):
+                    return await function(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class ServerTimingMiddleware:
+    """
+    요청 처리 중 기록한 단계 시간을 Server-Timing 응답 헤더로 전달하는 ASGI 미들웨어
+    (엔드포인트가 같은 태스크에서 실행되도록 BaseHTTPMiddleware를 사용하지 않음)
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with collect_stages() as timings:
+            async def send_with_timing(message: Dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    message["headers"] = list(message.get("headers", ())) + [
+                        (b"server-timing", timings.server_timing().encode("latin-1"))
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
@@ -1,8 +1,12 @@
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.core.metrics import register_collector, set_gauge
+from app.core.timing import record_stage
 
 # 데이터베이스 테이블 생성 여부 설정
 # 테이블이 이미 존재하는 경우 생성하지 않고 기존 테이블 사용
@@ -14,6 +18,37 @@ engine = create_engine(settings.DATABASE_URL)
 # 세션 팩토리 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 연결 풀 상태 (/metrics 조회 시점에 확인, QueuePool 외의 풀은 지원하는 값만)
+POOL_GAUGES = (
+    ("lawmate_db_pool_size", "size", "DB 연결 풀 크기"),
+    ("lawmate_db_pool_checked_out", "checkedout", "사용 중인 DB 연결 수"),
+    ("lawmate_db_pool_checked_in", "checkedin", "대기 중인 DB 연결 수"),
+    ("lawmate_db_pool_overflow", "overflow", "풀 크기를 넘어 만든 DB 연결 수"),
+)
+
+def _collect_pool_stats():
+    pool = engine.pool
+    for name, method, description in POOL_GAUGES:
+        if hasattr(pool, method):
+            set_gauge(name, getattr(pool, method)(), description=description)
+
+register_collector(_collect_pool_stats)
+
+# 커밋(flush 포함) 소요 시간을 단계 시간(db_commit)으로 기록 - 모든 세션에 적용
+@event.listens_for(Session, "before_commit")
+def _start_commit_timer(session):
+    session.info["commit_started"] = time.perf_counter()
+
+@event.listens_for(Session, "after_commit")
+def _record_commit_time(session):
+    started = session.info.pop("commit_started", None)
+    if started is not None:
+        record_stage("db_commit", time.perf_counter() - started)
+
+@event.listens_for(Session, "after_rollback")
+def _clear_commit_timer(session):
+    session.info.pop("commit_started", None)
+
 # 모델 기본 클래스
 Base = declarative_base()
 
@@ -0,0 +1,2 @@
+-- 법령 테이블에 시행일자 필드 추가 (현행법령 증분 동기화에 사용)
+ALTER TABLE Law ADD COLUMN enforcement_date VARCHAR(10);
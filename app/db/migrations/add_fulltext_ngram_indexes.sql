@@ -0,0 +1,4 @@
+-- 법령 조문 / 판례 FULLTEXT 색인 추가 (한글 검색을 위해 ngram 파서 사용, 기본 ngram_token_size = 2)
+-- LOCAL_SEARCH_BACKEND=fulltext 설정 시 MATCH ... AGAINST 검색에 사용
+ALTER TABLE Law_Article ADD FULLTEXT INDEX ft_law_article_content (content, article_title) WITH PARSER ngram;
+ALTER TABLE Precedent ADD FULLTEXT INDEX ft_precedent_text (case_name, summary) WITH PARSER ngram;
@@ -0,0 +1,2 @@
+-- 판례 테이블에 판시사항 필드 추가 (로컬 판례 검색 BM25F 필드로 사용)
+ALTER TABLE Precedent ADD COLUMN holding TEXT;
@@ -0,0 +1,3 @@
+-- 판례 테이블에 판례일련번호 필드 추가 (판례 수집 작업의 워터마크로 사용)
+ALTER TABLE Precedent ADD COLUMN precedent_serial VARCHAR(20);
+CREATE INDEX ix_precedent_serial ON Precedent (precedent_serial);
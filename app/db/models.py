@@ -21,7 +21,7 @@ class Lawyer(Base):
     __tablename__ = "Lawyer"
 
     lawyer_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("User.user_id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("user.user_id"), nullable=False)
     registration_number = Column(String(100), unique=True, nullable=False)
     expertise = Column(String(100))
     region = Column(String(100))
@@ -33,7 +33,7 @@ class Review(Base):
     __tablename__ = "Review"
 
     review_id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("User.user_id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("user.user_id"), nullable=False)
     lawyer_id = Column(Integer, ForeignKey("Lawyer.lawyer_id"), nullable=False)
     match_id = Column(Integer, nullable=False)
     rating = Column(Integer, nullable=False)
@@ -48,7 +48,7 @@ class Notice(Base):
     __tablename__ = "Notice"
 
     notice_id = Column(Integer, primary_key=True, autoincrement=True)
-    admin_id = Column(Integer, ForeignKey("User.user_id"), nullable=False)
+    admin_id = Column(Integer, ForeignKey("user.user_id"), nullable=False)
     title = Column(String(200), nullable=False)
     content = Column(Text, nullable=False)
     view_count = Column(Integer, default=0)
@@ -60,7 +60,7 @@ class CommunityPost(Base):
     __tablename__ = "Community_Post"
 
     post_id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("User.user_id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("user.user_id"), nullable=False)
     title = Column(String(200), nullable=False)
     content = Column(Text, nullable=False)
     category = Column(String(50))
@@ -73,7 +73,7 @@ class ACase(Base):
     __tablename__ = "aCase"
 
     aCase_id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("User.user_id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("user.user_id"), nullable=False)
     aCase_type = Column(String(50), nullable=False)
     title = Column(String(200), nullable=True)
     description = Column(Text, nullable=False)
@@ -88,7 +88,7 @@ class MatchingLog(Base):
     __tablename__ = "Matching_Log"
 
     match_id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey("User.user_id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("user.user_id"), nullable=False)
     lawyer_id = Column(Integer, ForeignKey("Lawyer.lawyer_id"), nullable=False)
     aCase_id = Column(Integer, ForeignKey("aCase.aCase_id"), nullable=False)
     matched_at = Column(DateTime, default=datetime.utcnow)
@@ -122,6 +122,7 @@ class Law(Base):
     law_name = Column(String(100), nullable=False)  # 법령명
     law_type = Column(String(50))  # 법종구분
     promulgation_date = Column(String(10))  # 공포일자
+    enforcement_date = Column(String(10))  # 시행일자
     link = Column(Text)  # 법령 링크
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -151,10 +152,12 @@ class Precedent(Base):
     __tablename__ = "Precedent"
 
     precedent_id = Column(Integer, primary_key=True, autoincrement=True)
+    precedent_serial = Column(String(20), index=True)  # 판례일련번호
     case_number = Column(String(100), unique=True, nullable=False)  # 사건번호
     case_name = Column(String(200))  # 사건명
     court = Column(String(100))  # 법원
     decision_date = Column(String(10))  # 판결일자
+    holding = Column(Text)  # 판시사항
     summary = Column(Text)  # 판결요지
     judgment_text = Column(Text)  # 판결내용
     link = Column(Text)  # 판례 링크
@@ -87,6 +87,9 @@ def execute_migration(sql_file_path):
                             print(f"정보: 컬럼 '{column_name.group(1)}'이(가) 이미 존재합니다.")
                         else:
                             print(f"정보: 컬럼이 이미 존재합니다.")
+                    # 인덱스가 이미 존재하는 경우 (1061: Duplicate key name) 무시
+                    elif e.args[0] == 1061:
+                        print(f"정보: 인덱스가 이미 존재합니다: {command[:50]}...")
                     else:
                         # 다른 오류는 출력
                         print(f"오류: {e}")
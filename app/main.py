@@ -1,18 +1,29 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import traceback
+from fastapi.responses import JSONResponse, PlainTextResponse
+import asyncio
+import logging
 
 from app.core.config import settings
+from app.core.event_loop_monitor import BlockingCallDetector, monitor_event_loop_lag
+from app.core.http_metrics import RequestMetricsMiddleware
+from app.core.metrics import render_prometheus
+from app.core.structured_logging import RequestLoggingMiddleware, setup_logging, shutdown_logging
+from app.core.profiling import BackgroundProfiler, RequestProfilingMiddleware
+from app.core.timing import ServerTimingMiddleware
 from app.db.database import engine, Base, create_tables
 
+# 로그는 대기열을 거쳐 별도 스레드에서 출력 (LOG_LEVEL, LOG_FORMAT, LOG_SAMPLE_RATE)
+setup_logging()
+logger = logging.getLogger(__name__)
+
 # 데이터베이스 테이블 생성 여부 확인
 if create_tables:
     # 테이블 생성 옵션이 True인 경우에만 테이블 생성
     Base.metadata.create_all(bind=engine)
-    print("테이블 생성이 진행되었습니다.")
+    logger.info("테이블 생성이 진행되었습니다.")
 else:
-    print("기존 테이블을 사용합니다. 테이블 생성을 건너뜁니다.")
+    logger.info("기존 테이블을 사용합니다. 테이블 생성을 건너뜁니다.")
 
 app = FastAPI(
     title="LawMate API",
@@ -29,26 +40,29 @@ app.add_middleware(
     allow_origins=["http://localhost:3000", "http://127.0.0.1:3000"],  # 프론트엔드 주소를 명시적으로 허용
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization", "Accept"],
+    allow_headers=["Content-Type", "Authorization", "Accept", "X-Request-ID"],
+    expose_headers=["X-Request-ID", "Server-Timing"],
 )
 
-# 요청 미들웨어 추가 - 모든 요청 로깅
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    print(f"\n\n[요청] {request.method} {request.url}")
-    print(f"API 경로: {request.url.path}")
-    print(f"Headers: {dict(request.headers)}")
-    
-    # 요청 처리
-    response = await call_next(request)
-    
-    # 응답 정보 로깅
-    print(f"[응답] 상태 코드: {response.status_code}")
-    
-    return response
+# 단계별 소요 시간(Claude 호출, 국가법령정보 API, XML 파싱, DB 커밋 등)을 Server-Timing 헤더로 응답
+app.add_middleware(ServerTimingMiddleware)
+
+# 관리자가 요청한 요청 한 건만 프로파일링 (X-Profile: 1 헤더 또는 _profile=1 쿼리)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(RequestProfilingMiddleware, dependency_overrides_provider=app)
+
+# 요청 상관관계 ID(X-Request-ID) + 접근 로그 한 줄 (헤더/쿼리 문자열은 기록하지 않음)
+# 프로파일 파일 이름에 요청 ID를 쓰므로 프로파일링 미들웨어보다 바깥에 등록
+app.add_middleware(RequestLoggingMiddleware)
+
+# 경로별 요청 수/처리 시간 기록
+# 마지막에 추가한 미들웨어가 가장 바깥에서 실행되므로 맨 마지막에 등록해
+# 로그/프로파일링(샘플러, 프로파일 파일 저장)/Server-Timing 미들웨어 처리 시간까지 포함
+if settings.METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware)
 
 # 라우터 등록 
-from app.api.endpoints import auth, users, cases, lawyers, documents, laws, precedents
+from app.api.endpoints import auth, users, cases, lawyers, documents, laws, precedents, profiles
 
 # API 버전 경로 설정
 api_v1_prefix = settings.API_V1_STR
@@ -60,13 +74,105 @@ app.include_router(lawyers.router, prefix=f"{api_v1_prefix}/lawyers", tags=["변
 app.include_router(documents.router, prefix=f"{api_v1_prefix}/documents", tags=["문서"])
 app.include_router(laws.router, prefix=f"{api_v1_prefix}/laws", tags=["법령"])
 app.include_router(precedents.router, prefix=f"{api_v1_prefix}/precedents", tags=["판례"])
+app.include_router(profiles.router, prefix=f"{api_v1_prefix}/admin/profiles", tags=["관리자"])
+
+# 백그라운드 작업 시작 - 로컬 법령 색인 로딩, 판례 검색기 생성, 의미 검색 색인 로딩, 사례 근사 중복 색인 생성, 판례 증분 수집
+async def load_law_article_index():
+    from app.services.law_search_index import load_or_build_law_article_index
+    
+    try:
+        await asyncio.to_thread(load_or_build_law_article_index)
+    except Exception as e:
+        logger.warning("법령 조문 색인 로딩 실패 - 국가법령정보 API를 사용합니다: %s", e)
+
+async def load_precedent_ranker():
+    from app.services.precedent_ranker import rebuild_precedent_ranker
+    
+    try:
+        await asyncio.to_thread(rebuild_precedent_ranker)
+    except Exception as e:
+        logger.warning("판례 검색기 생성 실패 - 판례 API를 사용합니다: %s", e)
+
+async def load_semantic_indexes():
+    from app.services.semantic_index import load_or_build_semantic_indexes
+    
+    try:
+        await asyncio.to_thread(load_or_build_semantic_indexes)
+    except Exception as e:
+        logger.warning("의미 검색 색인 로딩 실패 - 검색 결과 순서를 그대로 사용합니다: %s", e)
+
+async def load_near_duplicate_index():
+    from app.services.near_duplicate_index import rebuild_near_duplicate_index
+    
+    try:
+        await asyncio.to_thread(rebuild_near_duplicate_index)
+    except Exception as e:
+        logger.warning("사례 근사 중복 색인 생성 실패 - 모든 사례를 새로 분석합니다: %s", e)
+
+@app.on_event("startup")
+async def start_background_jobs():
+    setup_logging()
+    
+    # FULLTEXT 검색 사용 시 프로세스 내 색인은 생성하지 않음
+    use_memory_index = settings.LOCAL_SEARCH_BACKEND != "fulltext"
+    
+    if settings.LAW_LOCAL_SEARCH and use_memory_index:
+        app.state.law_index_task = asyncio.create_task(load_law_article_index())
+    
+    if settings.PRECEDENT_LOCAL_SEARCH and use_memory_index:
+        app.state.precedent_ranker_task = asyncio.create_task(load_precedent_ranker())
+    
+    if settings.SEMANTIC_SEARCH:
+        app.state.semantic_index_task = asyncio.create_task(load_semantic_indexes())
+    
+    if settings.NEAR_DUPLICATE_REUSE:
+        app.state.near_duplicate_task = asyncio.create_task(load_near_duplicate_index())
+    
+    if settings.PRECEDENT_INGEST_INTERVAL_MINUTES > 0:
+        from app.services.precedent_ingest_service import PrecedentIngestService
+        
+        app.state.precedent_ingest_task = asyncio.create_task(
+            PrecedentIngestService().run_forever(settings.PRECEDENT_INGEST_INTERVAL_MINUTES)
+        )
+        logger.info("판례 증분 수집을 %d분 간격으로 실행합니다.", settings.PRECEDENT_INGEST_INTERVAL_MINUTES)
+    
+    if settings.METRICS_ENABLED and settings.EVENT_LOOP_LAG_INTERVAL_SECONDS > 0:
+        app.state.event_loop_lag_task = asyncio.create_task(
+            monitor_event_loop_lag(settings.EVENT_LOOP_LAG_INTERVAL_SECONDS)
+        )
+    
+    # 이벤트 루프를 오래 막은 호출(동기 DB 호출, 비밀번호 해시, XML 파싱 등)을 위치별로 기록
+    if settings.METRICS_ENABLED and settings.EVENT_LOOP_BLOCK_THRESHOLD_MS > 0:
+        app.state.blocking_call_detector = BlockingCallDetector(
+            asyncio.get_running_loop(), settings.EVENT_LOOP_BLOCK_THRESHOLD_MS / 1000, settings.EVENT_LOOP_BLOCK_DEBUG
+        ).start()
+    
+    if settings.PROFILE_BACKGROUND_INTERVAL_MS > 0:
+        app.state.background_profiler = BackgroundProfiler(
+            settings.PROFILE_BACKGROUND_INTERVAL_MS / 1000, settings.PROFILE_FLUSH_SECONDS
+        ).start()
+        logger.info("백그라운드 프로파일링을 %.0fms 간격으로 실행합니다.", settings.PROFILE_BACKGROUND_INTERVAL_MS)
+
+@app.on_event("shutdown")
+async def stop_background_jobs():
+    for name in ("precedent_ingest_task", "event_loop_lag_task"):
+        task = getattr(app.state, name, None)
+        if task:
+            task.cancel()
+    
+    for name in ("background_profiler", "blocking_call_detector"):
+        worker = getattr(app.state, name, None)
+        if worker:
+            await asyncio.to_thread(worker.stop)
+    
+    # 대기열에 남은 로그 출력
+    shutdown_logging()
 
 # 전역 예외 핸들러 추가
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    # 서버 로그에 예외 정보 출력
-    print("\n\n서버 오류 발생:", str(exc))
-    print("\n예외 정보:\n", traceback.format_exc())
+    # 서버 로그에 예외 정보 출력 (요청 ID 포함)
+    logger.error("서버 오류 발생: %s %s", request.method, request.url.path, exc_info=exc)
     
     # 클라이언트에게 예외 정보 응답
     return JSONResponse(
@@ -78,6 +184,13 @@ async def global_exception_handler(request: Request, exc: Exception):
 def root():
     return {"message": "Welcome to LawMate API", "status": "running", "version": "0.1.0"}
 
+# 운영 지표 (Prometheus 텍스트 형식)
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    if not settings.METRICS_ENABLED:
+        return PlainTextResponse("metrics disabled", status_code=404)
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.get("/api/v1/test")
 def test_api():
     return {"message": "API v1 is working", "endpoints": ["/api/v1/auth/register", "/api/v1/auth/token"]}
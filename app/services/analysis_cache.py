@@ -0,0 +1,211 @@
+from typing import Dict, Any, Optional
+from collections import OrderedDict
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from app.core.config import settings
+from app.core.metrics import get_counter, register_collector, set_hit_ratio
+from app.services.text_utils import normalize_description
+
+# 조회 결과별 카운터 (조회할 때마다 레이블을 만들지 않도록 미리 생성)
+_hit_counter = get_counter("lawmate_analysis_cache_requests_total", "분석 결과 캐시 조회 수", {"result": "hit"})
+_miss_counter = get_counter("lawmate_analysis_cache_requests_total", "분석 결과 캐시 조회 수", {"result": "miss"})
+
+class AnalysisCache:
+    """
+    법률 문제 분석 결과 캐시 (analyze_legal_issue)
+    - 키: 모델명 + 프롬프트 버전 + 정규화한 사례 설명(NFC, 문장부호 제거, 공백 정리)의 SHA-256
+      (대체 모델로 받은 결과나 이전 프롬프트로 받은 결과는 다른 키로 저장)
+    - 저장: 로컬 SQLite 파일 (서버 재시작 후에도 유지) + 최근 사용 결과는 메모리 LRU
+    - 만료: 저장 후 ttl_seconds가 지나면 미적중으로 처리하고 삭제
+    - 크기 제한: max_entries를 넘으면 마지막 사용 시각이 오래된 결과부터 삭제 (행 수는 메모리에서 관리)
+    - async 코드에서는 get_async/set_async 사용: 메모리 적중은 바로 반환하고,
+      SQLite 조회/저장(commit 시 fsync)은 스레드 풀에서 실행해 이벤트 루프를 막지 않음
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float,
+        max_entries: int,
+        memory_entries: int = 1024
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (결과, 저장 시각)
+        # 메모리 캐시와 SQLite 연결은 잠금을 나눔 (디스크 작업 중에도 메모리 적중은 기다리지 않음)
+        self._memory_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS analysis_cache ("
+            "cache_key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS ix_analysis_cache_accessed ON analysis_cache (accessed_at)")
+        self._connection.commit()
+        # 저장된 행 수 (저장할 때마다 COUNT(*)로 전체를 세지 않도록 열 때 한 번만 셈)
+        self._count = self._connection.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+
+    @staticmethod
+    def make_key(model: str, description: str, version: str = "") -> str:
+        return hashlib.sha256(f"{model}\n{version}\n{normalize_description(description)}".encode("utf-8")).hexdigest()
+
+    def get(self, model: str, description: str, version: str = "") -> Optional[Dict[str, Any]]:
+        """캐시된 분석 결과 (없거나 만료되었으면 None)"""
+        key = self.make_key(model, description, version)
+        found, value = self._get_memory(key)
+        if not found:
+            value = self._get_disk(key)
+        return self._result(value)
+
+    async def get_async(self, model: str, description: str, version: str = "") -> Optional[Dict[str, Any]]:
+        """get과 같음 - 메모리에 없을 때만 스레드 풀에서 SQLite 조회"""
+        key = self.make_key(model, description, version)
+        found, value = self._get_memory(key)
+        if not found:
+            value = await asyncio.to_thread(self._get_disk, key)
+        return self._result(value)
+
+    def set(self, model: str, description: str, value: Dict[str, Any], version: str = "") -> None:
+        """분석 결과 저장 (크기 제한을 넘으면 오래 사용하지 않은 결과 삭제)"""
+        key = self.make_key(model, description, version)
+        now = time.time()
+        self._remember(key, value, now)
+        self._write(key, value, now)
+
+    async def set_async(self, model: str, description: str, value: Dict[str, Any], version: str = "") -> None:
+        """set과 같음 - 메모리에는 바로 저장하고 SQLite 저장은 스레드 풀에서 실행"""
+        key = self.make_key(model, description, version)
+        now = time.time()
+        self._remember(key, value, now)
+        await asyncio.to_thread(self._write, key, value, now)
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/미적중 횟수와 적중률"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0
+        }
+
+    def close(self) -> None:
+        with self._db_lock:
+            self._connection.close()
+
+    def _get_memory(self, key: str) -> tuple:
+        """(메모리에서 결정되었는지, 결과) - 만료된 결과는 메모리에서 지우고 디스크를 확인하도록 (False, None)"""
+        with self._memory_lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return False, None
+            value, created_at = entry
+            if time.time() - created_at < self.ttl_seconds:
+                self._memory.move_to_end(key)
+                return True, value
+            del self._memory[key]
+            return False, None
+
+    def _get_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        """SQLite에서 조회 (적중하면 마지막 사용 시각을 갱신하고 메모리 캐시에 넣음)"""
+        now = time.time()
+        with self._db_lock:
+            row = self._connection.execute(
+                "SELECT value, created_at FROM analysis_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = json.loads(row[0]), row[1]
+            if now - created_at < self.ttl_seconds:
+                self._connection.execute("UPDATE analysis_cache SET accessed_at = ? WHERE cache_key = ?", (now, key))
+                self._connection.commit()
+            else:
+                self._count -= self._connection.execute("DELETE FROM analysis_cache WHERE cache_key = ?", (key,)).rowcount
+                self._connection.commit()
+                return None
+        self._remember(key, value, created_at)
+        return value
+
+    def _write(self, key: str, value: Dict[str, Any], now: float) -> None:
+        with self._db_lock:
+            exists = self._connection.execute(
+                "SELECT 1 FROM analysis_cache WHERE cache_key = ?", (key,)
+            ).fetchone() is not None
+            self._connection.execute(
+                "INSERT OR REPLACE INTO analysis_cache (cache_key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now)
+            )
+            if not exists:
+                self._count += 1
+            evicted = False
+            if self._count > self.max_entries:
+                self._count -= self._connection.execute(
+                    "DELETE FROM analysis_cache WHERE cache_key IN "
+                    "(SELECT cache_key FROM analysis_cache ORDER BY accessed_at LIMIT ?)",
+                    (self._count - self.max_entries,)
+                ).rowcount
+                evicted = True
+            self._connection.commit()
+        if evicted:
+            # 메모리에만 남은 결과가 다시 사용되지 않도록 메모리 캐시도 비우고 방금 저장한 결과만 유지
+            with self._memory_lock:
+                self._memory.clear()
+            self._remember(key, value, now)
+
+    def _result(self, value: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if value is None:
+            self.misses += 1
+            _miss_counter.inc()
+            return None
+        self.hits += 1
+        _hit_counter.inc()
+        # 호출한 쪽에서 결과를 수정해도 캐시 값이 바뀌지 않도록 복사본 반환
+        return json.loads(json.dumps(value))
+
+    def _remember(self, key: str, value: Dict[str, Any], created_at: float) -> None:
+        with self._memory_lock:
+            self._memory[key] = (value, created_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+
+_analysis_cache: Optional[AnalysisCache] = None
+_analysis_cache_lock = threading.Lock()
+
+def get_analysis_cache() -> Optional[AnalysisCache]:
+    """서버 전체에서 공유하는 분석 결과 캐시 (ANALYSIS_CACHE가 꺼져 있으면 None)"""
+    global _analysis_cache
+    if not settings.ANALYSIS_CACHE:
+        return None
+    if _analysis_cache is None:
+        with _analysis_cache_lock:
+            if _analysis_cache is None:
+                _analysis_cache = AnalysisCache(
+                    settings.ANALYSIS_CACHE_PATH,
+                    ttl_seconds=settings.ANALYSIS_CACHE_TTL_HOURS * 3600,
+                    max_entries=settings.ANALYSIS_CACHE_MAX_ENTRIES,
+                    memory_entries=settings.ANALYSIS_CACHE_MEMORY_ENTRIES
+                )
+    return _analysis_cache
+
+def set_analysis_cache(cache: Optional[AnalysisCache]) -> None:
+    global _analysis_cache
+    _analysis_cache = cache
+
+def _collect_hit_ratio() -> None:
+    set_hit_ratio("analysis", _hit_counter.value, _hit_counter.value + _miss_counter.value)
+
+register_collector(_collect_hit_ratio)
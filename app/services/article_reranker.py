@@ -0,0 +1,85 @@
+from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+import time
+
+from app.core.config import settings
+from app.core.metrics import observe
+from app.db.models import LawArticle
+from app.services.relevance_scorer import RelevanceScorer, select_relevant
+from app.services.text_utils import estimate_tokens
+
+@dataclass
+class RerankResult:
+    """조문 재정렬 결과"""
+    ranked: List[LawArticle] = field(default_factory=list)  # 기준 점수 이상 조문 (점수 내림차순)
+    scores: List[int] = field(default_factory=list)  # ranked 순서의 관련성 점수 (0-100)
+    selected: List[LawArticle] = field(default_factory=list)  # 토큰 예산 안에서 답변 생성에 사용할 조문
+    stats: Dict[str, Any] = field(default_factory=dict)  # 후보 수, 선택 수, 토큰 수, 소요 시간
+
+
+class ArticleReranker:
+    """
+    검색된 조문 재정렬 단계 (검색과 답변 프롬프트 생성 사이)
+    법령별로 가져온 조문 전체를 사례 설명과 비교해 점수를 매기고,
+    점수 순으로 토큰 예산(PROMPT_ARTICLE_TOKEN_BUDGET)과 개수(PROMPT_ARTICLE_TOP_K) 안에서 조문 선택
+    (검색 결과 순서대로 앞의 3개를 쓰면 대부분 제1조 목적, 제2조 정의가 선택됨)
+    """
+
+    def __init__(self, scorer: Optional[RelevanceScorer] = None):
+        self.scorer = scorer or RelevanceScorer()
+
+    def rerank(
+        self,
+        description: str,
+        keywords: List[str],
+        articles: List[LawArticle],
+        top_k: Optional[int] = None,
+        token_budget: Optional[int] = None
+    ) -> RerankResult:
+        started = time.perf_counter()
+        top_k = top_k or settings.PROMPT_ARTICLE_TOP_K
+        token_budget = token_budget or settings.PROMPT_ARTICLE_TOKEN_BUDGET
+
+        scores = self.scorer.score(
+            description or "", keywords,
+            [f"{article.article_title or ''} {article.content or ''}" for article in articles],
+            corpus="law_articles",
+            doc_ids=[article.article_id for article in articles]
+        )
+        order = select_relevant(scores)
+        ranked = [articles[i] for i in order]
+
+        # 점수 순으로 예산 안에 들어가는 조문 선택 (예산을 넘는 긴 조문은 건너뛰고 다음 조문 확인)
+        selected = []
+        used_tokens = 0
+        for article in ranked:
+            if len(selected) >= top_k:
+                break
+            tokens = self.article_tokens(article)
+            if used_tokens + tokens > token_budget and selected:
+                continue
+            selected.append(article)
+            used_tokens += tokens
+
+        elapsed = time.perf_counter() - started
+        observe("lawmate_article_rerank_seconds", elapsed, description="조문 재정렬 소요 시간")
+
+        return RerankResult(
+            ranked=ranked,
+            scores=[int(round(scores[i])) for i in order],
+            selected=selected,
+            stats={
+                "candidates": len(articles),
+                "relevant": len(ranked),
+                "selected": len(selected),
+                "prompt_tokens": used_tokens,
+                # 비교용: 재정렬 없이 검색 순서대로 top_k개를 사용했을 때의 토큰 수
+                "baseline_tokens": sum(self.article_tokens(article) for article in articles[:top_k]),
+                "latency_ms": round(elapsed * 1000, 2)
+            }
+        )
+
+    @staticmethod
+    def article_tokens(article: LawArticle) -> int:
+        """프롬프트에 들어가는 조문 텍스트의 추정 토큰 수"""
+        return estimate_tokens(f"{article.article_number or ''} {article.article_title or ''} {article.content or ''}")
@@ -0,0 +1,397 @@
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+import argparse
+import asyncio
+import json
+import logging
+import time
+import httpx
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.checkpoint import JsonCheckpoint
+from app.core.config import settings
+from app.core.http_metrics import UpstreamCall
+from app.core.metrics import increment
+from app.db.database import SessionLocal
+from app.db.models import ACase, ACaseLaw, ACasePrecedent, LawArticle, Precedent
+from app.services.claude_service import ClaudeService
+from app.services.legal_consultation_service import LegalConsultationService
+from app.services.model_router import route_for
+from app.services.prompt_builder import Prompt, PromptBuilder
+from app.services.text_utils import description_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# 재분석할 호출 종류 (analyze: 법률 분야/키워드, consultation: 상담 답변)
+CALL_TYPES = ("analyze", "consultation")
+
+# custom_id에 넣는 설명 지문 길이 (결과를 저장할 때 제출 후 설명이 바뀌었는지 확인)
+FINGERPRINT_LENGTH = 16
+
+
+class ClaudeBatchClient:
+    """Claude Message Batches API 클라이언트 (배치 생성, 상태 조회, 결과 조회)"""
+
+    def __init__(self, claude_service: ClaudeService):
+        self.claude_service = claude_service
+
+    @property
+    def batches_url(self) -> str:
+        # CLAUDE_API_URL(.../v1/messages) 기준 (로컬 대역 서버도 같은 경로 사용)
+        return f"{self.claude_service.base_url.rstrip('/')}/batches"
+
+    async def create(self, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """배치 생성 (requests: custom_id와 params(Messages API 요청 본문) 목록)"""
+        with UpstreamCall("claude", "batches") as call:
+            async with httpx.AsyncClient() as client:
+                response = await client.post(
+                    self.batches_url,
+                    headers=self.claude_service.request_headers(),
+                    json={"requests": requests},
+                    timeout=300.0
+                )
+            call.response(response)
+        return self._json(response)
+
+    async def retrieve(self, batch_id: str) -> Dict[str, Any]:
+        """배치 처리 상태 조회"""
+        with UpstreamCall("claude", "batch_status") as call:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(
+                    f"{self.batches_url}/{batch_id}",
+                    headers=self.claude_service.request_headers(),
+                    timeout=60.0
+                )
+            call.response(response)
+        return self._json(response)
+
+    async def results(self, batch: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """처리가 끝난 배치의 결과를 한 줄(요청 1건)씩 읽어서 반환 (결과 파일 전체를 메모리에 올리지 않음)"""
+        async with httpx.AsyncClient() as client:
+            async with client.stream(
+                "GET",
+                batch["results_url"],
+                headers=self.claude_service.request_headers(),
+                timeout=300.0
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    raise Exception(f"Claude 배치 결과 조회 실패: {response.status_code}, {response.text}")
+                async for line in response.aiter_lines():
+                    if line.strip():
+                        yield json.loads(line)
+
+    def _json(self, response: httpx.Response) -> Dict[str, Any]:
+        if response.status_code != 200:
+            raise Exception(f"Claude 배치 API 호출 실패: {response.status_code}, {response.text}")
+        return response.json()
+
+
+class BatchReanalysisService:
+    """
+    기존 사례 일괄 재분석 서비스 (프롬프트 변경 후 저장된 분석/상담 결과 갱신)
+    사례를 aCase_id 순으로 읽어 Message Batches API로 제출하고, 처리가 끝나면 결과를 일괄 저장
+
+    - 사례 조회: aCase_id 키셋 + 서버 측 커서(stream_results)로 배치 하나 분량씩 읽음
+    - 요청: 사례당 분석(analyze) / 상담 답변(consultation) 요청 (모델/max_tokens는 CLAUDE_MODEL_ROUTES 기본 모델)
+      상담 답변은 사례에 이미 연결된 조문/판례를 사용 (법령/판례 검색은 다시 하지 않음)
+    - 저장: 결과를 읽으면서 일정 건수마다 claude_analysis를 일괄 UPDATE
+      (제출 후 설명이 바뀐 사례는 저장하지 않음, 실패한 요청은 기존 결과 유지)
+    - 재개: 제출한 배치 ID와 처리 완료한 마지막 aCase_id를 체크포인트 파일에 기록
+      중단 후 다시 실행하면 제출해 둔 배치의 결과를 기다려 저장한 뒤 다음 사례부터 이어서 진행
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        claude_service: Optional[ClaudeService] = None,
+        chunk_size: Optional[int] = None,
+        poll_seconds: Optional[float] = None,
+        checkpoint_path: Optional[str] = None,
+        call_types: Sequence[str] = CALL_TYPES
+    ):
+        self.session_factory = session_factory
+        self.claude_service = claude_service or ClaudeService()
+        self.client = ClaudeBatchClient(self.claude_service)
+        self.prompt_builder = PromptBuilder()
+        self.chunk_size = chunk_size or settings.BATCH_REANALYSIS_CHUNK_SIZE
+        self.poll_seconds = settings.BATCH_REANALYSIS_POLL_SECONDS if poll_seconds is None else poll_seconds
+        self.checkpoint = JsonCheckpoint(checkpoint_path or settings.BATCH_REANALYSIS_CHECKPOINT_PATH)
+        self.call_types = [call_type for call_type in CALL_TYPES if call_type in call_types]
+        # 서버 측 커서에서 한 번에 가져올 행 수 / 결과 저장 단위
+        self.read_chunk_size = 500
+        self.write_chunk_size = 500
+
+    async def run(self, max_batches: Optional[int] = None, restart: bool = False) -> Dict[str, Any]:
+        """
+        일괄 재분석 실행 (중단된 작업이 있으면 이어서 진행)
+
+        Parameters:
+        - max_batches: 이번 실행에서 처리할 최대 배치 수 (None이면 모든 사례를 처리할 때까지)
+        - restart: 체크포인트를 지우고 처음 사례부터 다시 시작
+
+        Returns:
+        - 처리 결과 통계 (배치 수, 사례 수, 저장/실패/설명 변경으로 건너뛴 요청 수, 완료 여부)
+        """
+        started = time.monotonic()
+        if restart:
+            self.checkpoint.clear()
+        state = self.checkpoint.load()
+
+        if state.get("call_types"):
+            # 중단된 작업은 처음 실행할 때의 호출 종류로 이어서 진행
+            self.call_types = state["call_types"]
+        state["call_types"] = self.call_types
+        stats = state.setdefault("stats", {"batches": 0, "cases": 0, "succeeded": 0, "errored": 0, "stale": 0})
+
+        batches = 0
+        completed = False
+        while max_batches is None or batches < max_batches:
+            pending = state.get("pending")
+            if pending is None:
+                requests, last_case_id, scanned = self._build_requests(state.get("last_case_id", 0))
+                if scanned == 0:
+                    completed = True
+                    break
+                if not requests:
+                    state["last_case_id"] = last_case_id
+                    self._save(state)
+                    continue
+
+                batch = await self.client.create(requests)
+                pending = {"batch_id": batch["id"], "last_case_id": last_case_id, "cases": scanned}
+                state["pending"] = pending
+                self._save(state)
+                logger.info("재분석 배치 제출: %s (사례 %d건, 요청 %d건, aCase_id ~%d)", batch["id"], scanned, len(requests), last_case_id)
+            else:
+                logger.info("제출해 둔 재분석 배치 %s의 결과를 이어서 기다립니다.", pending["batch_id"])
+
+            batch = await self._wait_for_batch(pending["batch_id"])
+            await self._write_results(batch, stats)
+
+            stats["batches"] += 1
+            stats["cases"] += pending["cases"]
+            state["last_case_id"] = pending["last_case_id"]
+            state["pending"] = None
+            self._save(state)
+            batches += 1
+
+        result = dict(stats, completed=completed, last_case_id=state.get("last_case_id", 0))
+        # 모든 사례를 처리했으면 체크포인트 삭제 (다음 실행은 처음 사례부터)
+        if completed:
+            self.checkpoint.clear()
+
+        logger.info("일괄 재분석 %s: %s (%.1f초)", "완료" if completed else "중단", result, time.monotonic() - started, extra={"fields": result})
+        return result
+
+    def _save(self, state: Dict[str, Any]) -> None:
+        self.checkpoint.state = state
+        self.checkpoint.save()
+
+    def _build_requests(self, after_case_id: int) -> Tuple[List[Dict[str, Any]], int, int]:
+        """
+        after_case_id 다음 사례부터 배치 하나 분량의 요청 생성
+        Returns: (배치 요청 목록, 마지막으로 읽은 aCase_id, 읽은 사례 수)
+        """
+        db = self.session_factory()
+        # 서버 측 커서로 읽는 동안에는 같은 연결에서 다른 쿼리를 실행할 수 없어 조문/판례는 별도 세션으로 조회
+        context_db = self.session_factory() if "consultation" in self.call_types else None
+        requests = []
+        last_case_id = after_case_id
+        scanned = 0
+        try:
+            rows = db.execute(
+                select(ACase.aCase_id, ACase.description)
+                .where(ACase.aCase_id > after_case_id)
+                .order_by(ACase.aCase_id)
+                .limit(self.chunk_size)
+                .execution_options(stream_results=True, yield_per=self.read_chunk_size)
+            )
+            for partition in rows.partitions():
+                contexts = self._load_contexts(context_db, [row.aCase_id for row in partition]) if context_db else {}
+                for case_id, description in partition:
+                    last_case_id = case_id
+                    scanned += 1
+                    if not description or not description.strip():
+                        continue
+
+                    fingerprint = description_fingerprint(description)[:FINGERPRINT_LENGTH]
+                    if "analyze" in self.call_types:
+                        prompt = self.prompt_builder.analyze(description)
+                        requests.append(self._batch_request(case_id, fingerprint, prompt))
+                    if "consultation" in self.call_types:
+                        law_articles, precedents = contexts.get(case_id, ([], []))
+                        laws, cases = LegalConsultationService.format_consultation_context(law_articles, precedents)
+                        prompt = self.prompt_builder.consultation(description, laws, cases)
+                        requests.append(self._batch_request(case_id, fingerprint, prompt))
+        finally:
+            db.close()
+            if context_db:
+                context_db.close()
+
+        return requests, last_case_id, scanned
+
+    def _load_contexts(self, db: Session, case_ids: List[int]) -> Dict[int, Tuple[List[LawArticle], List[Precedent]]]:
+        """사례별로 연결된 조문(관련성 점수 상위 PROMPT_ARTICLE_TOP_K개)과 판례(상위 3개)를 점수 순으로 조회"""
+        contexts: Dict[int, Tuple[List[LawArticle], List[Precedent]]] = {case_id: ([], []) for case_id in case_ids}
+
+        article_rows = (
+            db.query(ACaseLaw.aCase_id, LawArticle)
+            .join(LawArticle, ACaseLaw.article_id == LawArticle.article_id)
+            .options(joinedload(LawArticle.law))
+            .filter(ACaseLaw.aCase_id.in_(case_ids))
+            .order_by(ACaseLaw.aCase_id, ACaseLaw.relevance_score.desc())
+            .all()
+        )
+        for case_id, article in article_rows:
+            articles = contexts[case_id][0]
+            if len(articles) < settings.PROMPT_ARTICLE_TOP_K:
+                articles.append(article)
+
+        precedent_rows = (
+            db.query(ACasePrecedent.aCase_id, Precedent)
+            .join(Precedent, ACasePrecedent.precedent_id == Precedent.precedent_id)
+            .filter(ACasePrecedent.aCase_id.in_(case_ids))
+            .order_by(ACasePrecedent.aCase_id, ACasePrecedent.relevance_score.desc())
+            .all()
+        )
+        for case_id, precedent in precedent_rows:
+            precedents = contexts[case_id][1]
+            if len(precedents) < 3:
+                precedents.append(precedent)
+
+        return contexts
+
+    def _batch_request(self, case_id: int, fingerprint: str, prompt: Prompt) -> Dict[str, Any]:
+        """배치 요청 1건 (custom_id: 호출 종류-사례 ID-설명 지문)"""
+        route = route_for(prompt.call_type)
+        return {
+            "custom_id": f"{prompt.call_type}-{case_id}-{fingerprint}",
+            "params": self.claude_service.message_body(prompt.text, route["model"], prompt.max_tokens, prompt.system)
+        }
+
+    async def _wait_for_batch(self, batch_id: str) -> Dict[str, Any]:
+        """배치 처리가 끝날 때까지 poll_seconds 간격으로 상태 조회 (조회 실패 시 다음 간격에 다시 시도)"""
+        while True:
+            try:
+                batch = await self.client.retrieve(batch_id)
+            except Exception as e:
+                logger.warning("재분석 배치 상태 조회 실패 (%s): %s", batch_id, e, exc_info=e)
+                batch = None
+
+            if batch is not None:
+                if batch.get("processing_status") == "ended":
+                    logger.info("재분석 배치 처리 완료: %s %s", batch_id, batch.get("request_counts"))
+                    return batch
+                logger.info("재분석 배치 처리 중: %s %s", batch_id, batch.get("request_counts"))
+
+            await asyncio.sleep(self.poll_seconds)
+
+    async def _write_results(self, batch: Dict[str, Any], stats: Dict[str, int]) -> None:
+        """배치 결과를 write_chunk_size건씩 모아 사례에 저장"""
+        lines = []
+        async for line in self.client.results(batch):
+            lines.append(line)
+            if len(lines) >= self.write_chunk_size:
+                self._apply_results(lines, stats)
+                lines = []
+        if lines:
+            self._apply_results(lines, stats)
+
+    def _apply_results(self, lines: List[Dict[str, Any]], stats: Dict[str, int]) -> None:
+        """
+        결과 묶음을 사례별로 모아 claude_analysis에 병합 후 일괄 UPDATE
+        분석 결과는 keywords/legal_category, 상담 답변은 consultation_response와 설명 지문을 갱신
+        """
+        results: Dict[int, Tuple[str, Dict[str, str]]] = {}
+        for line in lines:
+            call_type, case_id, fingerprint = line["custom_id"].split("-")
+            result = line.get("result") or {}
+            if result.get("type") != "succeeded":
+                stats["errored"] += 1
+                increment("lawmate_batch_reanalysis_results_total", {"call_type": call_type, "result": result.get("type", "unknown")},
+                          "일괄 재분석 요청 결과 수")
+                continue
+            texts = results.setdefault(int(case_id), (fingerprint, {}))[1]
+            texts[call_type] = result["message"]["content"][0]["text"]
+
+        if not results:
+            return
+
+        db = self.session_factory()
+        try:
+            rows = (
+                db.query(ACase.aCase_id, ACase.description, ACase.claude_analysis)
+                .filter(ACase.aCase_id.in_(list(results)))
+                .all()
+            )
+            mappings = []
+            for case_id, description, claude_analysis in rows:
+                submitted_fingerprint, texts = results[case_id]
+                fingerprint = description_fingerprint(description)
+                if fingerprint[:FINGERPRINT_LENGTH] != submitted_fingerprint:
+                    # 배치 제출 후 설명이 바뀐 사례 (다음 상담 요청 때 새 설명으로 분석)
+                    self._count(stats, "stale", texts)
+                    continue
+
+                try:
+                    analysis = json.loads(claude_analysis) if claude_analysis else {}
+                except json.JSONDecodeError:
+                    analysis = {}
+                if not isinstance(analysis, dict):
+                    analysis = {}
+
+                if "analyze" in texts:
+                    parsed = self.claude_service.extract_json_from_text(texts.pop("analyze"))
+                    if "raw_response" in parsed:
+                        self._count(stats, "errored", {"analyze": ""})
+                    else:
+                        analysis["keywords"] = parsed.get("keywords", [])
+                        analysis["legal_category"] = parsed.get("legal_category", "")
+                        self._count(stats, "succeeded", {"analyze": ""})
+                if "consultation" in texts:
+                    analysis["consultation_response"] = texts["consultation"]
+                    analysis["fingerprint"] = fingerprint
+                    analysis.setdefault("keywords", [])
+                    analysis.setdefault("legal_category", "")
+                    analysis.setdefault("laws", [])
+                    analysis.setdefault("precedents", [])
+                    analysis.setdefault("reused_case_id", None)
+                    self._count(stats, "succeeded", texts)
+
+                mappings.append({"aCase_id": case_id, "claude_analysis": json.dumps(analysis, ensure_ascii=False)})
+
+            if mappings:
+                db.execute(update(ACase), mappings)
+                db.commit()
+        finally:
+            db.close()
+
+    def _count(self, stats: Dict[str, int], result: str, texts: Dict[str, str]) -> None:
+        stats[result] += len(texts)
+        for call_type in texts:
+            increment("lawmate_batch_reanalysis_results_total", {"call_type": call_type, "result": result}, "일괄 재분석 요청 결과 수")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='LawMate 기존 사례 일괄 재분석 도구 (Claude Message Batches API)')
+    parser.add_argument('--call-types', default=",".join(CALL_TYPES), help='재분석할 호출 종류 (analyze, consultation 쉼표로 구분)')
+    parser.add_argument('--chunk-size', type=int, default=None, help='배치 하나에 넣을 사례 수')
+    parser.add_argument('--poll-seconds', type=float, default=None, help='배치 처리 상태 조회 간격(초)')
+    parser.add_argument('--max-batches', type=int, default=None, help='이번 실행에서 처리할 최대 배치 수')
+    parser.add_argument('--checkpoint', default=None, help='체크포인트 파일 경로')
+    parser.add_argument('--restart', action='store_true', help='중단된 작업을 버리고 처음 사례부터 다시 시작')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")  # 명령줄 실행 시 진행 상황 출력
+
+    service = BatchReanalysisService(
+        chunk_size=args.chunk_size,
+        poll_seconds=args.poll_seconds,
+        checkpoint_path=args.checkpoint,
+        call_types=[call_type.strip() for call_type in args.call_types.split(",")]
+    )
+    await service.run(max_batches=args.max_batches, restart=args.restart)
+
+if __name__ == "__main__":
+    asyncio.run(main())
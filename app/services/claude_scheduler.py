@@ -0,0 +1,195 @@
+from typing import List, Optional, Tuple
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+import asyncio
+import heapq
+import itertools
+import time
+
+from app.core.config import settings
+from app.core.metrics import observe, set_gauge
+
+# 우선순위 (숫자가 작을수록 먼저 처리)
+PRIORITY_INTERACTIVE = 0  # 사용자가 기다리는 상담/분석
+PRIORITY_BATCH = 1  # 문서 초안 생성 등 나중에 처리해도 되는 작업
+
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BATCH: "batch"}
+
+
+class ClaudeSchedulerError(Exception):
+    """대기열이 가득 찼거나 대기 시간이 초과되어 Claude 요청을 보내지 못한 경우"""
+
+
+def priority_for(call_type: str) -> int:
+    """호출 종류별 우선순위 (CLAUDE_BATCH_CALL_TYPES에 있으면 batch)"""
+    return PRIORITY_BATCH if call_type in settings.CLAUDE_BATCH_CALL_TYPES else PRIORITY_INTERACTIVE
+
+
+def parse_retry_after(value: Optional[str], attempt: int) -> float:
+    """
+    retry-after 헤더 값(초 또는 HTTP 날짜)을 대기 시간(초)으로 변환
+    헤더가 없거나 해석할 수 없으면 지수 백오프 (1, 2, 4, ... 초)
+    """
+    if value:
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            pass
+    return float(2 ** attempt)
+
+
+class ClaudeScheduler:
+    """
+    Claude API 요청 스케줄러 (프로세스 단위)
+    - 동시 요청 한도: AIMD 방식으로 조절
+      성공 응답이 목표 지연 시간 안이면 한도를 조금씩 늘리고(한도당 +1/한도),
+      429 응답이면 절반으로, 목표 지연 시간을 넘으면 10% 줄임
+    - 429 응답의 retry-after 동안은 새 요청을 보내지 않음
+    - 한도를 넘는 요청은 우선순위(대화형 > batch), 도착 순서로 대기열에서 기다림
+    - 대기열 크기와 대기 시간(deadline)에 상한이 있어 넘으면 ClaudeSchedulerError
+    """
+
+    def __init__(
+        self,
+        initial_limit: Optional[int] = None,
+        min_limit: Optional[int] = None,
+        max_limit: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        latency_target: Optional[float] = None
+    ):
+        self.min_limit = min_limit or settings.CLAUDE_CONCURRENCY_MIN
+        self.max_limit = max_limit or settings.CLAUDE_CONCURRENCY_MAX
+        self.max_queue = max_queue if max_queue is not None else settings.CLAUDE_QUEUE_MAX
+        self.latency_target = latency_target or settings.CLAUDE_LATENCY_TARGET_SECONDS
+        self._limit = float(initial_limit or settings.CLAUDE_CONCURRENCY_INITIAL)
+        self.in_flight = 0
+        self.paused_until = 0.0  # retry-after가 끝나는 시각 (time.monotonic 기준)
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []  # (우선순위, 도착 순서, future)
+        self._sequence = itertools.count()
+        self._resume_handle: Optional[asyncio.TimerHandle] = None
+        self._resume_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._update_gauges()
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, min(self.max_limit, int(self._limit)))
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_INTERACTIVE, deadline: Optional[float] = None):
+        """
+        요청 한 건을 보낼 자리 확보 (async with 블록이 끝나면 반환)
+        deadline: time.monotonic 기준 대기 마감 시각
+        """
+        await self.acquire(priority, deadline)
+        try:
+            yield self
+        finally:
+            self.release()
+
+    async def acquire(self, priority: int = PRIORITY_INTERACTIVE, deadline: Optional[float] = None) -> None:
+        started = time.monotonic()
+        labels = {"priority": PRIORITY_NAMES.get(priority, str(priority))}
+
+        if self._can_start() and not self.queue_depth:
+            self.in_flight += 1
+            self._update_gauges()
+            observe("lawmate_claude_queue_wait_seconds", 0.0, labels, "Claude 요청 대기열 대기 시간")
+            return
+
+        if self.queue_depth >= self.max_queue:
+            raise ClaudeSchedulerError(f"Claude 요청 대기열이 가득 찼습니다 ({self.max_queue}건)")
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._update_gauges()
+        self._dispatch()
+
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                # 시간 초과와 동시에 자리가 배정된 경우 반환
+                self.release()
+            future.cancel()
+            self._update_gauges()
+            raise ClaudeSchedulerError(f"Claude 요청 대기 시간 초과 ({time.monotonic() - started:.1f}초)")
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            future.cancel()
+            self._update_gauges()
+            raise
+
+        observe("lawmate_claude_queue_wait_seconds", time.monotonic() - started, labels, "Claude 요청 대기열 대기 시간")
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._update_gauges()
+        self._dispatch()
+
+    def on_success(self, latency: float) -> None:
+        """성공 응답: 목표 지연 시간 안이면 한도 증가, 넘으면 10% 감소"""
+        if latency <= self.latency_target:
+            self._limit = min(self.max_limit, self._limit + 1.0 / max(self._limit, 1.0))
+        else:
+            self._limit = max(self.min_limit, self._limit * 0.9)
+        self._update_gauges()
+        self._dispatch()
+
+    def on_rate_limited(self, retry_after: float) -> None:
+        """429 응답: 한도를 절반으로 줄이고 retry-after 동안 새 요청을 보내지 않음"""
+        self._limit = max(self.min_limit, self._limit / 2)
+        self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+        self._update_gauges()
+
+    def _can_start(self) -> bool:
+        return self.in_flight < self.limit and time.monotonic() >= self.paused_until
+
+    def _dispatch(self) -> None:
+        """한도 안에서 대기 중인 요청을 우선순위 순으로 깨움 (retry-after 중이면 끝나는 시각에 다시 실행)"""
+        pause = self.paused_until - time.monotonic()
+        if pause > 0:
+            loop = asyncio.get_running_loop()
+            if self._waiters and (self._resume_handle is None or self._resume_loop is not loop):
+                def resume():
+                    self._resume_handle = None
+                    self._dispatch()
+                self._resume_handle = loop.call_later(pause, resume)
+                self._resume_loop = loop
+            return
+
+        while self._waiters and self.in_flight < self.limit:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self.in_flight += 1
+            future.set_result(None)
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        set_gauge("lawmate_claude_queue_depth", self.queue_depth, description="Claude 요청 대기열 길이")
+        set_gauge("lawmate_claude_in_flight", self.in_flight, description="처리 중인 Claude 요청 수")
+        set_gauge("lawmate_claude_concurrency_limit", self.limit, description="Claude 동시 요청 한도")
+
+
+_claude_scheduler: Optional[ClaudeScheduler] = None
+
+def get_claude_scheduler() -> ClaudeScheduler:
+    """프로세스 전체에서 공유하는 Claude 요청 스케줄러"""
+    global _claude_scheduler
+    if _claude_scheduler is None:
+        _claude_scheduler = ClaudeScheduler()
+    return _claude_scheduler
+
+def set_claude_scheduler(scheduler: Optional[ClaudeScheduler]) -> None:
+    global _claude_scheduler
+    _claude_scheduler = scheduler
@@ -1,106 +1,109 @@
-import json
-import re
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import logging
+import time
 import httpx
 from app.core.config import settings
+from app.core.metrics import all_histograms, get_histogram, observe, register_collector, set_hit_ratio
+from app.core.http_metrics import UpstreamCall
+from app.core.timing import record_stage
+from app.services.analysis_cache import get_analysis_cache
+from app.services.claude_scheduler import ClaudeSchedulerError, get_claude_scheduler, parse_retry_after, priority_for
+from app.services.model_router import get_model_router
+from app.services.prompt_builder import PromptBuilder
+from app.services.text_utils import estimate_tokens, extract_json_object
+
+logger = logging.getLogger(__name__)
+
+# 토큰 수 구간
+TOKEN_BUCKETS = (50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+def record_usage(call_type: str, estimated_tokens: int, usage: Dict[str, Any], elapsed: float) -> None:
+    """
+    Claude 호출별 토큰 수와 소요 시간 기록 (usage가 없으면 추정 입력 토큰 수 사용)
+    input_tokens는 캐시되지 않은 입력만 포함하므로 캐시 읽기/생성 토큰 수를 따로 기록
+    """
+    input_tokens = usage.get("input_tokens", estimated_tokens)
+    output_tokens = usage.get("output_tokens", 0)
+    cache_read_tokens = usage.get("cache_read_input_tokens") or 0
+    cache_creation_tokens = usage.get("cache_creation_input_tokens") or 0
+    logger.info(
+        "Claude 호출 [%s]: 입력 %d 토큰 (추정 %d), 캐시 읽기 %d / 캐시 생성 %d 토큰, 출력 %d 토큰, %.2f초",
+        call_type, input_tokens, estimated_tokens, cache_read_tokens, cache_creation_tokens, output_tokens, elapsed,
+        extra={"fields": {"call_type": call_type, "input_tokens": input_tokens, "estimated_tokens": estimated_tokens,
+                          "cache_read_tokens": cache_read_tokens, "cache_creation_tokens": cache_creation_tokens,
+                          "output_tokens": output_tokens, "elapsed_ms": round(elapsed * 1000, 1)}}
+    )
+
+    labels = {"call_type": call_type}
+    get_histogram("lawmate_claude_input_tokens", "Claude 호출 입력 토큰 수 (캐시 제외)", labels, TOKEN_BUCKETS).observe(input_tokens)
+    get_histogram("lawmate_claude_cache_read_tokens", "Claude 호출 캐시 읽기 토큰 수", labels, TOKEN_BUCKETS).observe(cache_read_tokens)
+    get_histogram("lawmate_claude_cache_creation_tokens", "Claude 호출 캐시 생성 토큰 수", labels, TOKEN_BUCKETS).observe(cache_creation_tokens)
+    get_histogram("lawmate_claude_output_tokens", "Claude 호출 출력 토큰 수", labels, TOKEN_BUCKETS).observe(output_tokens)
+    observe("lawmate_claude_request_seconds", elapsed, labels, "Claude 호출 소요 시간")
+
+def _collect_prompt_cache_ratio() -> None:
+    """프롬프트 캐시 적중률 (전체 입력 토큰 중 캐시에서 읽은 토큰 비율)"""
+    sums = {"lawmate_claude_input_tokens": 0.0, "lawmate_claude_cache_read_tokens": 0.0, "lawmate_claude_cache_creation_tokens": 0.0}
+    for name, _, histogram in all_histograms():
+        if name in sums:
+            sums[name] += histogram.sum
+    set_hit_ratio("claude_prompt", sums["lawmate_claude_cache_read_tokens"], sum(sums.values()))
+
+register_collector(_collect_prompt_cache_ratio)
 
 class ClaudeService:
     def __init__(self):
         self.api_key = settings.CLAUDE_API_KEY
-        self.base_url = "https://api.anthropic.com/v1/messages"
-        self.model = "claude-3-7-sonnet-20250219"  # 최신 모델 사용
+        self.base_url = settings.CLAUDE_API_URL
+        self.model_router = get_model_router()  # 호출 종류별 모델 선택 (CLAUDE_MODEL_ROUTES)
+        self.prompt_builder = PromptBuilder()
+        self.use_analysis_cache = settings.ANALYSIS_CACHE  # 분석 결과 캐시 사용 여부
     
     def extract_json_from_text(self, text: str) -> Dict[str, Any]:
         """
-        텍스트에서 JSON 내용을 추출하는 함수
-        여러 방법으로 추출을 시도하며, 가능한 형식:
-        1. 일반 JSON 객체
-        2. 마크다운 코드 블록 내 JSON (```json ... ```)
-        3. 중괄호({})로 둘러싸인 내용
+        텍스트에서 JSON 객체를 추출하는 함수
+        응답 전체가 JSON인 경우, 마크다운 코드 블록(```json ... ```)이나 설명문 사이에 있는 경우 모두
+        한 번의 탐색으로 처리 (중첩 객체/배열, 문자열 안의 중괄호 포함, text_utils.extract_json_object)
+        JSON 객체를 찾지 못하면 원본 텍스트를 raw_response로 반환
         """
-        # 방법 1: 전체 텍스트가 JSON인 경우
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            pass
-        
-        # 방법 2: 마크다운 코드 블록에서 JSON 추출
-        json_code_block = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', text)
-        if json_code_block:
-            try:
-                return json.loads(json_code_block.group(1))
-            except json.JSONDecodeError:
-                pass
-        
-        # 방법 3: 텍스트에서 중괄호로 둘러싸인 부분 찾기
-        json_braces = re.search(r'({[\s\S]*?})', text)
-        if json_braces:
-            try:
-                return json.loads(json_braces.group(1))
-            except json.JSONDecodeError:
-                pass
-        
-        # 모든 방법이 실패하면 원본 텍스트를 반환
-        return {"raw_response": text}
+        analysis = extract_json_object(text)
+        if analysis is None:
+            return {"raw_response": text}
+        return analysis
         
     async def analyze_legal_issue(self, description: str) -> Dict[str, Any]:
-        """사용자의 법률 문제를 분석하여 관련 법률 분야와 키워드 추출"""
-        
-        prompt = f"""
-        당신은 법률 전문가입니다. 다음 사용자의 법률 문제를 분석하고, 
-        관련된 법률 분야, 핵심 법률 쟁점과 키워드를 추출해주세요.
-        
-        사용자 문제:
-        {description}
-        
-        다음 형식으로 JSON 응답을 제공해주세요:
-        {{
-            "legal_category": "관련 법률 분야 (예: 민사, 형사, 부동산, 계약, 노동 등)",
-            "key_issues": ["핵심 법률 쟁점 1", "핵심 법률 쟁점 2", ...],
-            "keywords": ["키워드1", "키워드2", ...],
-            "relevant_laws": ["관련 법률1", "관련 법률2", ...]
-        }}
-        
-        JSON 형식으로만 응답해주세요. 추가 설명이나 텍스트를 포함하지 마세요.
         """
-        
-        response = await self._call_claude_api(prompt)
+        사용자의 법률 문제를 분석하여 관련 법률 분야와 키워드 추출
+        같은 내용의 설명(공백/문장부호 차이 무시)은 캐시된 분석 결과 사용
+        (캐시 키에는 실제로 응답한 모델과 프롬프트 버전을 넣어 대체 모델 결과나 이전 프롬프트 결과를 구분)
+        """
+        cache = get_analysis_cache() if self.use_analysis_cache else None
+        version = self.prompt_builder.version("analyze")
+        if cache:
+            # 지금 호출하면 응답할 모델 (기본 모델이 느려 대체 모델로 전환된 동안에는 대체 모델)
+            model, _ = self.model_router.select("analyze")
+            cached = await cache.get_async(model, description, version)
+            if cached is not None:
+                logger.debug("분석 결과 캐시 적중", extra={"fields": cache.stats()})
+                return cached
+        
+        prompt = self.prompt_builder.analyze(description)
+        response, model = await self._call_claude_api_with_model(prompt.text, prompt.call_type, prompt.max_tokens, prompt.system)
         
         # 향상된 JSON 추출 로직 사용
-        return self.extract_json_from_text(response)
+        analysis = self.extract_json_from_text(response)
+        
+        # JSON 추출에 실패한 응답은 캐시하지 않음
+        if cache and "raw_response" not in analysis:
+            await cache.set_async(model, description, analysis, version)
+        return analysis
     
     async def summarize_legal_info(self, laws: List[Dict], cases: List[Dict]) -> Dict[str, Any]:
         """법령과 판례 정보를 요약하고 쉽게 해석"""
         
-        laws_text = "\n\n".join([f"법령명: {law['lawName']}\n조항: {law['article']}\n내용: {law['content']}" for law in laws])
-        cases_text = "\n\n".join([f"사건번호: {case['caseNo']}\n판결요지: {case['summary']}" for case in cases])
-        
-        prompt = f"""
-        당신은 법률 전문가입니다. 다음 법령과 판례 정보를 일반인이 이해하기 쉽게 요약하고 
-        해석해주세요. 전문 용어는 가능한 쉬운 언어로 풀어서 설명해주세요.
-        
-        ## 관련 법령
-        {laws_text}
-        
-        ## 관련 판례
-        {cases_text}
-        
-        다음 형식으로 JSON 응답을 제공해주세요:
-        {{
-            "simplified_laws": [
-                {{"law_name": "법령명", "explanation": "쉬운 설명"}}
-            ],
-            "simplified_cases": [
-                {{"case_no": "사건번호", "explanation": "쉬운 설명", "implications": "이 판례가 의미하는 바"}}
-            ],
-            "user_rights": ["사용자의 법적 권리 1", "사용자의 법적 권리 2", ...],
-            "user_obligations": ["사용자의 법적 의무 1", "사용자의 법적 의무 2", ...]
-        }}
-        
-        JSON 형식으로만 응답해주세요. 추가 설명이나 텍스트를 포함하지 마세요.
-        """
-        
-        response = await self._call_claude_api(prompt)
+        prompt = self.prompt_builder.summarize(laws, cases)
+        response = await self._call_claude_api(prompt.text, prompt.call_type, prompt.max_tokens, prompt.system)
         
         # 향상된 JSON 추출 로직 사용
         return self.extract_json_from_text(response)
@@ -109,30 +112,8 @@ class ClaudeService:
                                      recipient_info: Optional[Dict[str, Any]] = None) -> str:
         """법률 문서 초안 생성 (내용증명, 이의제기서 등)"""
         
-        recipient_text = ""
-        if recipient_info:
-            recipient_text = f"""
-            수신자 정보:
-            이름/기관명: {recipient_info.get('name', '')}
-            주소: {recipient_info.get('address', '')}
-            연락처: {recipient_info.get('contact', '')}
-            """
-        
-        prompt = f"""
-        당신은 법률 문서 작성 전문가입니다. 다음 정보를 바탕으로 {doc_type} 문서 초안을 작성해주세요.
-        
-        ## 사례 정보
-        제목: {case_info.get('title', '')}
-        내용: {case_info.get('description', '')}
-        관련 법률 분야: {case_info.get('legal_category', '')}
-        
-        {recipient_text}
-        
-        문서의 형식과 내용은 한국의 법률 관행에 맞게 작성해주세요. 
-        필요한 법적 문구와 형식을 갖추되, 일반인도 이해할 수 있는 명확한 언어로 작성해주세요.
-        """
-        
-        response = await self._call_claude_api(prompt)
+        prompt = self.prompt_builder.document(doc_type, case_info, recipient_info)
+        response = await self._call_claude_api(prompt.text, prompt.call_type, prompt.max_tokens, prompt.system)
         return response
     
     async def generate_legal_consultation(self, user_description: str, laws: List[Dict], cases: List[Dict]) -> str:
@@ -148,75 +129,104 @@ class ClaudeService:
         Returns:
         - 법률 상담 답변 (종합적인 분석, 대응 방안, 구체적 절차 포함)
         """
-        # 법령 및 판례 정보 정리 (링크 정보 포함)
-        laws_text = "\n\n".join([f"법령명: {law.get('lawName')}\n조항: {law.get('article')}\n내용: {law.get('content')}\n링크: {law.get('link', '')}" for law in laws])
-        cases_text = "\n\n".join([f"사건번호: {case.get('caseNo')}\n법원: {case.get('court', '')}\n판결일: {case.get('decisionDate', '')}\n판결요지: {case.get('summary')}\n링크: {case.get('link', '')}" for case in cases])
-        
-        prompt = f"""
-        당신은 경험이 풍부한 법률 전문가입니다. 다음 사용자의 법률 문제에 대해 관련 법령과 판례를 참고하여 
-        상세하고 실용적인 법률 상담 답변을 제공해주세요. 전문 용어는 쉽게 풀어서 설명하고, 
-        사용자가 취해야 할 구체적인 행동 단계와 대응 방법을 명확하게 제시해주세요.
-        
-        ## 사용자 문제:
-        {user_description}
-        
-        ## 관련 법령:
-        {laws_text if laws_text else "관련 법령 정보가 없습니다."}
-        
-        ## 관련 판례:
-        {cases_text if cases_text else "관련 판례 정보가 없습니다."}
-        
-        다음 구조로 법률 상담 답변을 작성해주세요:
-        
-        1. 문제 요약: 사용자의 법률 문제를 명확하게 요약
-        2. 법적 분석: 관련 법령과 판례를 바탕으로 사용자의 법적 상황 분석
-        3. 사용자의 권리와 의무: 현 상황에서 사용자가 가진 법적 권리와 의무 설명
-        4. 대응 방안: 구체적인 대응 방법 제시 (여러 선택지가 있다면 각 옵션의 장단점 설명)
-        5. 단계별 행동 계획: 사용자가 취해야 할 구체적인 행동을 순차적으로 안내
-        6. 필요 서류/증거: 준비해야 할 서류나 확보해야 할 증거 안내
-        7. 법적 시간 제한: 관련 소멸시효나 기한이 있다면 명시
-        8. 전문가 도움 여부: 변호사 상담이 필요한 시점과 이유 안내
-        9. 참고 자료: 답변에서 사용한 법령 및 판례의 링크 제공
-        
-        각 법령과 판례의 링크 정보를 적극 활용하여, 사용자가 필요시 원본 법령이나 판례를 직접 확인할 수 있도록 안내해주세요.
-        답변의 끝부분에는 "더 자세한 법령 및 판례 정보는 위에 제공된 링크에서 확인하실 수 있습니다."라는 문구를 추가해주세요.
-        
-        명확하고 실용적인 조언을 제공하되, 단정적인 법적 판단은 피하고 상황에 따른 가능성을 설명해주세요.
-        일반인도 쉽게 이해하고 따를 수 있는 언어로 작성해주세요.
-        """
-        
-        response = await self._call_claude_api(prompt)
+        # 법령 및 판례 정보는 토큰 예산 안으로 줄여서 포함 (링크 정보 포함)
+        prompt = self.prompt_builder.consultation(user_description, laws, cases)
+        response = await self._call_claude_api(prompt.text, prompt.call_type, prompt.max_tokens, prompt.system)
         return response
     
-    async def _call_claude_api(self, prompt: str) -> str:
-        """Claude API 호출 함수"""
-        
-        headers = {
+    def request_headers(self) -> Dict[str, str]:
+        """Claude API 공통 요청 헤더"""
+        return {
             "Content-Type": "application/json",
             "x-api-key": self.api_key,
             "anthropic-version": "2023-06-01"
         }
-        
+    
+    def message_body(self, prompt: str, model: str, max_tokens: int, system: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Messages API 요청 본문 (Message Batches API 요청의 params로도 사용)
+        system이 있으면 고정 지시문 블록으로 넣고, CLAUDE_PROMPT_CACHE가 켜져 있으면 cache_control 지정
+        """
         data = {
-            "model": self.model,
+            "model": model,
             "messages": [{"role": "user", "content": prompt}],
-            "max_tokens": 4000
+            "max_tokens": max_tokens
         }
+        if system:
+            system_block = {"type": "text", "text": system}
+            if settings.CLAUDE_PROMPT_CACHE:
+                system_block["cache_control"] = {"type": "ephemeral"}
+            data["system"] = [system_block]
+        return data
+    
+    async def _call_claude_api(self, prompt: str, call_type: str = "default", max_tokens: Optional[int] = None,
+                               system: Optional[str] = None) -> str:
+        """
+        Claude API 호출 함수
+        call_type: 호출 종류 (모델/max_tokens 선택, 우선순위, 토큰 사용량 기록에 사용)
+        system: 고정 지시문 (CLAUDE_PROMPT_CACHE가 켜져 있으면 cache_control을 지정해 반복 호출 시 캐시된 앞부분 재사용)
+        """
+        text, _ = await self._call_claude_api_with_model(prompt, call_type, max_tokens, system)
+        return text
+    
+    async def _call_claude_api_with_model(self, prompt: str, call_type: str = "default", max_tokens: Optional[int] = None,
+                                          system: Optional[str] = None) -> Tuple[str, str]:
+        """
+        _call_claude_api와 같음 - (응답 텍스트, 실제로 응답한 모델) 반환
+        (ModelRouter가 대체 모델로 전환한 경우 대체 모델명)
+        """
+        
+        headers = self.request_headers()
+        
+        # 호출 종류별 모델 선택 (기본 모델이 지연 시간 SLO를 넘으면 더 빠른 모델)
+        model, route_max_tokens = self.model_router.select(call_type)
+        data = self.message_body(prompt, model, max_tokens or route_max_tokens, system)
+        
+        # 동시 요청 한도 안에서 호출하고, 429/529 응답은 retry-after만큼 기다린 후 재시도
+        scheduler = get_claude_scheduler()
+        priority = priority_for(call_type)
+        deadline = time.monotonic() + settings.CLAUDE_QUEUE_TIMEOUT_SECONDS
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.base_url,
-                    headers=headers,
-                    json=data,
-                    timeout=60.0  # 타임아웃 설정
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    # Claude API 응답에서 텍스트 추출
-                    return result["content"][0]["text"]
-                else:
+            for attempt in range(settings.CLAUDE_MAX_RETRIES + 1):
+                queued = time.perf_counter()
+                async with scheduler.slot(priority, deadline):
+                    record_stage("claude_queue", time.perf_counter() - queued)
+                    started = time.perf_counter()
+                    failed = True  # 응답을 받지 못하면(시간 초과, 네트워크 오류) 실패로 기록
+                    try:
+                        with UpstreamCall("claude", "messages") as call:
+                            async with httpx.AsyncClient() as client:
+                                response = await client.post(
+                                    self.base_url,
+                                    headers=headers,
+                                    json=data,
+                                    timeout=settings.CLAUDE_TIMEOUT_SECONDS  # 타임아웃 설정
+                                )
+                            call.response(response)
+                        failed = response.status_code in (429, 529) or response.status_code >= 500
+                    except asyncio.CancelledError:
+                        failed = False  # 클라이언트 연결 종료 등으로 취소된 호출은 모델 지연으로 보지 않음
+                        raise
+                    finally:
+                        # 실패한 호출도 라우터에 기록해야 기본 모델 과부하 시 대체 모델로 전환됨
+                        elapsed = time.perf_counter() - started
+                        self.model_router.record(call_type, model, elapsed, failed)
+                    
+                    if response.status_code == 200:
+                        scheduler.on_success(elapsed)
+                        result = response.json()
+                        record_usage(call_type, estimate_tokens(prompt) + estimate_tokens(system or ""), result.get("usage") or {}, elapsed)
+                        # Claude API 응답에서 텍스트 추출
+                        return result["content"][0]["text"], model
+                    
+                    # 요청 한도 초과(429) 또는 서버 과부하(529): 동시 요청 한도를 줄이고 재시도
+                    if response.status_code in (429, 529) and attempt < settings.CLAUDE_MAX_RETRIES:
+                        retry_after = parse_retry_after(response.headers.get("retry-after"), attempt)
+                        scheduler.on_rate_limited(retry_after)
+                        logger.warning("Claude API %d 응답 - %.1f초 후 재시도 (%d/%d)", response.status_code, retry_after, attempt + 1, settings.CLAUDE_MAX_RETRIES)
+                        continue
+                    
                     error_msg = f"Claude API 호출 실패: {response.status_code}, {response.text}"
                     
                     # 주요 오류 코드에 대한 추가 정보
@@ -228,6 +238,8 @@ class ClaudeService:
                         error_msg += "\n요청 한도 초과: API 호출 한도를 초과했습니다."
                     
                     raise Exception(error_msg)
+        except ClaudeSchedulerError as e:
+            raise Exception(f"Claude API 호출 실패: {e}")
         except httpx.RequestError as e:
             raise Exception(f"네트워크 오류: {e}")
         except Exception as e:
@@ -0,0 +1,170 @@
+from typing import List, Dict, Any, Optional, Tuple
+import re
+from sqlalchemy import case, func, or_
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session
+
+from app.db.models import Law, LawArticle, Precedent
+from app.services.law_search_index import law_to_index_info
+
+# MySQL 불리언 모드 연산자 (검색어에서 제거)
+BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+
+class FulltextSearchService:
+    """
+    DB FULLTEXT(ngram) 기반 법령 조문 / 판례 검색
+    MySQL에서는 MATCH ... AGAINST (IN BOOLEAN MODE)로 검색하고,
+    SQLite 등 FULLTEXT를 지원하지 않는 DB에서는 같은 결과 형식의 LIKE 검색으로 대체
+
+    - 법령 조문: Law_Article(content, article_title) 색인 사용
+    - 판례: Precedent(case_name, summary) 색인 사용
+    - 색인 생성: app/db/migrations/add_fulltext_ngram_indexes.sql
+    """
+
+    # LIKE 검색 시 필드별 가중치 (MATCH 점수 대신 사용)
+    ARTICLE_WEIGHTS = {"article_title": 2.0, "content": 1.0}
+    PRECEDENT_WEIGHTS = {"case_name": 2.0, "summary": 1.0}
+
+    @staticmethod
+    def clean_keywords(keywords: List[str]) -> List[str]:
+        """불리언 모드 연산자를 제거하고 공백 기준으로 분리한 검색어 목록 (중복 제거, 순서 유지)"""
+        terms = []
+        for keyword in keywords:
+            for term in BOOLEAN_OPERATORS.sub(" ", keyword or "").split():
+                if term not in terms:
+                    terms.append(term)
+        return terms
+
+    @staticmethod
+    def boolean_query(terms: List[str]) -> str:
+        """
+        MATCH ... AGAINST 불리언 모드 검색어
+        연산자 없이 나열하여 하나라도 포함된 행을 검색하고 관련도 점수로 정렬
+        (ngram 파서는 각 검색어를 2글자 ngram 구문 검색으로 처리)
+        """
+        return " ".join(terms)
+
+    def is_fulltext_supported(self, db: Session) -> bool:
+        return db.get_bind().dialect.name == "mysql"
+
+    def search_articles(self, db: Session, keywords: List[str], limit: int = 20) -> List[Tuple[int, int, float]]:
+        """
+        법령 조문 검색
+
+        Returns:
+        - [(article_id, law_id, 점수), ...] 점수 내림차순
+        """
+        terms = self.clean_keywords(keywords)
+        if not terms:
+            return []
+
+        if self.is_fulltext_supported(db):
+            score = match(LawArticle.content, LawArticle.article_title, against=self.boolean_query(terms)).in_boolean_mode()
+            condition = score
+        else:
+            score, condition = self._like_score(
+                terms, {LawArticle.article_title: self.ARTICLE_WEIGHTS["article_title"],
+                        LawArticle.content: self.ARTICLE_WEIGHTS["content"]}
+            )
+
+        rows = (
+            db.query(LawArticle.article_id, LawArticle.law_id, score.label("score"))
+            .filter(condition)
+            .order_by(score.desc(), LawArticle.article_id)
+            .limit(limit)
+            .all()
+        )
+        return [(article_id, law_id, float(row_score)) for article_id, law_id, row_score in rows]
+
+    def search_laws(self, db: Session, keywords: List[str], law_name: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        키워드로 법령 검색 (국가법령정보 API 법령 검색 결과와 같은 형식으로 반환)
+        법령 점수는 해당 법령에서 가장 관련도가 높은 조문의 점수로 계산
+        """
+        article_hits = self.search_articles(db, keywords + ([law_name] if law_name else []), limit=limit * 20)
+
+        law_scores: Dict[int, float] = {}
+        for _, law_id, score in article_hits:
+            law_scores[law_id] = max(law_scores.get(law_id, 0.0), score)
+
+        if not law_scores:
+            return []
+
+        laws = {law.law_id: law for law in db.query(Law).filter(Law.law_id.in_(list(law_scores.keys()))).all()}
+
+        # 법령명을 지정한 경우 법령명이 일치하는 법령만 사용 (일치하는 법령이 있을 때)
+        if law_name:
+            named = {law_id: score for law_id, score in law_scores.items() if law_id in laws and law_name in (laws[law_id].law_name or "")}
+            if named:
+                law_scores = named
+
+        results = []
+        for law_id, score in sorted(law_scores.items(), key=lambda item: item[1], reverse=True)[:limit]:
+            law = laws.get(law_id)
+            if not law:
+                continue
+            law_info = law_to_index_info(law)
+            results.append({
+                "lawId": law_info["law_code"],
+                "lawName": law_info["law_name"],
+                "promulgationDate": law_info["promulgation_date"],
+                "lawType": law_info["law_type"],
+                "currentHistory": "",
+                "link": law_info["link"],
+                "mst": "",
+                "enforcementDate": law_info["enforcement_date"],
+                "score": round(score, 4),
+                "source": "local"
+            })
+        return results
+
+    def search_precedents(self, db: Session, keywords: List[str], page: int = 1, display: int = 20) -> Dict[str, Any]:
+        """
+        판례 검색 (페이지 단위)
+
+        Returns:
+        - {"total": 전체 결과 수, "page": 페이지, "display": 페이지 크기,
+           "results": [(precedent_id, 점수), ...]}
+        """
+        page = max(page, 1)
+        terms = self.clean_keywords(keywords)
+        if not terms:
+            return {"total": 0, "page": page, "display": display, "results": []}
+
+        if self.is_fulltext_supported(db):
+            score = match(Precedent.case_name, Precedent.summary, against=self.boolean_query(terms)).in_boolean_mode()
+            condition = score
+        else:
+            score, condition = self._like_score(
+                terms, {Precedent.case_name: self.PRECEDENT_WEIGHTS["case_name"],
+                        Precedent.summary: self.PRECEDENT_WEIGHTS["summary"]}
+            )
+
+        total = db.query(func.count(Precedent.precedent_id)).filter(condition).scalar() or 0
+        rows = (
+            db.query(Precedent.precedent_id, score.label("score"))
+            .filter(condition)
+            .order_by(score.desc(), Precedent.precedent_id)
+            .offset((page - 1) * display)
+            .limit(display)
+            .all()
+        )
+        results = [(precedent_id, float(row_score)) for precedent_id, row_score in rows]
+        return {"total": total, "page": page, "display": display, "results": results}
+
+    def _like_score(self, terms: List[str], weighted_columns: Dict[Any, float]):
+        """
+        FULLTEXT 미지원 DB용 LIKE 검색 (점수 식, 검색 조건)
+        검색어가 포함된 필드의 가중치 합을 점수로 사용
+        """
+        patterns = ["%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%" for term in terms]
+
+        score_terms = []
+        conditions = []
+        for column, weight in weighted_columns.items():
+            for pattern in patterns:
+                matched = column.like(pattern, escape="\\")
+                score_terms.append(case((matched, weight), else_=0.0))
+                conditions.append(matched)
+
+        return sum(score_terms[1:], score_terms[0]), or_(*conditions)
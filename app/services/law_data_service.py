@@ -1,26 +1,36 @@
 from typing import List, Dict, Any, Optional
+import logging
 import httpx
 import xml.etree.ElementTree as ET
 import json
 import re
 import time
 import asyncio
+from sqlalchemy.orm import Session
 from app.core.config import settings
+from app.core.http_metrics import UpstreamCall
+from app.core.timing import timed
+from app.db.database import SessionLocal
+from app.services.fulltext_search import FulltextSearchService
+from app.services.law_search_index import get_law_article_index
+from app.services.precedent_ranker import get_precedent_ranker
+
+logger = logging.getLogger(__name__)
 
 class LawDataService:
     def __init__(self):
         self.law_api_key = settings.LAW_API_KEY
         self.case_api_key = settings.CASE_API_KEY
+        # 국가법령정보센터 웹사이트 기본 URL (LAW_API_BASE_URL로 로컬 대역 서버 지정 가능)
+        self.law_base_url = settings.LAW_API_BASE_URL.rstrip("/")
         # 국가법령정보센터 API URL - 법령 검색
-        self.law_search_url = "https://www.law.go.kr/DRF/lawSearch.do"
+        self.law_search_url = f"{self.law_base_url}/DRF/lawSearch.do"
         # 국가법령정보센터 API URL - 법령 상세 조회
-        self.law_detail_url = "https://www.law.go.kr/DRF/lawService.do"
+        self.law_detail_url = f"{self.law_base_url}/DRF/lawService.do"
         # 국가법령정보센터 판례 검색 URL (판례 목록 조회)
-        self.precedent_search_url = "https://www.law.go.kr/DRF/lawSearch.do"
+        self.precedent_search_url = f"{self.law_base_url}/DRF/lawSearch.do"
         # 국가법령정보센터 판례 상세 조회 URL
-        self.precedent_detail_url = "https://www.law.go.kr/DRF/lawService.do"
-        # 국가법령정보센터 웹사이트 기본 URL
-        self.law_base_url = "https://www.law.go.kr"
+        self.precedent_detail_url = f"{self.law_base_url}/DRF/lawService.do"
         
         # 사용자 에이전트 정보 설정
         self.headers = {
@@ -32,16 +42,51 @@ class LawDataService:
         # API 호출 재시도 설정
         self.max_retries = 3  # 최대 재시도 횟수
         self.retry_delay = 1  # 재시도 사이의 대기 시간(초)
+        self.timeout = settings.LAW_API_TIMEOUT_SECONDS  # 요청 1회 응답 대기 시간(초)
+        
+        # DB FULLTEXT 검색 (LOCAL_SEARCH_BACKEND=fulltext 인 경우 사용)
+        self.fulltext_search = FulltextSearchService()
+    
+    def search_local_precedents(self, db: Session, keywords: List[str], page: int = 1, display: int = 20) -> Dict[str, Any]:
+        """
+        로컬에 저장된 판례 검색 (LOCAL_SEARCH_BACKEND에 따라 BM25F 검색기 또는 DB FULLTEXT 사용)
+        
+        Returns:
+        - {"total": 전체 결과 수, "page": 페이지, "display": 페이지 크기,
+           "results": [(precedent_id, 점수), ...]}
+        """
+        if settings.LOCAL_SEARCH_BACKEND == "fulltext":
+            return self.fulltext_search.search_precedents(db, keywords, page=page, display=display)
+        return get_precedent_ranker().search(" ".join(keywords), page=page, display=display)
+    
+    def _search_laws_fulltext(self, keywords: List[str], law_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """DB FULLTEXT 색인으로 법령 검색 (별도 세션 사용)"""
+        db = SessionLocal()
+        try:
+            return self.fulltext_search.search_laws(db, keywords, law_name)
+        finally:
+            db.close()
     
     async def search_laws(self, keywords: List[str], law_name: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         키워드와 법령명으로 관련 법령 검색
-        국가법령정보센터 API 사용
+        로컬 법령 조문 색인을 먼저 검색하고, 결과가 없으면 국가법령정보센터 API 사용
         """
         # 키워드가 없으면 빈 리스트 반환
         if not keywords:
             return []
             
+        # 로컬 검색 (동기화된 법령 조문에서 결과가 있으면 API 호출 생략)
+        # 두 백엔드 모두 동기 작업이므로 스레드에서 실행해 이벤트 루프를 막지 않음
+        if settings.LAW_LOCAL_SEARCH:
+            if settings.LOCAL_SEARCH_BACKEND == "fulltext":
+                local_laws = await asyncio.to_thread(self._search_laws_fulltext, keywords, law_name)
+            else:
+                local_laws = await asyncio.to_thread(get_law_article_index().search_laws, keywords, law_name)
+            if local_laws:
+                logger.info("로컬 법령 검색 결과: %s개", len(local_laws))
+                return local_laws
+        
         # 키워드가 너무 많으면 상위 3개만 사용 (API 오류 방지)
         if len(keywords) > 3:
             keywords = keywords[:3]
@@ -58,7 +103,7 @@ class LawDataService:
         if law_name:
             params["query"] += f" {law_name}"
         
-        print(f"법령 검색 파라미터: {params}")
+        logger.debug("법령 검색 파라미터", extra={"fields": {"params": params}})
         
         # 재시도 카운터
         retry_count = 0
@@ -67,61 +112,119 @@ class LawDataService:
             try:
                 async with httpx.AsyncClient() as client:
                     # 헤더 추가
-                    response = await client.get(
-                        self.law_search_url, 
-                        params=params, 
-                        headers=self.headers,
-                        timeout=30.0
-                    )
+                    with UpstreamCall("law_api", "lawSearch") as call:
+                        response = await client.get(
+                            self.law_search_url, 
+                            params=params, 
+                            headers=self.headers,
+                            timeout=self.timeout
+                        )
+                        call.response(response)
                     
                     if response.status_code == 200:
                         content_type = response.headers.get('content-type', '').lower()
                         
                         # HTML이 반환된 경우 (오류 페이지)
                         if 'html' in content_type or response.text.strip().startswith('<!DOCTYPE html'):
-                            print(f"HTML 응답 받음 - 오류 페이지가 반환되었습니다.")
-                            print(f"응답 내용 일부: {response.text[:200]}...")
+                            logger.warning("HTML 응답 받음 - 오류 페이지가 반환되었습니다.")
+                            logger.debug("응답 내용 일부: %s...", response.text[:200])
                             
                             # 재시도 여부 확인
                             if retry_count < self.max_retries - 1:
                                 retry_count += 1
-                                print(f"재시도 {retry_count}/{self.max_retries}...")
+                                logger.info("재시도 %s/%s...", retry_count, self.max_retries)
                                 await asyncio.sleep(self.retry_delay)  # 재시도 전 지연
                                 continue
                             else:
-                                print(f"최대 재시도 횟수({self.max_retries})를 초과했습니다. 예시 데이터를 반환합니다.")
+                                logger.warning("최대 재시도 횟수(%s)를 초과했습니다. 예시 데이터를 반환합니다.", self.max_retries)
                                 # 예시 데이터 반환 (실제 API 호출이 실패한 경우)
                                 return self._get_mock_laws()
                         
                         # XML 응답 파싱
                         laws = self._parse_law_xml(response.text)
-                        print(f"법령 검색 결과: {len(laws)}개")
+                        logger.info("법령 검색 결과: %s개", len(laws))
                         return laws
                     else:
-                        print(f"법령 API 호출 실패: {response.status_code}, {response.text[:200]}")
+                        logger.warning("법령 API 호출 실패: %s, %s", response.status_code, response.text[:200])
                         
                         # 재시도 여부 확인
                         if retry_count < self.max_retries - 1:
                             retry_count += 1
-                            print(f"재시도 {retry_count}/{self.max_retries}...")
+                            logger.info("재시도 %s/%s...", retry_count, self.max_retries)
                             await asyncio.sleep(self.retry_delay)  # 재시도 전 지연
                             continue
                         else:
                             # 실패 시 예시 데이터 반환
                             return self._get_mock_laws()
             except Exception as e:
-                print(f"법령 검색 중 오류 발생: {e}")
+                logger.warning("법령 검색 중 오류 발생: %s", e)
                 
                 # 재시도 여부 확인
                 if retry_count < self.max_retries - 1:
                     retry_count += 1
-                    print(f"재시도 {retry_count}/{self.max_retries}...")
+                    logger.info("재시도 %s/%s...", retry_count, self.max_retries)
                     await asyncio.sleep(self.retry_delay)  # 재시도 전 지연
                     continue
                 else:
                     # 예외 발생 시 예시 데이터 반환
                     return self._get_mock_laws()
-    
+
+    async def list_current_laws(self, page: int = 1, display: int = 100) -> Optional[Dict[str, Any]]:
+        """
+        현행법령 전체 목록을 페이지 단위로 조회 (로컬 동기화용)
+        국가법령정보센터 API 사용
+
+        Parameters:
+        - page: 검색 결과 페이지 (기본값: 1)
+        - display: 페이지당 결과 개수 (기본값: 100, 최대: 100)
+
+        Returns:
+        - {"total_count": 전체 법령 수, "laws": 법령 목록}
+        - API 호출이 실패한 경우 None (예시 데이터를 반환하지 않음)
+        """
+        params = {
+            "OC": self.law_api_key,        # 기관코드
+            "target": "law",                # 검색 대상: 현행법령
+            "type": "XML",                  # 응답 형식: XML
+            "page": page,                   # 검색 결과 페이지
+            "display": min(display, 100)    # 검색 결과 개수 (최대 100개)
+        }
+
+        # 재시도 카운터
+        retry_count = 0
+
+        while retry_count < self.max_retries:
+            try:
+                async with httpx.AsyncClient() as client:
+                    with UpstreamCall("law_api", "lawSearch") as call:
+                        response = await client.get(
+                            self.law_search_url,
+                            params=params,
+                            headers=self.headers,
+                            timeout=self.timeout
+                        )
+                        call.response(response)
+
+                    content_type = response.headers.get('content-type', '').lower()
+                    is_html = 'html' in content_type or response.text.strip().startswith('<!DOCTYPE html')
+
+                    if response.status_code == 200 and not is_html:
+                        laws = self._parse_law_xml(response.text)
+                        total_count = self._parse_total_count(response.text)
+                        return {"total_count": total_count, "laws": laws}
+
+                    logger.warning("법령 목록 API 호출 실패 (페이지 %s): %s", page, response.status_code)
+            except Exception as e:
+                logger.warning("법령 목록 조회 중 오류 발생 (페이지 %s): %s", page, e)
+
+            # 재시도 여부 확인
+            retry_count += 1
+            if retry_count < self.max_retries:
+                logger.info("재시도 %s/%s...", retry_count, self.max_retries)
+                await asyncio.sleep(self.retry_delay)  # 재시도 전 지연
+
+        return None
+
     async def get_law_detail(self, mst: str, law_id: Optional[str] = None, jo: Optional[str] = None) -> Dict[str, Any]:
         """
         법령 상세 정보 조회 (전체 법령 또는 특정 조문)
@@ -152,15 +255,17 @@ class LawDataService:
         
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.get(self.law_detail_url, params=params, timeout=30.0)
+                with UpstreamCall("law_api", "lawService") as call:
+                    response = await client.get(self.law_detail_url, params=params, timeout=self.timeout)
+                    call.response(response)
                 
                 if response.status_code == 200:
                     content_type = response.headers.get('content-type', '').lower()
                     
                     # HTML이 반환된 경우 (오류 페이지)
                     if 'html' in content_type or response.text.strip().startswith('<!DOCTYPE html'):
-                        print(f"HTML 응답 받음 - 오류 페이지가 반환되었습니다.")
-                        print(f"응답 내용 일부: {response.text[:200]}...")
+                        logger.warning("HTML 응답 받음 - 오류 페이지가 반환되었습니다.")
+                        logger.debug("응답 내용 일부: %s...", response.text[:200])
                         
                         # 예시 데이터 반환 (실제 API 호출이 실패한 경우)
                         return self._get_mock_law_detail()
@@ -169,18 +274,23 @@ class LawDataService:
                     law_detail = self._parse_law_detail_xml(response.text)
                     return law_detail
                 else:
-                    print(f"법령 상세 API 호출 실패: {response.status_code}, {response.text[:200]}")
+                    logger.warning("법령 상세 API 호출 실패: %s, %s", response.status_code, response.text[:200])
                     # 실패 시 예시 데이터 반환
                     return self._get_mock_law_detail()
         except Exception as e:
-            print(f"법령 상세 조회 중 오류 발생: {e}")
+            logger.warning("법령 상세 조회 중 오류 발생: %s", e)
             # 예외 발생 시 예시 데이터 반환
             return self._get_mock_law_detail()
     
-    async def search_law_articles(self, law_id: str) -> List[Dict[str, Any]]:
+    async def search_law_articles(self, law_id: str, use_mock_on_failure: bool = True) -> Optional[List[Dict[str, Any]]]:
         """
         특정 법령의 조문 검색
         국가법령정보센터 API 사용
+        
+        Parameters:
+        - law_id: 법령 ID
+        - use_mock_on_failure: API 호출 실패 시 예시 데이터 반환 여부
+          (False인 경우 None 반환 - 동기화 작업에서 예시 데이터가 저장되지 않도록 사용)
         """
         params = {
             "OC": self.law_api_key,    # 기관코드
@@ -197,59 +307,61 @@ class LawDataService:
             try:
                 async with httpx.AsyncClient() as client:
                     # 헤더 추가
-                    response = await client.get(
-                        self.law_search_url, 
-                        params=params, 
-                        headers=self.headers,
-                        timeout=30.0
-                    )
+                    with UpstreamCall("law_api", "lawSearch") as call:
+                        response = await client.get(
+                            self.law_search_url, 
+                            params=params, 
+                            headers=self.headers,
+                            timeout=self.timeout
+                        )
+                        call.response(response)
                     
                     if response.status_code == 200:
                         content_type = response.headers.get('content-type', '').lower()
                         
                         # HTML이 반환된 경우 (오류 페이지)
                         if 'html' in content_type or response.text.strip().startswith('<!DOCTYPE html'):
-                            print(f"HTML 응답 받음 - 오류 페이지가 반환되었습니다.")
-                            print(f"응답 내용 일부: {response.text[:200]}...")
+                            logger.warning("HTML 응답 받음 - 오류 페이지가 반환되었습니다.")
+                            logger.debug("응답 내용 일부: %s...", response.text[:200])
                             
                             # 재시도 여부 확인
                             if retry_count < self.max_retries - 1:
                                 retry_count += 1
-                                print(f"재시도 {retry_count}/{self.max_retries}...")
+                                logger.info("재시도 %s/%s...", retry_count, self.max_retries)
                                 await asyncio.sleep(self.retry_delay)  # 재시도 전 지연
                                 continue
                             else:
-                                print(f"최대 재시도 횟수({self.max_retries})를 초과했습니다. 예시 데이터를 반환합니다.")
+                                logger.warning("최대 재시도 횟수(%s)를 초과했습니다. 예시 데이터를 반환합니다.", self.max_retries)
                                 # 예시 데이터 반환 (실제 API 호출이 실패한 경우)
-                                return self._get_mock_law_articles()
+                                return self._get_mock_law_articles() if use_mock_on_failure else None
                         
                         # XML 응답 파싱
                         articles = self._parse_article_xml(response.text)
                         return articles
                     else:
-                        print(f"조문 API 호출 실패: {response.status_code}, {response.text[:200]}")
+                        logger.warning("조문 API 호출 실패: %s, %s", response.status_code, response.text[:200])
                         
                         # 재시도 여부 확인
                         if retry_count < self.max_retries - 1:
                             retry_count += 1
-                            print(f"재시도 {retry_count}/{self.max_retries}...")
+                            logger.info("재시도 %s/%s...", retry_count, self.max_retries)
                             await asyncio.sleep(self.retry_delay)  # 재시도 전 지연
                             continue
                         else:
                             # 실패 시 예시 데이터 반환
-                            return self._get_mock_law_articles()
+                            return self._get_mock_law_articles() if use_mock_on_failure else None
             except Exception as e:
-                print(f"조문 검색 중 오류 발생: {e}")
+                logger.warning("조문 검색 중 오류 발생: %s", e)
                 
                 # 재시도 여부 확인
                 if retry_count < self.max_retries - 1:
                     retry_count += 1
-                    print(f"재시도 {retry_count}/{self.max_retries}...")
+                    logger.info("재시도 %s/%s...", retry_count, self.max_retries)
                     await asyncio.sleep(self.retry_delay)  # 재시도 전 지연
                     continue
                 else:
                     # 예외 발생 시 예시 데이터 반환
-                    return self._get_mock_law_articles()
+                    return self._get_mock_law_articles() if use_mock_on_failure else None
     
     async def search_precedents(
         self, 
@@ -259,8 +371,10 @@ class LawDataService:
         case_number: Optional[str] = None,
         reference_law: Optional[str] = None,
         page: int = 1,
-        display: int = 20
-    ) -> List[Dict[str, Any]]:
+        display: int = 20,
+        sort: Optional[str] = None,
+        use_mock_on_failure: bool = True
+    ) -> Optional[List[Dict[str, Any]]]:
         """
         판례 목록 검색
         국가법령정보센터 판례 목록 조회 API 사용
@@ -273,9 +387,12 @@ class LawDataService:
         - reference_law: 참조법령명 (예: '형법', '민법')
         - page: 검색 결과 페이지 (기본값: 1)
         - display: 검색된 결과 개수 (기본값: 20, 최대: 100)
+        - sort: 정렬 순서 (예: 'ddes' - 선고일자 내림차순). 지정하면 검색 조건 없이 전체 목록 조회 가능
+        - use_mock_on_failure: API 호출 실패 시 예시 데이터 반환 여부
+          (False인 경우 None 반환 - 판례 수집 작업에서 예시 데이터가 저장되지 않도록 사용)
         """
-        # 키워드가 없고 다른 검색 조건도 없으면 예시 데이터 반환
-        if not keywords and not court and not case_number and not reference_law:
+        # 키워드가 없고 다른 검색 조건도 없으면 예시 데이터 반환 (정렬을 지정한 전체 목록 조회는 제외)
+        if not keywords and not court and not case_number and not reference_law and not sort:
             return self._get_mock_precedents()
             
         # 키워드가 너무 많으면 상위 2개만 사용 (API 오류 방지)
@@ -307,33 +424,41 @@ class LawDataService:
         if reference_law:
             params["JO"] = reference_law
         
+        # 정렬 순서
+        if sort:
+            params["sort"] = sort
+        
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.get(self.precedent_search_url, params=params, timeout=30.0)
+                with UpstreamCall("law_api", "precSearch") as call:
+                    response = await client.get(self.precedent_search_url, params=params, timeout=self.timeout)
+                    call.response(response)
                 
                 if response.status_code == 200:
                     content_type = response.headers.get('content-type', '').lower()
                     
                     # HTML이 반환된 경우 (오류 페이지)
                     if 'html' in content_type or response.text.strip().startswith('<!DOCTYPE html'):
-                        print(f"HTML 응답 받음 - 오류 페이지가 반환되었습니다.")
-                        print(f"응답 내용 일부: {response.text[:200]}...")
+                        logger.warning("HTML 응답 받음 - 오류 페이지가 반환되었습니다.")
+                        logger.debug("응답 내용 일부: %s...", response.text[:200])
                         
                         # 예시 데이터 반환 (실제 API 호출이 실패한 경우)
-                        return self._get_mock_precedents()
+                        return self._get_mock_precedents() if use_mock_on_failure else None
                     
-                    # XML 응답 파싱
+                    # XML 응답 파싱 (파싱 실패 시 수집 작업에는 None을 반환해 마지막 페이지로 오인하지 않도록 함)
                     precedents = self._parse_precedent_list_xml(response.text)
-                    print(f"판례 검색 결과: {len(precedents)}개")
+                    if precedents is None:
+                        return [] if use_mock_on_failure else None
+                    logger.info("판례 검색 결과: %s개", len(precedents))
                     return precedents
                 else:
-                    print(f"판례 목록 API 호출 실패: {response.status_code}, {response.text[:200]}")
+                    logger.warning("판례 목록 API 호출 실패: %s, %s", response.status_code, response.text[:200])
                     # 실패 시 예시 데이터 반환
-                    return self._get_mock_precedents()
+                    return self._get_mock_precedents() if use_mock_on_failure else None
         except Exception as e:
-            print(f"판례 목록 검색 중 오류 발생: {e}")
+            logger.warning("판례 목록 검색 중 오류 발생: %s", e)
             # 예외 발생 시 예시 데이터 반환
-            return self._get_mock_precedents()
+            return self._get_mock_precedents() if use_mock_on_failure else None
     
     async def get_precedent_detail(self, precedent_id: str) -> Dict[str, Any]:
         """
@@ -345,8 +470,8 @@ class LawDataService:
         """
         # 기관코드 누락 및 API 엔드포인트 불안정 이슈로 인해 직접 호출하지 않고
         # 예시 데이터 반환 (실제 API 연동 후 수정 필요)
-        print(f"판례 상세 조회 API 호출 건너뛰기 (ID: {precedent_id})")
-        print(f"예시 데이터 사용 (API 안정화 필요)")
+        logger.debug("판례 상세 조회 API 호출 건너뛰기 (ID: %s)", precedent_id)
+        logger.debug("예시 데이터 사용 (API 안정화 필요)")
         
         # 특정 키워드에 따라 다른 예시 데이터 반환 (ID에 따라 다른 데이터)
         id_num = 0
@@ -361,6 +486,36 @@ class LawDataService:
         else:
             return self._get_mock_precedent_detail("계약해지")
     
+    async def fetch_precedent_detail(self, precedent_id: str) -> Optional[Dict[str, Any]]:
+        """
+        판례 본문 조회 API(lawService.do, target=prec)로 판시사항/판결요지/판례내용 조회
+        판례 목록 API에는 판시사항/판결요지가 없으므로 판례 수집 시 새 판례마다 사용
+        실패하면 예시 데이터 대신 None 반환 (예시 데이터가 저장되지 않도록)
+        """
+        params = {
+            "OC": self.law_api_key,  # 기관코드
+            "target": "prec",         # 서비스 대상: 판례
+            "type": "XML",            # 응답 형식: XML
+            "ID": precedent_id        # 판례 일련번호
+        }
+        
+        try:
+            async with httpx.AsyncClient() as client:
+                with UpstreamCall("law_api", "lawService") as call:
+                    response = await client.get(self.precedent_detail_url, params=params, timeout=self.timeout)
+                    call.response(response)
+        except Exception as e:
+            logger.warning("판례 본문 조회 중 오류 발생 (ID: %s): %s", precedent_id, e)
+            return None
+        
+        content_type = response.headers.get('content-type', '').lower()
+        if response.status_code != 200 or 'html' in content_type or response.text.strip().startswith('<!DOCTYPE html'):
+            logger.warning("판례 본문 API 호출 실패 (ID: %s): %s", precedent_id, response.status_code)
+            return None
+        
+        detail = self._parse_precedent_detail_xml(response.text)
+        return detail or None
+    
     async def get_law_detail_from_link(self, link: str) -> Dict[str, Any]:
         """
         법령 상세 링크에서 법령 정보 추출
@@ -371,7 +526,7 @@ class LawDataService:
         Returns:
         - 법령 상세 정보
         """
-        print(f"법령 상세 링크에서 정보 추출: {link}")
+        logger.debug("법령 상세 링크에서 정보 추출: %s", link)
         
         # 링크에서 법령명 추출
         law_name = link.split('/')[-1]
@@ -396,7 +551,7 @@ class LawDataService:
         Returns:
         - 판례 상세 정보
         """
-        print(f"판례 상세 링크에서 정보 추출: {link}")
+        logger.debug("판례 상세 링크에서 정보 추출: %s", link)
         
         # 링크에서 사건번호 추출
         case_number = link.split('/')[-1]
@@ -415,6 +570,7 @@ class LawDataService:
         
         return mock_precedent
     
+    @timed("xml_parse")
     def _parse_law_xml(self, xml_text: str) -> List[Dict[str, Any]]:
         """
         XML 형식의 법령 목록 정보를 파싱하는 함수
@@ -422,7 +578,7 @@ class LawDataService:
         try:
             # XML 형식 검증
             if not xml_text.strip().startswith('<?xml') and not xml_text.strip().startswith('<'):
-                print(f"XML 형식이 아닌 응답: {xml_text[:200]}...")
+                logger.debug("XML 형식이 아닌 응답: %s...", xml_text[:200])
                 return []
                 
             # XML 파싱
@@ -437,18 +593,32 @@ class LawDataService:
                     "promulgationDate": law.findtext('공포일자', ''),
                     "lawType": law.findtext('법종구분', ''),
                     "currentHistory": law.findtext('현행연혁', ''),
-                    "link": law.findtext('법령상세링크', '')
+                    "link": law.findtext('법령상세링크', ''),
+                    "mst": law.findtext('법령일련번호', ''),
+                    "enforcementDate": law.findtext('시행일자', '')
                 }
                 laws.append(law_info)
             
             return laws
         except Exception as e:
-            print(f"XML 파싱 중 오류 발생: {e}")
-            print(f"XML 내용: {xml_text[:200]}...")  # 오류 확인을 위해 일부 출력
+            logger.warning("XML 파싱 중 오류 발생: %s", e)
+            logger.debug("XML 내용: %s...", xml_text[:200])  # 오류 확인을 위해 일부 출력
             
             # 파싱 오류 시 빈 목록 반환
             return []
     
+    @timed("xml_parse")
+    def _parse_total_count(self, xml_text: str) -> int:
+        """
+        XML 형식의 목록 응답에서 전체 결과 수(totalCnt)를 추출하는 함수
+        """
+        try:
+            root = ET.fromstring(xml_text)
+            return int(root.findtext('.//totalCnt', '0') or 0)
+        except (ET.ParseError, ValueError):
+            return 0
+
+    @timed("xml_parse")
     def _parse_law_detail_xml(self, xml_text: str) -> Dict[str, Any]:
         """
         XML 형식의 법령 상세 정보를 파싱하는 함수
@@ -456,7 +626,7 @@ class LawDataService:
         try:
             # XML 형식 검증
             if not xml_text.strip().startswith('<?xml') and not xml_text.strip().startswith('<'):
-                print(f"XML 형식이 아닌 응답: {xml_text[:200]}...")
+                logger.debug("XML 형식이 아닌 응답: %s...", xml_text[:200])
                 return {}
                 
             # XML 파싱
@@ -531,10 +701,11 @@ class LawDataService:
             
             return law_info
         except Exception as e:
-            print(f"법령 상세 XML 파싱 중 오류 발생: {e}")
-            print(f"XML 내용: {xml_text[:200]}...")  # 오류 확인을 위해 일부 출력
+            logger.warning("법령 상세 XML 파싱 중 오류 발생: %s", e)
+            logger.debug("XML 내용: %s...", xml_text[:200])  # 오류 확인을 위해 일부 출력
             return {}
     
+    @timed("xml_parse")
     def _parse_article_xml(self, xml_text: str) -> List[Dict[str, Any]]:
         """
         XML 형식의 법령 조문 정보를 파싱하는 함수
@@ -542,7 +713,7 @@ class LawDataService:
         try:
             # XML 형식 검증
             if not xml_text.strip().startswith('<?xml') and not xml_text.strip().startswith('<'):
-                print(f"XML 형식이 아닌 응답: {xml_text[:200]}...")
+                logger.debug("XML 형식이 아닌 응답: %s...", xml_text[:200])
                 return []
                 
             # XML 파싱
@@ -563,18 +734,19 @@ class LawDataService:
             
             return articles
         except Exception as e:
-            print(f"조문 XML 파싱 중 오류 발생: {e}")
+            logger.warning("조문 XML 파싱 중 오류 발생: %s", e)
             return []
     
-    def _parse_precedent_list_xml(self, xml_text: str) -> List[Dict[str, Any]]:
+    @timed("xml_parse")
+    def _parse_precedent_list_xml(self, xml_text: str) -> Optional[List[Dict[str, Any]]]:
         """
-        XML 형식의 판례 목록 정보를 파싱하는 함수
+        XML 형식의 판례 목록 정보를 파싱하는 함수 (XML이 아니거나 파싱에 실패하면 None)
         """
         try:
             # XML 형식 검증
             if not xml_text.strip().startswith('<?xml') and not xml_text.strip().startswith('<'):
-                print(f"XML 형식이 아닌 응답: {xml_text[:200]}...")
-                return []
+                logger.debug("XML 형식이 아닌 응답: %s...", xml_text[:200])
+                return None
                 
             # XML 파싱
             root = ET.fromstring(xml_text)
@@ -582,7 +754,7 @@ class LawDataService:
             
             # 국가법령정보 API 응답 구조에 맞게 파싱
             total_count = root.findtext('.//totalCnt', '0')
-            print(f"판례 검색 총 결과 수: {total_count}")
+            logger.info("판례 검색 총 결과 수: %s", total_count)
             
             for prec in root.findall('.//prec'):
                 precedent_info = {
@@ -602,10 +774,11 @@ class LawDataService:
             
             return precedents
         except Exception as e:
-            print(f"판례 목록 XML 파싱 중 오류 발생: {e}")
-            print(f"XML 내용: {xml_text[:200]}...")  # 오류 확인을 위해 일부 출력
-            return []
+            logger.warning("판례 목록 XML 파싱 중 오류 발생: %s", e)
+            logger.debug("XML 내용: %s...", xml_text[:200])  # 오류 확인을 위해 일부 출력
+            return None
     
+    @timed("xml_parse")
     def _parse_precedent_detail_xml(self, xml_text: str) -> Dict[str, Any]:
         """
         XML 형식의 판례 상세 정보를 파싱하는 함수
@@ -613,7 +786,7 @@ class LawDataService:
         try:
             # XML 형식 검증
             if not xml_text.strip().startswith('<?xml') and not xml_text.strip().startswith('<'):
-                print(f"XML 형식이 아닌 응답: {xml_text[:200]}...")
+                logger.debug("XML 형식이 아닌 응답: %s...", xml_text[:200])
                 return {}
                 
             # XML 파싱
@@ -640,8 +813,8 @@ class LawDataService:
             
             return precedent_info
         except Exception as e:
-            print(f"판례 상세 XML 파싱 중 오류 발생: {e}")
-            print(f"XML 내용: {xml_text[:200]}...")  # 오류 확인을 위해 일부 출력
+            logger.warning("판례 상세 XML 파싱 중 오류 발생: %s", e)
+            logger.debug("XML 내용: %s...", xml_text[:200])  # 오류 확인을 위해 일부 출력
             return {}
     
     # 예시 데이터 제공 함수들
@@ -0,0 +1,300 @@
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterable
+from array import array
+from collections import Counter
+import logging
+import math
+import os
+import pickle
+import time
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.text_utils import char_bigrams
+
+logger = logging.getLogger(__name__)
+
+class LawArticleIndex:
+    """
+    법령 조문 전문 검색용 로컬 역색인
+    Law_Article의 조문제목과 조문내용을 글자 바이그램으로 토큰화하여 색인
+
+    - 포스팅 목록은 array('I')(문서 번호) / array('H')(출현 빈도)로 저장하여 메모리 사용량 최소화
+    - 검색 시에는 포스팅 배열을 복사 없이 NumPy 배열로 보고 벡터 연산으로 점수 계산
+    - 조문이 갱신되면 기존 문서는 삭제 표시하고 새 문서를 추가 (증분 갱신)
+    - 점수 계산은 BM25 방식 (조문제목은 가중치 2배)
+    """
+
+    VERSION = 1
+    # 전체 문서의 절반 이상에 등장하는 바이그램은 다른 검색어가 있으면 점수 계산에서 제외 (예: "한다")
+    COMMON_TERM_RATIO = 0.5
+    TITLE_WEIGHT = 2
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self.vocabulary: Dict[str, int] = {}
+        self.postings_docs: List[array] = []
+        self.postings_freqs: List[array] = []
+        self.doc_article_ids = array('I')
+        self.doc_law_ids = array('I')
+        self.doc_lengths = array('I')
+        self.article_docs: Dict[int, int] = {}
+        self.deleted = set()
+        self.laws: Dict[int, Dict[str, str]] = {}
+        self.total_length = 0
+
+    @property
+    def document_count(self) -> int:
+        """삭제되지 않은 문서 수"""
+        return len(self.doc_article_ids) - len(self.deleted)
+
+    def add_law(self, law_id: int, law_info: Dict[str, str]) -> None:
+        """법령 메타데이터 등록 (법령 단위 검색 결과 구성에 사용)"""
+        self.laws[law_id] = law_info
+
+    def add_document(self, article_id: int, law_id: int, title: str, content: str) -> None:
+        """조문 하나를 색인에 추가 (이미 색인된 조문이면 기존 문서를 삭제 표시)"""
+        previous_doc = self.article_docs.get(article_id)
+        if previous_doc is not None:
+            self.deleted.add(previous_doc)
+            self.total_length -= self.doc_lengths[previous_doc]
+
+        tokens = char_bigrams(title or "") * self.TITLE_WEIGHT + char_bigrams(content or "")
+        doc = len(self.doc_article_ids)
+        self.doc_article_ids.append(article_id)
+        self.doc_law_ids.append(law_id)
+        self.doc_lengths.append(len(tokens))
+        self.article_docs[article_id] = doc
+        self.total_length += len(tokens)
+
+        for term, freq in Counter(tokens).items():
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                term_id = len(self.postings_docs)
+                self.vocabulary[term] = term_id
+                self.postings_docs.append(array('I'))
+                self.postings_freqs.append(array('H'))
+            self.postings_docs[term_id].append(doc)
+            self.postings_freqs[term_id].append(min(freq, 65535))
+
+    def add_articles(self, articles: Iterable[Any]) -> None:
+        """
+        LawArticle 모델 객체들을 색인에 추가 (조문 저장 직후 증분 갱신용)
+        법령 메타데이터가 없으면 article.law 관계에서 함께 등록
+        """
+        for article in articles:
+            if article.law_id not in self.laws and getattr(article, "law", None) is not None:
+                self.add_law(article.law_id, law_to_index_info(article.law))
+            self.add_document(article.article_id, article.law_id, article.article_title, article.content)
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[int, float]]:
+        """
+        조문 검색
+
+        Returns:
+        - (article_id, 점수) 목록 (점수 내림차순)
+        """
+        doc_count = len(self.doc_article_ids)
+        if doc_count == 0:
+            return []
+
+        term_ids = [self.vocabulary[term] for term in set(char_bigrams(query)) if term in self.vocabulary]
+        if not term_ids:
+            return []
+
+        # 흔한 바이그램 제외 (모든 검색어가 흔한 경우에는 그대로 사용)
+        common_limit = self.COMMON_TERM_RATIO * doc_count
+        selective = [term_id for term_id in term_ids if len(self.postings_docs[term_id]) <= common_limit]
+        if selective:
+            term_ids = selective
+
+        length_norms = self._length_norms()
+        scores = np.zeros(doc_count, dtype=np.float32)
+
+        # 포스팅 배열을 복사 없이 NumPy 배열로 보고 벡터 연산으로 점수 누적
+        # (한 포스팅 목록 안의 문서 번호는 중복되지 않으므로 팬시 인덱싱 덧셈 사용 가능)
+        for term_id in term_ids:
+            docs = np.frombuffer(self.postings_docs[term_id], dtype=np.uint32)
+            freqs = np.frombuffer(self.postings_freqs[term_id], dtype=np.uint16).astype(np.float32)
+            df = len(docs)
+            weight = math.log(1 + (doc_count - df + 0.5) / (df + 0.5)) * (self.K1 + 1)
+            scores[docs] += weight * freqs / (freqs + length_norms[docs])
+            del docs
+
+        if self.deleted:
+            scores[np.fromiter(self.deleted, dtype=np.int64, count=len(self.deleted))] = 0
+
+        limit = min(limit, doc_count)
+        top_docs = np.argpartition(-scores, limit - 1)[:limit]
+        top_docs = top_docs[np.argsort(-scores[top_docs], kind="stable")]
+        return [(self.doc_article_ids[doc], float(scores[doc])) for doc in top_docs.tolist() if scores[doc] > 0]
+
+    def search_laws(self, keywords: List[str], law_name: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        키워드로 법령 검색 (국가법령정보 API 법령 검색 결과와 같은 형식으로 반환)
+        법령 점수는 해당 법령에서 가장 관련도가 높은 조문의 점수로 계산
+        """
+        query = " ".join(keywords + ([law_name] if law_name else []))
+        article_hits = self.search(query, limit=limit * 20)
+
+        law_scores: Dict[int, float] = {}
+        for article_id, score in article_hits:
+            law_id = self.doc_law_ids[self.article_docs[article_id]]
+            law_scores[law_id] = max(law_scores.get(law_id, 0.0), score)
+
+        # 법령명을 지정한 경우 법령명이 일치하는 법령만 사용 (일치하는 법령이 있을 때)
+        if law_name:
+            named = {law_id: score for law_id, score in law_scores.items() if law_name in self.laws.get(law_id, {}).get("law_name", "")}
+            if named:
+                law_scores = named
+
+        results = []
+        for law_id, score in sorted(law_scores.items(), key=lambda item: item[1], reverse=True)[:limit]:
+            law_info = self.laws.get(law_id)
+            if not law_info:
+                continue
+            results.append({
+                "lawId": law_info.get("law_code", ""),
+                "lawName": law_info.get("law_name", ""),
+                "promulgationDate": law_info.get("promulgation_date", ""),
+                "lawType": law_info.get("law_type", ""),
+                "currentHistory": "",
+                "link": law_info.get("link", ""),
+                "mst": "",
+                "enforcementDate": law_info.get("enforcement_date", ""),
+                "score": round(score, 4),
+                "source": "local"
+            })
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        """색인 통계 (문서 수, 바이그램 수, 포스팅 수, 포스팅 저장 크기)"""
+        postings = sum(len(docs) for docs in self.postings_docs)
+        posting_bytes = sum(docs.itemsize * len(docs) for docs in self.postings_docs) + \
+            sum(freqs.itemsize * len(freqs) for freqs in self.postings_freqs)
+        doc_bytes = sum(values.itemsize * len(values) for values in (self.doc_article_ids, self.doc_law_ids, self.doc_lengths))
+        return {
+            "documents": self.document_count,
+            "terms": len(self.vocabulary),
+            "postings": postings,
+            "posting_bytes": posting_bytes,
+            "document_bytes": doc_bytes
+        }
+
+    def save(self, path: str) -> None:
+        """색인을 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as file:
+            # 캐시 값(_로 시작하는 속성)은 저장하지 않음
+            state = {key: value for key, value in self.__dict__.items() if not key.startswith("_")}
+            pickle.dump({"version": self.VERSION, "state": state}, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["LawArticleIndex"]:
+        """파일에서 색인 불러오기 (파일이 없거나 버전이 다르면 None)"""
+        try:
+            with open(path, "rb") as file:
+                data = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning("법령 색인 파일을 읽을 수 없습니다: %s", e)
+            return None
+
+        if data.get("version") != cls.VERSION:
+            return None
+
+        index = cls()
+        index.__dict__.update(data["state"])
+        return index
+
+    def _length_norms(self) -> np.ndarray:
+        """
+        BM25 문서 길이 정규화 값 (k1 * (1 - b + b * 문서길이 / 평균길이))
+        문서가 추가될 때만 다시 계산하고 그 외에는 캐시된 값 사용
+        """
+        cached = self.__dict__.get("_norm_cache")
+        if cached is not None and len(cached) == len(self.doc_lengths):
+            return cached
+
+        average_length = self.total_length / max(self.document_count, 1) or 1.0
+        lengths = np.array(self.doc_lengths, dtype=np.float32)
+        norms = self.K1 * (1 - self.B + self.B * lengths / average_length)
+        self._norm_cache = norms
+        return norms
+
+def law_to_index_info(law: Any) -> Dict[str, str]:
+    """Law 모델 객체를 색인용 법령 메타데이터로 변환"""
+    return {
+        "law_code": law.law_code or "",
+        "law_name": law.law_name or "",
+        "law_type": law.law_type or "",
+        "promulgation_date": law.promulgation_date or "",
+        "enforcement_date": getattr(law, "enforcement_date", "") or "",
+        "link": law.link or ""
+    }
+
+def build_law_article_index(db: Session) -> LawArticleIndex:
+    """DB에 저장된 전체 법령 조문으로 색인 생성"""
+    from app.db.models import Law, LawArticle
+
+    started = time.monotonic()
+    index = LawArticleIndex()
+
+    for law in db.query(Law).yield_per(1000):
+        index.add_law(law.law_id, law_to_index_info(law))
+
+    rows = db.query(LawArticle.article_id, LawArticle.law_id, LawArticle.article_title, LawArticle.content)
+    for article_id, law_id, title, content in rows.yield_per(1000):
+        index.add_document(article_id, law_id, title, content)
+
+    logger.info("법령 조문 색인 생성 완료: %s (%.1f초)", index.stats(), time.monotonic() - started)
+    return index
+
+
+# 프로세스 전역 색인 (서버 시작 시 파일 또는 DB에서 불러옴)
+_law_article_index = LawArticleIndex()
+
+def get_law_article_index() -> LawArticleIndex:
+    """현재 사용 중인 법령 조문 색인 반환"""
+    return _law_article_index
+
+def set_law_article_index(index: LawArticleIndex) -> None:
+    """사용할 법령 조문 색인 교체"""
+    global _law_article_index
+    _law_article_index = index
+
+def load_or_build_law_article_index(session_factory: Optional[Callable[[], Session]] = None) -> LawArticleIndex:
+    """
+    저장된 색인 파일을 불러오고, 없으면 DB에서 새로 생성하여 저장
+    (서버 시작 시 별도 스레드에서 실행)
+    """
+    index = None
+    if os.path.exists(settings.LAW_INDEX_PATH):
+        index = LawArticleIndex.load(settings.LAW_INDEX_PATH)
+
+    if index is None:
+        index = rebuild_law_article_index(session_factory)
+    else:
+        set_law_article_index(index)
+        logger.info("법령 조문 색인 파일을 불러왔습니다: %s", index.stats())
+
+    return index
+
+def rebuild_law_article_index(session_factory: Optional[Callable[[], Session]] = None, save: bool = True) -> LawArticleIndex:
+    """DB에서 색인을 새로 생성하여 교체하고 파일로 저장"""
+    if session_factory is None:
+        from app.db.database import SessionLocal
+        session_factory = SessionLocal
+
+    db = session_factory()
+    try:
+        index = build_law_article_index(db)
+    finally:
+        db.close()
+
+    set_law_article_index(index)
+    if save:
+        index.save(settings.LAW_INDEX_PATH)
+    return index
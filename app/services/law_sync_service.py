@@ -0,0 +1,307 @@
+from typing import List, Dict, Any, Optional, Callable
+import argparse
+import asyncio
+import logging
+import os
+import time
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.checkpoint import JsonCheckpoint
+from app.db.database import SessionLocal
+from app.db.models import Law, LawArticle
+from app.services.law_data_service import LawDataService
+from app.services.law_search_index import get_law_article_index, law_to_index_info, rebuild_law_article_index
+from app.services.semantic_index import rebuild_semantic_index
+
+logger = logging.getLogger(__name__)
+
+class LawSyncService:
+    """
+    현행법령 로컬 동기화 서비스
+    국가법령정보센터의 현행법령 목록과 각 법령의 조문을 Law / Law_Article 테이블에 저장
+
+    - 증분 동기화: 공포일자 또는 시행일자가 바뀐 법령(또는 조문이 없는 법령)만 다시 조회
+    - 동시 실행 제한: 조문 조회는 LAW_SYNC_CONCURRENCY 개까지만 동시에 실행
+    - 체크포인트: 처리한 법령을 파일에 기록하여 중단된 동기화를 이어서 실행
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        law_data_service: Optional[LawDataService] = None,
+        concurrency: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+        page_size: int = 100
+    ):
+        self.session_factory = session_factory
+        self.law_data_service = law_data_service or LawDataService()
+        self.concurrency = concurrency or settings.LAW_SYNC_CONCURRENCY
+        self.checkpoint = JsonCheckpoint(checkpoint_path or settings.LAW_SYNC_CHECKPOINT_PATH)
+        self.page_size = page_size
+        # 체크포인트 저장 주기 (처리한 법령 수 기준)
+        self.checkpoint_interval = 10
+
+    async def sync(self, full: bool = False) -> Dict[str, int]:
+        """
+        현행법령 동기화 실행
+
+        Parameters:
+        - full: True인 경우 변경 여부와 관계없이 모든 법령의 조문을 다시 조회
+
+        Returns:
+        - 동기화 결과 통계 (목록 법령 수, 대상 법령 수, 성공/실패 수, 저장된 조문 수)
+        """
+        started = time.monotonic()
+        state = self.checkpoint.load()
+
+        if state.get("pending") is not None:
+            logger.info("이전 동기화를 이어서 진행합니다. (완료: %d/%d)", len(state.get("done", [])), len(state["pending"]))
+        else:
+            # 1. 현행법령 목록 조회
+            law_list = await self._fetch_law_list()
+            if law_list is None:
+                logger.warning("현행법령 목록을 가져오지 못했습니다. 동기화를 중단합니다.")
+                return {"listed": 0, "pending": 0, "synced": 0, "failed": 0, "articles": 0}
+
+            # 2. 변경된 법령만 동기화 대상으로 선택
+            pending = self._select_changed_laws(law_list, full)
+            state = {"listed": len(law_list), "pending": pending, "done": []}
+            self.checkpoint.state = state
+            self.checkpoint.save()
+            logger.info("현행법령 %d개 중 %d개 법령을 동기화합니다.", len(law_list), len(pending))
+
+        # 3. 대상 법령의 조문 조회 및 저장
+        stats = await self._sync_pending_laws(state)
+        stats["listed"] = state.get("listed", 0)
+        stats["pending"] = len(state["pending"])
+
+        # 실패한 법령이 없으면 체크포인트 삭제 (다음 실행은 새 증분 동기화)
+        if stats["failed"] == 0:
+            self.checkpoint.clear()
+        else:
+            self.checkpoint.save()
+            logger.warning("%d개 법령 동기화 실패 - 다음 실행 시 다시 시도합니다.", stats["failed"])
+
+        logger.info("동기화 완료: %s (%.1f초)", stats, time.monotonic() - started, extra={"fields": stats})
+        return stats
+
+    async def _fetch_law_list(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        현행법령 목록 전체 조회
+        첫 페이지에서 전체 건수를 확인한 뒤 나머지 페이지는 제한된 동시성으로 조회
+        """
+        first_page = await self.law_data_service.list_current_laws(page=1, display=self.page_size)
+        if first_page is None:
+            return None
+
+        total_count = first_page["total_count"]
+        page_count = max(1, -(-total_count // self.page_size))
+        logger.info("현행법령 전체 %d개 (%d 페이지)", total_count, page_count)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch_page(page: int) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self.law_data_service.list_current_laws(page=page, display=self.page_size)
+
+        pages = await asyncio.gather(*(fetch_page(page) for page in range(2, page_count + 1)))
+
+        # 목록이 일부만 조회된 경우 삭제된 법령으로 오인하지 않도록 전체 동기화를 중단
+        if any(page is None for page in pages):
+            return None
+
+        law_list = list(first_page["laws"])
+        for page in pages:
+            law_list.extend(page["laws"])
+
+        # 중복 법령 제거 (페이지 경계에서 목록이 바뀐 경우 대비)
+        unique_laws = {}
+        for law_info in law_list:
+            if law_info.get("lawId"):
+                unique_laws[law_info["lawId"]] = law_info
+
+        return list(unique_laws.values())
+
+    def _select_changed_laws(self, law_list: List[Dict[str, Any]], full: bool) -> Dict[str, Dict[str, Any]]:
+        """
+        공포일자 / 시행일자를 비교하여 다시 조회해야 할 법령 선택
+        조문이 하나도 저장되지 않은 법령도 대상에 포함
+        """
+        if full:
+            return {law_info["lawId"]: law_info for law_info in law_list}
+
+        db = self.session_factory()
+        try:
+            stored = {
+                law_code: (promulgation_date or "", enforcement_date or "")
+                for law_code, promulgation_date, enforcement_date in db.query(
+                    Law.law_code, Law.promulgation_date, Law.enforcement_date
+                ).all()
+            }
+            laws_with_articles = {
+                law_code for (law_code,) in db.query(Law.law_code).join(LawArticle, LawArticle.law_id == Law.law_id).distinct().all()
+            }
+        finally:
+            db.close()
+
+        pending = {}
+        for law_info in law_list:
+            law_code = law_info["lawId"]
+            dates = (law_info.get("promulgationDate", ""), law_info.get("enforcementDate", ""))
+            if stored.get(law_code) != dates or law_code not in laws_with_articles:
+                pending[law_code] = law_info
+
+        return pending
+
+    async def _sync_pending_laws(self, state: Dict[str, Any]) -> Dict[str, int]:
+        """
+        동기화 대상 법령의 조문을 제한된 동시성으로 조회하여 저장
+        """
+        done = set(state.setdefault("done", []))
+        targets = [law_info for law_code, law_info in state["pending"].items() if law_code not in done]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        stats = {"synced": 0, "failed": 0, "articles": 0}
+        processed_since_save = 0
+
+        async def sync_one(law_info: Dict[str, Any]) -> None:
+            nonlocal processed_since_save
+
+            async with semaphore:
+                articles = await self.law_data_service.search_law_articles(
+                    law_info["lawId"], use_mock_on_failure=False
+                )
+
+            if articles is None:
+                logger.warning("조문 조회 실패: %s (%s)", law_info.get("lawName", ""), law_info["lawId"])
+                stats["failed"] += 1
+                return
+
+            # DB 저장 (동기 세션이므로 이벤트 루프에서 순차적으로 실행됨)
+            db = self.session_factory()
+            try:
+                saved_count = self._save_law_with_articles(db, law_info, articles)
+            except Exception as e:
+                db.rollback()
+                logger.error("법령 저장 중 오류 발생: %s (%s): %s", law_info.get("lawName", ""), law_info["lawId"], e, exc_info=e)
+                stats["failed"] += 1
+                return
+            finally:
+                db.close()
+
+            stats["synced"] += 1
+            stats["articles"] += saved_count
+
+            # 처리 완료 기록 및 주기적 체크포인트 저장
+            state["done"].append(law_info["lawId"])
+            processed_since_save += 1
+            if processed_since_save >= self.checkpoint_interval:
+                processed_since_save = 0
+                self.checkpoint.save()
+
+        await asyncio.gather(*(sync_one(law_info) for law_info in targets))
+
+        return stats
+
+    def _save_law_with_articles(self, db: Session, law_info: Dict[str, Any], articles: List[Dict[str, Any]]) -> int:
+        """
+        법령과 조문을 DB에 저장 (기존 데이터는 갱신)
+        조문은 사례 연결(aCase_Law)에서 참조될 수 있으므로 삭제하지 않고 내용만 갱신
+
+        Returns:
+        - 새로 추가되거나 갱신된 조문 수
+        """
+        law_code = law_info["lawId"]
+        law = db.query(Law).filter(Law.law_code == law_code).first()
+
+        link = law_info.get("link", "")
+        if not link and law_info.get("lawName", ""):
+            link = f"https://www.law.go.kr/법령/{law_info.get('lawName', '')}"
+
+        if law is None:
+            law = Law(law_code=law_code)
+            db.add(law)
+
+        law.law_name = law_info.get("lawName", "") or law.law_name or ""
+        law.law_type = law_info.get("lawType", "") or law.law_type
+        law.promulgation_date = law_info.get("promulgationDate", "")
+        law.enforcement_date = law_info.get("enforcementDate", "")
+        law.link = law.link or link
+        db.flush()
+
+        changed_articles = []
+        existing_articles = {
+            article.article_number: article
+            for article in db.query(LawArticle).filter(LawArticle.law_id == law.law_id).all()
+        }
+
+        for article_info in articles:
+            article_number = article_info.get("article", "")
+            if not article_number:
+                continue
+
+            title = article_info.get("articleTitle", "")
+            content = article_info.get("content", "")
+            article = existing_articles.get(article_number)
+
+            if article is None:
+                article = LawArticle(
+                    law_id=law.law_id,
+                    article_number=article_number,
+                    article_title=title,
+                    content=content
+                )
+                db.add(article)
+                existing_articles[article_number] = article
+                changed_articles.append(article)
+            elif article.article_title != title or article.content != content:
+                article.article_title = title
+                article.content = content
+                changed_articles.append(article)
+
+        # 커밋 후에는 객체가 만료되므로 색인에 필요한 값을 미리 확보
+        db.flush()
+        law_id = law.law_id
+        law_info_for_index = law_to_index_info(law)
+        documents = [
+            (article.article_id, article.law_id, article.article_title, article.content)
+            for article in changed_articles
+        ]
+
+        db.commit()
+
+        # 로컬 검색 색인에 바뀐 조문 반영
+        if documents:
+            index = get_law_article_index()
+            index.add_law(law_id, law_info_for_index)
+            for document in documents:
+                index.add_document(*document)
+
+        return len(documents)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='LawMate 현행법령 로컬 동기화 도구')
+    parser.add_argument('--full', action='store_true', help='변경 여부와 관계없이 모든 법령의 조문을 다시 조회')
+    parser.add_argument('--concurrency', type=int, default=None, help='동시에 조회할 법령 수')
+    parser.add_argument('--checkpoint', default=None, help='체크포인트 파일 경로')
+    parser.add_argument('--reset', action='store_true', help='저장된 체크포인트를 무시하고 처음부터 실행')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")  # 명령줄 실행 시 진행 상황 출력
+
+    service = LawSyncService(concurrency=args.concurrency, checkpoint_path=args.checkpoint)
+    if args.reset:
+        service.checkpoint.clear()
+
+    stats = await service.sync(full=args.full)
+
+    # 조문이 바뀐 경우 로컬 검색 색인 / 의미 검색 색인 파일 다시 생성 (서버는 재시작 시 새 색인을 불러옴)
+    if stats["articles"] > 0 or not os.path.exists(settings.LAW_INDEX_PATH):
+        rebuild_law_article_index()
+    if settings.SEMANTIC_SEARCH and stats["articles"] > 0:
+        rebuild_semantic_index("law_articles")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,10 +1,22 @@
 from typing import List, Dict, Any, Optional, Tuple
+import logging
 import json
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.timing import collect_stages, stage
 from app.db.models import ACase, Law, LawArticle, Precedent, ACaseLaw, ACasePrecedent
 from app.services.claude_service import ClaudeService
 from app.services.law_data_service import LawDataService
+from app.services.law_search_index import get_law_article_index
+from app.services.near_duplicate_index import get_near_duplicate_index
+from app.services.article_reranker import ArticleReranker
+from app.services.prompt_builder import PromptBuilder
+from app.services.relevance_scorer import RelevanceScorer, select_relevant
+from app.services.semantic_index import get_semantic_index
+from app.services.text_utils import description_fingerprint
+
+logger = logging.getLogger(__name__)
 
 class LegalConsultationService:
     """법률 상담 서비스 클래스"""
@@ -12,6 +24,9 @@ class LegalConsultationService:
     def __init__(self, use_mock_data: bool = False):
         self.claude_service = ClaudeService()
         self.law_data_service = LawDataService()
+        self.relevance_scorer = RelevanceScorer()
+        self.article_reranker = ArticleReranker(self.relevance_scorer)
+        self.prompt_builder = PromptBuilder()
         # mock 데이터 사용 여부
         self.use_mock_data = use_mock_data
     
@@ -24,30 +39,85 @@ class LegalConsultationService:
         4. 법령/판례 DB 저장
         5. 법률 상담 답변 생성 (Claude API)
         """
-        # 1. 키워드 추출
-        keywords, legal_category = await self._extract_keywords(description)
-        
-        # 2. 법령 검색 및 저장
-        laws, law_articles = await self._search_and_save_laws(db, case_id, keywords)
+        # 단계별 소요 시간 (Claude 호출, 국가법령정보 API, XML 파싱, DB 커밋 포함) - 분석 결과와 함께 저장
+        with collect_stages() as timings:
+            # 1. 키워드 추출 (이미 분석한 사례와 설명이 거의 같으면 그 결과 재사용)
+            with stage("keywords"):
+                near_duplicate = self._find_near_duplicate(db, case_id, description)
+                if near_duplicate:
+                    source_case_id, keywords, legal_category = near_duplicate
+                else:
+                    source_case_id = None
+                    keywords, legal_category = await self._extract_keywords(description)
+            
+            retrieval = None
+            if source_case_id and settings.NEAR_DUPLICATE_REUSE_RETRIEVAL:
+                with stage("reuse_retrieval"):
+                    retrieval = self._reuse_retrieval(db, case_id, source_case_id, keywords, description)
+            
+            if retrieval:
+                laws, law_articles, precedents = retrieval
+            else:
+                # 2. 법령 검색 및 저장
+                with stage("law_search"):
+                    laws, law_articles = await self._search_and_save_laws(db, case_id, keywords, description)
+                
+                # 3. 판례 검색 및 저장
+                with stage("precedent_search"):
+                    precedents = await self._search_and_save_precedents(db, case_id, keywords, description)
+            
+            # 4. 법률 상담 답변 생성 (새로운 상세 답변 함수 사용)
+            with stage("consultation"):
+                consultation_response = await self._generate_detailed_consultation(
+                    description, law_articles, precedents
+                )
+            
+            result = {
+                "consultation_response": consultation_response,
+                "keywords": keywords,
+                "legal_category": legal_category,
+                "laws": [{"law_name": law.law_name, "law_id": law.law_id} for law in laws],
+                "precedents": [{"case_number": p.case_number, "precedent_id": p.precedent_id} for p in precedents],
+                "reused_case_id": source_case_id,  # 분석 결과를 재사용한 사례 ID (없으면 None)
+                "timings": timings.summary()  # 저장 직전까지의 단계별 소요 시간
+            }
+            
+            # 클로드 분석 결과 저장 (설명 지문과 함께 저장해 설명이 바뀌지 않았으면 다시 분석하지 않음)
+            with stage("save_analysis"):
+                await self._save_claude_analysis(db, case_id, description, keywords, legal_category, consultation_response, result)
         
-        # 3. 판례 검색 및 저장
-        precedents = await self._search_and_save_precedents(db, case_id, keywords)
+        # 이후 비슷한 사례에서 재사용할 수 있도록 근사 중복 색인에 추가
+        index = get_near_duplicate_index()
+        if index is not None:
+            index.add(case_id, description)
         
-        # 4. 법률 상담 답변 생성 (새로운 상세 답변 함수 사용)
-        consultation_response = await self._generate_detailed_consultation(
-            description, law_articles, precedents
-        )
+        # 5. 결과 반환
+        return result
+    
+    def get_stored_consultation(self, case: ACase) -> Optional[Dict[str, Any]]:
+        """
+        사례에 저장된 상담 결과 (설명 지문이 현재 설명과 같을 때만 반환, 없거나 설명이 바뀌었으면 None)
+        """
+        if not case.claude_analysis:
+            return None
+        try:
+            analysis = json.loads(case.claude_analysis)
+        except json.JSONDecodeError:
+            return None
         
-        # 클로드 분석 결과 저장
-        await self._save_claude_analysis(db, case_id, description, keywords, legal_category, consultation_response)
+        if not isinstance(analysis, dict) or "consultation_response" not in analysis:
+            return None
+        if analysis.get("fingerprint") != description_fingerprint(case.description):
+            return None
         
-        # 5. 결과 반환
         return {
-            "consultation_response": consultation_response,
-            "keywords": keywords,
-            "legal_category": legal_category,
-            "laws": [{"law_name": law.law_name, "law_id": law.law_id} for law in laws],
-            "precedents": [{"case_number": p.case_number, "precedent_id": p.precedent_id} for p in precedents]
+            "consultation_response": analysis["consultation_response"],
+            "keywords": analysis.get("keywords", []),
+            "legal_category": analysis.get("legal_category", ""),
+            "laws": analysis.get("laws", []),
+            "precedents": analysis.get("precedents", []),
+            "reused_case_id": analysis.get("reused_case_id"),
+            "timings": analysis.get("timings")
         }
     
     async def _extract_keywords(self, description: str) -> Tuple[List[str], str]:
@@ -67,14 +137,80 @@ class LegalConsultationService:
         
         return keywords, legal_category
     
-    async def _search_and_save_laws(self, db: Session, case_id: int, keywords: List[str]) -> Tuple[List[Law], List[LawArticle]]:
+    def _find_near_duplicate(self, db: Session, case_id: int, description: str) -> Optional[Tuple[int, List[str], str]]:
+        """
+        근사 중복 색인에서 설명이 거의 같은 기존 사례를 찾아 (사례 ID, 키워드, 법률 분야) 반환
+        비슷한 사례가 없거나 저장된 분석 결과에 키워드가 없으면 None
+        """
+        index = get_near_duplicate_index() if settings.NEAR_DUPLICATE_REUSE else None
+        if index is None:
+            return None
+        
+        match = index.query(description, exclude=case_id)
+        if match is None:
+            return None
+        
+        source_case_id, similarity = match
+        source_case = db.query(ACase).filter(ACase.aCase_id == source_case_id).first()
+        try:
+            analysis = json.loads(source_case.claude_analysis) if source_case and source_case.claude_analysis else {}
+        except json.JSONDecodeError:
+            analysis = {}
+        
+        keywords = analysis.get("keywords") if isinstance(analysis, dict) else None
+        if not keywords:
+            return None
+        
+        logger.info("비슷한 사례 분석 결과 재사용: 사례 %s (유사도 %.2f)", source_case_id, similarity)
+        return source_case_id, keywords, analysis.get("legal_category", "")
+    
+    def _reuse_retrieval(self, db: Session, case_id: int, source_case_id: int, keywords: List[str],
+                         description: str) -> Optional[Tuple[List[Law], List[LawArticle], List[Precedent]]]:
+        """
+        기존 사례와 연결된 조문/판례를 새 사례에 연결 (외부 API 검색 생략)
+        관련성 점수와 조문 선택은 새 사례 설명으로 다시 계산, 연결된 조문이 없으면 None
+        """
+        article_ids = [
+            article_id for (article_id,) in db.query(ACaseLaw.article_id)
+            .filter(ACaseLaw.aCase_id == source_case_id, ACaseLaw.article_id.isnot(None))
+            .order_by(ACaseLaw.relevance_score.desc()).all()
+        ]
+        if not article_ids:
+            return None
+        
+        article_order = {article_id: position for position, article_id in enumerate(article_ids)}
+        articles = sorted(
+            db.query(LawArticle).filter(LawArticle.article_id.in_(article_ids)).all(),
+            key=lambda article: article_order[article.article_id]
+        )
+        law_order = {law_id: position for position, law_id in enumerate(dict.fromkeys(a.law_id for a in articles))}
+        laws = sorted(
+            db.query(Law).filter(Law.law_id.in_(list(law_order))).all(),
+            key=lambda law: law_order[law.law_id]
+        )
+        
+        rerank_result = self.article_reranker.rerank(description, keywords, articles)
+        self._save_case_law_relations(db, case_id, list(zip(rerank_result.ranked, rerank_result.scores)))
+        
+        precedent_ids = [
+            precedent_id for (precedent_id,) in db.query(ACasePrecedent.precedent_id)
+            .filter(ACasePrecedent.aCase_id == source_case_id).all()
+        ]
+        precedents = db.query(Precedent).filter(Precedent.precedent_id.in_(precedent_ids)).all() if precedent_ids else []
+        precedents = self._link_relevant_precedents(db, case_id, keywords, description, precedents)
+        
+        logger.info("비슷한 사례의 검색 결과 재사용: 조문 %s개, 판례 %s개", len(rerank_result.selected), len(precedents))
+        return laws, rerank_result.selected, precedents
+    
+    async def _search_and_save_laws(self, db: Session, case_id: int, keywords: List[str], description: Optional[str] = None) -> Tuple[List[Law], List[LawArticle]]:
         """
         키워드로 법령 검색 및 DB 저장
-        상위 3개 법령의 조문도 검색하여 저장
+        상위 3개 법령의 조문도 검색하여 저장 (description이 있으면 의미 검색 점수로 법령 순서 조정)
+        조문은 재정렬 단계(ArticleReranker)에서 선택된 답변 생성용 조문만 관련성 점수 순으로 반환
         """
         # 사용자 지정 예시 데이터 사용 여부 확인
         if self.use_mock_data:
-            print("예시 데이터 사용 모드: 법령 예시 데이터 사용")
+            logger.debug("예시 데이터 사용 모드: 법령 예시 데이터 사용")
             law_list = self.law_data_service._get_mock_laws()
         else:
             # 키워드로 법령 목록 검색
@@ -84,6 +220,9 @@ class LegalConsultationService:
         if not law_list:
             return [], []
         
+        if description:
+            law_list = self._rank_laws(db, description, law_list)
+        
         saved_laws = []
         all_law_articles = []
         
@@ -97,20 +236,47 @@ class LegalConsultationService:
             if law and 'lawId' in law_info:
                 # 예시 데이터 사용 여부 확인
                 if self.use_mock_data:
-                    print(f"예시 데이터 사용 모드: {law.law_name} 조문 예시 데이터 사용")
+                    logger.debug("예시 데이터 사용 모드: %s 조문 예시 데이터 사용", law.law_name)
                     articles = self.law_data_service._get_mock_law_articles()
                 else:
-                    articles = await self.law_data_service.search_law_articles(law_info['lawId'])
+                    # 로컬 동기화된 조문이 있으면 API 호출 없이 사용
+                    local_articles = db.query(LawArticle).filter(LawArticle.law_id == law.law_id).all()
+                    if local_articles:
+                        articles = None
+                    else:
+                        articles = await self.law_data_service.search_law_articles(law_info['lawId'])
                 
                 # 조문 DB에 저장
-                law_articles = self._save_law_articles(db, law.law_id, articles)
+                if articles is None:
+                    law_articles = local_articles
+                else:
+                    law_articles = self._save_law_articles(db, law.law_id, articles)
                 all_law_articles.extend(law_articles)
-                
-                # 사례-법령 연결 저장
-                for article in law_articles:
-                    self._save_case_law_relation(db, case_id, law.law_id, article.article_id)
         
-        return saved_laws, all_law_articles
+        # 조문 재정렬: 관련성 점수 기준 이상인 조문만 사례와 연결하고, 토큰 예산 안의 상위 조문을 답변 생성에 사용
+        rerank_result = self.article_reranker.rerank(description or "", keywords, all_law_articles)
+        logger.info("조문 재정렬: %s", rerank_result.stats)
+        self._save_case_law_relations(db, case_id, list(zip(rerank_result.ranked, rerank_result.scores)))
+        
+        return saved_laws, rerank_result.selected
+    
+    def _rank_laws(self, db: Session, description: str, law_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        법령 검색 결과를 사용자 문제와 의미가 가장 가까운 조문의 유사도 순으로 정렬
+        로컬에 조문이 없는 법령은 유사도 0으로 보고 기존 순서 유지
+        """
+        index = get_semantic_index("law_articles") if settings.SEMANTIC_SEARCH else None
+        if index is None:
+            return law_list
+        
+        law_scores = index.group_scores(description)
+        if not law_scores:
+            return law_list
+        
+        law_codes = [law_info.get('lawId', '') for law_info in law_list]
+        law_ids = dict(db.query(Law.law_code, Law.law_id).filter(Law.law_code.in_(law_codes)).all())
+        
+        return sorted(law_list, key=lambda law_info: -law_scores.get(law_ids.get(law_info.get('lawId', '')), 0.0))
     
     def _save_law(self, db: Session, law_info: Dict[str, Any]) -> Optional[Law]:
         """
@@ -153,6 +319,7 @@ class LegalConsultationService:
         법령 조문을 DB에 저장 (중복 조문은 제외)
         """
         saved_articles = []
+        new_articles = []
         
         for article_info in articles:
             # 조문번호 확인
@@ -183,41 +350,60 @@ class LegalConsultationService:
             db.refresh(new_article)
             
             saved_articles.append(new_article)
+            new_articles.append(new_article)
+        
+        # 로컬 검색 색인에 새 조문 반영
+        if new_articles:
+            get_law_article_index().add_articles(new_articles)
         
         return saved_articles
     
-    def _save_case_law_relation(self, db: Session, case_id: int, law_id: int, article_id: Optional[int] = None) -> None:
+    def _save_case_law_relations(self, db: Session, case_id: int, scored_articles: List[Tuple[LawArticle, int]]) -> None:
         """
-        사례와 법령/조문 간의 연결 저장 (중복 시 무시)
+        사례와 법령 조문 간의 연결을 관련성 점수와 함께 저장 (이미 있으면 점수만 갱신)
         """
-        # 이미 존재하는 연결인지 확인
-        existing_relation = db.query(ACaseLaw).filter(
-            ACaseLaw.aCase_id == case_id,
-            ACaseLaw.law_id == law_id,
-            ACaseLaw.article_id == article_id
-        ).first()
-        
-        if existing_relation:
+        if not scored_articles:
             return
         
-        # 새 연결 추가
-        new_relation = ACaseLaw(
-            aCase_id=case_id,
-            law_id=law_id,
-            article_id=article_id,
-            relevance_score=80  # 기본 관련성 점수
-        )
+        article_ids = [article.article_id for article, _ in scored_articles]
+        existing_relations = {
+            relation.article_id: relation
+            for relation in db.query(ACaseLaw).filter(
+                ACaseLaw.aCase_id == case_id,
+                ACaseLaw.article_id.in_(article_ids)
+            ).all()
+        }
+        
+        for article, relevance_score in scored_articles:
+            relation = existing_relations.get(article.article_id)
+            if relation:
+                relation.relevance_score = relevance_score
+                continue
+            
+            db.add(ACaseLaw(
+                aCase_id=case_id,
+                law_id=article.law_id,
+                article_id=article.article_id,
+                relevance_score=relevance_score
+            ))
         
-        db.add(new_relation)
         db.commit()
     
-    async def _search_and_save_precedents(self, db: Session, case_id: int, keywords: List[str]) -> List[Precedent]:
+    async def _search_and_save_precedents(self, db: Session, case_id: int, keywords: List[str], description: Optional[str] = None) -> List[Precedent]:
         """
         키워드로 판례 검색 및 DB 저장
+        로컬 판례 DB에 결과가 있으면 판례 API를 호출하지 않고 점수 상위 판례 사용
+        판례는 관련성 점수 내림차순으로 반환하며 기준 점수(RELEVANCE_MIN_SCORE) 미만은 제외
         """
+        # 로컬 판례 검색
+        if settings.PRECEDENT_LOCAL_SEARCH and keywords and not self.use_mock_data:
+            local_precedents = self._search_local_precedents(db, keywords, limit=3)
+            if local_precedents:
+                return self._link_relevant_precedents(db, case_id, keywords, description, local_precedents)
+        
         # 사용자 지정 예시 데이터 사용 여부 확인
         if self.use_mock_data:
-            print("예시 데이터 사용 모드: 판례 예시 데이터 사용")
+            logger.debug("예시 데이터 사용 모드: 판례 예시 데이터 사용")
             precedent_list = self.law_data_service._get_mock_precedents()
         else:
             # 키워드로 판례 목록 검색
@@ -234,11 +420,37 @@ class LegalConsultationService:
             # 판례 DB에 저장 (이미 있으면 기존 것 사용)
             precedent = self._save_precedent(db, precedent_info)
             saved_precedents.append(precedent)
-            
-            # 사례-판례 연결 저장
-            self._save_case_precedent_relation(db, case_id, precedent.precedent_id)
         
-        return saved_precedents
+        return self._link_relevant_precedents(db, case_id, keywords, description, saved_precedents)
+    
+    def _link_relevant_precedents(self, db: Session, case_id: int, keywords: List[str], description: Optional[str],
+                                  precedents: List[Precedent]) -> List[Precedent]:
+        """
+        판례 관련성 점수 계산 후 기준 점수 이상인 판례만 사례와 연결 (점수 내림차순으로 반환)
+        """
+        scores = self.relevance_scorer.score(
+            description or "", keywords,
+            [f"{p.case_name or ''} {p.holding or ''} {p.summary or ''}" for p in precedents],
+            corpus="precedents",
+            doc_ids=[p.precedent_id for p in precedents]
+        )
+        selected = select_relevant(scores)
+        self._save_case_precedent_relations(db, case_id, [(precedents[i], int(round(scores[i]))) for i in selected])
+        return [precedents[i] for i in selected]
+    
+    def _search_local_precedents(self, db: Session, keywords: List[str], limit: int = 3) -> List[Precedent]:
+        """
+        로컬 판례 검색으로 점수 상위 판례 조회 (점수 순서 유지)
+        """
+        ranked = self.law_data_service.search_local_precedents(db, keywords, page=1, display=limit)["results"]
+        if not ranked:
+            return []
+        
+        precedent_ids = [precedent_id for precedent_id, _ in ranked]
+        rows = db.query(Precedent).filter(Precedent.precedent_id.in_(precedent_ids)).all()
+        rows_by_id = {row.precedent_id: row for row in rows}
+        
+        return [rows_by_id[precedent_id] for precedent_id in precedent_ids if precedent_id in rows_by_id]
     
     def _save_precedent(self, db: Session, precedent_info: Dict[str, Any]) -> Precedent:
         """
@@ -263,10 +475,12 @@ class LegalConsultationService:
         
         # 새 판례 추가
         new_precedent = Precedent(
+            precedent_serial=precedent_info.get('precedentId', ''),
             case_number=case_number,
             case_name=precedent_info.get('caseName', ''),
             court=precedent_info.get('court', ''),
             decision_date=precedent_info.get('decisionDate', ''),
+            holding=precedent_info.get('holding', ''),
             summary=precedent_info.get('summary', ''),
             judgment_text=precedent_info.get('judgmentText', ''),
             link=link
@@ -278,48 +492,66 @@ class LegalConsultationService:
         
         return new_precedent
     
-    def _save_case_precedent_relation(self, db: Session, case_id: int, precedent_id: int) -> None:
+    def _save_case_precedent_relations(self, db: Session, case_id: int, scored_precedents: List[Tuple[Precedent, int]]) -> None:
         """
-        사례와 판례 간의 연결 저장 (중복 시 무시)
+        사례와 판례 간의 연결을 관련성 점수와 함께 저장 (이미 있으면 점수만 갱신)
         """
-        # 이미 존재하는 연결인지 확인
-        existing_relation = db.query(ACasePrecedent).filter(
-            ACasePrecedent.aCase_id == case_id,
-            ACasePrecedent.precedent_id == precedent_id
-        ).first()
-        
-        if existing_relation:
+        if not scored_precedents:
             return
         
-        # 새 연결 추가
-        new_relation = ACasePrecedent(
-            aCase_id=case_id,
-            precedent_id=precedent_id,
-            relevance_score=80  # 기본 관련성 점수
-        )
+        precedent_ids = [precedent.precedent_id for precedent, _ in scored_precedents]
+        existing_relations = {
+            relation.precedent_id: relation
+            for relation in db.query(ACasePrecedent).filter(
+                ACasePrecedent.aCase_id == case_id,
+                ACasePrecedent.precedent_id.in_(precedent_ids)
+            ).all()
+        }
+        
+        for precedent, relevance_score in scored_precedents:
+            relation = existing_relations.get(precedent.precedent_id)
+            if relation:
+                relation.relevance_score = relevance_score
+                continue
+            
+            db.add(ACasePrecedent(
+                aCase_id=case_id,
+                precedent_id=precedent.precedent_id,
+                relevance_score=relevance_score
+            ))
         
-        db.add(new_relation)
         db.commit()
     
     async def _save_claude_analysis(self, db: Session, case_id: int, description: str, keywords: List[str], 
-                                   legal_category: str, consultation_response: str) -> None:
+                                   legal_category: str, consultation_response: str,
+                                   result: Optional[Dict[str, Any]] = None) -> None:
         """
         Claude API의 분석 결과를 사례 DB에 저장
+        result가 있으면 연결된 법령/판례 목록도 함께 저장 (저장된 결과를 그대로 반환할 때 사용)
         """
         try:
             # 해당 사례 조회
             case = db.query(ACase).filter(ACase.aCase_id == case_id).first()
             if case:
                 # Claude 분석 결과 저장
-                case.claude_analysis = json.dumps({
+                analysis = {
                     "keywords": keywords,
                     "legal_category": legal_category,
-                    "consultation_response": consultation_response
-                }, ensure_ascii=False)
+                    "consultation_response": consultation_response,
+                    "fingerprint": description_fingerprint(description)
+                }
+                if result:
+                    analysis.update({
+                        "laws": result["laws"],
+                        "precedents": result["precedents"],
+                        "reused_case_id": result["reused_case_id"],
+                        "timings": result.get("timings")
+                    })
+                case.claude_analysis = json.dumps(analysis, ensure_ascii=False)
                 
                 db.commit()
         except Exception as e:
-            print(f"Claude 분석 결과 저장 중 오류 발생: {e}")
+            logger.warning("Claude 분석 결과 저장 중 오류 발생: %s", e)
     
     async def _generate_consultation_response(
         self, 
@@ -332,77 +564,38 @@ class LegalConsultationService:
         """
         Claude API를 사용하여 법률 상담 답변 생성 (기본 버전)
         """
-        # 법령 및 판례 정보 정리
-        laws_text = ""
-        for i, article in enumerate(law_articles[:3], 1):  # 최대 3개 조문만 사용
-            laws_text += f"[법령 {i}]\n"
-            laws_text += f"법령명: {getattr(article, 'law_name', '')}\n"
-            laws_text += f"조문번호: {article.article_number}\n"
-            laws_text += f"조문제목: {article.article_title}\n"
-            laws_text += f"조문내용: {article.content}\n\n"
-        
-        precedents_text = ""
-        for i, precedent in enumerate(precedents[:3], 1):  # 최대 3개 판례만 사용
-            precedents_text += f"[판례 {i}]\n"
-            precedents_text += f"사건번호: {precedent.case_number}\n"
-            precedents_text += f"법원: {precedent.court}\n"
-            precedents_text += f"판결일자: {precedent.decision_date}\n"
-            precedents_text += f"판결요지: {precedent.summary}\n\n"
-        
-        # 법령 정보가 없는 경우
-        if not laws_text:
-            laws_text = "관련 법령 정보가 없습니다."
-        
-        # 판례 정보가 없는 경우
-        if not precedents_text:
-            precedents_text = "관련 판례 정보가 없습니다."
-        
-        # 법률 상담 답변 생성을 위한 Claude API 호출
-        consultation_prompt = f"""
-        당신은 법률 전문가입니다. 다음 사용자의 법률 문제에 대해 관련 법령과 판례를 참고하여 답변해주세요.
-        
-        ## 사용자 문제:
-        {description}
-        
-        ## 관련 법률 분야:
-        {legal_category}
-        
-        ## 관련 키워드:
-        {", ".join(keywords)}
-        
-        ## 관련 법령:
-        {laws_text}
-        
-        ## 관련 판례:
-        {precedents_text}
-        
-        다음 형식으로 법률 상담 답변을 작성해주세요:
-        1. 문제 요약: 사용자의 법률 문제를 간단히 요약
-        2. 적용 법령 및 판례: 어떤 법령과 판례가 적용되는지 설명
-        3. 법률적 견해: 문제에 대한 법률적 견해 제시
-        4. 권리와 의무: 사용자의 법적 권리와 의무 설명
-        5. 대응 방안: 사용자가 취할 수 있는 법적 대응 방안 제안
-        
-        일반인도 이해할 수 있는 쉬운 언어로 설명해주세요.
-        """
+        # 법령 및 판례 정보는 토큰 예산 안으로 줄여서 포함 (관련성 높은 순으로 예산이 남는 만큼)
+        laws = [{
+            "lawName": getattr(article, 'law_name', ''),
+            "article": article.article_number,
+            "articleTitle": article.article_title,
+            "content": article.content
+        } for article in law_articles]
+        cases = [{
+            "caseNo": precedent.case_number,
+            "court": precedent.court,
+            "decisionDate": precedent.decision_date,
+            "summary": precedent.summary
+        } for precedent in precedents]
+        prompt = self.prompt_builder.basic_consultation(description, keywords, legal_category, laws, cases)
         
         # Claude API 호출
-        response = await self.claude_service._call_claude_api(consultation_prompt)
+        response = await self.claude_service._call_claude_api(prompt.text, prompt.call_type, prompt.max_tokens, prompt.system)
         
         return response
     
-    async def _generate_detailed_consultation(
-        self, 
-        user_description: str, 
+    @staticmethod
+    def format_consultation_context(
         law_articles: List[LawArticle], 
         precedents: List[Precedent]
-    ) -> str:
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """
-        Claude API를 사용하여 구체적인 행동 계획이 포함된 상세 법률 상담 답변 생성
+        상담 답변 프롬프트에 넣을 법령/판례 정보 변환 (링크 포함, 없으면 기본 예시 데이터)
+        일괄 재분석(BatchReanalysisService)에서도 같은 형식으로 프롬프트를 만들 때 사용
         """
         # API 요청을 위한 법령 및 판례 정보 변환
         formatted_laws = []
-        for article in law_articles[:3]:  # 최대 3개 조문만 사용
+        for article in law_articles:  # 재정렬 단계에서 토큰 예산 안으로 선택된 조문
             # 법령 링크 정보 획득
             law_link = ""
             if hasattr(article, 'law') and article.law and article.law.link:
@@ -455,6 +648,19 @@ class LegalConsultationService:
                 }
             ]
         
+        return formatted_laws, formatted_precedents
+    
+    async def _generate_detailed_consultation(
+        self, 
+        user_description: str, 
+        law_articles: List[LawArticle], 
+        precedents: List[Precedent]
+    ) -> str:
+        """
+        Claude API를 사용하여 구체적인 행동 계획이 포함된 상세 법률 상담 답변 생성
+        """
+        formatted_laws, formatted_precedents = self.format_consultation_context(law_articles, precedents)
+        
         # 상세 법률 상담 생성
         response = await self.claude_service.generate_legal_consultation(
             user_description, formatted_laws, formatted_precedents
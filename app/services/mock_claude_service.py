@@ -1,6 +1,6 @@
 from typing import Dict, Any, List, Optional
-import json
-import re
+
+from app.services.text_utils import extract_json_object
 
 class MockClaudeService:
     """
@@ -12,36 +12,15 @@ class MockClaudeService:
     
     def extract_json_from_text(self, text: str) -> Dict[str, Any]:
         """
-        텍스트에서 JSON 내용을 추출하는 함수
-        여러 방법으로 추출을 시도하며, 가능한 형식:
-        1. 일반 JSON 객체
-        2. 마크다운 코드 블록 내 JSON (```json ... ```)
-        3. 중괄호({})로 둘러싸인 내용
+        텍스트에서 JSON 객체를 추출하는 함수
+        응답 전체가 JSON인 경우, 마크다운 코드 블록(```json ... ```)이나 설명문 사이에 있는 경우 모두
+        한 번의 탐색으로 처리 (중첩 객체/배열, 문자열 안의 중괄호 포함, text_utils.extract_json_object)
+        JSON 객체를 찾지 못하면 원본 텍스트를 raw_response로 반환
         """
-        # 방법 1: 전체 텍스트가 JSON인 경우
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            pass
-        
-        # 방법 2: 마크다운 코드 블록에서 JSON 추출
-        json_code_block = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', text)
-        if json_code_block:
-            try:
-                return json.loads(json_code_block.group(1))
-            except json.JSONDecodeError:
-                pass
-        
-        # 방법 3: 텍스트에서 중괄호로 둘러싸인 부분 찾기
-        json_braces = re.search(r'({[\s\S]*?})', text)
-        if json_braces:
-            try:
-                return json.loads(json_braces.group(1))
-            except json.JSONDecodeError:
-                pass
-        
-        # 모든 방법이 실패하면 원본 텍스트를 반환
-        return {"raw_response": text}
+        analysis = extract_json_object(text)
+        if analysis is None:
+            return {"raw_response": text}
+        return analysis
     
     async def analyze_legal_issue(self, description: str) -> Dict[str, Any]:
         """사용자의 법률 문제를 분석하여 관련 법률 분야와 키워드 추출 (모의 응답)"""
@@ -368,8 +347,9 @@ class MockClaudeService:
 [변호사 상담이 필요한 시점과 이유 안내]
             """
     
-    async def _call_claude_api(self, prompt: str) -> str:
-        """Mock Claude API 호출 함수"""
+    async def _call_claude_api(self, prompt: str, call_type: str = "default", max_tokens: Optional[int] = None,
+                               system: Optional[str] = None) -> str:
+        """Mock Claude API 호출 함수 (call_type, max_tokens, system은 ClaudeService와 호출 형식을 맞추기 위한 인자)"""
         
         # 임대차 관련 응답
         if "임대차" in prompt or "전세" in prompt or "월세" in prompt or "세입자" in prompt:
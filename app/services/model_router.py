@@ -0,0 +1,107 @@
+from typing import Any, Deque, Dict, Optional, Tuple
+from collections import deque
+import logging
+import threading
+import time
+
+from app.core.config import settings
+from app.core.metrics import observe
+
+logger = logging.getLogger(__name__)
+
+
+def route_for(call_type: str) -> Dict[str, Any]:
+    """호출 종류별 라우팅 설정 (CLAUDE_MODEL_ROUTES에 없으면 default)"""
+    routes = settings.CLAUDE_MODEL_ROUTES
+    return routes.get(call_type) or routes["default"]
+
+
+class ModelRouter:
+    """
+    호출 종류별 Claude 모델 선택
+    - 기본은 CLAUDE_MODEL_ROUTES의 model 사용
+    - 기본 모델의 최근 응답 p95 지연 시간이 slo_p95_seconds를 넘으면 fallback_model로 전환하고,
+      CLAUDE_ROUTE_FALLBACK_SECONDS가 지나면 최근 기록을 비우고 기본 모델을 다시 사용
+    - 시간 초과/과부하(429/529)/서버 오류로 실패한 호출은 SLO를 지키지 못한 호출로 보고
+      최근 기록에 CLAUDE_TIMEOUT_SECONDS 이상으로 넣음 (기본 모델이 과부하일 때 전환되도록)
+    - 호출 종류/모델별 실제 지연 시간은 lawmate_claude_route_seconds 히스토그램에 기록
+    """
+
+    def __init__(
+        self,
+        window: Optional[int] = None,
+        min_samples: Optional[int] = None,
+        fallback_seconds: Optional[float] = None
+    ):
+        self.window = window or settings.CLAUDE_ROUTE_LATENCY_WINDOW
+        self.min_samples = min_samples or settings.CLAUDE_ROUTE_MIN_SAMPLES
+        self.fallback_seconds = fallback_seconds if fallback_seconds is not None else settings.CLAUDE_ROUTE_FALLBACK_SECONDS
+        self._latencies: Dict[str, Deque[float]] = {}  # 호출 종류별 기본 모델의 최근 지연 시간
+        self._fallback_until: Dict[str, float] = {}  # 호출 종류별 대체 모델 사용 종료 시각 (time.monotonic 기준)
+        self._lock = threading.Lock()
+
+    def select(self, call_type: str) -> Tuple[str, int]:
+        """이번 호출에 사용할 (모델, max_tokens)"""
+        route = route_for(call_type)
+        fallback_model = route.get("fallback_model")
+        if fallback_model:
+            with self._lock:
+                until = self._fallback_until.get(call_type)
+                if until is not None:
+                    if time.monotonic() < until:
+                        return fallback_model, route["max_tokens"]
+                    # 전환 기간이 끝나면 기본 모델을 새 기록으로 다시 평가
+                    del self._fallback_until[call_type]
+                    self._latencies.pop(call_type, None)
+        return route["model"], route["max_tokens"]
+
+    def record(self, call_type: str, model: str, latency: float, failed: bool = False) -> None:
+        """
+        응답 지연 시간 기록 (기본 모델의 p95가 SLO를 넘으면 대체 모델로 전환)
+        failed: 시간 초과/과부하/서버 오류로 응답을 받지 못한 호출 (타임아웃 시간 이상으로 평가)
+        """
+        observe("lawmate_claude_route_seconds", latency, {"call_type": call_type, "model": model}, "Claude 라우트별 응답 시간")
+
+        route = route_for(call_type)
+        if model != route["model"]:
+            return
+        if failed:
+            latency = max(latency, settings.CLAUDE_TIMEOUT_SECONDS)
+
+        with self._lock:
+            latencies = self._latencies.setdefault(call_type, deque(maxlen=self.window))
+            latencies.append(latency)
+            p95 = self._p95(latencies)
+            slo = route.get("slo_p95_seconds")
+            if route.get("fallback_model") and slo and p95 is not None and p95 > slo:
+                self._fallback_until[call_type] = time.monotonic() + self.fallback_seconds
+                latencies.clear()
+                logger.warning(
+                    "Claude 라우트 [%s] p95 %.1f초 > SLO %.1f초 - %.0f초 동안 %s 사용",
+                    call_type, p95, slo, self.fallback_seconds, route["fallback_model"]
+                )
+
+    def p95(self, call_type: str) -> Optional[float]:
+        """기본 모델의 최근 p95 지연 시간 (기록이 min_samples보다 적으면 None)"""
+        with self._lock:
+            return self._p95(self._latencies.get(call_type, ()))
+
+    def _p95(self, latencies) -> Optional[float]:
+        if len(latencies) < self.min_samples:
+            return None
+        ordered = sorted(latencies)
+        return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+
+_model_router: Optional[ModelRouter] = None
+
+def get_model_router() -> ModelRouter:
+    """프로세스 전체에서 공유하는 모델 라우터 (최근 지연 시간 기록 공유)"""
+    global _model_router
+    if _model_router is None:
+        _model_router = ModelRouter()
+    return _model_router
+
+def set_model_router(router: Optional[ModelRouter]) -> None:
+    global _model_router
+    _model_router = router
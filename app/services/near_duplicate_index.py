@@ -0,0 +1,163 @@
+from typing import Callable, Dict, List, Optional, Tuple
+from collections import defaultdict
+import logging
+import threading
+import time
+import zlib
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import ACase
+from app.services.text_utils import normalize_description
+
+logger = logging.getLogger(__name__)
+
+# MinHash 해시 함수 계산용 소수 (2^31 - 1, a*x + b가 uint64 범위를 넘지 않음)
+_PRIME = np.uint64((1 << 31) - 1)
+
+
+def shingles(text: str, size: int) -> List[str]:
+    """
+    정규화한 설명의 글자 단위 shingle (공백 제거 후 size 글자씩 겹쳐 자름)
+    띄어쓰기 차이와 조사 변화에 덜 민감하도록 어절이 아닌 글자 단위 사용
+    """
+    compact = normalize_description(text).replace(" ", "")
+    if len(compact) <= size:
+        return [compact] if compact else []
+    return [compact[i:i + size] for i in range(len(compact) - size + 1)]
+
+
+class NearDuplicateIndex:
+    """
+    사례 설명 근사 중복 색인 (MinHash + LSH)
+    - 설명을 글자 shingle 집합으로 보고 num_perm개 해시의 최솟값(MinHash 서명)으로 Jaccard 유사도 추정
+    - 서명을 bands개 구간으로 나눠 한 구간이라도 같으면 후보로 보고(LSH), 후보만 서명 일치율로 유사도 계산
+    - 기준 유사도(threshold) 이상인 가장 비슷한 사례를 반환
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        num_perm: Optional[int] = None,
+        bands: Optional[int] = None,
+        shingle_size: Optional[int] = None,
+        seed: int = 1
+    ):
+        self.threshold = threshold if threshold is not None else settings.NEAR_DUPLICATE_THRESHOLD
+        self.num_perm = num_perm or settings.NEAR_DUPLICATE_NUM_PERM
+        self.bands = bands or settings.NEAR_DUPLICATE_BANDS
+        self.shingle_size = shingle_size or settings.NEAR_DUPLICATE_SHINGLE_SIZE
+        if self.num_perm % self.bands:
+            raise ValueError(f"num_perm({self.num_perm})은 bands({self.bands})로 나누어떨어져야 합니다.")
+        self.rows = self.num_perm // self.bands
+
+        random = np.random.RandomState(seed)
+        self._a = random.randint(1, int(_PRIME), size=self.num_perm).astype(np.uint64)
+        self._b = random.randint(0, int(_PRIME), size=self.num_perm).astype(np.uint64)
+
+        self._signatures: Dict[int, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, set]] = [defaultdict(set) for _ in range(self.bands)]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash 서명 (shingle이 없으면 None)"""
+        items = shingles(text, self.shingle_size)
+        if not items:
+            return None
+        hashes = np.fromiter(
+            (zlib.crc32(item.encode("utf-8")) for item in set(items)), dtype=np.uint64
+        ) % _PRIME
+        # (num_perm, shingle 수) 행렬에서 해시 함수별 최솟값
+        return ((self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+    def add(self, case_id: int, description: str) -> None:
+        """사례 설명 추가 (같은 사례가 이미 있으면 교체)"""
+        signature = self.signature(description)
+        with self._lock:
+            self._remove(case_id)
+            if signature is None:
+                return
+            self._signatures[case_id] = signature
+            for band, key in enumerate(self._band_keys(signature)):
+                self._buckets[band][key].add(case_id)
+
+    def remove(self, case_id: int) -> None:
+        with self._lock:
+            self._remove(case_id)
+
+    def query(self, description: str, exclude: Optional[int] = None) -> Optional[Tuple[int, float]]:
+        """기준 유사도 이상인 가장 비슷한 사례 (사례 ID, 추정 유사도), 없으면 None"""
+        matches = self.candidates(description, exclude)
+        if not matches or matches[0][1] < self.threshold:
+            return None
+        return matches[0]
+
+    def candidates(self, description: str, exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        """LSH 후보 사례와 추정 유사도 (유사도 내림차순, 기준 유사도 적용 전)"""
+        signature = self.signature(description)
+        if signature is None:
+            return []
+
+        with self._lock:
+            candidate_ids = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                candidate_ids.update(self._buckets[band].get(key, ()))
+            candidate_ids.discard(exclude)
+            if not candidate_ids:
+                return []
+            ids = list(candidate_ids)
+            stored = np.stack([self._signatures[case_id] for case_id in ids])
+
+        similarities = (stored == signature).mean(axis=1)
+        order = np.argsort(-similarities, kind="stable")
+        return [(ids[i], float(similarities[i])) for i in order]
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def _remove(self, case_id: int) -> None:
+        signature = self._signatures.pop(case_id, None)
+        if signature is None:
+            return
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(case_id)
+                if not bucket:
+                    del self._buckets[band][key]
+
+
+_near_duplicate_index: Optional[NearDuplicateIndex] = None
+
+def get_near_duplicate_index() -> Optional[NearDuplicateIndex]:
+    """현재 사용 중인 사례 근사 중복 색인 (아직 생성되지 않았으면 None)"""
+    return _near_duplicate_index
+
+def set_near_duplicate_index(index: Optional[NearDuplicateIndex]) -> None:
+    global _near_duplicate_index
+    _near_duplicate_index = index
+
+def rebuild_near_duplicate_index(session_factory: Optional[Callable[[], Session]] = None) -> NearDuplicateIndex:
+    """분석 결과가 저장된 사례 설명으로 근사 중복 색인 생성 (서버 시작 시 별도 스레드에서 실행)"""
+    if session_factory is None:
+        from app.db.database import SessionLocal
+        session_factory = SessionLocal
+
+    started = time.monotonic()
+    index = NearDuplicateIndex()
+    db = session_factory()
+    try:
+        rows = db.query(ACase.aCase_id, ACase.description).filter(ACase.claude_analysis.isnot(None)).yield_per(1000)
+        for case_id, description in rows:
+            index.add(case_id, description)
+    finally:
+        db.close()
+
+    set_near_duplicate_index(index)
+    logger.info("사례 근사 중복 색인 생성 완료: %d건 (%.1f초)", len(index), time.monotonic() - started)
+    return index
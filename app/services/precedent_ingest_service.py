@@ -0,0 +1,387 @@
+from typing import List, Dict, Any, Optional, Callable
+import argparse
+import asyncio
+import logging
+import re
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import insert, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.checkpoint import JsonCheckpoint
+from app.db.database import SessionLocal
+from app.db.models import Precedent
+from app.services.law_data_service import LawDataService
+from app.services.precedent_ranker import rebuild_precedent_ranker
+from app.services.semantic_index import rebuild_semantic_index
+
+logger = logging.getLogger(__name__)
+
+def compact_date(value: Optional[str]) -> str:
+    """
+    선고일자를 비교 가능한 YYYYMMDD로 변환 (숫자가 아닌 문자 제거)
+    실제 판례 목록 API는 'YYYY.MM.DD' 형식으로 응답하므로 그대로 비교하면 워터마크 비교가 맞지 않음
+    8자리 날짜가 아니면 빈 문자열
+    """
+    digits = re.sub(r"\D", "", value or "")
+    return digits if len(digits) == 8 else ""
+
+
+class PrecedentIngestService:
+    """
+    판례 코퍼스 증분 수집 서비스
+    국가법령정보센터 판례 목록을 선고일자 내림차순으로 페이지 단위 조회하여 Precedent 테이블에 저장
+
+    - 워터마크: 지금까지 수집한 가장 큰 판례일련번호와 가장 최근 선고일자(YYYYMMDD)를 체크포인트 파일에 기록
+    - 증분 수집: 워터마크의 선고일자보다 PRECEDENT_INGEST_LOOKBACK_DAYS 이전 판례가 나오면 조회 중단
+      (늦게 등록되는 판례를 놓치지 않기 위해 일정 기간을 겹쳐서 다시 확인)
+    - 병렬 조회: PRECEDENT_INGEST_CONCURRENCY 개 페이지를 동시에 조회
+    - 중복 제거: 사건번호(case_number) 기준으로 이미 저장된 판례는 제외하고 일괄 저장
+    - 본문 조회: 판례 목록 API에는 판시사항/판결요지가 없으므로 새 판례마다 판례 본문 API로 채워서 저장
+      (PRECEDENT_INGEST_FETCH_DETAILS, 조회에 실패한 판례는 다음 실행에서 PRECEDENT_INGEST_BACKFILL_LIMIT건씩 다시 조회)
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        law_data_service: Optional[LawDataService] = None,
+        concurrency: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+        page_size: int = 100,
+        lookback_days: Optional[int] = None,
+        fetch_details: Optional[bool] = None,
+        backfill_limit: Optional[int] = None
+    ):
+        self.session_factory = session_factory
+        self.law_data_service = law_data_service or LawDataService()
+        self.concurrency = concurrency or settings.PRECEDENT_INGEST_CONCURRENCY
+        self.checkpoint = JsonCheckpoint(checkpoint_path or settings.PRECEDENT_INGEST_CHECKPOINT_PATH)
+        self.page_size = page_size
+        self.lookback_days = settings.PRECEDENT_INGEST_LOOKBACK_DAYS if lookback_days is None else lookback_days
+        self.fetch_details = settings.PRECEDENT_INGEST_FETCH_DETAILS if fetch_details is None else fetch_details
+        self.backfill_limit = settings.PRECEDENT_INGEST_BACKFILL_LIMIT if backfill_limit is None else backfill_limit
+        # 한 번에 IN 조건으로 조회할 사건번호 수
+        self.lookup_chunk_size = 500
+
+    async def ingest(self, max_pages: Optional[int] = None) -> Dict[str, Any]:
+        """
+        판례 증분 수집 1회 실행
+
+        Parameters:
+        - max_pages: 이번 실행에서 조회할 최대 페이지 수 (None이면 제한 없음)
+
+        Returns:
+        - 수집 결과 통계 (조회 페이지 수, 조회 판례 수, 새로 저장된 판례 수, 본문을 채운 판례 수, 완료 여부, 워터마크)
+        """
+        started = time.monotonic()
+        state = self.checkpoint.load()
+        watermark = state.get("watermark", {})
+        cutoff_date = self._cutoff_date(watermark.get("decision_date", ""))
+
+        # 중단된 수집이 있으면 이어서 진행
+        page = state.get("next_page", 1)
+        run_max = state.get("run_max", {"serial": 0, "decision_date": ""})
+        if page > 1:
+            logger.info("이전 판례 수집을 %d 페이지부터 이어서 진행합니다.", page)
+
+        stats = {"pages": 0, "fetched": 0, "inserted": 0, "details": 0, "completed": False}
+
+        while max_pages is None or stats["pages"] < max_pages:
+            page_numbers = list(range(page, page + self.concurrency))
+            if max_pages is not None:
+                page_numbers = page_numbers[:max_pages - stats["pages"]]
+
+            results = await asyncio.gather(*(self._fetch_page(number) for number in page_numbers))
+
+            # 일부 페이지 조회/XML 파싱 실패 시 체크포인트를 바꾸지 않고 다음 실행에서 다시 시도
+            # (빈 목록으로 처리하면 마지막 페이지로 오인해 워터마크가 앞당겨짐)
+            if any(result is None for result in results):
+                logger.warning("판례 목록 조회 실패 (%d~%d 페이지) - 다음 실행 시 이어서 진행합니다.", page_numbers[0], page_numbers[-1])
+                break
+
+            items = [item for result in results for item in result]
+            stats["pages"] += len(page_numbers)
+            stats["fetched"] += len(items)
+            # DB 조회/저장은 동기 작업이므로 스레드에서 실행 (서버 안에서 수집할 때 요청 처리를 막지 않도록)
+            rows = await asyncio.to_thread(self._new_rows, items)
+            if self.fetch_details:
+                stats["details"] += await self._fill_details(rows)
+            stats["inserted"] += await asyncio.to_thread(self._insert_rows, rows)
+            run_max = self._merge_watermark(run_max, items)
+
+            page += len(page_numbers)
+            state["next_page"] = page
+            state["run_max"] = run_max
+            self.checkpoint.state = state
+            self.checkpoint.save()
+
+            # 마지막 페이지에 도달한 경우
+            if any(len(result) < self.page_size for result in results):
+                stats["completed"] = True
+                break
+
+            # 워터마크 이전 판례까지 확인한 경우 (증분 수집 종료)
+            decision_dates = [date for date in (compact_date(item.get("decisionDate")) for item in items) if date]
+            if cutoff_date and decision_dates and min(decision_dates) < cutoff_date:
+                stats["completed"] = True
+                break
+
+        # 수집이 끝까지 완료된 경우에만 워터마크 갱신
+        if stats["completed"]:
+            state = {"watermark": self._merge_watermark(watermark, [], run_max)}
+            self.checkpoint.state = state
+            self.checkpoint.save()
+
+        # 이전 실행에서 본문 조회에 실패했거나 본문 조회 전에 저장된 판례 채우기
+        backfilled = await self.backfill_details() if self.fetch_details else 0
+        stats["details"] += backfilled
+
+        # 새 판례가 저장되거나 본문을 채운 경우 로컬 판례 검색기 / 의미 검색 색인 다시 생성
+        changed = stats["inserted"] + backfilled
+        if changed > 0 and settings.PRECEDENT_LOCAL_SEARCH and settings.LOCAL_SEARCH_BACKEND != "fulltext":
+            await asyncio.to_thread(rebuild_precedent_ranker, self.session_factory)
+        if changed > 0 and settings.SEMANTIC_SEARCH:
+            await asyncio.to_thread(rebuild_semantic_index, "precedents", self.session_factory)
+
+        stats["watermark"] = state.get("watermark", watermark)
+        logger.info("판례 수집 완료: %s (%.1f초)", stats, time.monotonic() - started, extra={"fields": stats})
+        return stats
+
+    async def run_forever(self, interval_minutes: int) -> None:
+        """
+        백그라운드 판례 수집 루프
+        interval_minutes 간격으로 증분 수집을 반복 실행 (오류가 발생해도 루프는 유지)
+        """
+        while True:
+            try:
+                await self.ingest()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("판례 수집 중 오류 발생: %s", e, exc_info=e)
+
+            await asyncio.sleep(interval_minutes * 60)
+
+    async def _fetch_page(self, page: int) -> Optional[List[Dict[str, Any]]]:
+        """판례 목록 한 페이지 조회 (선고일자 내림차순, 실패 시 None)"""
+        return await self.law_data_service.search_precedents(
+            page=page,
+            display=self.page_size,
+            sort="ddes",
+            use_mock_on_failure=False
+        )
+
+    def _cutoff_date(self, watermark_date: str) -> str:
+        """워터마크 선고일자에서 재확인 기간을 뺀 날짜 (YYYYMMDD)"""
+        watermark_date = compact_date(watermark_date)
+        if not watermark_date:
+            return ""
+
+        try:
+            date = datetime.strptime(watermark_date, "%Y%m%d")
+        except ValueError:
+            return ""
+
+        return (date - timedelta(days=self.lookback_days)).strftime("%Y%m%d")
+
+    def _merge_watermark(
+        self,
+        watermark: Dict[str, Any],
+        items: List[Dict[str, Any]],
+        other: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """기존 워터마크와 새로 조회한 판례 중 가장 큰 판례일련번호 / 선고일자를 선택"""
+        serial = watermark.get("serial", 0)
+        decision_date = compact_date(watermark.get("decision_date"))
+
+        candidates = [{"serial": item.get("precedentId", ""), "decision_date": item.get("decisionDate", "")} for item in items]
+        if other:
+            candidates.append(other)
+
+        for candidate in candidates:
+            candidate_serial = str(candidate.get("serial", ""))
+            if candidate_serial.isdigit():
+                serial = max(serial, int(candidate_serial))
+            decision_date = max(decision_date, compact_date(candidate.get("decision_date")))
+
+        return {"serial": serial, "decision_date": decision_date}
+
+    def _new_rows(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """판례 목록을 사건번호 기준으로 중복 제거하고 아직 저장되지 않은 판례만 Precedent 행으로 변환"""
+        # 같은 배치 안의 중복 제거
+        rows_by_case_number = {}
+        for item in items:
+            case_number = item.get("caseNumber", "")
+            if case_number and case_number not in rows_by_case_number:
+                rows_by_case_number[case_number] = self._to_row(item)
+
+        if not rows_by_case_number:
+            return []
+
+        db = self.session_factory()
+        try:
+            # 이미 저장된 사건번호 제외
+            case_numbers = list(rows_by_case_number.keys())
+            for i in range(0, len(case_numbers), self.lookup_chunk_size):
+                chunk = case_numbers[i:i + self.lookup_chunk_size]
+                for (case_number,) in db.query(Precedent.case_number).filter(Precedent.case_number.in_(chunk)).all():
+                    rows_by_case_number.pop(case_number, None)
+        finally:
+            db.close()
+
+        return list(rows_by_case_number.values())
+
+    def _insert_rows(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        판례 행 일괄 저장
+
+        Returns:
+        - 새로 저장된 판례 수
+        """
+        if not rows:
+            return 0
+
+        db = self.session_factory()
+        try:
+            try:
+                db.execute(insert(Precedent), rows)
+                db.commit()
+                return len(rows)
+            except IntegrityError:
+                # 상담 처리 중 같은 판례가 동시에 저장된 경우 한 건씩 저장하며 중복 무시
+                db.rollback()
+                return self._insert_one_by_one(db, rows)
+        finally:
+            db.close()
+
+    async def _fill_details(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        판례 본문 API로 판시사항/판결요지/판례내용 채우기 (PRECEDENT_INGEST_CONCURRENCY 개씩 동시 조회)
+
+        Returns:
+        - 본문을 채운 판례 수 (조회에 실패한 판례는 비워 두고 backfill_details에서 다시 조회)
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fill(row: Dict[str, Any]) -> bool:
+            if not row.get("precedent_serial"):
+                return False
+            async with semaphore:
+                detail = await self.law_data_service.fetch_precedent_detail(row["precedent_serial"])
+            if not detail:
+                return False
+            row["holding"] = detail.get("판시사항", "") or row.get("holding", "")
+            row["summary"] = detail.get("판결요지", "") or row.get("summary", "")
+            row["judgment_text"] = detail.get("판례내용", "") or row.get("judgment_text", "")
+            return True
+
+        return sum(await asyncio.gather(*(fill(row) for row in rows)))
+
+    async def backfill_details(self, limit: Optional[int] = None) -> int:
+        """
+        판시사항/판결요지가 비어 있는 저장된 판례를 최대 limit건 본문 API로 채움
+
+        Returns:
+        - 본문을 채운 판례 수
+        (수정 시각이 오래된 판례부터 조회하므로 계속 실패하는 판례가 있어도 나머지 판례가 차례로 채워짐)
+        """
+        limit = self.backfill_limit if limit is None else limit
+        if limit <= 0:
+            return 0
+
+        rows = await asyncio.to_thread(self._backfill_rows, limit)
+        if not rows:
+            return 0
+
+        filled = await self._fill_details(rows)
+        await asyncio.to_thread(self._save_backfill, rows)
+        return filled
+
+    def _backfill_rows(self, limit: int) -> List[Dict[str, Any]]:
+        """판시사항/판결요지가 비어 있는 판례를 수정 시각이 오래된 순서로 최대 limit건 조회"""
+        db = self.session_factory()
+        try:
+            precedents = db.query(Precedent.precedent_id, Precedent.precedent_serial).filter(
+                or_(Precedent.holding.is_(None), Precedent.holding == ""),
+                or_(Precedent.summary.is_(None), Precedent.summary == ""),
+                Precedent.precedent_serial.isnot(None),
+                Precedent.precedent_serial != ""
+            ).order_by(Precedent.updated_at, Precedent.precedent_id.desc()).limit(limit).all()
+            return [
+                {"precedent_id": precedent_id, "precedent_serial": precedent_serial}
+                for precedent_id, precedent_serial in precedents
+            ]
+        finally:
+            db.close()
+
+    def _save_backfill(self, rows: List[Dict[str, Any]]) -> None:
+        """backfill_details에서 조회한 본문 저장"""
+        db = self.session_factory()
+        try:
+            precedents = db.query(Precedent).filter(
+                Precedent.precedent_id.in_([row["precedent_id"] for row in rows])
+            ).all()
+            rows_by_id = {row["precedent_id"]: row for row in rows}
+            for precedent in precedents:
+                row = rows_by_id[precedent.precedent_id]
+                if "holding" in row:
+                    precedent.holding = row["holding"]
+                    precedent.summary = row["summary"]
+                    precedent.judgment_text = row["judgment_text"] or precedent.judgment_text
+                # 조회에 실패한 판례도 수정 시각을 갱신해 다음 실행에서는 다른 판례부터 조회 (같은 판례만 반복 조회하지 않도록)
+                precedent.updated_at = datetime.utcnow()
+            db.commit()
+        finally:
+            db.close()
+
+    def _insert_one_by_one(self, db: Session, rows: List[Dict[str, Any]]) -> int:
+        """판례를 한 건씩 저장 (중복 사건번호는 무시)"""
+        inserted = 0
+        for row in rows:
+            try:
+                db.execute(insert(Precedent), [row])
+                db.commit()
+                inserted += 1
+            except IntegrityError:
+                db.rollback()
+        return inserted
+
+    def _to_row(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """판례 목록 항목을 Precedent 테이블 행으로 변환"""
+        case_number = item.get("caseNumber", "")
+        link = item.get("link", "") or f"https://www.law.go.kr/판례/{case_number}"
+
+        return {
+            "precedent_serial": item.get("precedentId", ""),
+            "case_number": case_number,
+            "case_name": item.get("caseName", ""),
+            "court": item.get("court", ""),
+            "decision_date": item.get("decisionDate", ""),
+            "holding": item.get("holding", ""),
+            "summary": item.get("summary", ""),
+            "judgment_text": item.get("judgmentText", ""),
+            "link": link
+        }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='LawMate 판례 증분 수집 도구')
+    parser.add_argument('--max-pages', type=int, default=None, help='이번 실행에서 조회할 최대 페이지 수')
+    parser.add_argument('--concurrency', type=int, default=None, help='동시에 조회할 페이지 수')
+    parser.add_argument('--checkpoint', default=None, help='체크포인트 파일 경로')
+    parser.add_argument('--watch', type=int, default=0, metavar='MINUTES', help='지정한 간격(분)으로 수집을 반복 실행')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")  # 명령줄 실행 시 진행 상황 출력
+
+    service = PrecedentIngestService(concurrency=args.concurrency, checkpoint_path=args.checkpoint)
+
+    if args.watch > 0:
+        await service.run_forever(args.watch)
+    else:
+        await service.ingest(max_pages=args.max_pages)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,219 @@
+from typing import Dict, Any, Optional, Tuple, Callable, Iterable
+from collections import Counter, OrderedDict
+import logging
+import math
+import threading
+import time
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import register_collector, set_hit_ratio
+from app.services.text_utils import char_bigrams, normalize_text
+
+logger = logging.getLogger(__name__)
+
+class PrecedentRanker:
+    """
+    로컬 판례 BM25F 검색기
+    Precedent 테이블의 사건명 / 판시사항 / 판결요지를 필드별 가중치를 두고 하나의 점수로 계산
+
+    - 필드별 포스팅은 CSR 형식(indptr / indices / data) NumPy 배열로 저장
+    - 검색어 바이그램마다 필드별 포스팅을 벡터 연산으로 누적하여 점수 계산
+    - 검색어별 전체 순위를 LRU 캐시에 저장하고 페이지 단위로 잘라서 반환
+    """
+
+    FIELDS = ("case_name", "holding", "summary")
+    FIELD_WEIGHTS = {"case_name": 3.0, "holding": 2.0, "summary": 1.0}
+    FIELD_B = {"case_name": 0.5, "holding": 0.75, "summary": 0.75}
+    K1 = 1.2
+
+    def __init__(self, cache_size: Optional[int] = None):
+        self.vocabulary: Dict[str, int] = {}
+        self.precedent_ids = np.zeros(0, dtype=np.int64)
+        self.document_frequencies = np.zeros(0, dtype=np.int32)
+        self.indptr: Dict[str, np.ndarray] = {}
+        self.indices: Dict[str, np.ndarray] = {}
+        self.data: Dict[str, np.ndarray] = {}
+        self.length_norms: Dict[str, np.ndarray] = {}
+
+        self.cache_size = cache_size or settings.PRECEDENT_RANK_CACHE_SIZE
+        self._cache: "OrderedDict[str, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def document_count(self) -> int:
+        return len(self.precedent_ids)
+
+    def build(self, rows: Iterable[Tuple[int, Optional[str], Optional[str], Optional[str]]]) -> "PrecedentRanker":
+        """
+        (precedent_id, 사건명, 판시사항, 판결요지) 목록으로 색인 생성
+        """
+        precedent_ids = []
+        term_lists = {field: [] for field in self.FIELDS}
+        doc_lists = {field: [] for field in self.FIELDS}
+        tf_lists = {field: [] for field in self.FIELDS}
+        lengths = {field: [] for field in self.FIELDS}
+
+        for doc, (precedent_id, *texts) in enumerate(rows):
+            precedent_ids.append(precedent_id)
+            for field, text in zip(self.FIELDS, texts):
+                tokens = char_bigrams(text or "")
+                lengths[field].append(len(tokens))
+                for term, tf in Counter(tokens).items():
+                    term_id = self.vocabulary.setdefault(term, len(self.vocabulary))
+                    term_lists[field].append(term_id)
+                    doc_lists[field].append(doc)
+                    tf_lists[field].append(tf)
+
+        doc_count = len(precedent_ids)
+        term_count = len(self.vocabulary)
+        self.precedent_ids = np.array(precedent_ids, dtype=np.int64)
+
+        # 필드별 CSR 배열 구성 (바이그램 번호 순으로 정렬)
+        pair_keys = []
+        for field in self.FIELDS:
+            terms = np.array(term_lists[field], dtype=np.int64)
+            docs = np.array(doc_lists[field], dtype=np.int32)
+            tfs = np.array(tf_lists[field], dtype=np.float32)
+
+            order = np.argsort(terms, kind="stable")
+            indptr = np.zeros(term_count + 1, dtype=np.int64)
+            np.cumsum(np.bincount(terms, minlength=term_count), out=indptr[1:])
+
+            self.indptr[field] = indptr
+            self.indices[field] = docs[order]
+            self.data[field] = tfs[order]
+
+            field_lengths = np.array(lengths[field], dtype=np.float32)
+            average_length = float(field_lengths.mean()) if doc_count and field_lengths.mean() > 0 else 1.0
+            b = self.FIELD_B[field]
+            self.length_norms[field] = 1 - b + b * field_lengths / average_length
+
+            pair_keys.append(terms * max(doc_count, 1) + docs)
+
+        # 문서 빈도: 어느 필드든 바이그램이 한 번이라도 나오면 1회로 계산
+        if pair_keys and doc_count:
+            unique_pairs = np.unique(np.concatenate(pair_keys))
+            self.document_frequencies = np.bincount(unique_pairs // doc_count, minlength=term_count).astype(np.int32)
+        else:
+            self.document_frequencies = np.zeros(term_count, dtype=np.int32)
+
+        self.clear_cache()
+        return self
+
+    def search(self, query: str, page: int = 1, display: int = 20) -> Dict[str, Any]:
+        """
+        판례 검색 (페이지 단위)
+
+        Returns:
+        - {"total": 전체 결과 수, "page": 페이지, "display": 페이지 크기,
+           "results": [(precedent_id, 점수), ...]}
+        """
+        precedent_ids, scores = self.rank(query)
+        page = max(page, 1)
+        start = (page - 1) * display
+        results = [
+            (int(precedent_id), float(score))
+            for precedent_id, score in zip(precedent_ids[start:start + display], scores[start:start + display])
+        ]
+        return {"total": len(precedent_ids), "page": page, "display": display, "results": results}
+
+    def rank(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """검색어에 대한 전체 판례 순위 (precedent_id 배열, 점수 배열) - 결과는 캐시됨"""
+        key = " ".join(sorted(set(normalize_text(query).split())))
+
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return cached
+            self.cache_misses += 1
+
+        ranked = self._score(query)
+
+        with self._cache_lock:
+            self._cache[key] = ranked
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return ranked
+
+    def clear_cache(self) -> None:
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _score(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """BM25F 점수 계산 후 점수 내림차순으로 정렬"""
+        doc_count = self.document_count
+        empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32))
+        if doc_count == 0:
+            return empty
+
+        term_ids = [self.vocabulary[term] for term in set(char_bigrams(query)) if term in self.vocabulary]
+        if not term_ids:
+            return empty
+
+        scores = np.zeros(doc_count, dtype=np.float32)
+        for term_id in term_ids:
+            # 필드 가중치와 길이 정규화를 적용한 가상 출현 빈도 누적
+            pseudo_tf = np.zeros(doc_count, dtype=np.float32)
+            for field in self.FIELDS:
+                start, end = self.indptr[field][term_id], self.indptr[field][term_id + 1]
+                if start == end:
+                    continue
+                docs = self.indices[field][start:end]
+                pseudo_tf[docs] += self.FIELD_WEIGHTS[field] * self.data[field][start:end] / self.length_norms[field][docs]
+
+            df = self.document_frequencies[term_id]
+            idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+            scores += idf * pseudo_tf / (self.K1 + pseudo_tf)
+
+        matched = np.flatnonzero(scores > 0)
+        order = matched[np.argsort(-scores[matched], kind="stable")]
+        return self.precedent_ids[order], scores[order]
+
+
+def build_precedent_ranker(db: Session) -> PrecedentRanker:
+    """DB에 저장된 전체 판례로 검색기 생성"""
+    from app.db.models import Precedent
+
+    started = time.monotonic()
+    rows = db.query(Precedent.precedent_id, Precedent.case_name, Precedent.holding, Precedent.summary).yield_per(1000)
+    ranker = PrecedentRanker().build(rows)
+    logger.info("판례 검색기 생성 완료: %d건, 바이그램 %d개 (%.1f초)", ranker.document_count, len(ranker.vocabulary), time.monotonic() - started)
+    return ranker
+
+
+# 프로세스 전역 판례 검색기 (서버 시작 시 / 판례 수집 후 DB에서 다시 생성)
+_precedent_ranker = PrecedentRanker()
+
+def get_precedent_ranker() -> PrecedentRanker:
+    """현재 사용 중인 판례 검색기 반환"""
+    return _precedent_ranker
+
+def _collect_hit_ratio() -> None:
+    """현재 판례 검색기(마지막으로 생성한 이후)의 검색어별 순위 캐시 적중률"""
+    ranker = _precedent_ranker
+    set_hit_ratio("precedent_rank", ranker.cache_hits, ranker.cache_hits + ranker.cache_misses)
+
+register_collector(_collect_hit_ratio)
+
+def rebuild_precedent_ranker(session_factory: Optional[Callable[[], Session]] = None) -> PrecedentRanker:
+    """DB에서 판례 검색기를 새로 생성하여 교체"""
+    global _precedent_ranker
+
+    if session_factory is None:
+        from app.db.database import SessionLocal
+        session_factory = SessionLocal
+
+    db = session_factory()
+    try:
+        _precedent_ranker = build_precedent_ranker(db)
+    finally:
+        db.close()
+
+    return _precedent_ranker
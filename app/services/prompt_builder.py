@@ -0,0 +1,325 @@
+from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
+import hashlib
+import re
+import textwrap
+
+from app.core.config import settings
+from app.services.model_router import route_for
+from app.services.text_utils import estimate_tokens
+
+# 프롬프트 템플릿 (모듈 로딩 시 한 번만 들여쓰기 제거)
+def _template(text: str) -> str:
+    return textwrap.dedent(text).strip()
+
+# 고정 지시문(형식, JSON 스키마)은 system 프롬프트로 보내 프롬프트 캐시 대상이 되도록 하고,
+# 사용자 문제와 법령/판례처럼 호출마다 바뀌는 내용만 user 메시지에 넣음
+ANALYZE_SYSTEM = _template("""
+    당신은 법률 전문가입니다. 사용자의 법률 문제를 분석하고,
+    관련된 법률 분야, 핵심 법률 쟁점과 키워드를 추출해주세요.
+
+    다음 형식으로 JSON 응답을 제공해주세요:
+    {
+        "legal_category": "관련 법률 분야 (예: 민사, 형사, 부동산, 계약, 노동 등)",
+        "key_issues": ["핵심 법률 쟁점 1", "핵심 법률 쟁점 2", ...],
+        "keywords": ["키워드1", "키워드2", ...],
+        "relevant_laws": ["관련 법률1", "관련 법률2", ...]
+    }
+
+    JSON 형식으로만 응답해주세요. 추가 설명이나 텍스트를 포함하지 마세요.
+""")
+
+ANALYZE_TEMPLATE = _template("""
+    사용자 문제:
+    {description}
+""")
+
+SUMMARIZE_SYSTEM = _template("""
+    당신은 법률 전문가입니다. 주어진 법령과 판례 정보를 일반인이 이해하기 쉽게 요약하고
+    해석해주세요. 전문 용어는 가능한 쉬운 언어로 풀어서 설명해주세요.
+
+    다음 형식으로 JSON 응답을 제공해주세요:
+    {
+        "simplified_laws": [
+            {"law_name": "법령명", "explanation": "쉬운 설명"}
+        ],
+        "simplified_cases": [
+            {"case_no": "사건번호", "explanation": "쉬운 설명", "implications": "이 판례가 의미하는 바"}
+        ],
+        "user_rights": ["사용자의 법적 권리 1", "사용자의 법적 권리 2", ...],
+        "user_obligations": ["사용자의 법적 의무 1", "사용자의 법적 의무 2", ...]
+    }
+
+    JSON 형식으로만 응답해주세요. 추가 설명이나 텍스트를 포함하지 마세요.
+""")
+
+SUMMARIZE_TEMPLATE = _template("""
+    ## 관련 법령
+    {laws_text}
+
+    ## 관련 판례
+    {cases_text}
+""")
+
+RECIPIENT_TEMPLATE = _template("""
+    수신자 정보:
+    이름/기관명: {name}
+    주소: {address}
+    연락처: {contact}
+""")
+
+DOCUMENT_SYSTEM = _template("""
+    당신은 법률 문서 작성 전문가입니다. 주어진 사례 정보를 바탕으로 요청된 종류의 법률 문서 초안을 작성해주세요.
+
+    문서의 형식과 내용은 한국의 법률 관행에 맞게 작성해주세요.
+    필요한 법적 문구와 형식을 갖추되, 일반인도 이해할 수 있는 명확한 언어로 작성해주세요.
+""")
+
+DOCUMENT_TEMPLATE = _template("""
+    다음 정보를 바탕으로 {doc_type} 문서 초안을 작성해주세요.
+
+    ## 사례 정보
+    제목: {title}
+    내용: {description}
+    관련 법률 분야: {legal_category}
+
+    {recipient_text}
+""")
+
+CONSULTATION_SYSTEM = _template("""
+    당신은 경험이 풍부한 법률 전문가입니다. 사용자의 법률 문제에 대해 관련 법령과 판례를 참고하여
+    상세하고 실용적인 법률 상담 답변을 제공해주세요. 전문 용어는 쉽게 풀어서 설명하고,
+    사용자가 취해야 할 구체적인 행동 단계와 대응 방법을 명확하게 제시해주세요.
+
+    다음 구조로 법률 상담 답변을 작성해주세요:
+
+    1. 문제 요약: 사용자의 법률 문제를 명확하게 요약
+    2. 법적 분석: 관련 법령과 판례를 바탕으로 사용자의 법적 상황 분석
+    3. 사용자의 권리와 의무: 현 상황에서 사용자가 가진 법적 권리와 의무 설명
+    4. 대응 방안: 구체적인 대응 방법 제시 (여러 선택지가 있다면 각 옵션의 장단점 설명)
+    5. 단계별 행동 계획: 사용자가 취해야 할 구체적인 행동을 순차적으로 안내
+    6. 필요 서류/증거: 준비해야 할 서류나 확보해야 할 증거 안내
+    7. 법적 시간 제한: 관련 소멸시효나 기한이 있다면 명시
+    8. 전문가 도움 여부: 변호사 상담이 필요한 시점과 이유 안내
+    9. 참고 자료: 답변에서 사용한 법령 및 판례의 링크 제공
+
+    각 법령과 판례의 링크 정보를 적극 활용하여, 사용자가 필요시 원본 법령이나 판례를 직접 확인할 수 있도록 안내해주세요.
+    답변의 끝부분에는 "더 자세한 법령 및 판례 정보는 위에 제공된 링크에서 확인하실 수 있습니다."라는 문구를 추가해주세요.
+
+    명확하고 실용적인 조언을 제공하되, 단정적인 법적 판단은 피하고 상황에 따른 가능성을 설명해주세요.
+    일반인도 쉽게 이해하고 따를 수 있는 언어로 작성해주세요.
+""")
+
+CONSULTATION_TEMPLATE = _template("""
+    ## 사용자 문제:
+    {description}
+
+    ## 관련 법령:
+    {laws_text}
+
+    ## 관련 판례:
+    {cases_text}
+""")
+
+BASIC_CONSULTATION_SYSTEM = _template("""
+    당신은 법률 전문가입니다. 사용자의 법률 문제에 대해 관련 법령과 판례를 참고하여 답변해주세요.
+
+    다음 형식으로 법률 상담 답변을 작성해주세요:
+    1. 문제 요약: 사용자의 법률 문제를 간단히 요약
+    2. 적용 법령 및 판례: 어떤 법령과 판례가 적용되는지 설명
+    3. 법률적 견해: 문제에 대한 법률적 견해 제시
+    4. 권리와 의무: 사용자의 법적 권리와 의무 설명
+    5. 대응 방안: 사용자가 취할 수 있는 법적 대응 방안 제안
+
+    일반인도 이해할 수 있는 쉬운 언어로 설명해주세요.
+""")
+
+BASIC_CONSULTATION_TEMPLATE = _template("""
+    ## 사용자 문제:
+    {description}
+
+    ## 관련 법률 분야:
+    {legal_category}
+
+    ## 관련 키워드:
+    {keywords}
+
+    ## 관련 법령:
+    {laws_text}
+
+    ## 관련 판례:
+    {cases_text}
+""")
+
+NO_LAWS_TEXT = "관련 법령 정보가 없습니다."
+NO_CASES_TEXT = "관련 판례 정보가 없습니다."
+OMITTED_MARK = " …(이하 생략)"
+
+# 호출 종류별 템플릿 (템플릿이 바뀌면 프롬프트 버전도 바뀜)
+_TEMPLATES = {
+    "analyze": (ANALYZE_SYSTEM, ANALYZE_TEMPLATE),
+    "summarize": (SUMMARIZE_SYSTEM, SUMMARIZE_TEMPLATE),
+    "document": (DOCUMENT_SYSTEM, DOCUMENT_TEMPLATE, RECIPIENT_TEMPLATE),
+    "consultation": (CONSULTATION_SYSTEM, CONSULTATION_TEMPLATE, BASIC_CONSULTATION_SYSTEM, BASIC_CONSULTATION_TEMPLATE),
+}
+
+# 문장 경계 (마침표/물음표/느낌표 뒤 공백)
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.?!。])\s+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class Prompt:
+    """Claude API에 보낼 프롬프트와 호출 설정"""
+    call_type: str  # 호출 종류 (analyze, summarize, document, consultation)
+    system: str  # 고정 지시문 (호출 종류별로 항상 같음, 프롬프트 캐시 대상)
+    text: str  # 호출마다 바뀌는 user 메시지
+    max_tokens: int  # 응답 최대 토큰 수
+    estimated_tokens: int  # system + user 추정 입력 토큰 수
+
+
+class PromptBuilder:
+    """
+    토큰 예산 기반 프롬프트 생성기
+    - 템플릿은 모듈 로딩 시 들여쓰기를 제거해 두고 값만 채움
+    - 고정 지시문은 system, 사례별 내용은 user 메시지로 분리 (system은 호출 종류별로 바이트 단위까지 동일)
+    - 조문 내용(content)과 판결요지(summary)는 항목당 PROMPT_FIELD_TOKEN_BUDGET 안으로 앞부분 문장만 남김
+    - 법령/판례 목록 전체는 PROMPT_CONTEXT_TOKEN_BUDGET 안에서 앞 순서(관련성 높은 순)부터 포함
+    - 응답 최대 토큰 수(max_tokens)는 호출 종류별 CLAUDE_MODEL_ROUTES 설정 사용
+    """
+
+    # 법령/판례 목록 예산 중 법령 비율 (법령에서 남은 예산은 판례에 사용)
+    LAW_BUDGET_RATIO = 0.6
+
+    def __init__(self, field_budget: Optional[int] = None, context_budget: Optional[int] = None):
+        self.field_budget = field_budget or settings.PROMPT_FIELD_TOKEN_BUDGET
+        self.context_budget = context_budget or settings.PROMPT_CONTEXT_TOKEN_BUDGET
+
+    def version(self, call_type: str) -> str:
+        """
+        호출 종류별 프롬프트 버전 (템플릿과 토큰 예산의 해시)
+        템플릿이나 예산을 바꾸면 값이 바뀌므로 분석 결과 캐시 키에 넣어 이전 프롬프트의 결과를 재사용하지 않음
+        """
+        parts = _TEMPLATES.get(call_type, ()) + (str(self.field_budget), str(self.context_budget))
+        return hashlib.sha256("\n\0".join(parts).encode("utf-8")).hexdigest()[:12]
+
+    def analyze(self, description: str) -> Prompt:
+        text = ANALYZE_TEMPLATE.format(description=self.condense(description, self.context_budget))
+        return self._prompt("analyze", ANALYZE_SYSTEM, text)
+
+    def summarize(self, laws: List[Dict], cases: List[Dict]) -> Prompt:
+        laws_text, cases_text = self._context(
+            laws, lambda law, content: f"법령명: {law.get('lawName')}\n조항: {law.get('article')}\n내용: {content}", "content",
+            cases, lambda case, summary: f"사건번호: {case.get('caseNo')}\n판결요지: {summary}", "summary"
+        )
+        return self._prompt("summarize", SUMMARIZE_SYSTEM, SUMMARIZE_TEMPLATE.format(laws_text=laws_text, cases_text=cases_text))
+
+    def document(self, doc_type: str, case_info: Dict[str, Any], recipient_info: Optional[Dict[str, Any]] = None) -> Prompt:
+        recipient_text = ""
+        if recipient_info:
+            recipient_text = RECIPIENT_TEMPLATE.format(
+                name=recipient_info.get('name', ''),
+                address=recipient_info.get('address', ''),
+                contact=recipient_info.get('contact', '')
+            )
+        text = DOCUMENT_TEMPLATE.format(
+            doc_type=doc_type,
+            title=case_info.get('title', ''),
+            description=self.condense(case_info.get('description', ''), self.context_budget),
+            legal_category=case_info.get('legal_category', ''),
+            recipient_text=recipient_text
+        ).strip()
+        return self._prompt("document", DOCUMENT_SYSTEM, text)
+
+    def consultation(self, description: str, laws: List[Dict], cases: List[Dict]) -> Prompt:
+        laws_text, cases_text = self._context(
+            laws, lambda law, content: f"법령명: {law.get('lawName')}\n조항: {law.get('article')}\n내용: {content}\n링크: {law.get('link', '')}", "content",
+            cases, lambda case, summary: f"사건번호: {case.get('caseNo')}\n법원: {case.get('court', '')}\n판결일: {case.get('decisionDate', '')}\n판결요지: {summary}\n링크: {case.get('link', '')}", "summary"
+        )
+        text = CONSULTATION_TEMPLATE.format(description=description, laws_text=laws_text, cases_text=cases_text)
+        return self._prompt("consultation", CONSULTATION_SYSTEM, text)
+
+    def basic_consultation(self, description: str, keywords: List[str], legal_category: str,
+                           laws: List[Dict], cases: List[Dict]) -> Prompt:
+        laws_text, cases_text = self._context(
+            laws, lambda law, content: f"법령명: {law.get('lawName')}\n조문번호: {law.get('article')}\n조문제목: {law.get('articleTitle', '')}\n조문내용: {content}", "content",
+            cases, lambda case, summary: f"사건번호: {case.get('caseNo')}\n법원: {case.get('court', '')}\n판결일자: {case.get('decisionDate', '')}\n판결요지: {summary}", "summary"
+        )
+        text = BASIC_CONSULTATION_TEMPLATE.format(
+            description=description,
+            legal_category=legal_category,
+            keywords=", ".join(keywords),
+            laws_text=laws_text,
+            cases_text=cases_text
+        )
+        return self._prompt("consultation", BASIC_CONSULTATION_SYSTEM, text)
+
+    @staticmethod
+    def condense(text: Optional[str], max_tokens: int) -> str:
+        """
+        긴 텍스트를 토큰 예산 안으로 줄임
+        공백을 정리한 뒤 앞에서부터 문장 단위로 채우고(조문/판결요지는 앞 문장에 핵심이 있음),
+        첫 문장만으로 예산을 넘으면 글자 단위로 자름
+        """
+        text = _WHITESPACE.sub(" ", text or "").strip()
+        if estimate_tokens(text) <= max_tokens:
+            return text
+
+        budget = max(max_tokens - estimate_tokens(OMITTED_MARK), 1)
+        kept = []
+        used = 0
+        for sentence in _SENTENCE_BOUNDARY.split(text):
+            tokens = estimate_tokens(sentence) + 1
+            if used + tokens > budget:
+                break
+            kept.append(sentence)
+            used += tokens
+
+        if kept:
+            return " ".join(kept) + OMITTED_MARK
+
+        # 첫 문장이 예산보다 긴 경우: 예산에 맞는 길이를 이진 탐색으로 찾아 자름
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if estimate_tokens(text[:middle]) <= budget:
+                low = middle
+            else:
+                high = middle - 1
+        return text[:low].rstrip() + OMITTED_MARK
+
+    def _context(self, laws: List[Dict], format_law, law_field: str,
+                 cases: List[Dict], format_case, case_field: str):
+        """법령/판례 목록을 예산 안에서 텍스트로 변환 (법령 예산에서 남은 토큰은 판례에 사용)"""
+        law_budget = int(self.context_budget * self.LAW_BUDGET_RATIO)
+        laws_text, used = self._items(laws, format_law, law_field, law_budget)
+        cases_text, _ = self._items(cases, format_case, case_field, self.context_budget - used)
+        return laws_text or NO_LAWS_TEXT, cases_text or NO_CASES_TEXT
+
+    def _items(self, items: List[Dict], format_item, field: str, budget: int):
+        blocks = []
+        used = 0
+        for item in items:
+            # 필드를 제외한 항목 정보(법령명, 링크 등)의 토큰 수
+            overhead = estimate_tokens(format_item(item, ""))
+            field_budget = min(self.field_budget, budget - used - overhead)
+            if field_budget < 20:
+                break
+            block = format_item(item, self.condense(item.get(field, ""), field_budget))
+            blocks.append(block)
+            used += estimate_tokens(block)
+        return "\n\n".join(blocks), used
+
+    def _prompt(self, call_type: str, system: str, text: str) -> Prompt:
+        return Prompt(
+            call_type=call_type,
+            system=system,
+            text=text,
+            max_tokens=max_tokens_for(call_type),
+            estimated_tokens=estimate_tokens(system) + estimate_tokens(text)
+        )
+
+
+def max_tokens_for(call_type: str) -> int:
+    """호출 종류별 응답 최대 토큰 수 (설정에 없으면 default 값)"""
+    return route_for(call_type)["max_tokens"]
@@ -0,0 +1,83 @@
+from typing import List, Optional, Sequence
+import numpy as np
+
+from app.core.config import settings
+from app.services.semantic_index import get_semantic_index
+from app.services.text_utils import char_bigrams
+
+class RelevanceScorer:
+    """
+    사례-조문 / 사례-판례 연결 관련성 점수 계산 (0-100)
+    후보 전체를 한 번에 행렬 연산으로 계산
+
+    - 키워드 일치도: 키워드 바이그램이 후보 텍스트에 포함된 비율 (후보 집합 내 희귀한 바이그램일수록 높은 가중치)
+    - 의미 유사도: 사례 설명과 후보 텍스트의 임베딩 코사인 유사도 (의미 검색 색인이 있을 때만 사용)
+    """
+
+    def __init__(self, keyword_weight: Optional[float] = None):
+        self.keyword_weight = settings.RELEVANCE_KEYWORD_WEIGHT if keyword_weight is None else keyword_weight
+
+    def score(
+        self,
+        description: str,
+        keywords: List[str],
+        texts: Sequence[str],
+        corpus: Optional[str] = None,
+        doc_ids: Optional[Sequence[int]] = None
+    ) -> np.ndarray:
+        """
+        후보 텍스트별 관련성 점수
+
+        Parameters:
+        - description: 사례 설명
+        - keywords: 추출된 키워드
+        - texts: 후보 조문/판례 텍스트
+        - corpus: 의미 검색 색인 이름 ("law_articles" / "precedents")
+        - doc_ids: 후보 문서 ID (색인에 저장된 임베딩 재사용)
+
+        Returns:
+        - 후보 순서대로 0-100 점수 배열 (float32)
+        """
+        if not texts:
+            return np.zeros(0, dtype=np.float32)
+
+        keyword_scores = self._keyword_scores(keywords or [description], texts)
+
+        index = get_semantic_index(corpus) if corpus and settings.SEMANTIC_SEARCH else None
+        if index is None or not description:
+            return (keyword_scores * 100).astype(np.float32)
+
+        ids = list(doc_ids) if doc_ids is not None else [-1] * len(texts)
+        semantic_scores = np.clip(index.similarities(description, ids, list(texts)), 0.0, 1.0)
+        combined = self.keyword_weight * keyword_scores + (1 - self.keyword_weight) * semantic_scores
+        return (combined * 100).astype(np.float32)
+
+    def _keyword_scores(self, keywords: List[str], texts: Sequence[str]) -> np.ndarray:
+        """키워드 바이그램 포함 여부 행렬(후보 수 x 바이그램 수)과 가중치 벡터의 곱으로 일치도 계산 (0-1)"""
+        terms = list(dict.fromkeys(term for keyword in keywords for term in char_bigrams(keyword)))
+        if not terms:
+            return np.zeros(len(texts), dtype=np.float32)
+
+        term_ids = {term: i for i, term in enumerate(terms)}
+        matches = np.zeros((len(texts), len(terms)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            columns = [term_ids[term] for term in set(char_bigrams(text or "")) if term in term_ids]
+            matches[row, columns] = 1.0
+
+        # 후보 대부분에 나오는 바이그램은 구분력이 낮으므로 가중치를 낮춤
+        document_frequencies = matches.sum(axis=0)
+        weights = np.log1p((len(texts) + 1) / (document_frequencies + 1)).astype(np.float32)
+        return matches @ weights / weights.sum()
+
+
+def select_relevant(scores: np.ndarray, min_score: Optional[float] = None, min_keep: int = 1) -> List[int]:
+    """
+    점수 내림차순 후보 위치 중 기준 점수 이상인 것만 반환
+    기준을 넘는 후보가 없어도 상위 min_keep개는 유지 (검색 결과가 있는데 모두 버려지는 것을 방지)
+    """
+    min_score = settings.RELEVANCE_MIN_SCORE if min_score is None else min_score
+    order = np.argsort(-scores, kind="stable")
+    selected = [int(i) for i in order if scores[i] >= min_score]
+    if len(selected) < min_keep:
+        selected = [int(i) for i in order[:min_keep]]
+    return selected
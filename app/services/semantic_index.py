@@ -0,0 +1,387 @@
+from typing import List, Dict, Optional, Tuple, Callable, Iterable, Sequence
+from array import array
+from collections import Counter
+import logging
+import math
+import os
+import threading
+import time
+import zlib
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.text_utils import char_bigrams, normalize_text, words
+
+logger = logging.getLogger(__name__)
+
+class HashingEmbedder:
+    """
+    해싱 TF-IDF + SVD(잠재 의미 분석) 임베딩
+    어절과 글자 바이그램을 해시 버킷(hash_dim)으로 모은 TF-IDF 벡터를 SVD 주성분(dim)으로 투영
+
+    - 어휘 사전 없이 crc32 해시로 버킷을 정하므로 새 단어가 나와도 다시 학습할 필요 없음
+    - 버킷 충돌은 부호 해시(+1/-1)로 상쇄
+    - 학습 결과는 idf(hash_dim)와 주성분 행렬(hash_dim x dim) 두 배열뿐
+    """
+
+    def __init__(self, hash_dim: int, dim: int, idf: Optional[np.ndarray] = None, components: Optional[np.ndarray] = None):
+        self.hash_dim = hash_dim
+        self.dim = dim
+        self.idf = idf if idf is not None else np.ones(hash_dim, dtype=np.float32)
+        self.components = components
+        self._hash_cache: Dict[str, Tuple[int, float]] = {}
+        self._hash_lock = threading.Lock()
+
+    def features(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """텍스트의 해시 버킷 번호와 부호가 적용된 로그 출현 빈도 (희소 벡터)"""
+        normalized = normalize_text(text)
+        counts = Counter(char_bigrams(normalized))
+        counts.update(word for word in words(normalized) if len(word) > 2)
+
+        buckets: Dict[int, float] = {}
+        for token, tf in counts.items():
+            bucket, sign = self._hash(token)
+            buckets[bucket] = buckets.get(bucket, 0.0) + sign * (1.0 + math.log(tf))
+
+        indices = np.fromiter(buckets.keys(), dtype=np.int32, count=len(buckets))
+        values = np.fromiter(buckets.values(), dtype=np.float32, count=len(buckets))
+        return indices, values
+
+    def dense(self, sparse_rows: Sequence[Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+        """희소 벡터 목록을 idf 가중치와 L2 정규화를 적용한 (행 수 x hash_dim) 행렬로 변환"""
+        matrix = np.zeros((len(sparse_rows), self.hash_dim), dtype=np.float32)
+        for row, (indices, values) in enumerate(sparse_rows):
+            matrix[row, indices] = values * self.idf[indices]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def project(self, matrix: np.ndarray) -> np.ndarray:
+        """TF-IDF 행렬을 주성분 공간으로 투영하고 L2 정규화 (코사인 유사도 = 내적)"""
+        embeddings = matrix @ self.components
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        np.divide(embeddings, norms, out=embeddings, where=norms > 0)
+        return embeddings.astype(np.float32, copy=False)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """텍스트 목록 임베딩 (행 수 x dim)"""
+        return self.project(self.dense([self.features(text) for text in texts]))
+
+    def _hash(self, token: str) -> Tuple[int, float]:
+        cached = self._hash_cache.get(token)
+        if cached is None:
+            value = zlib.crc32(token.encode("utf-8"))
+            cached = (value % self.hash_dim, 1.0 if value & 0x80000000 else -1.0)
+            with self._hash_lock:
+                if len(self._hash_cache) < 200000:
+                    self._hash_cache[token] = cached
+        return cached
+
+
+class SemanticIndex:
+    """
+    CPU 전용 의미 검색 색인
+    문서 임베딩을 float32 .npy 파일로 저장하고 메모리 맵으로 읽어 행 묶음 단위 행렬곱으로 top-k 검색
+
+    - ids: 문서 ID (조문 article_id / 판례 precedent_id, 오름차순)
+    - groups: 문서가 속한 그룹 ID (조문의 law_id, 판례는 0)
+    - embeddings: (문서 수 x dim) float32 메모리 맵 배열
+    """
+
+    VERSION = 1
+    # 한 번에 행렬곱할 문서 행 수 (dim 128 기준 약 32MB)
+    BATCH_ROWS = 65536
+
+    def __init__(self, embedder: HashingEmbedder, ids: np.ndarray, groups: np.ndarray, embeddings: np.ndarray):
+        self.embedder = embedder
+        self.ids = ids
+        self.groups = groups
+        self.embeddings = embeddings
+
+    @property
+    def document_count(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(
+        cls,
+        rows: Iterable[Tuple[int, int, str]],
+        path: str,
+        hash_dim: Optional[int] = None,
+        dim: Optional[int] = None,
+        chunk_rows: int = 4096
+    ) -> "SemanticIndex":
+        """
+        (문서 ID, 그룹 ID, 텍스트) 목록으로 색인 생성 후 path 경로에 저장
+
+        1. 해시 TF 희소 벡터 계산 및 버킷별 문서 빈도 집계
+        2. TF-IDF 행렬을 묶음 단위로 만들어 공분산(hash_dim x hash_dim) 누적
+        3. 공분산 고유벡터 상위 dim개를 주성분으로 선택 (SVD와 동일, 문서 수가 hash_dim 이하면 직접 SVD)
+        4. 문서 임베딩을 메모리 맵 파일에 묶음 단위로 기록
+        """
+        hash_dim = hash_dim or settings.SEMANTIC_HASH_DIM
+        dim = min(dim or settings.SEMANTIC_DIM, hash_dim)
+        embedder = HashingEmbedder(hash_dim, dim)
+
+        ids = array("q")
+        groups = array("q")
+        offsets = array("q", [0])
+        indices = array("i")
+        values = array("f")
+        document_frequencies = np.zeros(hash_dim, dtype=np.int64)
+
+        for doc_id, group_id, text in rows:
+            row_indices, row_values = embedder.features(text or "")
+            ids.append(doc_id)
+            groups.append(group_id or 0)
+            indices.extend(row_indices.tolist())
+            values.extend(row_values.tolist())
+            offsets.append(len(indices))
+            document_frequencies[row_indices] += 1
+
+        doc_count = len(ids)
+        embedder.idf = (np.log((1 + doc_count) / (1 + document_frequencies)) + 1).astype(np.float32)
+
+        all_indices = np.frombuffer(indices, dtype=np.int32) if indices else np.zeros(0, dtype=np.int32)
+        all_values = np.frombuffer(values, dtype=np.float32) if values else np.zeros(0, dtype=np.float32)
+        all_offsets = np.frombuffer(offsets, dtype=np.int64)
+
+        # 문서 ID 오름차순으로 저장 (검색 시 ID -> 행 번호를 이진 탐색으로 찾음)
+        all_ids = np.frombuffer(ids, dtype=np.int64) if ids else np.zeros(0, dtype=np.int64)
+        all_groups = np.frombuffer(groups, dtype=np.int64) if groups else np.zeros(0, dtype=np.int64)
+        order = np.argsort(all_ids, kind="stable")
+
+        def chunks():
+            for start in range(0, doc_count, chunk_rows):
+                end = min(start + chunk_rows, doc_count)
+                yield start, end, embedder.dense([
+                    (all_indices[all_offsets[row]:all_offsets[row + 1]], all_values[all_offsets[row]:all_offsets[row + 1]])
+                    for row in order[start:end]
+                ])
+
+        components = np.zeros((hash_dim, dim), dtype=np.float32)
+        if doc_count <= hash_dim:
+            # 문서 수가 적으면 TF-IDF 행렬을 그대로 SVD (문서 수 x hash_dim)
+            matrix = np.concatenate([chunk for _, _, chunk in chunks()]) if doc_count else np.zeros((0, hash_dim), dtype=np.float32)
+            _, _, vt = np.linalg.svd(matrix, full_matrices=False)
+            components[:, :min(dim, len(vt))] = vt[:dim].T
+        else:
+            gram = np.zeros((hash_dim, hash_dim), dtype=np.float64)
+            for _, _, matrix in chunks():
+                gram += matrix.T @ matrix
+
+            _, eigenvectors = np.linalg.eigh(gram)
+            components[:] = eigenvectors[:, ::-1][:, :dim]
+        embedder.components = components
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp.npy"
+        embeddings = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=(doc_count, dim))
+        for start, end, matrix in chunks():
+            embeddings[start:end] = embedder.project(matrix)
+        embeddings.flush()
+        del embeddings
+        os.replace(tmp_path, cls._embeddings_path(path))
+
+        np.savez(
+            f"{path}.tmp.npz",
+            version=cls.VERSION,
+            hash_dim=hash_dim,
+            dim=dim,
+            idf=embedder.idf,
+            components=embedder.components,
+            ids=all_ids[order],
+            groups=all_groups[order]
+        )
+        os.replace(f"{path}.tmp.npz", cls._model_path(path))
+
+        return cls.load(path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["SemanticIndex"]:
+        """저장된 색인 불러오기 (임베딩은 메모리 맵으로 열어 필요한 부분만 읽음)"""
+        try:
+            with np.load(cls._model_path(path)) as model:
+                if int(model["version"]) != cls.VERSION:
+                    return None
+                embedder = HashingEmbedder(int(model["hash_dim"]), int(model["dim"]), model["idf"], model["components"])
+                ids = model["ids"]
+                groups = model["groups"]
+            embeddings = np.load(cls._embeddings_path(path), mmap_mode="r")
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning("의미 검색 색인 파일을 읽을 수 없습니다: %s", e)
+            return None
+
+        if len(embeddings) != len(ids):
+            return None
+        return cls(embedder, ids, groups, embeddings)
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[int, float]]:
+        """검색어와 의미가 가까운 문서 top-k [(문서 ID, 코사인 유사도), ...]"""
+        return self.search_batch([query], k)[0]
+
+    def search_batch(self, queries: Sequence[str], k: int = 10) -> List[List[Tuple[int, float]]]:
+        """
+        여러 검색어를 한 번에 검색
+        문서 행을 BATCH_ROWS 단위로 (검색어 수 x dim) @ (dim x 행 수) 행렬곱하고
+        묶음마다 argpartition으로 top-k 후보만 남겨 병합
+        """
+        if not queries or self.document_count == 0 or k <= 0:
+            return [[] for _ in queries]
+
+        query_matrix = self.embedder.embed(queries)
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+
+        for start in range(0, self.document_count, self.BATCH_ROWS):
+            block = self.embeddings[start:start + self.BATCH_ROWS]
+            scores = (block @ query_matrix.T).T
+
+            keep = min(k, scores.shape[1])
+            top = np.argpartition(-scores, keep - 1, axis=1)[:, :keep]
+            candidate_scores = np.concatenate([best_scores, np.take_along_axis(scores, top, axis=1)], axis=1)
+            candidate_rows = np.concatenate([best_rows, top + start], axis=1)
+
+            keep = min(k, candidate_scores.shape[1])
+            top = np.argpartition(-candidate_scores, keep - 1, axis=1)[:, :keep]
+            best_scores = np.take_along_axis(candidate_scores, top, axis=1)
+            best_rows = np.take_along_axis(candidate_rows, top, axis=1)
+
+        results = []
+        for scores, rows in zip(best_scores, best_rows):
+            order = np.argsort(-scores, kind="stable")
+            results.append([(int(self.ids[row]), float(score)) for row, score in zip(rows[order], scores[order]) if score > 0])
+        return results
+
+    def similarities(self, query: str, doc_ids: Sequence[int], texts: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        검색어와 지정한 문서들의 코사인 유사도
+        색인에 없는 문서(색인 생성 이후 저장된 조문 등)는 texts로 즉석 임베딩하여 계산
+        """
+        if not doc_ids:
+            return np.zeros(0, dtype=np.float32)
+
+        query_vector = self.embedder.embed([query])[0]
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        if self.document_count:
+            rows = np.minimum(np.searchsorted(self.ids, doc_ids), self.document_count - 1)
+            found = self.ids[rows] == doc_ids
+        else:
+            rows = np.zeros(len(doc_ids), dtype=np.int64)
+            found = np.zeros(len(doc_ids), dtype=bool)
+
+        vectors = np.zeros((len(doc_ids), self.embedder.dim), dtype=np.float32)
+        if found.any():
+            vectors[found] = self.embeddings[rows[found]]
+        missing = np.flatnonzero(~found)
+        if len(missing) and texts is not None:
+            vectors[missing] = self.embedder.embed([texts[i] for i in missing])
+
+        return vectors @ query_vector
+
+    def group_scores(self, query: str, k: int = 50) -> Dict[int, float]:
+        """검색어 top-k 문서를 그룹별로 모아 그룹마다 가장 높은 유사도 반환 (조문 -> 법령 점수)"""
+        hits = self.search(query, k)
+        if not hits:
+            return {}
+
+        hit_ids = np.array([doc_id for doc_id, _ in hits], dtype=np.int64)
+        hit_groups = self.groups[np.searchsorted(self.ids, hit_ids)]
+
+        scores: Dict[int, float] = {}
+        for group_id, (_, score) in zip(hit_groups.tolist(), hits):
+            scores[group_id] = max(scores.get(group_id, 0.0), score)
+        return scores
+
+    @staticmethod
+    def _model_path(path: str) -> str:
+        return f"{path}.npz"
+
+    @staticmethod
+    def _embeddings_path(path: str) -> str:
+        return f"{path}.embeddings.npy"
+
+
+def _law_article_rows(db: Session) -> Iterable[Tuple[int, int, str]]:
+    from app.db.models import LawArticle
+
+    query = db.query(LawArticle.article_id, LawArticle.law_id, LawArticle.article_title, LawArticle.content).order_by(LawArticle.article_id)
+    for article_id, law_id, title, content in query.yield_per(1000):
+        yield article_id, law_id, f"{title or ''} {content or ''}"
+
+def _precedent_rows(db: Session) -> Iterable[Tuple[int, int, str]]:
+    from app.db.models import Precedent
+
+    query = db.query(Precedent.precedent_id, Precedent.case_name, Precedent.holding, Precedent.summary).order_by(Precedent.precedent_id)
+    for precedent_id, case_name, holding, summary in query.yield_per(1000):
+        yield precedent_id, 0, f"{case_name or ''} {holding or ''} {summary or ''}"
+
+# 색인 이름별 DB 조회 함수 (문서 ID 오름차순)
+CORPORA: Dict[str, Callable[[Session], Iterable[Tuple[int, int, str]]]] = {
+    "law_articles": _law_article_rows,
+    "precedents": _precedent_rows,
+}
+
+
+# 프로세스 전역 의미 검색 색인 (서버 시작 시 파일 또는 DB에서 불러옴)
+_semantic_indexes: Dict[str, SemanticIndex] = {}
+
+def semantic_index_path(name: str) -> str:
+    return os.path.join(settings.SEMANTIC_INDEX_DIR, name)
+
+def get_semantic_index(name: str) -> Optional[SemanticIndex]:
+    """현재 사용 중인 의미 검색 색인 반환 (아직 생성되지 않았으면 None)"""
+    return _semantic_indexes.get(name)
+
+def set_semantic_index(name: str, index: Optional[SemanticIndex]) -> None:
+    """사용할 의미 검색 색인 교체"""
+    if index is None:
+        _semantic_indexes.pop(name, None)
+    else:
+        _semantic_indexes[name] = index
+
+def rebuild_semantic_index(name: str, session_factory: Optional[Callable[[], Session]] = None) -> SemanticIndex:
+    """DB에서 의미 검색 색인을 새로 생성하여 교체"""
+    if session_factory is None:
+        from app.db.database import SessionLocal
+        session_factory = SessionLocal
+
+    started = time.monotonic()
+    db = session_factory()
+    try:
+        index = SemanticIndex.build(CORPORA[name](db), semantic_index_path(name))
+    finally:
+        db.close()
+
+    set_semantic_index(name, index)
+    logger.info("의미 검색 색인 생성 완료 (%s): %d건 (%.1f초)", name, index.document_count, time.monotonic() - started)
+    return index
+
+def load_or_build_semantic_indexes(session_factory: Optional[Callable[[], Session]] = None) -> None:
+    """
+    저장된 의미 검색 색인 파일을 불러오고, 없으면 DB에서 새로 생성
+    (서버 시작 시 별도 스레드에서 실행)
+    """
+    for name in CORPORA:
+        index = SemanticIndex.load(semantic_index_path(name)) if os.path.exists(SemanticIndex._model_path(semantic_index_path(name))) else None
+        if index is None:
+            rebuild_semantic_index(name, session_factory)
+        else:
+            set_semantic_index(name, index)
+            logger.info("의미 검색 색인 파일을 불러왔습니다 (%s): %d건", name, index.document_count)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='LawMate 의미 검색 색인 생성 도구')
+    parser.add_argument('--corpus', choices=list(CORPORA.keys()), action='append', help='생성할 색인 (기본값: 전체)')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")  # 명령줄 실행 시 진행 상황 출력
+
+    for name in args.corpus or CORPORA.keys():
+        rebuild_semantic_index(name)
+
+if __name__ == "__main__":
+    main()
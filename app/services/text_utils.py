@@ -0,0 +1,82 @@
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import math
+import re
+import unicodedata
+
+# 한글, 영문, 숫자 연속 구간 (공백/문장부호 기준으로 분리)
+_WORD_PATTERN = re.compile(r"[0-9A-Za-z가-힣]+")
+_HANGUL_PATTERN = re.compile(r"[가-힣]")
+_JSON_DECODER = json.JSONDecoder(strict=False)
+
+def normalize_text(text: str) -> str:
+    """검색용 텍스트 정규화 (유니코드 NFC, 소문자 변환)"""
+    return unicodedata.normalize("NFC", text or "").lower()
+
+def normalize_description(text: str) -> str:
+    """
+    사례 설명 비교용 정규화 (유니코드 NFC, 소문자 변환, 문장부호/기호 제거, 연속 공백 정리)
+    같은 내용을 띄어쓰기나 문장부호만 다르게 붙여넣은 설명이 같은 값이 되도록 함
+    """
+    text = normalize_text(text)
+    text = "".join(" " if unicodedata.category(char)[0] in ("P", "S") else char for char in text)
+    return " ".join(text.split())
+
+def description_fingerprint(text: str) -> str:
+    """사례 설명 내용 지문 (정규화한 설명의 SHA-256, 설명 변경 여부 확인용)"""
+    return hashlib.sha256(normalize_description(text).encode("utf-8")).hexdigest()
+
+def words(text: str) -> List[str]:
+    """정규화한 텍스트를 어절 단위로 분리 (문장부호 제외)"""
+    return _WORD_PATTERN.findall(normalize_text(text))
+
+def char_bigrams(text: str) -> List[str]:
+    """
+    한국어 글자 단위 바이그램 토큰화
+    형태소 분석기 없이도 조사/어미 변화에 강하도록 어절을 두 글자씩 겹쳐 자름
+    (예: "임대차보호법" -> ["임대", "대차", "차보", "보호", "호법"])
+    한 글자 어절은 그대로 토큰으로 사용
+    """
+    tokens = []
+    for word in words(text):
+        if len(word) == 1:
+            tokens.append(word)
+            continue
+        for i in range(len(word) - 1):
+            tokens.append(word[i:i + 2])
+    return tokens
+
+def estimate_tokens(text: str) -> int:
+    """
+    Claude 입력 토큰 수 추정 (토크나이저 없이 계산)
+    한글은 글자당 약 1토큰, 그 외 문자는 약 4글자당 1토큰으로 계산 (실제보다 약간 크게 추정)
+    """
+    if not text:
+        return 0
+    hangul = len(_HANGUL_PATTERN.findall(text))
+    return hangul + math.ceil((len(text) - hangul) / 4)
+
+def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Claude 응답 텍스트에서 첫 번째 JSON 객체 추출 (없으면 None)
+    응답 전체가 JSON인 경우, 앞뒤 설명문이나 마크다운 코드 블록(```json ... ```) 안에 있는 경우 모두 처리
+
+    - "{" 위치에서 JSON 디코더(raw_decode)로 중첩 객체/배열, 문자열 안의 중괄호와 이스케이프까지 한 번에 해석
+    - 해석에 실패하면 실패한 위치 이후의 다음 "{"부터 다시 시도하므로 텍스트를 한 번만 훑음 (선형 시간)
+    - 문자열 안의 줄바꿈 등 제어 문자는 허용 (strict=False)
+    """
+    if not text:
+        return None
+
+    position = text.find("{")
+    while position != -1:
+        try:
+            parsed, _ = _JSON_DECODER.raw_decode(text, position)
+            return parsed
+        except json.JSONDecodeError as e:
+            # 닫히지 않은 문자열: 뒤쪽에는 키가 있는 객체가 있을 수 없음 (응답이 max_tokens에서 잘린 경우 등)
+            if e.msg.startswith("Unterminated string"):
+                return None
+            position = text.find("{", max(e.pos, position + 1))
+    return None
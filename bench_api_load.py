@@ -0,0 +1,408 @@
+"""
+LawMate API 부하 테스트 (asyncio)
+- 가상 사용자 N명이 정해진 비율(--mix)로 로그인, 사례 생성/조회, 법령 검색, 문서 목록 조회/생성 요청을 반복
+- 경로별 처리량(초당 요청 수), 오류율, p50/p95/p99 응답 시간을 출력하고 JSON으로 저장 (--output)
+- 저장해 둔 기준 결과(--baseline)와 비교해 p95 응답 시간, 처리량, 오류율이 나빠진 경로가 있으면 종료 코드 1
+- --stand-ins: Claude API/국가법령정보 API 대역 서버와 임시 SQLite DB로 LawMate 서버를 띄워 외부 API 없이 실행
+
+실행:
+  python bench_api_load.py --stand-ins --users 20 --duration 60 --output load_result.json
+  python bench_api_load.py --stand-ins --users 20 --duration 60 --baseline load_result.json
+  python bench_api_load.py --base-url http://127.0.0.1:8000 --email load1@example.com --password ... --users 10
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+
+from bench_law_search_index import percentile
+from bench_near_duplicate import STORIES, make_description
+
+API_PREFIX = "/api/v1"
+
+# 경로 이름 -> (메서드, 경로 틀)
+# 법령 라우터는 자체 prefix("/laws")가 있어 실제 경로가 /laws/laws/search
+ROUTES = {
+    "auth_token": ("POST", "/auth/token"),
+    "create_case": ("POST", "/cases/"),
+    "read_case": ("GET", "/cases/{case_id}"),
+    "search_laws": ("GET", "/laws/laws/search"),
+    "list_documents": ("GET", "/documents/"),
+    "create_document": ("POST", "/documents/"),
+}
+
+# 기본 요청 비율 (조회가 많고, Claude를 호출하는 사례/문서 생성은 적게)
+DEFAULT_MIX = {
+    "auth_token": 1, "create_case": 2, "read_case": 5, "search_laws": 4, "list_documents": 2, "create_document": 1
+}
+
+SEARCH_QUERIES = ["임대차 보증금", "전세 계약갱신", "임금 체불", "부당 해고", "손해배상", "주택임대차보호법 대항력"]
+DOCUMENT_TYPES = ["내용증명", "지급명령 신청서", "고소장"]
+
+# 기준 결과와 비교할 때 무시하는 작은 응답 시간 차이(ms)
+MIN_REGRESSION_MS = 5.0
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """'read_case=5,search_laws=4' 형식의 요청 비율 (지정하지 않은 경로는 0)"""
+    mix = {name: 0 for name in ROUTES}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in ROUTES:
+            raise ValueError(f"알 수 없는 경로: {name} (가능한 값: {', '.join(ROUTES)})")
+        mix[name.strip()] = int(weight)
+    return mix
+
+
+def route_label(name: str) -> str:
+    method, path = ROUTES[name]
+    return f"{method} {path}"
+
+
+class LoadStats:
+    """경로별 응답 시간과 상태 코드 수집 (측정 구간 밖의 요청은 버림)"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+        self.errors: Dict[str, int] = {}
+        self.started: Optional[float] = None
+        self.ended: Optional[float] = None
+
+    def record(self, name: str, status: str, seconds: float, error: bool) -> None:
+        now = time.perf_counter()
+        if self.started is None or now < self.started or (self.ended is not None and now > self.ended):
+            return
+        self.latencies.setdefault(name, []).append(seconds * 1000)
+        statuses = self.statuses.setdefault(name, {})
+        statuses[status] = statuses.get(status, 0) + 1
+        self.errors[name] = self.errors.get(name, 0) + (1 if error else 0)
+
+    def report(self) -> Dict[str, Any]:
+        elapsed = max((self.ended or time.perf_counter()) - (self.started or 0.0), 1e-9)
+        routes = {}
+        for name, latencies in sorted(self.latencies.items()):
+            routes[route_label(name)] = summarize(latencies, self.errors[name], elapsed, self.statuses[name])
+        every = [latency for latencies in self.latencies.values() for latency in latencies]
+        total = summarize(every, sum(self.errors.values()), elapsed, {}) if every else {"requests": 0}
+        return {"elapsed_seconds": round(elapsed, 3), "total": total, "routes": routes}
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float, statuses: Dict[str, int]) -> Dict[str, Any]:
+    summary = {
+        "requests": len(latencies),
+        "errors": errors,
+        "error_rate": round(errors / len(latencies), 4),
+        "throughput": round(len(latencies) / elapsed, 3),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+    }
+    if statuses:
+        summary["statuses"] = dict(sorted(statuses.items()))
+    return summary
+
+
+class VirtualUser:
+    """로그인한 사용자 한 명의 요청 흐름 (생성한 사례 ID를 기억해 조회/문서 생성에 사용)"""
+
+    def __init__(self, client: httpx.AsyncClient, email: str, password: str, token: Optional[str],
+                 rng: random.Random, stats: LoadStats):
+        self.client = client
+        self.email = email
+        self.password = password
+        self.token = token
+        self.rng = rng
+        self.stats = stats
+        self.case_ids: List[int] = []
+
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+    async def request(self, name: str, **kwargs) -> Optional[httpx.Response]:
+        method, path = ROUTES[name]
+        url = API_PREFIX + path.format(**kwargs.pop("path_params", {}))
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers(), **kwargs)
+        except httpx.HTTPError as e:
+            self.stats.record(name, type(e).__name__, time.perf_counter() - started, error=True)
+            return None
+        self.stats.record(name, str(response.status_code), time.perf_counter() - started,
+                          error=response.status_code >= 400)
+        return response
+
+    async def login(self) -> None:
+        response = await self.request("auth_token", data={"username": self.email, "password": self.password})
+        if response is not None and response.status_code == 200:
+            self.token = response.json()["access_token"]
+
+    async def create_case(self) -> None:
+        label = self.rng.choice(list(STORIES))
+        response = await self.request("create_case", json={
+            "title": label.replace("_", " "), "description": make_description(self.rng, label), "category": "일반"
+        })
+        if response is not None and response.status_code == 200:
+            body = response.json()
+            self.case_ids.append(body.get("aCase_id") or body.get("id"))
+
+    async def run(self, name: str) -> None:
+        # 사례가 필요한 요청인데 아직 만든 사례가 없으면 사례부터 생성
+        if name in ("read_case", "create_document") and not self.case_ids:
+            name = "create_case"
+        if name == "auth_token":
+            await self.login()
+        elif name == "create_case":
+            await self.create_case()
+        elif name == "read_case":
+            await self.request("read_case", path_params={"case_id": self.rng.choice(self.case_ids)})
+        elif name == "search_laws":
+            await self.request("search_laws", params={"q": self.rng.choice(SEARCH_QUERIES)})
+        elif name == "list_documents":
+            params = {"case_id": self.rng.choice(self.case_ids)} if self.case_ids else {}
+            await self.request("list_documents", params=params)
+        elif name == "create_document":
+            await self.request("create_document", json={
+                "aCase_id": self.rng.choice(self.case_ids), "doc_type": self.rng.choice(DOCUMENT_TYPES)
+            })
+
+
+async def run_load(base_url: str, accounts: List[Dict[str, Optional[str]]], users: int = 10,
+                   duration: float = 30.0, warmup: float = 0.0, mix: Optional[Dict[str, int]] = None,
+                   think_ms: float = 0.0, seed: int = 0, timeout: float = 120.0) -> Dict[str, Any]:
+    """
+    가상 사용자 users명이 warmup + duration초 동안 요청을 반복하고, warmup 이후 duration초 동안의 결과를 집계
+    accounts: 가상 사용자가 돌아가며 쓸 계정 목록 ({"email", "password", "token"}, token이 없으면 처음에 로그인)
+    """
+    mix = mix or DEFAULT_MIX
+    names = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in names]
+    stats = LoadStats()
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        virtual_users = []
+        for number in range(users):
+            account = accounts[number % len(accounts)]
+            virtual_users.append(VirtualUser(client, account["email"], account.get("password") or "",
+                                             account.get("token"), random.Random(f"{seed}:{number}"), stats))
+        # 토큰이 없는 계정은 측정 전에 로그인
+        await asyncio.gather(*(user.login() for user in virtual_users if not user.token))
+
+        began = time.perf_counter()
+        stats.started = began + warmup
+        stats.ended = stats.started + duration
+
+        async def loop(user: VirtualUser) -> None:
+            while time.perf_counter() < stats.ended:
+                await user.run(user.rng.choices(names, weights)[0])
+                if think_ms > 0:
+                    await asyncio.sleep(user.rng.expovariate(1000.0 / think_ms))
+
+        await asyncio.gather(*(loop(user) for user in virtual_users))
+
+    report = stats.report()
+    report["config"] = {
+        "base_url": base_url, "users": users, "duration_seconds": duration, "warmup_seconds": warmup,
+        "mix": mix, "think_ms": think_ms, "seed": seed
+    }
+    return report
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.2) -> List[str]:
+    """기준 결과보다 p95가 tolerance 비율 넘게 느려졌거나, 처리량이 줄었거나, 오류율이 늘어난 경로 목록"""
+    regressions = []
+    for label, base in baseline.get("routes", {}).items():
+        current = report["routes"].get(label)
+        if current is None:
+            regressions.append(f"{label}: 이번 실행에서 요청이 없음")
+            continue
+        if current["p95_ms"] > base["p95_ms"] * (1 + tolerance) and current["p95_ms"] - base["p95_ms"] > MIN_REGRESSION_MS:
+            regressions.append(f"{label}: p95 {base['p95_ms']:.1f} ms -> {current['p95_ms']:.1f} ms")
+        if current["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(f"{label}: 처리량 {base['throughput']:.2f} -> {current['throughput']:.2f} 요청/초")
+        if current["error_rate"] > base["error_rate"] + 0.01:
+            regressions.append(f"{label}: 오류율 {base['error_rate']:.2%} -> {current['error_rate']:.2%}")
+    return regressions
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    config = report["config"]
+    print(f"=== 부하 테스트 ({config['users']}명, {config['duration_seconds']}초, {config['base_url']}) ===")
+    for label, route in list(report["routes"].items()) + [("전체", report["total"])]:
+        if not route.get("requests"):
+            continue
+        statuses = ", ".join(f"{status}: {count}" for status, count in route.get("statuses", {}).items())
+        print(
+            f"{label}: {route['requests']}건 ({route['throughput']:.2f}/초), 오류 {route['error_rate']:.2%}, "
+            f"p50 {route['p50_ms']:.1f} ms / p95 {route['p95_ms']:.1f} ms / p99 {route['p99_ms']:.1f} ms"
+            + (f" [{statuses}]" if statuses else "")
+        )
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"서버가 시작되지 않았습니다 (종료 코드 {process.returncode}): {' '.join(process.args)}")
+        with contextlib.suppress(OSError), socket.create_connection(("127.0.0.1", port), timeout=0.5):
+            return
+        time.sleep(0.1)
+    raise RuntimeError(f"서버가 {timeout:.0f}초 안에 시작되지 않았습니다: {' '.join(process.args)}")
+
+
+def create_database(path: str, accounts: List[Dict[str, Optional[str]]]) -> None:
+    """부하 테스트용 SQLite DB 생성 (API가 쓰는 테이블과 계정만)"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.db.models import ACase, ACaseLaw, ACasePrecedent, Base, Document, Law, LawArticle, Precedent, User
+
+    engine = create_engine(f"sqlite:///{path}")
+    tables = [User.__table__, ACase.__table__, Document.__table__, Law.__table__, LawArticle.__table__,
+              Precedent.__table__, ACaseLaw.__table__, ACasePrecedent.__table__]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    db = sessionmaker(bind=engine)()
+    try:
+        for account in accounts:
+            if account.get("password"):
+                from app.api.endpoints.auth import get_password_hash
+                password = get_password_hash(account["password"])
+            else:
+                password = "-"  # 토큰으로만 접속하는 계정
+            db.add(User(name=account["email"].split("@")[0], email=account["email"], password=password))
+        db.commit()
+    finally:
+        db.close()
+        engine.dispose()
+
+
+@contextlib.contextmanager
+def stand_in_stack(accounts: List[Dict[str, Optional[str]]], claude_args: Optional[List[str]] = None,
+                   law_args: Optional[List[str]] = None, app_env: Optional[Dict[str, str]] = None) -> Iterator[str]:
+    """
+    Claude/국가법령정보 대역 서버와 임시 SQLite DB를 쓰는 LawMate 서버를 띄우고 서버 주소 반환
+    claude_args / law_args: 대역 서버 실행 옵션 (예: ["--latency", "lognormal:0.8:0.5"])
+    """
+    directory = tempfile.mkdtemp(prefix="lawmate_load_")
+    database = os.path.join(directory, "lawmate.sqlite3")
+    create_database(database, accounts)
+
+    claude_port, law_port, app_port = free_port(), free_port(), free_port()
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{database}",
+        CLAUDE_API_URL=f"http://127.0.0.1:{claude_port}/v1/messages",
+        CLAUDE_API_KEY="load-test",
+        LAW_API_BASE_URL=f"http://127.0.0.1:{law_port}",
+        LAW_API_KEY="load-test",
+        LAW_INDEX_PATH=os.path.join(directory, "law_article_index.pkl"),
+        SEMANTIC_INDEX_DIR=os.path.join(directory, "semantic"),
+        ANALYSIS_CACHE_PATH=os.path.join(directory, "analysis_cache.sqlite3"),
+        MOCK_LAW_API_FIXTURE_DIR=os.path.join(directory, "fixtures"),
+        PRECEDENT_INGEST_INTERVAL_MINUTES="0",
+        **(app_env or {})
+    )
+    commands = [
+        ([sys.executable, "mock_claude_server.py", "--port", str(claude_port)] + (claude_args or []), claude_port),
+        ([sys.executable, "mock_law_api_server.py", "--port", str(law_port)] + (law_args or []), law_port),
+        ([sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(app_port), "--log-level", "warning"], app_port),
+    ]
+    processes = []
+    log = open(os.path.join(directory, "servers.log"), "w", encoding="utf-8")
+    try:
+        for command, port in commands:
+            process = subprocess.Popen(command, env=env, stdout=log, stderr=subprocess.STDOUT,
+                                       cwd=os.path.dirname(os.path.abspath(__file__)))
+            processes.append(process)
+            wait_for_port(port, process)
+        print(f"대역 서버 실행: Claude {claude_port}, 국가법령정보 {law_port}, LawMate {app_port} (로그: {log.name})")
+        yield f"http://127.0.0.1:{app_port}"
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        log.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LawMate API 부하 테스트 (경로별 처리량과 p50/p95/p99 응답 시간)')
+    parser.add_argument('--base-url', default=None, help='실행 중인 LawMate 서버 주소 (--stand-ins와 함께 쓰지 않음)')
+    parser.add_argument('--stand-ins', action='store_true', help='대역 서버와 임시 DB로 LawMate 서버를 띄워 실행')
+    parser.add_argument('--claude-args', default='', help='Claude 대역 서버 옵션 (예: "--latency lognormal:0.8:0.5 --tokens-per-second 60")')
+    parser.add_argument('--law-args', default='', help='국가법령정보 대역 서버 옵션 (예: "--corpus-laws 5000 --html-error-rate 0.02")')
+    parser.add_argument('--email', default=os.getenv("LOAD_TEST_EMAIL", "load@example.com"), help='계정 이메일 (--accounts개면 load1@..., load2@...)')
+    parser.add_argument('--password', default=os.getenv("LOAD_TEST_PASSWORD", "load-test-password"))
+    parser.add_argument('--accounts', type=int, default=1, help='가상 사용자가 나눠 쓸 계정 수')
+    parser.add_argument('--users', type=int, default=10, help='동시 가상 사용자 수')
+    parser.add_argument('--duration', type=float, default=30.0, help='측정 시간(초)')
+    parser.add_argument('--warmup', type=float, default=5.0, help='측정 전 예열 시간(초)')
+    parser.add_argument('--mix', default=None, help='요청 비율 (예: "read_case=5,search_laws=4,create_case=1")')
+    parser.add_argument('--think-ms', type=float, default=0.0, help='요청 사이 평균 대기 시간(ms, 지수 분포)')
+    parser.add_argument('--output', default=None, help='결과 JSON 저장 경로')
+    parser.add_argument('--baseline', default=None, help='비교할 기준 결과 JSON')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='허용하는 p95/처리량 변화 비율')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if bool(args.base_url) == args.stand_ins:
+        parser.error("--base-url 또는 --stand-ins 중 하나를 지정하세요.")
+
+    if args.accounts > 1:
+        name, _, domain = args.email.partition("@")
+        emails = [f"{name}{number}@{domain}" for number in range(1, args.accounts + 1)]
+    else:
+        emails = [args.email]
+    accounts = [{"email": email, "password": args.password, "token": None} for email in emails]
+    mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+
+    def run(base_url: str) -> Dict[str, Any]:
+        return asyncio.run(run_load(base_url, accounts, users=args.users, duration=args.duration,
+                                    warmup=args.warmup, mix=mix, think_ms=args.think_ms, seed=args.seed))
+
+    if args.stand_ins:
+        with stand_in_stack(accounts, args.claude_args.split(), args.law_args.split()) as base_url:
+            report = run(base_url)
+    else:
+        report = run(args.base_url)
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare_to_baseline(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n기준 결과({args.baseline}) 대비 성능 저하:")
+            for regression in regressions:
+                print(f"- {regression}")
+            sys.exit(1)
+        print(f"\n기준 결과({args.baseline}) 대비 성능 저하 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import random
+import statistics
+import time
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Base, Law, LawArticle, Precedent
+from app.services.fulltext_search import FulltextSearchService
+from bench_law_search_index import LEGAL_TERMS, make_article, percentile
+
+# 벤치마크 전용 DB에서만 실행 (테이블을 새로 만들고 합성 데이터를 저장함)
+TABLES = [Law.__table__, LawArticle.__table__, Precedent.__table__]
+FULLTEXT_INDEXES = [
+    "ALTER TABLE Law_Article ADD FULLTEXT INDEX ft_law_article_content (content, article_title) WITH PARSER ngram",
+    "ALTER TABLE Precedent ADD FULLTEXT INDEX ft_precedent_text (case_name, summary) WITH PARSER ngram",
+]
+
+def seed(session_factory, articles: int, precedents: int, rng: random.Random, is_mysql: bool):
+    db = session_factory()
+    try:
+        law_count = max(1, articles // 100)
+        db.execute(insert(Law), [
+            {"law_id": law_id, "law_code": f"{law_id:06d}", "law_name": f"합성법{law_id}", "law_type": "법률"}
+            for law_id in range(1, law_count + 1)
+        ])
+
+        rows = []
+        for article_id in range(1, articles + 1):
+            title, content = make_article(rng)
+            rows.append({"law_id": (article_id - 1) // 100 + 1, "article_number": str(article_id),
+                         "article_title": title, "content": content})
+            if len(rows) == 5000:
+                db.execute(insert(LawArticle), rows)
+                rows = []
+        if rows:
+            db.execute(insert(LawArticle), rows)
+
+        rows = []
+        for precedent_id in range(1, precedents + 1):
+            title, content = make_article(rng)
+            rows.append({"case_number": f"2024다{precedent_id}", "case_name": title, "summary": content})
+            if len(rows) == 5000:
+                db.execute(insert(Precedent), rows)
+                rows = []
+        if rows:
+            db.execute(insert(Precedent), rows)
+        db.commit()
+
+        if is_mysql:
+            for statement in FULLTEXT_INDEXES:
+                db.execute(text(statement))
+            db.commit()
+    finally:
+        db.close()
+
+class LikeSearchService(FulltextSearchService):
+    """비교 기준: FULLTEXT 색인 없이 LIKE '%검색어%' 조건으로 전체 행을 검사하여 점수 계산"""
+
+    def is_fulltext_supported(self, db) -> bool:
+        return False
+
+def measure(name, func, queries):
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        func(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+    print(f"{name}: p50 {statistics.median(latencies):.2f} ms, p95 {percentile(latencies, 0.95):.2f} ms, "
+          f"p99 {percentile(latencies, 0.99):.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description='DB FULLTEXT(ngram) 검색과 LIKE 검색 지연 시간 비교')
+    parser.add_argument('--database-url', default='sqlite://',
+                        help='벤치마크 전용 DB URL (예: mysql+pymysql://user:pw@host/lawmate_bench). 운영 DB 사용 금지')
+    parser.add_argument('--articles', type=int, default=20000, help='합성 조문 수')
+    parser.add_argument('--precedents', type=int, default=20000, help='합성 판례 수')
+    parser.add_argument('--queries', type=int, default=100, help='측정할 검색 횟수')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    is_mysql = engine.dialect.name == "mysql"
+    Base.metadata.drop_all(bind=engine, tables=list(reversed(TABLES)))
+    Base.metadata.create_all(bind=engine, tables=TABLES)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    rng = random.Random(args.seed)
+    print(f"=== 합성 데이터 저장 ({engine.dialect.name}, 조문 {args.articles}개, 판례 {args.precedents}개) ===")
+    started = time.perf_counter()
+    seed(session_factory, args.articles, args.precedents, rng, is_mysql)
+    print(f"저장 시간: {time.perf_counter() - started:.1f}초")
+    if not is_mysql:
+        print("참고: FULLTEXT를 지원하지 않는 DB이므로 FULLTEXT 경로도 LIKE 검색으로 대체됩니다.")
+
+    service = FulltextSearchService()
+    like_service = LikeSearchService()
+    queries = [rng.sample(LEGAL_TERMS, rng.randint(1, 3)) for _ in range(args.queries)]
+    db = session_factory()
+    try:
+        print(f"\n=== 검색 지연 시간 ({args.queries}회) ===")
+        measure("조문 FULLTEXT", lambda terms: service.search_articles(db, terms, limit=20), queries)
+        measure("조문 LIKE", lambda terms: like_service.search_articles(db, terms, limit=20), queries)
+        measure("판례 FULLTEXT", lambda terms: service.search_precedents(db, terms, display=20), queries)
+        measure("판례 LIKE", lambda terms: like_service.search_precedents(db, terms, display=20), queries)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
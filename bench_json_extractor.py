@@ -0,0 +1,99 @@
+import argparse
+import json
+import random
+import re
+import statistics
+import time
+
+from app.services.text_utils import extract_json_object
+from bench_law_search_index import percentile
+
+LEGAL_TERMS = ["임대인", "임차인", "보증금", "계약갱신", "손해배상", "근로자", "임금", "해고", "대항력", "우선변제권"]
+
+def legacy_extract(text):
+    """이전 ClaudeService.extract_json_from_text (전체 → 코드 블록 → 비탐욕 중괄호 정규식 순서로 시도)"""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    json_code_block = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', text)
+    if json_code_block:
+        try:
+            return json.loads(json_code_block.group(1))
+        except json.JSONDecodeError:
+            pass
+    json_braces = re.search(r'({[\s\S]*?})', text)
+    if json_braces:
+        try:
+            return json.loads(json_braces.group(1))
+        except json.JSONDecodeError:
+            pass
+    return {"raw_response": text}
+
+def make_analysis(rng: random.Random, items: int) -> dict:
+    """중첩 객체/배열이 있는 분석 결과 (문자열 안에 중괄호와 이스케이프된 따옴표 포함)"""
+    return {
+        "legal_category": "부동산/임대차",
+        "key_issues": [{
+            "issue": f"{rng.choice(LEGAL_TERMS)} 쟁점 {i}",
+            "detail": {"laws": [rng.choice(LEGAL_TERMS) for _ in range(5)], "note": "조건 {예외} 및 \"인용\" 포함"},
+            "scores": [rng.randint(0, 100) for _ in range(10)]
+        } for i in range(items)],
+        "keywords": [rng.choice(LEGAL_TERMS) for _ in range(20)],
+        "relevant_laws": ["주택임대차보호법", "민법"]
+    }
+
+def make_prose(rng: random.Random, sentences: int) -> str:
+    return " ".join(f"{rng.choice(LEGAL_TERMS)}에 관한 설명입니다." for _ in range(sentences))
+
+# 응답 형식별 텍스트 (이름, 텍스트)
+def make_cases(rng: random.Random, items: int, prose: int):
+    analysis = json.dumps(make_analysis(rng, items), ensure_ascii=False, indent=2)
+    return [
+        ("JSON만", analysis),
+        ("코드 블록", f"{make_prose(rng, prose)}\n\n```json\n{analysis}\n```\n\n{make_prose(rng, prose)}"),
+        ("설명문 + 중첩 JSON", f"{make_prose(rng, prose)}\n{analysis}\n{make_prose(rng, prose)}"),
+        ("중괄호 설명 + 코드 블록", f"형식: {{분야}}와 {{키워드}}로 답합니다. {make_prose(rng, prose)}\n```json\n{analysis}\n```"),
+        ("깨진 중괄호 반복 + JSON", "{ 분야: 미정 } " * (prose * 10) + analysis),
+        ("JSON 없음", make_prose(rng, prose * 3)),
+    ]
+
+def measure(function, text, repeat):
+    latencies = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(text)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return result, latencies
+
+def main():
+    parser = argparse.ArgumentParser(description='Claude 응답 JSON 추출 벤치마크 (이전 정규식 방식과 비교)')
+    parser.add_argument('--items', type=int, default=200, help='분석 결과의 key_issues 항목 수 (응답 길이)')
+    parser.add_argument('--prose', type=int, default=200, help='JSON 앞뒤 설명문 문장 수')
+    parser.add_argument('--repeat', type=int, default=50, help='형식별 반복 측정 횟수')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cases = make_cases(rng, args.items, args.prose)
+    expected = make_analysis(random.Random(args.seed), args.items)
+
+    print(f"=== JSON 추출 (key_issues {args.items}개, 설명문 {args.prose}문장, {args.repeat}회 반복) ===")
+    for name, text in cases:
+        legacy_result, legacy_latencies = measure(legacy_extract, text, args.repeat)
+        new_result, new_latencies = measure(extract_json_object, text, args.repeat)
+        legacy_ok = legacy_result == expected
+        new_ok = new_result == expected if name != "JSON 없음" else new_result is None
+        if name == "JSON 없음":
+            legacy_ok = "raw_response" in legacy_result
+        print(
+            f"{name} ({len(text):,}자): "
+            f"이전 p50 {statistics.median(legacy_latencies):.3f} ms / p95 {percentile(legacy_latencies, 0.95):.3f} ms "
+            f"({'성공' if legacy_ok else '실패'}), "
+            f"단일 탐색 p50 {statistics.median(new_latencies):.3f} ms / p95 {percentile(new_latencies, 0.95):.3f} ms "
+            f"({'성공' if new_ok else '실패'})"
+        )
+
+if __name__ == "__main__":
+    main()
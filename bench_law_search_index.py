@@ -0,0 +1,79 @@
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from app.services.law_search_index import LawArticleIndex
+
+# 합성 조문 생성에 사용할 법률 용어
+LEGAL_TERMS = [
+    "임대인", "임차인", "보증금", "계약갱신", "손해배상", "해지", "해제", "근로자", "사용자", "퇴직급여",
+    "임금", "해고", "정당한 사유", "대항력", "우선변제권", "확정일자", "전세권", "저당권", "채권자", "채무자",
+    "소멸시효", "부당이득", "불법행위", "위약금", "중개보수", "관리비", "원상회복", "명도", "경매", "배당",
+    "상속", "유류분", "이혼", "양육비", "재산분할", "명예훼손", "모욕", "사기", "횡령", "배임",
+    "행정처분", "과태료", "영업정지", "허가", "신고", "등록", "취소", "이의신청", "심판", "소송"
+]
+CONNECTORS = ["은", "는", "이", "가", "을", "를", "에게", "에 대하여", "의", "와"]
+ENDINGS = ["하여야 한다.", "할 수 있다.", "하지 못한다.", "으로 본다.", "에 따른다."]
+
+def make_article(rng: random.Random) -> tuple:
+    title = rng.choice(LEGAL_TERMS) + rng.choice(["의 제한", "의 효력", "의 절차", "등", "의 특례"])
+    sentences = []
+    for _ in range(rng.randint(2, 6)):
+        words = [rng.choice(LEGAL_TERMS) + rng.choice(CONNECTORS) for _ in range(rng.randint(3, 8))]
+        sentences.append(" ".join(words) + " " + rng.choice(ENDINGS))
+    return title, " ".join(sentences)
+
+def percentile(values, ratio):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+def main():
+    parser = argparse.ArgumentParser(description='법령 조문 로컬 색인 벤치마크')
+    parser.add_argument('--articles', type=int, default=100000, help='합성 조문 수')
+    parser.add_argument('--queries', type=int, default=200, help='측정할 검색 횟수')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    index = LawArticleIndex()
+    law_count = max(1, args.articles // 100)
+    for law_id in range(1, law_count + 1):
+        index.add_law(law_id, {"law_code": f"{law_id:06d}", "law_name": f"합성법{law_id}", "law_type": "법률",
+                               "promulgation_date": "", "enforcement_date": "", "link": ""})
+
+    print(f"=== 색인 생성 ({args.articles}개 조문) ===")
+    started = time.perf_counter()
+    for article_id in range(1, args.articles + 1):
+        title, content = make_article(rng)
+        index.add_document(article_id, (article_id - 1) // 100 + 1, title, content)
+    build_seconds = time.perf_counter() - started
+
+    stats = index.stats()
+    path = os.path.join(tempfile.mkdtemp(), "law_article_index.pkl")
+    index.save(path)
+    file_bytes = os.path.getsize(path)
+
+    print(f"생성 시간: {build_seconds:.1f}초")
+    print(f"바이그램 수: {stats['terms']}, 포스팅 수: {stats['postings']}")
+    print(f"포스팅 크기: {stats['posting_bytes'] / 1024 / 1024:.1f} MB, 문서 정보 크기: {stats['document_bytes'] / 1024 / 1024:.1f} MB")
+    print(f"색인 파일 크기: {file_bytes / 1024 / 1024:.1f} MB")
+
+    print(f"\n=== 검색 지연 시간 ({args.queries}회) ===")
+    queries = [" ".join(rng.sample(LEGAL_TERMS, rng.randint(1, 3))) for _ in range(args.queries)]
+    index.search(queries[0])  # 길이 정규화 캐시 생성
+
+    for name, search in (("조문 검색", lambda q: index.search(q, limit=20)),
+                         ("법령 검색", lambda q: index.search_laws(q.split(), limit=10))):
+        latencies = []
+        for query in queries:
+            started = time.perf_counter()
+            search(query)
+            latencies.append((time.perf_counter() - started) * 1000)
+        print(f"{name}: p50 {statistics.median(latencies):.2f} ms, p95 {percentile(latencies, 0.95):.2f} ms, "
+              f"p99 {percentile(latencies, 0.99):.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import argparse
+import json
+import random
+import statistics
+import time
+
+from app.services.near_duplicate_index import NearDuplicateIndex
+from bench_law_search_index import percentile
+
+# 사례 유형별 설명 틀 (같은 분야의 다른 쟁점은 표현이 많이 겹치도록 구성해 오재사용을 측정)
+STORIES = {
+    "전세보증금_미반환": [
+        "{period} 전세 계약이 {month}에 끝났는데 집주인이 보증금 {amount}을 돌려주지 않고 있습니다.",
+        "새 세입자가 구해지면 주겠다는 말만 반복하고 연락도 잘 안 됩니다.",
+        "이사를 가야 하는데 보증금을 어떻게 돌려받을 수 있을까요?",
+    ],
+    "전세_갱신거절": [
+        "{period} 전세 계약이 {month}에 끝나는데 집주인이 보증금 {amount}을 올려주지 않으면 나가라고 합니다.",
+        "계약갱신요구권을 쓰겠다고 했더니 실거주를 하겠다며 거절했습니다.",
+        "계속 살고 싶은데 집주인의 갱신 거절이 정당한가요?",
+    ],
+    "월세_수리비": [
+        "{period} 월세 계약으로 살고 있는데 {month}부터 보일러가 고장 나서 수리비 {amount}이 나왔습니다.",
+        "집주인은 세입자가 고쳐야 한다며 수리비를 주지 않겠다고 합니다.",
+        "수리비를 누가 부담해야 하나요?",
+    ],
+    "임금체불": [
+        "회사에서 {period} 일했는데 {month}부터 월급 {amount}을 받지 못했습니다.",
+        "사장님은 회사 사정이 어렵다며 조금만 기다려 달라고만 합니다.",
+        "밀린 임금을 받으려면 어떻게 해야 하나요?",
+    ],
+    "부당해고": [
+        "회사에서 {period} 일했는데 {month}에 갑자기 내일부터 나오지 말라는 통보를 받았습니다.",
+        "해고 사유도 알려주지 않았고 서면 통지도 없었습니다. 월급은 {amount}이었습니다.",
+        "부당해고로 다툴 수 있을까요?",
+    ],
+    "중고거래_사기": [
+        "{month}에 중고거래 사이트에서 노트북을 {amount}에 사기로 하고 돈을 먼저 보냈습니다.",
+        "판매자가 {period} 넘게 물건을 보내지 않고 연락도 끊겼습니다.",
+        "돈을 돌려받을 방법이 있을까요?",
+    ],
+    "층간소음": [
+        "위층 이웃의 층간소음 때문에 {period} 동안 잠을 제대로 못 자고 있습니다.",
+        "{month}부터 관리사무소에 여러 번 이야기했지만 달라지지 않았고 병원비로 {amount}을 썼습니다.",
+        "법적으로 대응할 수 있는 방법이 있나요?",
+    ],
+}
+
+PERIODS = ["1년", "2년", "3년", "6개월", "1년 반", "4년"]
+MONTHS = ["1월", "3월", "5월", "지난달", "이번 달", "작년 말"]
+AMOUNTS = ["3억 원", "2억", "5천만 원", "1억 5천만 원", "300만 원", "80만원", "250만원"]
+FILLERS = ["정말 답답합니다.", "도와주세요.", "처음 겪는 일이라 막막합니다.", "", "", ""]
+PUNCTUATION = [".", "!", "..", "?", ""]
+
+
+def make_description(rng: random.Random, label: str) -> str:
+    """사례 유형 설명 틀에 세부 값, 문장 순서, 띄어쓰기, 문장부호 변화를 준 설명 생성"""
+    values = {"period": rng.choice(PERIODS), "month": rng.choice(MONTHS), "amount": rng.choice(AMOUNTS)}
+    sentences = [sentence.format(**values) for sentence in STORIES[label]]
+    if rng.random() < 0.3:
+        sentences[0], sentences[1] = sentences[1], sentences[0]
+    if rng.random() < 0.3:
+        sentences = sentences[:-1]
+    sentences.append(rng.choice(FILLERS))
+
+    text = " ".join(sentence for sentence in sentences if sentence)
+    if rng.random() < 0.3:
+        text = text.replace(" ", "  ").replace("니다.", "니다" + rng.choice(PUNCTUATION))
+    if rng.random() < 0.3:
+        text = text.replace("있습니다", "있어요").replace("했습니다", "했어요")
+    return text
+
+
+def evaluate(index: NearDuplicateIndex, labels, queries, thresholds):
+    """기준 유사도별 재사용률과 오재사용률 (LSH 후보는 한 번만 계산)"""
+    best_matches = []
+    latencies = []
+    for label, description in queries:
+        started = time.perf_counter()
+        candidates = index.candidates(description)
+        latencies.append((time.perf_counter() - started) * 1000)
+        best_matches.append((label, candidates[0] if candidates else None))
+
+    rows = []
+    for threshold in thresholds:
+        reused = [(label, labels[match[0]]) for label, match in best_matches if match and match[1] >= threshold]
+        false_reuse = sum(1 for label, matched_label in reused if label != matched_label)
+        rows.append((threshold, len(reused) / len(queries), false_reuse / len(reused) if reused else 0.0, false_reuse))
+    return rows, latencies
+
+
+def load_cases_from_db():
+    """DB에 저장된 분석 완료 사례 (사례 ID, 설명, 법률 분야, 키워드)"""
+    from app.db.database import SessionLocal
+    from app.db.models import ACase
+
+    db = SessionLocal()
+    try:
+        cases = []
+        for case_id, description, analysis in db.query(ACase.aCase_id, ACase.description, ACase.claude_analysis).filter(
+            ACase.claude_analysis.isnot(None)
+        ):
+            try:
+                data = json.loads(analysis)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(data, dict) and data.get("keywords"):
+                cases.append((case_id, description, data.get("legal_category", ""), set(data["keywords"])))
+        return cases
+    finally:
+        db.close()
+
+
+def evaluate_db(thresholds):
+    """
+    저장된 사례로 오재사용률 측정 (각 사례를 빼고 나머지에서 찾았을 때)
+    찾은 사례와 법률 분야가 다르거나 키워드 Jaccard가 0.5 미만이면 오재사용으로 계산
+    """
+    cases = load_cases_from_db()
+    if len(cases) < 2:
+        print("분석 결과가 저장된 사례가 2건 미만입니다.")
+        return
+
+    index = NearDuplicateIndex()
+    for case_id, description, _, _ in cases:
+        index.add(case_id, description)
+    by_id = {case[0]: case for case in cases}
+
+    print(f"\n=== 저장된 사례 {len(cases)}건 (사례별로 자신을 제외하고 검색) ===")
+    matches = [(case, index.candidates(case[1], exclude=case[0])) for case in cases]
+    for threshold in thresholds:
+        reused = 0
+        false_reuse = 0
+        for (_, _, category, keywords), candidates in matches:
+            if not candidates or candidates[0][1] < threshold:
+                continue
+            reused += 1
+            _, _, matched_category, matched_keywords = by_id[candidates[0][0]]
+            overlap = len(keywords & matched_keywords) / len(keywords | matched_keywords)
+            if category != matched_category or overlap < 0.5:
+                false_reuse += 1
+        print(f"기준 {threshold:.2f}: 재사용 {reused}건 ({reused / len(cases):.1%}), "
+              f"오재사용 {false_reuse}건 ({false_reuse / reused if reused else 0:.1%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='사례 근사 중복 재사용 오프라인 평가 (기준 유사도별 재사용률/오재사용률)')
+    parser.add_argument('--cases', type=int, default=5000, help='색인할 합성 사례 수')
+    parser.add_argument('--queries', type=int, default=1000, help='새로 들어오는 합성 사례 수')
+    parser.add_argument('--db', action='store_true', help='합성 데이터 대신 DB에 저장된 사례로 평가')
+    parser.add_argument('--unseen', default="전세_갱신거절,부당해고", help='색인에서 제외할 사례 유형 (쉼표로 구분)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    thresholds = [0.5, 0.6, 0.7, 0.75, 0.8, 0.85, 0.9]
+
+    if args.db:
+        evaluate_db(thresholds)
+        return
+
+    rng = random.Random(args.seed)
+    label_names = list(STORIES)
+    # 색인에 없는 유형 (같은 분야의 다른 쟁점): 이 유형의 새 사례가 재사용되면 모두 오재사용
+    unseen = set(args.unseen.split(",")) if args.unseen else set()
+    index = NearDuplicateIndex()
+    labels = {}
+
+    started = time.perf_counter()
+    for case_id in range(1, args.cases + 1):
+        label = rng.choice([name for name in label_names if name not in unseen])
+        labels[case_id] = label
+        index.add(case_id, make_description(rng, label))
+    print(f"=== 색인 생성 ({args.cases}건): {time.perf_counter() - started:.2f}초 ===")
+
+    queries = []
+    for _ in range(args.queries):
+        label = rng.choice(label_names)
+        queries.append((label, make_description(rng, label)))
+
+    rows, latencies = evaluate(index, labels, queries, thresholds)
+    print(f"검색 지연 시간: p50 {statistics.median(latencies):.2f} ms, p95 {percentile(latencies, 0.95):.2f} ms")
+
+    print(f"\n=== 기준 유사도별 결과 (새 사례 {args.queries}건, 색인에 없는 유형: {', '.join(sorted(unseen)) or '없음'}) ===")
+    print("오재사용률 = 재사용한 사례 중 유형이 다른 사례의 결과를 가져온 비율")
+    for threshold, reuse_rate, false_rate, false_count in rows:
+        print(f"기준 {threshold:.2f}: 재사용률 {reuse_rate:.1%}, 오재사용률 {false_rate:.2%} ({false_count}건)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from app.services.semantic_index import SemanticIndex
+from bench_law_search_index import LEGAL_TERMS, make_article, percentile
+
+def main():
+    parser = argparse.ArgumentParser(description='의미 검색 색인 벤치마크 (CPU 전용)')
+    parser.add_argument('--articles', type=int, default=100000, help='합성 조문 수')
+    parser.add_argument('--queries', type=int, default=200, help='측정할 검색 횟수')
+    parser.add_argument('--batch', type=int, default=16, help='묶음 검색 시 한 번에 처리할 검색어 수')
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rows = []
+    for article_id in range(1, args.articles + 1):
+        title, content = make_article(rng)
+        rows.append((article_id, (article_id - 1) // 100 + 1, f"{title} {content}"))
+
+    path = os.path.join(tempfile.mkdtemp(), "law_articles")
+    print(f"=== 색인 생성 ({args.articles}개 조문) ===")
+    started = time.perf_counter()
+    index = SemanticIndex.build(rows, path)
+    print(f"생성 시간: {time.perf_counter() - started:.1f}초")
+    print(f"임베딩 파일 크기: {os.path.getsize(SemanticIndex._embeddings_path(path)) / 1024 / 1024:.1f} MB "
+          f"({index.document_count} x {index.embedder.dim} float32, 메모리 맵)")
+
+    queries = [" ".join(rng.sample(LEGAL_TERMS, rng.randint(2, 5))) + " 관련 문제입니다" for _ in range(args.queries)]
+    index.search(queries[0])  # 메모리 맵 페이지 로딩
+
+    print(f"\n=== 검색 지연 시간 ({args.queries}회, top-{args.k}) ===")
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        index.search(query, k=args.k)
+        latencies.append((time.perf_counter() - started) * 1000)
+    print(f"단일 검색: p50 {statistics.median(latencies):.2f} ms, p95 {percentile(latencies, 0.95):.2f} ms, "
+          f"p99 {percentile(latencies, 0.99):.2f} ms")
+
+    started = time.perf_counter()
+    for start in range(0, len(queries), args.batch):
+        index.search_batch(queries[start:start + args.batch], k=args.k)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"묶음 검색 ({args.batch}개씩): 검색어당 평균 {elapsed / len(queries):.2f} ms")
+
+    candidates = list(range(1, min(args.articles, 300) + 1))
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        index.similarities(query, candidates)
+        latencies.append((time.perf_counter() - started) * 1000)
+    print(f"후보 {len(candidates)}개 유사도: p50 {statistics.median(latencies):.2f} ms, p95 {percentile(latencies, 0.95):.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+테스트 공통 헬퍼
+pytest가 자동으로 불러옴 (테스트 파일을 스크립트로 실행할 때는 __main__에서 헬퍼 함수를 직접 넘김)
+여러 테스트 파일에서 쓰는 헬퍼는 다른 테스트 파일이 아니라 여기서 가져옴 (from conftest import ...)
+"""
+import io
+import json
+import logging
+import socket
+import threading
+import time
+from typing import Callable, List
+
+import pytest
+import uvicorn
+from sqlalchemy import Table, create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.core.structured_logging import setup_logging, shutdown_logging
+from app.db.models import Base, User, ACase, Law, LawArticle, Precedent, ACaseLaw, ACasePrecedent
+from app.services.claude_service import ClaudeService
+from app.services.law_data_service import LawDataService
+
+# 상담 테스트용 사례 설명 (같은 쟁점 / 다른 쟁점)
+DESCRIPTION = "2년 전세 계약이 지난달에 끝났는데 집주인이 보증금 3억 원을 돌려주지 않고 있습니다. 어떻게 해야 하나요?"
+DIFFERENT = "회사에서 3년 일했는데 지난달부터 월급을 받지 못했습니다. 밀린 임금을 받으려면 어떻게 해야 하나요?"
+
+def new_session_factory(tables: List[Table]) -> Callable[[], Session]:
+    """지정한 테이블만 만든 메모리 SQLite 세션 팩토리 (여러 스레드에서 같은 DB를 보도록 연결 하나를 공유)"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine, tables=tables)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture
+def session_factory_for():
+    """
+    테이블 목록을 받아 메모리 SQLite 세션 팩토리를 만드는 함수
+    예: session_factory = session_factory_for([Precedent.__table__])
+    테스트가 끝나면 만든 엔진을 정리
+    """
+    engines = []
+
+    def make(tables: List[Table]) -> Callable[[], Session]:
+        session_factory = new_session_factory(tables)
+        engines.append(session_factory.kw["bind"])
+        return session_factory
+
+    yield make
+    for engine in engines:
+        engine.dispose()
+
+def make_session() -> Session:
+    """상담 처리에 필요한 테이블(사용자, 사례, 법령/조문, 판례, 사례 연결)을 만든 메모리 SQLite 세션"""
+    tables = [User.__table__, ACase.__table__, Law.__table__, LawArticle.__table__, Precedent.__table__,
+              ACaseLaw.__table__, ACasePrecedent.__table__]
+    return new_session_factory(tables)()
+
+def start_server(app):
+    """로컬 대역 서버를 빈 포트에서 실행하고 (서버, 주소) 반환"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}/v1/messages"
+
+def make_service(url):
+    """Claude 대역 서버 주소로 호출하는 ClaudeService (분석 결과 캐시 사용 안 함)"""
+    service = ClaudeService()
+    service.use_analysis_cache = False
+    service.api_key = "test-key"
+    service.base_url = url
+    return service
+
+def make_law_service(url):
+    """LAW_API_BASE_URL을 대역 서버 주소로 바꿔 만든 LawDataService (재시도 대기 없음)"""
+    original_base_url = settings.LAW_API_BASE_URL
+    settings.LAW_API_BASE_URL = url.split("/v1/")[0]
+    try:
+        service = LawDataService()
+    finally:
+        settings.LAW_API_BASE_URL = original_base_url
+    service.law_api_key = "test"
+    service.retry_delay = 0
+    return service
+
+class StubClaudeService:
+    """분석 호출 횟수를 세는 Claude 서비스 대역"""
+
+    def __init__(self):
+        self.analyze_calls = 0
+
+    async def analyze_legal_issue(self, description):
+        self.analyze_calls += 1
+        return {"legal_category": "부동산/임대차", "keywords": ["보증금", "반환", "임대차"]}
+
+    async def generate_legal_consultation(self, user_description, laws, cases):
+        return "상담 답변"
+
+class capture_logs:
+    """app 로거 출력을 메모리로 모음 (끝나면 원래 설정으로 복구)"""
+
+    def __init__(self, level=logging.INFO):
+        self.level = level
+        self.stream = io.StringIO()
+
+    def __enter__(self):
+        shutdown_logging()
+        setup_logging(self.stream)
+        logging.getLogger("app").setLevel(self.level)
+        return self
+
+    def __exit__(self, *args):
+        shutdown_logging()  # 대기열에 남은 로그까지 출력
+        setup_logging()
+
+    def entries(self):
+        return [json.loads(line) for line in self.stream.getvalue().splitlines() if line]
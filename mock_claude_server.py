@@ -0,0 +1,465 @@
+"""
+Claude Messages API 로컬 대역 서버 (테스트용)
+- POST /v1/messages 요청 형식(헤더, model, max_tokens, messages, system 블록, cache_control)을 검사
+- cache_control이 지정된 system 앞부분을 기억해 두고 usage에 캐시 생성/읽기 토큰 수를 채워 응답
+- 받은 요청은 app.state.requests에 저장 (테스트에서 요청 형식 확인용)
+- Message Batches API: POST /v1/messages/batches, GET /v1/messages/batches/{id}, GET /v1/messages/batches/{id}/results
+  (각 요청의 params를 /v1/messages와 같은 기준으로 검사, 결과는 JSONL)
+- 부하 테스트용 응답 특성 (StandInProfile): 첫 토큰 지연 시간 분포, 출력 토큰 생성 속도, 429/5xx 응답 비율,
+  "stream": true 요청은 SSE 이벤트(message_start ~ message_stop)로 응답
+  같은 seed면 같은 요청(본문, 몇 번째 시도인지)에 항상 같은 응답/지연 시간/오류를 돌려줌
+- GET /mock/stats: 받은 요청 수, 오류 주입 횟수, 동시 처리 중인 요청 수(최대값 포함)
+
+실행: python mock_claude_server.py --latency lognormal:0.8:0.5 --tokens-per-second 60 --rate-limit-rate 0.05
+      (CLAUDE_API_URL=http://127.0.0.1:8001/v1/messages 로 설정 후 서버 실행)
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+from app.services.text_utils import estimate_tokens
+
+# 실제 API와 같이 이보다 짧은 앞부분은 캐시하지 않음
+DEFAULT_MIN_CACHE_TOKENS = 1024
+
+# Message Batches API 제한
+MAX_BATCH_REQUESTS = 100000
+CUSTOM_ID_PATTERN = re.compile(r"^[a-zA-Z0-9_-]{1,64}$")
+
+ANALYSIS_RESPONSE = {
+    "legal_category": "부동산/임대차",
+    "key_issues": ["임대차 보증금 반환", "임차권등기명령"],
+    "keywords": ["보증금", "반환", "임차권등기", "주택임대차보호법"],
+    "relevant_laws": ["주택임대차보호법", "민법"]
+}
+
+CONSULTATION_RESPONSE = "# 법률 상담 답변\n\n## 1. 문제 요약\n로컬 대역 서버의 답변입니다."
+
+# consultation_tokens만큼 답변을 늘릴 때 반복하는 문단
+CONSULTATION_FILLER = "\n\n## {n}. 세부 안내\n임대인에게 내용증명을 보내고, 반환되지 않으면 임차권등기명령과 지급명령을 차례로 검토하세요."
+
+# 스트리밍 응답의 content_block_delta 한 번에 보내는 글자 수
+STREAM_CHUNK_CHARS = 20
+
+
+@dataclass
+class StandInProfile:
+    """
+    부하 테스트용 응답 특성
+    latency: 첫 토큰까지의 지연 시간 분포 ("fixed:초", "uniform:최소:최대", "lognormal:중앙값:sigma")
+    tokens_per_second: 출력 토큰 생성 속도 (0이면 첫 토큰 이후 바로 전체 응답)
+    rate_limit_rate: 429(rate_limit_error) 응답 비율 (retry-after 헤더 포함)
+    server_error_rate: 5xx 응답 비율 (500 api_error, 529 overloaded_error 절반씩)
+    consultation_tokens: 상담 답변 길이 (추정 토큰 수, 0이면 기본 답변, max_tokens를 넘으면 잘라서 stop_reason=max_tokens)
+    seed: 지연 시간/오류 주입 난수 시드
+    """
+    latency: str = "fixed:0"
+    tokens_per_second: float = 0.0
+    rate_limit_rate: float = 0.0
+    server_error_rate: float = 0.0
+    retry_after: float = 1.0
+    consultation_tokens: int = 0
+    seed: int = 0
+
+    def __post_init__(self):
+        self.sample_latency(random.Random(0))  # 잘못된 분포 지정은 시작할 때 오류
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """첫 토큰까지의 지연 시간(초) 추출"""
+        kind, *values = self.latency.split(":")
+        try:
+            numbers = [float(value) for value in values]
+            if kind == "fixed" and len(numbers) == 1:
+                return max(numbers[0], 0.0)
+            if kind == "uniform" and len(numbers) == 2:
+                return max(rng.uniform(numbers[0], numbers[1]), 0.0)
+            if kind == "lognormal" and len(numbers) == 2 and numbers[0] > 0:
+                return rng.lognormvariate(math.log(numbers[0]), numbers[1])
+        except ValueError:
+            pass
+        raise ValueError(f"지연 시간 분포 형식 오류: {self.latency} (fixed:초, uniform:최소:최대, lognormal:중앙값:sigma)")
+
+    def generation_seconds(self, output_tokens: int) -> float:
+        """출력 토큰 생성에 걸리는 시간(초)"""
+        return output_tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    @classmethod
+    def from_env(cls) -> "StandInProfile":
+        """MOCK_CLAUDE_* 환경 변수로 설정 (uvicorn mock_claude_server:app 으로 실행할 때 사용)"""
+        return cls(
+            latency=os.getenv("MOCK_CLAUDE_LATENCY", "fixed:0"),
+            tokens_per_second=float(os.getenv("MOCK_CLAUDE_TOKENS_PER_SECOND", "0")),
+            rate_limit_rate=float(os.getenv("MOCK_CLAUDE_RATE_LIMIT_RATE", "0")),
+            server_error_rate=float(os.getenv("MOCK_CLAUDE_SERVER_ERROR_RATE", "0")),
+            retry_after=float(os.getenv("MOCK_CLAUDE_RETRY_AFTER", "1")),
+            consultation_tokens=int(os.getenv("MOCK_CLAUDE_CONSULTATION_TOKENS", "0")),
+            seed=int(os.getenv("MOCK_CLAUDE_SEED", "0"))
+        )
+
+
+def error_response(status_code: int, error_type: str, message: str,
+                   headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={"type": "error", "error": {"type": error_type, "message": message}},
+        headers=headers
+    )
+
+
+def validate_request(headers, body: Any) -> Optional[Tuple[int, str, str]]:
+    """요청 형식 검사 (문제가 있으면 (상태 코드, 오류 종류, 메시지), 없으면 None)"""
+    if not headers.get("x-api-key"):
+        return 401, "authentication_error", "x-api-key 헤더가 없습니다."
+    if not headers.get("anthropic-version"):
+        return 400, "invalid_request_error", "anthropic-version 헤더가 없습니다."
+    if not isinstance(body, dict):
+        return 400, "invalid_request_error", "요청 본문은 JSON 객체여야 합니다."
+    if not isinstance(body.get("model"), str) or not body["model"]:
+        return 400, "invalid_request_error", "model: 필수 문자열입니다."
+    if not isinstance(body.get("max_tokens"), int) or body["max_tokens"] <= 0:
+        return 400, "invalid_request_error", "max_tokens: 양의 정수여야 합니다."
+    if "stream" in body and not isinstance(body["stream"], bool):
+        return 400, "invalid_request_error", "stream: true 또는 false여야 합니다."
+
+    messages = body.get("messages")
+    if not isinstance(messages, list) or not messages:
+        return 400, "invalid_request_error", "messages: 비어 있지 않은 목록이어야 합니다."
+    for message in messages:
+        if not isinstance(message, dict) or message.get("role") not in ("user", "assistant"):
+            return 400, "invalid_request_error", "messages: role은 user 또는 assistant여야 합니다."
+        if not isinstance(message.get("content"), (str, list)):
+            return 400, "invalid_request_error", "messages: content는 문자열 또는 블록 목록이어야 합니다."
+
+    system = body.get("system")
+    if system is not None and not isinstance(system, str):
+        if not isinstance(system, list):
+            return 400, "invalid_request_error", "system: 문자열 또는 블록 목록이어야 합니다."
+        for block in system:
+            if not isinstance(block, dict) or block.get("type") != "text" or not isinstance(block.get("text"), str):
+                return 400, "invalid_request_error", "system: 각 블록은 type=text와 text가 필요합니다."
+            cache_control = block.get("cache_control")
+            if cache_control is not None and cache_control != {"type": "ephemeral"}:
+                return 400, "invalid_request_error", "system.cache_control: type은 ephemeral이어야 합니다."
+    return None
+
+
+def text_of(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    return "".join(block.get("text", "") for block in content if isinstance(block, dict))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """추정 토큰 수가 max_tokens 이하가 되도록 뒤를 자름"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low]
+
+
+def sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def system_blocks(body: Dict[str, Any]) -> List[Dict[str, Any]]:
+    system = body.get("system")
+    if system is None:
+        return []
+    if isinstance(system, str):
+        return [{"type": "text", "text": system}]
+    return system
+
+
+def create_app(min_cache_tokens: int = DEFAULT_MIN_CACHE_TOKENS, batch_polls: int = 1,
+               profile: Optional[StandInProfile] = None) -> FastAPI:
+    """
+    min_cache_tokens: 캐시할 최소 앞부분 토큰 수
+    batch_polls: 배치가 처리 완료로 바뀌기 전까지 처리 중으로 응답할 상태 조회 횟수
+    profile: 지연 시간/토큰 생성 속도/오류 주입 설정 (없으면 지연과 오류 없이 바로 응답)
+    """
+    profile = profile or StandInProfile()
+    app = FastAPI(title="Claude API 대역 서버")
+    app.state.profile = profile
+    app.state.attempts = {}  # 요청 본문 해시 -> 받은 횟수 (재시도마다 다른 난수 사용)
+    app.state.stats = {
+        "requests": 0, "succeeded": 0, "streamed": 0, "rate_limited": 0, "server_errors": 0,
+        "in_flight": 0, "max_in_flight": 0
+    }
+    app.state.requests = []  # 받은 요청 (headers, body)
+    app.state.cache = set()  # 캐시된 앞부분 해시
+    app.state.batch_requests = []  # 받은 배치 생성 요청 (headers, body)
+    app.state.batches = {}  # 배치 ID -> {"batch": 배치 정보, "results": 결과 목록, "polls": 상태 조회 횟수}
+    app.state.failed_custom_ids = set()  # 배치 결과를 errored로 응답할 custom_id
+
+    def request_rng(body: Dict[str, Any]) -> random.Random:
+        """요청 본문과 시도 횟수로 정해지는 난수 생성기 (같은 seed면 요청 순서와 관계없이 같은 결과)"""
+        key = hashlib.sha256(json.dumps(body, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+        attempt = app.state.attempts.get(key, 0)
+        app.state.attempts[key] = attempt + 1
+        return random.Random(f"{profile.seed}:{key}:{attempt}")
+
+    def injected_error(rng: random.Random) -> Optional[JSONResponse]:
+        """설정한 비율로 429 / 500 / 529 응답"""
+        draw = rng.random()
+        if draw < profile.rate_limit_rate:
+            app.state.stats["rate_limited"] += 1
+            return error_response(429, "rate_limit_error", "대역 서버 요청 한도 초과",
+                                  headers={"retry-after": f"{profile.retry_after:g}"})
+        if draw < profile.rate_limit_rate + profile.server_error_rate:
+            app.state.stats["server_errors"] += 1
+            if rng.random() < 0.5:
+                return error_response(500, "api_error", "대역 서버 내부 오류")
+            return error_response(529, "overloaded_error", "대역 서버 과부하")
+        return None
+
+    def response_text(body: Dict[str, Any], blocks: List[Dict[str, Any]]) -> str:
+        """JSON 응답을 요구하는 지시문이면 분석 결과 형식, 아니면 상담 답변 형식 (consultation_tokens만큼 늘림)"""
+        instructions = "".join(block["text"] for block in blocks) + text_of(body["messages"][0]["content"])
+        if "JSON" in instructions:
+            return json.dumps(ANALYSIS_RESPONSE, ensure_ascii=False)
+
+        text = CONSULTATION_RESPONSE
+        section = 2
+        while estimate_tokens(text) < profile.consultation_tokens:
+            text += CONSULTATION_FILLER.format(n=section)
+            section += 1
+        return text
+
+    def message_response(body: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+        """검사를 통과한 요청 본문에 대한 Messages API 응답 (캐시 토큰 수 포함)"""
+        # cache_control이 지정된 마지막 블록까지가 캐시 대상 앞부분
+        blocks = system_blocks(body)
+        cached_until = max((i + 1 for i, block in enumerate(blocks) if block.get("cache_control")), default=0)
+        prefix = "".join(block["text"] for block in blocks[:cached_until])
+        rest = "".join(block["text"] for block in blocks[cached_until:])
+        rest += "".join(text_of(message["content"]) for message in body["messages"])
+
+        prefix_tokens = estimate_tokens(prefix)
+        cache_read_tokens = cache_creation_tokens = 0
+        input_tokens = estimate_tokens(rest)
+        if prefix and prefix_tokens >= min_cache_tokens:
+            key = hashlib.sha256(f"{body['model']}\n{prefix}".encode("utf-8")).hexdigest()
+            if key in app.state.cache:
+                cache_read_tokens = prefix_tokens
+            else:
+                app.state.cache.add(key)
+                cache_creation_tokens = prefix_tokens
+        else:
+            input_tokens += prefix_tokens
+
+        full_text = response_text(body, blocks)
+        text = truncate_to_tokens(full_text, body["max_tokens"])
+
+        return {
+            "id": f"msg_mock_{rng.getrandbits(96):024x}",
+            "type": "message",
+            "role": "assistant",
+            "model": body["model"],
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn" if text == full_text else "max_tokens",
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": input_tokens,
+                "cache_creation_input_tokens": cache_creation_tokens,
+                "cache_read_input_tokens": cache_read_tokens,
+                "output_tokens": estimate_tokens(text)
+            }
+        }
+
+    @app.post("/v1/messages")
+    async def create_message(request: Request):
+        try:
+            body = await request.json()
+        except json.JSONDecodeError:
+            return error_response(400, "invalid_request_error", "요청 본문이 JSON이 아닙니다.")
+        app.state.requests.append((dict(request.headers), body))
+
+        problem = validate_request(request.headers, body)
+        if problem:
+            return error_response(*problem)
+
+        stats = app.state.stats
+        stats["requests"] += 1
+        rng = request_rng(body)
+        error = injected_error(rng)
+        if error is not None:
+            return error
+
+        message = message_response(body, rng)
+        first_token_seconds = profile.sample_latency(rng)
+        if body.get("stream"):
+            stats["streamed"] += 1
+            return StreamingResponse(stream_events(message, first_token_seconds), media_type="text/event-stream")
+
+        start_request()
+        try:
+            await asyncio.sleep(first_token_seconds + profile.generation_seconds(message["usage"]["output_tokens"]))
+        finally:
+            stats["in_flight"] -= 1
+        stats["succeeded"] += 1
+        return message
+
+    def start_request() -> None:
+        stats = app.state.stats
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+
+    async def stream_events(message: Dict[str, Any], first_token_seconds: float) -> AsyncIterator[str]:
+        """Messages API 스트리밍 이벤트 (출력 토큰 생성 속도에 맞춰 text_delta 전송)"""
+        stats = app.state.stats
+        start_request()
+        try:
+            await asyncio.sleep(first_token_seconds)
+            started = dict(message, content=[], stop_reason=None, usage=dict(message["usage"], output_tokens=1))
+            yield sse("message_start", {"type": "message_start", "message": started})
+            yield sse("content_block_start", {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}})
+            yield sse("ping", {"type": "ping"})
+
+            text = message["content"][0]["text"]
+            for position in range(0, len(text), STREAM_CHUNK_CHARS):
+                chunk = text[position:position + STREAM_CHUNK_CHARS]
+                await asyncio.sleep(profile.generation_seconds(estimate_tokens(chunk)))
+                yield sse("content_block_delta", {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": chunk}})
+
+            yield sse("content_block_stop", {"type": "content_block_stop", "index": 0})
+            yield sse("message_delta", {
+                "type": "message_delta",
+                "delta": {"stop_reason": message["stop_reason"], "stop_sequence": None},
+                "usage": {"output_tokens": message["usage"]["output_tokens"]}
+            })
+            yield sse("message_stop", {"type": "message_stop"})
+            stats["succeeded"] += 1
+        finally:
+            stats["in_flight"] -= 1
+
+    @app.get("/mock/stats")
+    async def mock_stats():
+        return app.state.stats
+
+    @app.post("/v1/messages/batches")
+    async def create_batch(request: Request):
+        try:
+            body = await request.json()
+        except json.JSONDecodeError:
+            return error_response(400, "invalid_request_error", "요청 본문이 JSON이 아닙니다.")
+        app.state.batch_requests.append((dict(request.headers), body))
+
+        requests = body.get("requests") if isinstance(body, dict) else None
+        if not isinstance(requests, list) or not requests:
+            return error_response(400, "invalid_request_error", "requests: 비어 있지 않은 목록이어야 합니다.")
+        if len(requests) > MAX_BATCH_REQUESTS:
+            return error_response(400, "invalid_request_error", f"requests: 최대 {MAX_BATCH_REQUESTS}건입니다.")
+
+        custom_ids = set()
+        for position, item in enumerate(requests):
+            custom_id = item.get("custom_id") if isinstance(item, dict) else None
+            if not isinstance(custom_id, str) or not CUSTOM_ID_PATTERN.match(custom_id):
+                return error_response(400, "invalid_request_error", f"requests.{position}.custom_id: 영문/숫자/_/- 1~64자여야 합니다.")
+            if custom_id in custom_ids:
+                return error_response(400, "invalid_request_error", f"requests.{position}.custom_id: 중복된 값입니다.")
+            custom_ids.add(custom_id)
+            problem = validate_request(request.headers, item.get("params"))
+            if problem:
+                status_code, error_type, message = problem
+                return error_response(status_code, error_type, f"requests.{position}.params: {message}")
+
+        # 결과는 바로 만들어 두고, 상태 조회가 batch_polls번 있은 뒤에 처리 완료로 표시
+        results = []
+        for item in requests:
+            if item["custom_id"] in app.state.failed_custom_ids:
+                result = {"type": "errored", "error": {"type": "error", "error": {"type": "api_error", "message": "대역 서버 오류"}}}
+            else:
+                result = {"type": "succeeded", "message": message_response(item["params"], request_rng(item["params"]))}
+            results.append({"custom_id": item["custom_id"], "result": result})
+
+        now = datetime.now(timezone.utc)
+        batch = {
+            "id": f"msgbatch_mock_{random.getrandbits(96):024x}",
+            "type": "message_batch",
+            "processing_status": "in_progress",
+            "request_counts": {"processing": len(requests), "succeeded": 0, "errored": 0, "canceled": 0, "expired": 0},
+            "ended_at": None,
+            "created_at": now.isoformat(),
+            "expires_at": (now + timedelta(hours=24)).isoformat(),
+            "cancel_initiated_at": None,
+            "results_url": None
+        }
+        app.state.batches[batch["id"]] = {"batch": batch, "results": results, "polls": 0}
+        return batch
+
+    @app.get("/v1/messages/batches/{batch_id}")
+    async def retrieve_batch(batch_id: str, request: Request):
+        entry = app.state.batches.get(batch_id)
+        if entry is None:
+            return error_response(404, "not_found_error", f"배치를 찾을 수 없습니다: {batch_id}")
+
+        entry["polls"] += 1
+        batch = entry["batch"]
+        if batch["processing_status"] != "ended" and entry["polls"] > batch_polls:
+            succeeded = sum(1 for line in entry["results"] if line["result"]["type"] == "succeeded")
+            batch["processing_status"] = "ended"
+            batch["ended_at"] = datetime.now(timezone.utc).isoformat()
+            batch["request_counts"] = {
+                "processing": 0, "succeeded": succeeded, "errored": len(entry["results"]) - succeeded,
+                "canceled": 0, "expired": 0
+            }
+            batch["results_url"] = f"{str(request.base_url).rstrip('/')}/v1/messages/batches/{batch_id}/results"
+        return batch
+
+    @app.get("/v1/messages/batches/{batch_id}/results")
+    async def batch_results(batch_id: str):
+        entry = app.state.batches.get(batch_id)
+        if entry is None:
+            return error_response(404, "not_found_error", f"배치를 찾을 수 없습니다: {batch_id}")
+        if entry["batch"]["processing_status"] != "ended":
+            return error_response(400, "invalid_request_error", "아직 처리 중인 배치입니다.")
+        lines = "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in entry["results"])
+        return PlainTextResponse(lines, media_type="application/x-jsonl")
+
+    return app
+
+
+app = create_app(int(os.getenv("MOCK_CLAUDE_MIN_CACHE_TOKENS", str(DEFAULT_MIN_CACHE_TOKENS))), profile=StandInProfile.from_env())
+
+if __name__ == "__main__":
+    defaults = StandInProfile.from_env()
+    parser = argparse.ArgumentParser(description='Claude Messages API 로컬 대역 서버')
+    parser.add_argument('--port', type=int, default=int(os.getenv("MOCK_CLAUDE_PORT", "8001")))
+    parser.add_argument('--min-cache-tokens', type=int, default=int(os.getenv("MOCK_CLAUDE_MIN_CACHE_TOKENS", str(DEFAULT_MIN_CACHE_TOKENS))))
+    parser.add_argument('--latency', default=defaults.latency, help='첫 토큰 지연 시간 분포 (fixed:초, uniform:최소:최대, lognormal:중앙값:sigma)')
+    parser.add_argument('--tokens-per-second', type=float, default=defaults.tokens_per_second, help='출력 토큰 생성 속도 (0이면 바로 응답)')
+    parser.add_argument('--rate-limit-rate', type=float, default=defaults.rate_limit_rate, help='429 응답 비율')
+    parser.add_argument('--server-error-rate', type=float, default=defaults.server_error_rate, help='500/529 응답 비율')
+    parser.add_argument('--retry-after', type=float, default=defaults.retry_after, help='429 응답의 retry-after(초)')
+    parser.add_argument('--consultation-tokens', type=int, default=defaults.consultation_tokens, help='상담 답변 길이(추정 토큰 수)')
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    args = parser.parse_args()
+
+    profile = StandInProfile(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        rate_limit_rate=args.rate_limit_rate,
+        server_error_rate=args.server_error_rate,
+        retry_after=args.retry_after,
+        consultation_tokens=args.consultation_tokens,
+        seed=args.seed
+    )
+    uvicorn.run(create_app(args.min_cache_tokens, profile=profile), host="127.0.0.1", port=args.port)
@@ -0,0 +1,432 @@
+"""
+국가법령정보센터 Open API 로컬 대역 서버 (테스트/부하 테스트용)
+- GET /DRF/lawSearch.do (target=law, article, prec), GET /DRF/lawService.do (target=law, prec)
+- 기록해 둔 XML(fixture)이 있으면 요청 파라미터(OC, type 제외)로 찾아 그대로 응답
+  fixture 디렉터리의 index.json: {"lawSearch.do?display=10&query=임대차&target=law": "파일명.xml", ...}
+- fixture가 없으면 합성 법령/판례 말뭉치로 XML을 만들어 응답 (corpus_laws, articles_per_law, corpus_precedents)
+  같은 seed/말뭉치 크기면 항상 같은 법령 목록과 조문, 판례를 만듦
+- --record-upstream을 지정하면 fixture가 없는 요청을 실제 API로 보내 응답을 fixture로 저장한 뒤 응답
+- 부하 테스트용 응답 특성 (LawStandInProfile): 지연 시간 분포, HTML 오류 페이지 비율, 응답 지연(타임아웃) 비율
+- GET /mock/stats: 받은 요청 수, 응답 종류별 횟수, 동시 처리 중인 요청 수(최대값 포함)
+
+실행: python mock_law_api_server.py --corpus-laws 5000 --latency lognormal:0.3:0.5 --html-error-rate 0.02
+      (LAW_API_BASE_URL=http://127.0.0.1:8002 로 설정 후 서버 실행)
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
+from xml.sax.saxutils import escape
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, Response
+
+from mock_claude_server import StandInProfile
+
+DEFAULT_FIXTURE_DIR = "fixtures/law_api"
+FIXTURE_INDEX = "index.json"
+
+# fixture를 찾을 때 제외하는 파라미터 (기관코드, 응답 형식)
+IGNORED_PARAMS = {"OC", "type"}
+
+# 합성 법령명 = 분야 + 종류 (조합을 다 쓰면 뒤에 번호를 붙임)
+LAW_TOPICS = [
+    "주택임대차", "상가건물 임대차", "근로기준", "최저임금", "개인정보", "전자상거래 등에서의 소비자",
+    "가사소송", "채무자 회생 및 파산", "소액사건심판", "도로교통", "국민건강보험", "부동산 거래신고 등에 관한"
+]
+LAW_KINDS = ["보호법", "법", "법 시행령", "법 시행규칙"]
+ARTICLE_TITLES = ["목적", "정의", "적용범위", "대항력 등", "보증금의 회수", "계약의 갱신", "손해배상", "벌칙"]
+ARTICLE_TERMS = ["임대인", "임차인", "보증금", "근로자", "사용자", "임금", "손해배상", "계약갱신", "우선변제권", "대항력"]
+COURTS = ["대법원", "서울고등법원", "서울중앙지방법원", "수원지방법원", "부산지방법원"]
+CASE_NAMES = ["보증금반환", "임대차보증금", "손해배상(기)", "해고무효확인", "임금", "건물명도", "부당이득금"]
+CASE_MARKS = ["다", "가단", "가합", "나", "두"]
+
+HTML_ERROR_PAGE = (
+    "<!DOCTYPE html>\n<html><head><title>국가법령정보센터</title></head>"
+    "<body><h2>일시적인 오류가 발생했습니다.</h2><p>잠시 후 다시 시도해 주세요.</p></body></html>"
+)
+
+
+@dataclass
+class LawStandInProfile:
+    """
+    부하 테스트용 응답 특성
+    latency: 응답 지연 시간 분포 ("fixed:초", "uniform:최소:최대", "lognormal:중앙값:sigma")
+    html_error_rate: 200 상태 코드와 함께 HTML 오류 페이지로 응답하는 비율 (실제 API가 장애 시 돌려주는 형태)
+    timeout_rate: timeout_seconds 동안 응답하지 않는 비율 (클라이언트 응답 대기 시간 초과 재현)
+    corpus_laws / articles_per_law / corpus_precedents: 합성 말뭉치 크기
+    seed: 지연 시간/오류 주입/합성 말뭉치 난수 시드
+    """
+    latency: str = "fixed:0"
+    html_error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    timeout_seconds: float = 60.0
+    corpus_laws: int = 100
+    articles_per_law: int = 20
+    corpus_precedents: int = 1000
+    seed: int = 0
+
+    def __post_init__(self):
+        self.sample_latency(random.Random(0))  # 잘못된 분포 지정은 시작할 때 오류
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """응답 지연 시간(초) 추출 (Claude 대역 서버와 같은 분포 형식)"""
+        return StandInProfile(latency=self.latency).sample_latency(rng)
+
+    @classmethod
+    def from_env(cls) -> "LawStandInProfile":
+        """MOCK_LAW_API_* 환경 변수로 설정 (uvicorn mock_law_api_server:app 으로 실행할 때 사용)"""
+        return cls(
+            latency=os.getenv("MOCK_LAW_API_LATENCY", "fixed:0"),
+            html_error_rate=float(os.getenv("MOCK_LAW_API_HTML_ERROR_RATE", "0")),
+            timeout_rate=float(os.getenv("MOCK_LAW_API_TIMEOUT_RATE", "0")),
+            timeout_seconds=float(os.getenv("MOCK_LAW_API_TIMEOUT_SECONDS", "60")),
+            corpus_laws=int(os.getenv("MOCK_LAW_API_CORPUS_LAWS", "100")),
+            articles_per_law=int(os.getenv("MOCK_LAW_API_ARTICLES_PER_LAW", "20")),
+            corpus_precedents=int(os.getenv("MOCK_LAW_API_CORPUS_PRECEDENTS", "1000")),
+            seed=int(os.getenv("MOCK_LAW_API_SEED", "0"))
+        )
+
+
+def fixture_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """fixture 조회 키 (엔드포인트 + OC/type을 뺀 파라미터를 이름순으로 정렬)"""
+    items = sorted((name, str(value)) for name, value in params.items() if name not in IGNORED_PARAMS)
+    return f"{endpoint}?{urlencode(items)}"
+
+
+class FixtureStore:
+    """fixture 디렉터리 (index.json + XML 파일) 읽기/기록"""
+
+    def __init__(self, directory: Optional[str]):
+        self.directory = directory
+        self.index: Dict[str, str] = {}
+        if directory and os.path.exists(os.path.join(directory, FIXTURE_INDEX)):
+            with open(os.path.join(directory, FIXTURE_INDEX), encoding="utf-8") as file:
+                self.index = json.load(file)
+
+    def load(self, key: str) -> Optional[str]:
+        filename = self.index.get(key)
+        if filename is None:
+            return None
+        with open(os.path.join(self.directory, filename), encoding="utf-8") as file:
+            return file.read()
+
+    def save(self, key: str, xml_text: str) -> None:
+        if not self.directory:
+            raise ValueError("fixture 디렉터리가 지정되지 않았습니다.")
+        os.makedirs(self.directory, exist_ok=True)
+        filename = f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]}.xml"
+        with open(os.path.join(self.directory, filename), "w", encoding="utf-8") as file:
+            file.write(xml_text)
+        self.index[key] = filename
+        index_path = os.path.join(self.directory, FIXTURE_INDEX)
+        with open(f"{index_path}.tmp", "w", encoding="utf-8") as file:
+            json.dump(self.index, file, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(f"{index_path}.tmp", index_path)
+
+
+class SyntheticCorpus:
+    """seed로 정해지는 합성 법령/조문/판례 말뭉치 (목록은 처음 검색할 때 한 번 만들고, 조문은 요청마다 만듦)"""
+
+    def __init__(self, profile: LawStandInProfile):
+        self.profile = profile
+        self._laws: Optional[List[Dict[str, str]]] = None
+        self._precedents: Optional[List[Dict[str, str]]] = None
+
+    def laws(self) -> List[Dict[str, str]]:
+        if self._laws is None:
+            self._laws = [self.law(number) for number in range(self.profile.corpus_laws)]
+        return self._laws
+
+    def precedents(self) -> List[Dict[str, str]]:
+        if self._precedents is None:
+            self._precedents = [self.precedent(number) for number in range(self.profile.corpus_precedents)]
+        return self._precedents
+
+    def law(self, number: int) -> Dict[str, str]:
+        combinations = len(LAW_TOPICS) * len(LAW_KINDS)
+        name = f"{LAW_TOPICS[number % len(LAW_TOPICS)]}{LAW_KINDS[number // len(LAW_TOPICS) % len(LAW_KINDS)]}"
+        if number >= combinations:
+            name += f" {number // combinations}"
+        rng = random.Random(f"{self.profile.seed}:law:{number}")
+        promulgation = f"{rng.randint(1990, 2024)}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}"
+        return {
+            "lawId": f"{number + 1:06d}",
+            "법령일련번호": f"{200000 + number}",
+            "법령명": name,
+            "공포일자": promulgation,
+            "시행일자": promulgation,
+            "법종구분": "대통령령" if "시행령" in name else ("부령" if "시행규칙" in name else "법률"),
+            "현행연혁": "현행",
+            "법령상세링크": f"/DRF/lawService.do?target=law&MST={200000 + number}&type=HTML"
+        }
+
+    def law_by_mst(self, mst: str) -> Optional[Dict[str, str]]:
+        try:
+            number = int(mst) - 200000
+        except ValueError:
+            return None
+        return self.law(number) if 0 <= number < self.profile.corpus_laws else None
+
+    def law_by_id(self, law_id: str) -> Optional[Dict[str, str]]:
+        try:
+            number = int(law_id) - 1
+        except ValueError:
+            return None
+        return self.law(number) if 0 <= number < self.profile.corpus_laws else None
+
+    def articles(self, law: Dict[str, str]) -> List[Dict[str, str]]:
+        rng = random.Random(f"{self.profile.seed}:articles:{law['lawId']}")
+        articles = []
+        for number in range(1, self.profile.articles_per_law + 1):
+            terms = rng.sample(ARTICLE_TERMS, 3)
+            articles.append({
+                "articleId": f"{law['lawId']}{number:04d}",
+                "조문번호": str(number),
+                "조문제목": ARTICLE_TITLES[(number - 1) % len(ARTICLE_TITLES)],
+                "조문내용": f"제{number}조 {terms[0]}은(는) {terms[1]}에 관하여 {terms[2]}을(를) 보장하여야 한다.",
+                "조문시행일자": law["시행일자"]
+            })
+        return articles
+
+    def precedent(self, number: int) -> Dict[str, str]:
+        rng = random.Random(f"{self.profile.seed}:prec:{number}")
+        # 번호가 클수록 최근 판례 (sort=ddes 목록을 번호 역순으로 만들 수 있도록)
+        year = 2000 + number * 25 // max(self.profile.corpus_precedents, 1)
+        court = COURTS[rng.randrange(len(COURTS))]
+        case_number = f"{year}{CASE_MARKS[rng.randrange(len(CASE_MARKS))]}{10000 + number}"
+        return {
+            "판례일련번호": f"{300000 + number}",
+            "사건명": CASE_NAMES[rng.randrange(len(CASE_NAMES))],
+            "사건번호": case_number,
+            "선고일자": f"{year}{1 + number % 12:02d}{1 + number % 28:02d}",
+            "법원명": court,
+            "법원종류코드": "400201" if court == "대법원" else "400202",
+            "사건종류명": "민사",
+            "사건종류코드": "400101",
+            "판결유형": "판결",
+            "선고": "선고",
+            "판례상세링크": f"/DRF/lawService.do?target=prec&ID={300000 + number}&type=HTML"
+        }
+
+
+def element(tag: str, value: str) -> str:
+    return f"<{tag}>{escape(value)}</{tag}>"
+
+
+def search_xml(root: str, item_tag: str, items: List[Dict[str, str]], total_count: int, page: int) -> str:
+    body = "".join(
+        f'<{item_tag} id="{position}">' + "".join(element(tag, value) for tag, value in item.items()) + f"</{item_tag}>"
+        for position, item in enumerate(items, start=1)
+    )
+    return (f'<?xml version="1.0" encoding="UTF-8"?><{root}><totalCnt>{total_count}</totalCnt>'
+            f"<page>{page}</page>{body}</{root}>")
+
+
+def page_of(items: List[Any], params: Dict[str, str]) -> List[Any]:
+    page = max(int(params.get("page", 1) or 1), 1)
+    display = min(max(int(params.get("display", 20) or 20), 1), 100)
+    return items[(page - 1) * display:page * display]
+
+
+def matches(text: str, query: str) -> bool:
+    """검색어 중 하나라도 포함하면 일치 (공백으로 구분)"""
+    terms = query.split()
+    return not terms or any(term in text for term in terms)
+
+
+def create_app(fixture_dir: Optional[str] = None, profile: Optional[LawStandInProfile] = None,
+               record_upstream: Optional[str] = None) -> FastAPI:
+    """
+    fixture_dir: 기록한 XML을 찾을 디렉터리 (없으면 항상 합성 말뭉치로 응답)
+    profile: 지연 시간/오류 주입/합성 말뭉치 설정
+    record_upstream: fixture가 없는 요청을 보낼 실제 API 주소 (예: https://www.law.go.kr), 응답은 fixture로 저장
+    """
+    profile = profile or LawStandInProfile()
+    app = FastAPI(title="국가법령정보 API 대역 서버")
+    app.state.profile = profile
+    app.state.fixtures = FixtureStore(fixture_dir)
+    app.state.corpus = SyntheticCorpus(profile)
+    app.state.attempts = {}  # fixture 키 -> 받은 횟수 (재시도마다 다른 난수 사용)
+    app.state.stats = {
+        "requests": 0, "replayed": 0, "recorded": 0, "synthetic": 0, "html_errors": 0, "timeouts": 0,
+        "in_flight": 0, "max_in_flight": 0
+    }
+    app.state.requests = []  # 받은 요청 (엔드포인트, 파라미터)
+
+    def request_rng(key: str) -> random.Random:
+        """fixture 키와 시도 횟수로 정해지는 난수 생성기"""
+        attempt = app.state.attempts.get(key, 0)
+        app.state.attempts[key] = attempt + 1
+        return random.Random(f"{profile.seed}:{key}:{attempt}")
+
+    def synthetic_search(params: Dict[str, str]) -> Optional[str]:
+        corpus = app.state.corpus
+        target = params.get("target")
+        page = max(int(params.get("page", 1) or 1), 1)
+        if target == "law":
+            laws = [law for law in corpus.laws() if matches(law["법령명"], params.get("query", ""))]
+            return search_xml("LawSearch", "law", page_of(laws, params), len(laws), page)
+        if target == "article":
+            # 서비스 코드는 법령 ID를 MST로 보내므로 MST 값은 법령일련번호와 법령 ID 모두로 찾음
+            mst = params.get("MST", "")
+            law = corpus.law_by_mst(mst) or corpus.law_by_id(mst) or corpus.law_by_id(params.get("ID", ""))
+            articles = []
+            if law:
+                articles = [{"articleId": article["articleId"], "lawId": law["lawId"], "조문번호": article["조문번호"],
+                             "조문제목": article["조문제목"], "조문내용": article["조문내용"], "법령명": law["법령명"]}
+                            for article in corpus.articles(law)]
+            return search_xml("ArticleSearch", "article", page_of(articles, params), len(articles), page)
+        if target == "prec":
+            precedents = [prec for prec in corpus.precedents()
+                          if matches(prec["사건명"], params.get("query", ""))
+                          and (not params.get("curt") or prec["법원명"] == params["curt"])
+                          and (not params.get("nb") or params["nb"] in prec["사건번호"])]
+            if params.get("sort") == "ddes":
+                precedents.sort(key=lambda prec: prec["선고일자"], reverse=True)
+            return search_xml("PrecSearch", "prec", page_of(precedents, params), len(precedents), page)
+        return None
+
+    def synthetic_service(params: Dict[str, str]) -> Optional[str]:
+        corpus = app.state.corpus
+        target = params.get("target")
+        if target == "law":
+            law = corpus.law_by_id(params.get("ID", "")) or corpus.law_by_mst(params.get("MST", ""))
+            if law is None:
+                return None
+            articles = corpus.articles(law)
+            if params.get("JO"):
+                # 조번호 6자리 (앞 4자리 조, 뒤 2자리 가지번호)
+                articles = [article for article in articles if article["조문번호"] == str(int(params["JO"][:4] or 0))]
+            basic = "".join(element(tag, value) for tag, value in [
+                ("법령ID", law["lawId"]), ("법령명_한글", law["법령명"]), ("법령명약칭", ""),
+                ("공포일자", law["공포일자"]), ("공포번호", law["법령일련번호"][-5:]), ("시행일자", law["시행일자"]),
+                ("소관부처", "법무부"), ("법종구분", law["법종구분"])
+            ])
+            body = "".join(
+                "<조문>" + "".join(element(tag, article[tag]) for tag in ("조문번호", "조문제목", "조문내용", "조문시행일자"))
+                + element("조문가지번호", "0") + "</조문>"
+                for article in articles
+            )
+            return f'<?xml version="1.0" encoding="UTF-8"?><법령><기본정보>{basic}</기본정보>{body}</법령>'
+        if target == "prec":
+            try:
+                number = int(params.get("ID", "")) - 300000
+            except ValueError:
+                return None
+            if not 0 <= number < profile.corpus_precedents:
+                return None
+            prec = corpus.precedent(number)
+            fields = [("판례정보일련번호", prec["판례일련번호"])] + [
+                (tag, prec[tag]) for tag in ("사건명", "사건번호", "선고일자", "선고", "법원명", "법원종류코드",
+                                            "사건종류명", "사건종류코드", "판결유형")
+            ] + [
+                ("판시사항", f"{prec['사건명']} 사건에서 임대인의 보증금 반환 의무의 범위"),
+                ("판결요지", "임대차 종료 시 임대인은 보증금을 반환하여야 한다."),
+                ("참조조문", "주택임대차보호법 제3조"), ("참조판례", ""),
+                ("판례내용", f"{prec['법원명']} {prec['선고일자']} 선고 {prec['사건번호']} 판결")
+            ]
+            return '<?xml version="1.0" encoding="UTF-8"?><PrecService>' + "".join(element(tag, value) for tag, value in fields) + "</PrecService>"
+        return None
+
+    async def record(endpoint: str, params: Dict[str, str], key: str) -> Optional[str]:
+        """실제 API 응답을 fixture로 저장 (HTML 오류 페이지나 실패 응답은 저장하지 않음)"""
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"{record_upstream.rstrip('/')}/DRF/{endpoint}", params=params, timeout=60.0)
+        if response.status_code != 200 or response.text.strip().startswith("<!DOCTYPE html"):
+            print(f"기록 실패 ({key}): {response.status_code}")
+            return None
+        app.state.fixtures.save(key, response.text)
+        app.state.stats["recorded"] += 1
+        return response.text
+
+    async def handle(endpoint: str, request: Request) -> Response:
+        params = dict(request.query_params)
+        app.state.requests.append((endpoint, params))
+        stats = app.state.stats
+        stats["requests"] += 1
+        key = fixture_key(endpoint, params)
+        rng = request_rng(key)
+
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        try:
+            await asyncio.sleep(profile.sample_latency(rng))
+            draw = rng.random()
+            if draw < profile.timeout_rate:
+                stats["timeouts"] += 1
+                await asyncio.sleep(profile.timeout_seconds)
+                return HTMLResponse(HTML_ERROR_PAGE, status_code=504)
+            if draw < profile.timeout_rate + profile.html_error_rate:
+                stats["html_errors"] += 1
+                return HTMLResponse(HTML_ERROR_PAGE)
+
+            xml_text = app.state.fixtures.load(key)
+            if xml_text is not None:
+                stats["replayed"] += 1
+            elif record_upstream:
+                xml_text = await record(endpoint, params, key)
+            else:
+                xml_text = synthetic_search(params) if endpoint == "lawSearch.do" else synthetic_service(params)
+                if xml_text is not None:
+                    stats["synthetic"] += 1
+            if xml_text is None:
+                # 실제 API와 같이 잘못된 요청에도 200 + HTML 오류 페이지
+                stats["html_errors"] += 1
+                return HTMLResponse(HTML_ERROR_PAGE)
+            return Response(xml_text, media_type="text/xml;charset=UTF-8")
+        finally:
+            stats["in_flight"] -= 1
+
+    @app.get("/DRF/lawSearch.do")
+    async def law_search(request: Request):
+        return await handle("lawSearch.do", request)
+
+    @app.get("/DRF/lawService.do")
+    async def law_service(request: Request):
+        return await handle("lawService.do", request)
+
+    @app.get("/mock/stats")
+    async def mock_stats():
+        return app.state.stats
+
+    return app
+
+
+app = create_app(os.getenv("MOCK_LAW_API_FIXTURE_DIR", DEFAULT_FIXTURE_DIR), profile=LawStandInProfile.from_env())
+
+if __name__ == "__main__":
+    defaults = LawStandInProfile.from_env()
+    parser = argparse.ArgumentParser(description='국가법령정보센터 Open API 로컬 대역 서버')
+    parser.add_argument('--port', type=int, default=int(os.getenv("MOCK_LAW_API_PORT", "8002")))
+    parser.add_argument('--fixture-dir', default=os.getenv("MOCK_LAW_API_FIXTURE_DIR", DEFAULT_FIXTURE_DIR), help='기록한 XML 디렉터리')
+    parser.add_argument('--record-upstream', default=None, help='fixture가 없는 요청을 보내 기록할 실제 API 주소 (예: https://www.law.go.kr)')
+    parser.add_argument('--latency', default=defaults.latency, help='응답 지연 시간 분포 (fixed:초, uniform:최소:최대, lognormal:중앙값:sigma)')
+    parser.add_argument('--html-error-rate', type=float, default=defaults.html_error_rate, help='HTML 오류 페이지 응답 비율')
+    parser.add_argument('--timeout-rate', type=float, default=defaults.timeout_rate, help='응답하지 않는 요청 비율')
+    parser.add_argument('--timeout-seconds', type=float, default=defaults.timeout_seconds, help='응답하지 않는 요청의 대기 시간(초)')
+    parser.add_argument('--corpus-laws', type=int, default=defaults.corpus_laws, help='합성 법령 수')
+    parser.add_argument('--articles-per-law', type=int, default=defaults.articles_per_law, help='합성 법령당 조문 수')
+    parser.add_argument('--corpus-precedents', type=int, default=defaults.corpus_precedents, help='합성 판례 수')
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    args = parser.parse_args()
+
+    profile = LawStandInProfile(
+        latency=args.latency,
+        html_error_rate=args.html_error_rate,
+        timeout_rate=args.timeout_rate,
+        timeout_seconds=args.timeout_seconds,
+        corpus_laws=args.corpus_laws,
+        articles_per_law=args.articles_per_law,
+        corpus_precedents=args.corpus_precedents,
+        seed=args.seed
+    )
+    uvicorn.run(create_app(args.fixture_dir, profile=profile, record_upstream=args.record_upstream),
+                host="127.0.0.1", port=args.port)
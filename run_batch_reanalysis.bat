@@ -0,0 +1,7 @@
+@echo off
+echo 기존 사례 일괄 재분석을 시작합니다...
+
+python -m app.services.batch_reanalysis_service %*
+
+echo 일괄 재분석이 종료되었습니다.
+pause
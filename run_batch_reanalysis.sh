@@ -0,0 +1,10 @@
+#!/bin/bash
+# 기존 사례 일괄 재분석 실행 스크립트 (Claude Message Batches API)
+# 사용 예: sh run_batch_reanalysis.sh --call-types consultation  (상담 답변만 다시 생성)
+# 중단된 경우 같은 명령으로 다시 실행하면 이어서 진행합니다.
+
+echo "기존 사례 일괄 재분석을 시작합니다..."
+
+python -m app.services.batch_reanalysis_service "$@"
+
+echo "일괄 재분석이 종료되었습니다."
@@ -0,0 +1,7 @@
+@echo off
+echo 현행법령 로컬 동기화를 시작합니다...
+
+python -m app.services.law_sync_service %*
+
+echo 동기화가 완료되었습니다.
+pause
@@ -0,0 +1,9 @@
+#!/bin/bash
+# 현행법령 로컬 동기화 실행 스크립트
+# 사용 예: sh run_law_sync.sh --full  (전체 법령 조문 다시 조회)
+
+echo "현행법령 로컬 동기화를 시작합니다..."
+
+python -m app.services.law_sync_service "$@"
+
+echo "동기화가 완료되었습니다."
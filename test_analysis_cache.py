@@ -0,0 +1,183 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unicodedata
+
+from app.services.analysis_cache import AnalysisCache, set_analysis_cache
+from app.services.claude_service import ClaudeService
+from app.services.text_utils import normalize_description
+
+DESCRIPTION = "전세 계약이 끝났는데,   집주인이 보증금을 돌려주지 않습니다!!"
+ANALYSIS = {"legal_category": "부동산/임대차", "keywords": ["보증금", "반환"]}
+
+def make_cache(directory, **kwargs):
+    options = {"ttl_seconds": 3600, "max_entries": 100}
+    options.update(kwargs)
+    return AnalysisCache(os.path.join(directory, "analysis_cache.sqlite3"), **options)
+
+def test_normalize_description():
+    """공백, 문장부호, 유니코드 조합 차이가 같은 값으로 정규화되는지 확인"""
+    decomposed = unicodedata.normalize("NFD", "간")  # 초성/중성/종성으로 분리된 "간"
+    assert len(decomposed) == 3
+    assert normalize_description(f"  {decomposed}  단, 한  문장! ") == "간 단 한 문장"
+    assert normalize_description(DESCRIPTION) == normalize_description("전세 계약이 끝났는데 집주인이 보증금을 돌려주지 않습니다.")
+
+def test_cache_hit_and_persistence():
+    """같은 설명은 캐시에서 조회되고, 새로 연 캐시에서도 유지되는지 확인"""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = make_cache(directory)
+        assert cache.get("model", DESCRIPTION) is None
+        cache.set("model", DESCRIPTION, ANALYSIS)
+
+        started = time.perf_counter()
+        cached = cache.get("model", "전세 계약이 끝났는데 집주인이 보증금을 돌려주지 않습니다.")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"캐시 조회 시간: {elapsed_ms:.3f}ms, {cache.stats()}")
+        assert cached == ANALYSIS
+        assert cache.get("other-model", DESCRIPTION) is None
+        assert cache.stats() == {"hits": 1, "misses": 2, "hit_ratio": 0.3333}
+
+        # 반환값을 수정해도 캐시 값은 바뀌지 않음
+        cached["keywords"].append("수정")
+        assert cache.get("model", DESCRIPTION) == ANALYSIS
+        cache.close()
+
+        reopened = make_cache(directory)
+        assert reopened.get("model", DESCRIPTION) == ANALYSIS
+        reopened.close()
+
+def test_ttl_and_eviction():
+    """만료된 결과는 미적중 처리되고, 크기 제한을 넘으면 오래 사용하지 않은 결과부터 삭제되는지 확인"""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = make_cache(directory, ttl_seconds=0)
+        cache.set("model", DESCRIPTION, ANALYSIS)
+        assert cache.get("model", DESCRIPTION) is None
+        cache.close()
+
+        cache = make_cache(directory, max_entries=2, memory_entries=1)
+        cache.set("model", "첫 번째 사례", ANALYSIS)
+        time.sleep(0.01)
+        cache.set("model", "두 번째 사례", ANALYSIS)
+        time.sleep(0.01)
+        assert cache.get("model", "첫 번째 사례") == ANALYSIS  # 첫 번째 사례를 최근 사용으로 갱신
+        time.sleep(0.01)
+        cache.set("model", "세 번째 사례", ANALYSIS)
+
+        assert cache.get("model", "두 번째 사례") is None
+        assert cache.get("model", "첫 번째 사례") == ANALYSIS
+        assert cache.get("model", "세 번째 사례") == ANALYSIS
+        cache.close()
+
+def test_async_disk_access_off_loop():
+    """get_async/set_async는 SQLite 작업을 이벤트 루프 스레드에서 실행하지 않고, 저장할 때 전체 행 수를 세지 않는지 확인"""
+    with tempfile.TemporaryDirectory() as directory:
+        make_cache(directory).set("model", "저장된 사례", ANALYSIS)
+        cache = make_cache(directory, max_entries=3)
+        statements = []
+        cache._connection.set_trace_callback(lambda sql: statements.append((threading.get_ident(), sql)))
+
+        async def main():
+            loop_thread = threading.get_ident()
+            assert await cache.get_async("model", "저장된 사례") == ANALYSIS  # 디스크 적중
+            disk_statements = len(statements)
+            assert await cache.get_async("model", "저장된 사례") == ANALYSIS  # 메모리 적중
+            assert len(statements) == disk_statements
+            for number in range(5):
+                await cache.set_async("model", f"새 사례 {number}", ANALYSIS)
+            return loop_thread
+
+        loop_thread = asyncio.run(main())
+        assert statements and all(thread != loop_thread for thread, _ in statements)
+        assert not any("COUNT(*)" in sql for _, sql in statements)
+
+        # 행 수를 메모리에서 관리해도 크기 제한이 지켜짐
+        count = cache._connection.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+        assert count == cache._count == 3
+        cache.close()
+
+def test_analyze_uses_cache():
+    """analyze_legal_issue가 두 번째 호출부터 Claude API를 호출하지 않는지 확인"""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = make_cache(directory)
+        set_analysis_cache(cache)
+        try:
+            service = ClaudeService()
+            service.use_analysis_cache = True
+            calls = []
+
+            async def fake_call(prompt, call_type="default", max_tokens=None, system=None):
+                calls.append(prompt)
+                return '{"legal_category": "부동산/임대차", "keywords": ["보증금"]}', service.model_router.select(call_type)[0]
+
+            service._call_claude_api_with_model = fake_call
+            first = asyncio.run(service.analyze_legal_issue(DESCRIPTION))
+            second = asyncio.run(service.analyze_legal_issue("전세 계약이 끝났는데 집주인이 보증금을 돌려주지 않습니다"))
+            assert first == second
+            assert len(calls) == 1
+
+            # JSON 추출에 실패한 응답은 캐시하지 않음
+            async def broken_call(prompt, call_type="default", max_tokens=None, system=None):
+                calls.append(prompt)
+                return "분석할 수 없습니다.", service.model_router.select(call_type)[0]
+
+            service._call_claude_api_with_model = broken_call
+            asyncio.run(service.analyze_legal_issue("다른 사례"))
+            asyncio.run(service.analyze_legal_issue("다른 사례"))
+            assert len(calls) == 3
+        finally:
+            set_analysis_cache(None)
+            cache.close()
+
+def test_analyze_cache_key_model_and_version():
+    """대체 모델이 응답한 결과는 기본 모델로 돌아온 뒤 재사용하지 않고, 프롬프트가 바뀌면 다시 분석하는지 확인"""
+    from types import SimpleNamespace
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = make_cache(directory)
+        set_analysis_cache(cache)
+        try:
+            service = ClaudeService()
+            service.use_analysis_cache = True
+            router = SimpleNamespace(model="primary-model")
+            service.model_router = SimpleNamespace(select=lambda call_type: (router.model, 1024))
+            served = []
+
+            async def fake_call(prompt, call_type="default", max_tokens=None, system=None):
+                served.append(router.model)
+                return '{"legal_category": "부동산/임대차"}', router.model
+
+            service._call_claude_api_with_model = fake_call
+
+            # 대체 모델로 전환된 동안 받은 결과는 대체 모델 키로 저장
+            router.model = "fallback-model"
+            asyncio.run(service.analyze_legal_issue(DESCRIPTION))
+            asyncio.run(service.analyze_legal_issue(DESCRIPTION))
+            assert served == ["fallback-model"]
+            version = service.prompt_builder.version("analyze")
+            assert cache.get("fallback-model", DESCRIPTION, version) is not None
+            assert cache.get("primary-model", DESCRIPTION, version) is None
+
+            # 기본 모델로 돌아오면 기본 모델로 다시 분석
+            router.model = "primary-model"
+            asyncio.run(service.analyze_legal_issue(DESCRIPTION))
+            assert served == ["fallback-model", "primary-model"]
+
+            # 프롬프트(템플릿/토큰 예산)가 바뀌면 이전 결과를 재사용하지 않음
+            service.prompt_builder.context_budget += 1
+            assert service.prompt_builder.version("analyze") != version
+            asyncio.run(service.analyze_legal_issue(DESCRIPTION))
+            assert served == ["fallback-model", "primary-model", "primary-model"]
+        finally:
+            set_analysis_cache(None)
+            cache.close()
+
+if __name__ == "__main__":
+    test_normalize_description()
+    test_cache_hit_and_persistence()
+    test_ttl_and_eviction()
+    test_async_disk_access_off_loop()
+    test_analyze_uses_cache()
+    test_analyze_cache_key_model_and_version()
+    print("\n모든 테스트 완료!")
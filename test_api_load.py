@@ -0,0 +1,82 @@
+import asyncio
+import json
+import subprocess
+import sys
+import tempfile
+
+from app.api.endpoints.auth import create_access_token
+from bench_api_load import compare_to_baseline, parse_mix, route_label, run_load, stand_in_stack
+
+def token_accounts(count):
+    """비밀번호 대신 미리 발급한 토큰으로 접속하는 계정"""
+    return [{"email": f"load{number}@example.com", "password": None,
+             "token": create_access_token({"sub": f"load{number}@example.com"})} for number in range(1, count + 1)]
+
+def route(p95_ms, throughput, error_rate=0.0):
+    return {"requests": 100, "errors": 0, "error_rate": error_rate, "throughput": throughput,
+            "p50_ms": p95_ms / 2, "p95_ms": p95_ms, "p99_ms": p95_ms * 1.5}
+
+def test_compare_to_baseline():
+    baseline = {"routes": {
+        "GET /cases/{case_id}": route(100.0, 50.0),
+        "GET /laws/laws/search": route(200.0, 20.0),
+        "POST /cases/": route(2.0, 5.0),
+        "GET /documents/": route(50.0, 10.0),
+    }}
+    report = {"routes": {
+        "GET /cases/{case_id}": route(150.0, 49.0),          # p95 50% 증가
+        "GET /laws/laws/search": route(210.0, 12.0),         # 처리량 40% 감소
+        "POST /cases/": route(4.0, 5.0, error_rate=0.05),    # p95 증가는 작은 차이라 무시, 오류율 증가
+    }}
+    regressions = compare_to_baseline(report, baseline)
+    assert len(regressions) == 4
+    assert regressions[0].startswith("GET /cases/{case_id}: p95")
+    assert "처리량" in regressions[1] and "오류율" in regressions[2]
+    assert regressions[3] == "GET /documents/: 이번 실행에서 요청이 없음"
+    assert compare_to_baseline(baseline, baseline) == []
+
+def test_parse_mix():
+    assert parse_mix("read_case=3, search_laws=1") == {
+        "auth_token": 0, "create_case": 0, "read_case": 3, "search_laws": 1, "list_documents": 0, "create_document": 0
+    }
+    try:
+        parse_mix("unknown=1")
+        assert False, "알 수 없는 경로가 허용됨"
+    except ValueError:
+        pass
+
+def test_load_against_stand_ins():
+    """대역 서버와 임시 DB로 띄운 LawMate 서버에 요청을 보내 경로별 결과를 집계하는지 확인"""
+    accounts = token_accounts(2)
+    mix = parse_mix("create_case=1,read_case=3,search_laws=2,list_documents=1")
+    with stand_in_stack(accounts) as base_url:
+        report = asyncio.run(run_load(base_url, accounts, users=4, duration=2.0, warmup=0.5, mix=mix, seed=1))
+
+    print(json.dumps(report["total"], ensure_ascii=False))
+    routes = report["routes"]
+    assert set(routes) == {route_label(name) for name in ("create_case", "read_case", "search_laws", "list_documents")}
+    for label, result in routes.items():
+        assert result["requests"] > 0 and result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"], label
+    assert routes["POST /cases/"]["statuses"] == {"200": routes["POST /cases/"]["requests"]}
+    assert routes["GET /cases/{case_id}"]["error_rate"] == 0
+    assert report["total"]["requests"] == sum(result["requests"] for result in routes.values())
+    assert report["config"]["users"] == 4
+
+def test_cli_baseline_exit_code():
+    """기준 결과보다 나빠지면 종료 코드 1"""
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8") as file:
+        json.dump({"routes": {"GET /cases/{case_id}": route(0.001, 1e9)}}, file)
+    result = subprocess.run(
+        [sys.executable, "bench_api_load.py", "--base-url", "http://127.0.0.1:9", "--users", "1", "--duration", "0.5",
+         "--warmup", "0", "--mix", "read_case=1", "--baseline", file.name],
+        capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 1, result.stdout + result.stderr
+    assert "성능 저하" in result.stdout
+
+if __name__ == "__main__":
+    test_compare_to_baseline()
+    test_parse_mix()
+    test_load_against_stand_ins()
+    test_cli_baseline_exit_code()
+    print("\n모든 테스트 완료!")
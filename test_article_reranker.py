@@ -0,0 +1,60 @@
+from app.core.metrics import get_histogram
+from app.db.models import LawArticle
+from app.services.article_reranker import ArticleReranker
+
+DESCRIPTION = "계약 기간이 끝났는데 집주인이 전세 보증금을 돌려주지 않고 있습니다. 어떻게 해야 하나요?"
+KEYWORDS = ["보증금", "반환", "임차권등기"]
+
+def make_articles():
+    articles = [
+        LawArticle(article_id=1, law_id=1, article_number="1", article_title="목적",
+                   content="이 법은 주거용 건물의 임대차에 관하여 민법에 대한 특례를 규정함을 목적으로 한다."),
+        LawArticle(article_id=2, law_id=1, article_number="2", article_title="적용 범위",
+                   content="이 법은 주거용 건물의 전부 또는 일부의 임대차에 관하여 적용한다."),
+    ]
+    # 관련 없는 조문 다수
+    for number in range(3, 60):
+        articles.append(LawArticle(article_id=number, law_id=1, article_number=str(number), article_title="벌칙",
+                                   content=f"제{number}조를 위반한 자는 1년 이하의 징역 또는 1천만원 이하의 벌금에 처한다."))
+    articles.append(LawArticle(article_id=100, law_id=1, article_number="3의3", article_title="임차권등기명령",
+                               content="임대차가 끝난 후 보증금이 반환되지 아니한 경우 임차인은 법원에 임차권등기명령을 신청할 수 있다."))
+    articles.append(LawArticle(article_id=101, law_id=1, article_number="4", article_title="임대차기간 등",
+                               content="임대차기간이 끝난 경우에도 임차인이 보증금을 반환받을 때까지는 임대차관계가 존속되는 것으로 본다."))
+    articles.append(LawArticle(article_id=102, law_id=1, article_number="3의2", article_title="보증금의 회수",
+                               content="임차인이 임차주택에 대하여 보증금반환청구소송의 확정판결에 따라서 경매를 신청하는 경우 " * 20))
+    return articles
+
+def test_rerank_prefers_relevant_articles():
+    """목적/정의 조문 대신 사례와 관련된 조문이 선택되는지 확인"""
+    articles = make_articles()
+    histogram = get_histogram("lawmate_article_rerank_seconds")
+    before = histogram.count
+
+    result = ArticleReranker().rerank(DESCRIPTION, KEYWORDS, articles, top_k=3, token_budget=400)
+    print(f"재정렬 결과: {[a.article_number for a in result.selected]} {result.stats}")
+
+    selected = [article.article_id for article in result.selected]
+    assert selected[0] == 100
+    assert 101 in selected
+    assert 1 not in selected and 2 not in selected
+    assert result.scores == sorted(result.scores, reverse=True)
+    assert histogram.count == before + 1
+
+def test_rerank_token_budget():
+    """토큰 예산을 넘는 긴 조문은 건너뛰고 다음 조문을 선택하는지 확인"""
+    articles = make_articles()
+    reranker = ArticleReranker()
+
+    result = reranker.rerank(DESCRIPTION, KEYWORDS, articles, top_k=5, token_budget=200)
+    assert 102 not in [article.article_id for article in result.selected]
+    assert result.stats["prompt_tokens"] <= 200
+    assert result.stats["prompt_tokens"] == sum(reranker.article_tokens(a) for a in result.selected)
+
+    # 예산보다 긴 조문이라도 가장 관련성이 높으면 하나는 선택 (잘라내기는 프롬프트 생성 단계에서 처리)
+    result = reranker.rerank(DESCRIPTION, ["경매", "확정판결"], articles, top_k=1, token_budget=50)
+    assert [article.article_id for article in result.selected] == [102]
+
+if __name__ == "__main__":
+    test_rerank_prefers_relevant_articles()
+    test_rerank_token_budget()
+    print("\n모든 테스트 완료!")
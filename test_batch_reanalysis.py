@@ -0,0 +1,130 @@
+import asyncio
+import json
+import os
+import tempfile
+
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import ACase, ACaseLaw, ACasePrecedent, Law, LawArticle, Precedent
+from app.services.batch_reanalysis_service import BatchReanalysisService
+from app.services.legal_consultation_service import LegalConsultationService
+from app.services.model_router import route_for
+from app.services.text_utils import description_fingerprint
+from conftest import DESCRIPTION, DIFFERENT, make_service, make_session, start_server
+from mock_claude_server import ANALYSIS_RESPONSE, CONSULTATION_RESPONSE, create_app
+
+def make_cases():
+    """사례 5건 (1번 사례에는 조문/판례 연결, 2번 사례에는 이전 분석 결과 저장)"""
+    db = make_session()
+    for case_id in range(1, 6):
+        description = DESCRIPTION if case_id % 2 else DIFFERENT
+        db.add(ACase(aCase_id=case_id, user_id=1, aCase_type="일반", description=f"{description} ({case_id})"))
+    db.add(Law(law_id=1, law_code="001", law_name="주택임대차보호법", link="https://www.law.go.kr/법령/주택임대차보호법"))
+    db.add(LawArticle(article_id=1, law_id=1, article_number="제3조의3", content="임차권등기명령을 신청할 수 있다."))
+    db.add(Precedent(precedent_id=1, case_number="2020다1234", court="대법원", summary="보증금 반환 의무"))
+    db.add(ACaseLaw(aCase_id=1, law_id=1, article_id=1, relevance_score=80))
+    db.add(ACasePrecedent(aCase_id=1, precedent_id=1, relevance_score=70))
+    db.commit()
+
+    case = db.query(ACase).filter(ACase.aCase_id == 2).first()
+    case.claude_analysis = json.dumps({"keywords": ["이전"], "legal_category": "이전 분야", "laws": [{"law_name": "근로기준법", "law_id": 2}]},
+                                      ensure_ascii=False)
+    db.commit()
+    return db, sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
+
+def test_batch_reanalysis():
+    """배치 요청 형식과 결과 저장 확인 (실패한 요청은 기존 결과 유지)"""
+    db, session_factory = make_cases()
+    app = create_app(batch_polls=2)
+    app.state.failed_custom_ids.add(f"analyze-2-{_fingerprint(db, 2)}")
+    server, url = start_server(app)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            service = BatchReanalysisService(
+                session_factory=session_factory, claude_service=make_service(url), chunk_size=2,
+                poll_seconds=0.01, checkpoint_path=os.path.join(directory, "batch.json")
+            )
+            stats = asyncio.run(service.run())
+            assert not os.path.exists(os.path.join(directory, "batch.json"))
+    finally:
+        server.should_exit = True
+
+    print(f"재분석 결과: {stats}")
+    assert stats["completed"] and stats["batches"] == 3 and stats["cases"] == 5
+    assert stats["succeeded"] == 9 and stats["errored"] == 1
+
+    # 배치당 사례 2건, 사례당 분석/상담 요청 2건
+    sizes = [len(body["requests"]) for _, body in app.state.batch_requests]
+    assert sizes == [4, 4, 2]
+    first_batch = {item["custom_id"].split("-")[0] + item["custom_id"].split("-")[1]: item["params"]
+                   for item in app.state.batch_requests[0][1]["requests"]}
+    assert first_batch["analyze1"]["model"] == route_for("analyze")["model"]
+    assert first_batch["consultation1"]["model"] == route_for("consultation")["model"]
+    assert "임차권등기명령" in first_batch["consultation1"]["messages"][0]["content"]
+
+    db.expire_all()
+    consultation_service = LegalConsultationService(use_mock_data=True)
+    for case in db.query(ACase).order_by(ACase.aCase_id).all():
+        stored = consultation_service.get_stored_consultation(case)
+        assert stored is not None and stored["consultation_response"] == CONSULTATION_RESPONSE
+        if case.aCase_id == 2:
+            # 분석 요청이 실패한 사례는 이전 키워드와 연결 법령 목록 유지
+            assert stored["keywords"] == ["이전"] and stored["laws"][0]["law_name"] == "근로기준법"
+        else:
+            assert stored["keywords"] == ANALYSIS_RESPONSE["keywords"]
+
+def test_batch_reanalysis_resume():
+    """제출 후 중단되면 다시 실행할 때 배치를 새로 제출하지 않고 결과를 이어서 저장하는지 확인"""
+    db, session_factory = make_cases()
+    app = create_app(batch_polls=0)
+    server, url = start_server(app)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint_path = os.path.join(directory, "batch.json")
+            service = BatchReanalysisService(
+                session_factory=session_factory, claude_service=make_service(url), chunk_size=3,
+                poll_seconds=0.01, checkpoint_path=checkpoint_path, call_types=["consultation"]
+            )
+
+            async def crash(batch_id):
+                raise KeyboardInterrupt()
+            service._wait_for_batch = crash
+            try:
+                asyncio.run(service.run())
+                assert False, "중단되지 않음"
+            except KeyboardInterrupt:
+                pass
+            assert len(app.state.batch_requests) == 1
+            with open(checkpoint_path, encoding="utf-8") as file:
+                assert json.load(file)["pending"]["last_case_id"] == 3
+
+            # 제출 후 설명이 바뀐 사례는 결과를 저장하지 않음
+            case = db.query(ACase).filter(ACase.aCase_id == 3).first()
+            case.description = "층간소음 때문에 잠을 못 자고 있습니다."
+            db.commit()
+
+            resumed = BatchReanalysisService(
+                session_factory=session_factory, claude_service=make_service(url), chunk_size=3,
+                poll_seconds=0.01, checkpoint_path=checkpoint_path
+            )
+            stats = asyncio.run(resumed.run())
+    finally:
+        server.should_exit = True
+
+    print(f"재개 후 결과: {stats}")
+    assert stats["completed"] and stats["batches"] == 2
+    # 처음 실행한 호출 종류(consultation)로 이어서 진행
+    assert all(item["custom_id"].startswith("consultation-") for _, body in app.state.batch_requests for item in body["requests"])
+    assert len(app.state.batch_requests) == 2
+    assert stats["stale"] == 1 and stats["succeeded"] == 4
+
+    db.expire_all()
+    assert db.query(ACase).filter(ACase.aCase_id == 3).first().claude_analysis is None
+
+def _fingerprint(db, case_id):
+    return description_fingerprint(db.query(ACase).filter(ACase.aCase_id == case_id).first().description)[:16]
+
+if __name__ == "__main__":
+    test_batch_reanalysis()
+    test_batch_reanalysis_resume()
+    print("\n모든 테스트 완료!")
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.api.endpoints import cases
+from app.api.endpoints.auth import get_current_user
+from app.db.database import get_db
+from app.db.models import ACase
+from app.main import app
+from conftest import DESCRIPTION, DIFFERENT, StubClaudeService, make_session
+
+def test_analyze_returns_stored_result():
+    """설명이 바뀌지 않았으면 저장된 결과를 반환하고, force=true 또는 설명 변경 시 다시 분석하는지 확인"""
+    db = make_session()
+    db.add(ACase(aCase_id=1, user_id=1, aCase_type="일반", description=DESCRIPTION, status="open"))
+    db.commit()
+
+    stub = StubClaudeService()
+    original_claude_service = cases.legal_consultation_service.claude_service
+    cases.legal_consultation_service.claude_service = stub
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(user_id=1)
+    try:
+        client = TestClient(app)
+        first = client.post("/api/v1/cases/1/analyze")
+        assert first.status_code == 200
+        assert stub.analyze_calls == 1
+
+        second = client.post("/api/v1/cases/1/analyze")
+        assert second.json() == first.json()
+        assert stub.analyze_calls == 1
+
+        client.post("/api/v1/cases/1/analyze", params={"force": "true"})
+        assert stub.analyze_calls == 2
+
+        # 설명이 바뀌면 저장된 결과를 쓰지 않음
+        case = db.query(ACase).filter(ACase.aCase_id == 1).first()
+        case.description = DIFFERENT
+        db.commit()
+        client.post("/api/v1/cases/1/analyze")
+        assert stub.analyze_calls == 3
+    finally:
+        cases.legal_consultation_service.claude_service = original_claude_service
+        app.dependency_overrides.clear()
+
+if __name__ == "__main__":
+    test_analyze_returns_stored_result()
+    print("\n모든 테스트 완료!")
@@ -0,0 +1,152 @@
+import asyncio
+import time
+
+import app.services.claude_service as claude_module
+from app.core.metrics import get_gauge
+from app.services.claude_scheduler import (
+    ClaudeScheduler, ClaudeSchedulerError, PRIORITY_BATCH, PRIORITY_INTERACTIVE,
+    parse_retry_after, set_claude_scheduler
+)
+from app.services.claude_service import ClaudeService
+
+def test_concurrency_limit():
+    """동시에 처리 중인 요청 수가 한도를 넘지 않는지 확인"""
+    scheduler = ClaudeScheduler(initial_limit=2, max_limit=2)
+    running = []
+    peak = []
+
+    async def request():
+        async with scheduler.slot():
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+
+    async def main():
+        await asyncio.gather(*(request() for _ in range(6)))
+
+    asyncio.run(main())
+    assert max(peak) == 2
+    assert scheduler.in_flight == 0 and scheduler.queue_depth == 0
+
+def test_interactive_before_batch():
+    """대기열에서 대화형 요청이 먼저 들어온 batch 요청보다 먼저 처리되는지 확인"""
+    scheduler = ClaudeScheduler(initial_limit=1, max_limit=1)
+    order = []
+
+    async def request(name, priority):
+        async with scheduler.slot(priority):
+            order.append(name)
+
+    async def main():
+        await scheduler.acquire()
+        batch = asyncio.create_task(request("batch", PRIORITY_BATCH))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(request("interactive", PRIORITY_INTERACTIVE))
+        await asyncio.sleep(0)
+        assert scheduler.queue_depth == 2
+        assert get_gauge("lawmate_claude_queue_depth").value == 2
+        scheduler.release()
+        await asyncio.gather(batch, interactive)
+
+    asyncio.run(main())
+    assert order == ["interactive", "batch"]
+
+def test_queue_bound_and_deadline():
+    """대기열이 가득 차면 바로 실패하고, 마감 시각이 지나면 대기를 포기하는지 확인"""
+    scheduler = ClaudeScheduler(initial_limit=1, max_limit=1, max_queue=1)
+
+    async def main():
+        await scheduler.acquire()
+        waiter = asyncio.create_task(scheduler.acquire(deadline=time.monotonic() + 0.05))
+        await asyncio.sleep(0)
+        try:
+            await scheduler.acquire()
+            assert False, "대기열이 가득 찼는데 요청이 대기열에 들어감"
+        except ClaudeSchedulerError as e:
+            assert "가득" in str(e)
+        try:
+            await waiter
+            assert False, "마감 시각이 지났는데 대기를 계속함"
+        except ClaudeSchedulerError as e:
+            assert "시간 초과" in str(e)
+        assert scheduler.queue_depth == 0
+        scheduler.release()
+        assert scheduler.in_flight == 0
+
+    asyncio.run(main())
+
+def test_aimd():
+    """429 응답이면 한도를 절반으로, 빠른 성공 응답이 이어지면 한도를 다시 늘리는지 확인"""
+    scheduler = ClaudeScheduler(initial_limit=8, min_limit=1, max_limit=16, latency_target=1.0)
+    scheduler.on_rate_limited(0)
+    assert scheduler.limit == 4
+    scheduler.on_rate_limited(0)
+    scheduler.on_rate_limited(0)
+    scheduler.on_rate_limited(0)
+    assert scheduler.limit == 1
+
+    for _ in range(10):
+        scheduler.on_success(0.1)
+    assert scheduler.limit >= 4
+    before = scheduler.limit
+    scheduler.on_success(5.0)
+    assert scheduler._limit < before + 1
+
+def test_parse_retry_after():
+    assert parse_retry_after("3", 0) == 3.0
+    assert parse_retry_after("0.5", 0) == 0.5
+    assert parse_retry_after(None, 2) == 4.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", 0) == 0.0
+
+def test_retry_after_429():
+    """429 응답의 retry-after만큼 기다린 후 재시도하는지 확인"""
+    scheduler = ClaudeScheduler(initial_limit=4)
+    set_claude_scheduler(scheduler)
+    calls = []
+
+    class FakeResponse:
+        def __init__(self, status_code, headers=None, body=None):
+            self.status_code = status_code
+            self.headers = headers or {}
+            self.text = "rate limited"
+            self._body = body
+
+        def json(self):
+            return self._body
+
+    class FakeClient:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args):
+            return False
+
+        async def post(self, url, headers=None, json=None, timeout=None):
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                return FakeResponse(429, {"retry-after": "0.2"})
+            return FakeResponse(200, body={"content": [{"text": "답변"}], "usage": {"input_tokens": 10, "output_tokens": 2}})
+
+    original = claude_module.httpx.AsyncClient
+    claude_module.httpx.AsyncClient = FakeClient
+    try:
+        text = asyncio.run(ClaudeService()._call_claude_api("질문", "consultation"))
+    finally:
+        claude_module.httpx.AsyncClient = original
+        set_claude_scheduler(None)
+
+    assert text == "답변"
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.2
+    assert scheduler.limit == 2
+    assert scheduler.in_flight == 0
+
+if __name__ == "__main__":
+    test_concurrency_limit()
+    test_interactive_before_batch()
+    test_queue_bound_and_deadline()
+    test_aimd()
+    test_parse_retry_after()
+    test_retry_after_429()
+    print("\n모든 테스트 완료!")
@@ -0,0 +1,64 @@
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql
+from sqlalchemy.dialects.mysql import match
+
+from app.db.models import Law, LawArticle, Precedent
+from app.services.fulltext_search import FulltextSearchService
+
+def make_session(session_factory_for):
+    db = session_factory_for([Law.__table__, LawArticle.__table__, Precedent.__table__])()
+
+    db.add_all([
+        Law(law_id=1, law_code="000001", law_name="주택임대차보호법", law_type="법률", promulgation_date="20200101"),
+        Law(law_id=2, law_code="000002", law_name="근로기준법", law_type="법률", promulgation_date="20210101"),
+        LawArticle(law_id=1, article_number="1", article_title="목적", content="주거용 건물의 임대차에 관하여 민법에 대한 특례를 규정한다."),
+        LawArticle(law_id=1, article_number="6", article_title="계약의 갱신", content="임차인이 계약갱신을 요구할 경우 정당한 사유 없이 거절하지 못한다."),
+        LawArticle(law_id=2, article_number="23", article_title="해고 등의 제한", content="사용자는 근로자에게 정당한 이유 없이 해고를 하지 못한다."),
+        Precedent(precedent_id=1, case_number="2024다1", case_name="임대차보증금반환", summary="임대차 종료 시 보증금을 반환하여야 한다."),
+        Precedent(precedent_id=2, case_number="2024다2", case_name="손해배상(기)", summary="임차인이 입은 손해는 통상의 손해에 한한다."),
+        Precedent(precedent_id=3, case_number="2024두3", case_name="부당해고구제재심판정취소", summary="해고에는 정당한 이유가 있어야 한다."),
+    ])
+    db.commit()
+    return db
+
+def test_clean_keywords():
+    """불리언 모드 연산자 제거 확인"""
+    assert FulltextSearchService.clean_keywords(["+보증금", "임대차 (반환)", "보증금*"]) == ["보증금", "임대차", "반환"]
+    assert FulltextSearchService.clean_keywords(['"', "-"]) == []
+
+def test_mysql_query_uses_match_against():
+    """MySQL에서는 MATCH ... AGAINST 불리언 모드로 검색하는지 확인"""
+    score = match(LawArticle.content, LawArticle.article_title, against="보증금 임대차").in_boolean_mode()
+    sql = str(select(LawArticle.article_id).where(score).compile(dialect=mysql.dialect()))
+    print(sql)
+    assert "MATCH (`Law_Article`.content, `Law_Article`.article_title) AGAINST (%s IN BOOLEAN MODE)" in sql
+
+def test_like_fallback_search(session_factory_for):
+    """SQLite에서 LIKE 검색으로 같은 결과 형식을 반환하는지 확인"""
+    db = make_session(session_factory_for)
+    service = FulltextSearchService()
+    assert not service.is_fulltext_supported(db)
+
+    laws = service.search_laws(db, ["계약갱신", "거절"])
+    assert laws[0]["lawId"] == "000001"
+    assert laws[0]["source"] == "local"
+
+    laws = service.search_laws(db, ["정당한"], law_name="근로기준법")
+    assert [law["lawId"] for law in laws] == ["000002"]
+
+    result = service.search_precedents(db, ["보증금", "반환"], page=1, display=2)
+    assert result["total"] == 1
+    assert result["results"][0][0] == 1
+
+    # 사건명 일치가 판결요지 일치보다 높은 점수
+    result = service.search_precedents(db, ["임대차", "임차인"])
+    assert [precedent_id for precedent_id, _ in result["results"]] == [1, 2]
+    assert service.search_precedents(db, ["100%"])["total"] == 0
+
+if __name__ == "__main__":
+    from conftest import new_session_factory
+
+    test_clean_keywords()
+    test_mysql_query_uses_match_against()
+    test_like_fallback_search(new_session_factory)
+    print("\n모든 테스트 완료!")
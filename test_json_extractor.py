@@ -0,0 +1,53 @@
+import json
+import random
+
+from app.services.claude_service import ClaudeService
+from app.services.mock_claude_service import MockClaudeService
+from app.services.text_utils import extract_json_object
+from bench_json_extractor import legacy_extract, make_analysis, make_cases
+
+ANALYSIS = {
+    "legal_category": "부동산/임대차",
+    "key_issues": [{"issue": "보증금 반환", "laws": ["주택임대차보호법", "민법"]}],
+    "keywords": ["보증금", "반환"],
+    "note": "괄호 {예외}와 \"인용\" 포함"
+}
+
+def test_extract_json_object():
+    text = json.dumps(ANALYSIS, ensure_ascii=False, indent=2)
+    assert extract_json_object(text) == ANALYSIS
+    assert extract_json_object(f"분석 결과입니다.\n```json\n{text}\n```\n참고하세요.") == ANALYSIS
+    # 코드 블록 없이 설명문 사이에 있는 중첩 객체 (이전 정규식 방식은 첫 "}"에서 잘림)
+    assert extract_json_object(f"분석 결과는 다음과 같습니다: {text} 이상입니다.") == ANALYSIS
+    # JSON이 아닌 중괄호 뒤의 객체, JSON이 아닌 바깥 중괄호 안의 객체
+    assert extract_json_object(f"형식: {{분야}} 및 {{키워드}}\n{text}") == ANALYSIS
+    assert extract_json_object('{설명: {"keywords": ["임금"]}}') == {"keywords": ["임금"]}
+    # 문자열 안의 줄바꿈 허용
+    assert extract_json_object('{"answer": "첫 줄\n둘째 줄"}') == {"answer": "첫 줄\n둘째 줄"}
+
+    assert extract_json_object("JSON이 없는 답변입니다.") is None
+    assert extract_json_object("") is None
+    # max_tokens에서 잘린 응답
+    assert extract_json_object('{"legal_category": "부동산", "keywords": ["보증') is None
+
+def test_not_worse_than_legacy():
+    """이전 방식이 추출한 객체는 모두 같은 결과로 추출하는지 확인"""
+    rng = random.Random(7)
+    for name, text in make_cases(rng, 5, 5):
+        legacy = legacy_extract(text)
+        if isinstance(legacy, dict) and "raw_response" not in legacy:
+            assert extract_json_object(text) == legacy, name
+        if name != "JSON 없음":
+            assert extract_json_object(text) == make_analysis(random.Random(7), 5), name
+
+def test_services_share_extractor():
+    text = f"```json\n{json.dumps(ANALYSIS, ensure_ascii=False)}\n```"
+    assert ClaudeService().extract_json_from_text(text) == ANALYSIS
+    assert MockClaudeService().extract_json_from_text(text) == ANALYSIS
+    assert ClaudeService().extract_json_from_text("답변") == {"raw_response": "답변"}
+
+if __name__ == "__main__":
+    test_extract_json_object()
+    test_not_worse_than_legacy()
+    test_services_share_extractor()
+    print("\n모든 테스트 완료!")
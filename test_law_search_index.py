@@ -0,0 +1,74 @@
+import os
+import tempfile
+
+from app.services.law_search_index import LawArticleIndex
+from app.services.text_utils import char_bigrams
+
+def make_index():
+    index = LawArticleIndex()
+    index.add_law(1, {"law_code": "000001", "law_name": "주택임대차보호법", "law_type": "법률",
+                      "promulgation_date": "20200101", "enforcement_date": "20200701", "link": ""})
+    index.add_law(2, {"law_code": "000002", "law_name": "근로기준법", "law_type": "법률",
+                      "promulgation_date": "20210101", "enforcement_date": "20210701", "link": ""})
+    index.add_document(101, 1, "목적", "이 법은 주거용 건물의 임대차에 관하여 민법에 대한 특례를 규정한다.")
+    index.add_document(102, 1, "계약의 갱신", "임대인은 임차인이 계약갱신을 요구할 경우 정당한 사유 없이 거절하지 못한다.")
+    index.add_document(103, 1, "보증금의 회수", "임차인은 보증금을 반환받을 때까지 임대차관계가 존속되는 것으로 본다.")
+    index.add_document(201, 2, "해고 등의 제한", "사용자는 근로자에게 정당한 이유 없이 해고를 하지 못한다.")
+    index.add_document(202, 2, "퇴직급여 제도", "사용자는 퇴직하는 근로자에게 퇴직급여를 지급하여야 한다.")
+    return index
+
+def test_char_bigrams():
+    """바이그램 토큰화 확인"""
+    assert char_bigrams("임대차보호법") == ["임대", "대차", "차보", "보호", "호법"]
+    assert char_bigrams("제 6조") == ["제", "6조"]
+
+def test_search_articles():
+    """조문 검색 결과가 관련도 순으로 정렬되는지 확인"""
+    index = make_index()
+
+    hits = index.search("계약갱신 거절")
+    print(f"검색 결과: {hits}")
+    assert hits[0][0] == 102
+
+    hits = index.search("퇴직금 지급")
+    assert hits[0][0] == 202
+
+def test_search_laws():
+    """법령 단위 검색 결과 형식 확인"""
+    index = make_index()
+
+    laws = index.search_laws(["보증금", "임대차"])
+    assert laws[0]["lawId"] == "000001"
+    assert laws[0]["lawName"] == "주택임대차보호법"
+    assert laws[0]["source"] == "local"
+
+    laws = index.search_laws(["정당한"], law_name="근로기준법")
+    assert [law["lawId"] for law in laws] == ["000002"]
+
+def test_incremental_update():
+    """조문 갱신 시 기존 문서가 검색에서 제외되는지 확인"""
+    index = make_index()
+    index.add_document(101, 1, "목적", "이 법은 전세사기 피해를 예방함을 목적으로 한다.")
+
+    assert index.document_count == 5
+    assert [article_id for article_id, _ in index.search("전세사기")] == [101]
+    assert index.search("주거용 건물") == []
+
+def test_save_and_load():
+    """색인 파일 저장 및 불러오기 확인"""
+    index = make_index()
+    path = os.path.join(tempfile.mkdtemp(), "law_article_index.pkl")
+    index.search("계약갱신")  # 길이 정규화 캐시 생성
+    index.save(path)
+
+    loaded = LawArticleIndex.load(path)
+    assert loaded.stats() == index.stats()
+    assert loaded.search("계약갱신 거절") == index.search("계약갱신 거절")
+
+if __name__ == "__main__":
+    test_char_bigrams()
+    test_search_articles()
+    test_search_laws()
+    test_incremental_update()
+    test_save_and_load()
+    print("\n모든 테스트 완료!")
@@ -0,0 +1,100 @@
+import asyncio
+import os
+import tempfile
+
+from app.db.models import Law, LawArticle
+from app.services.law_sync_service import LawSyncService
+
+class FakeLawDataService:
+    """국가법령정보 API 대신 고정된 법령 목록과 조문을 반환하는 테스트용 서비스"""
+
+    def __init__(self, laws, failing_law_ids=()):
+        self.laws = laws
+        self.failing_law_ids = set(failing_law_ids)
+        self.article_calls = []
+
+    async def list_current_laws(self, page=1, display=100):
+        start = (page - 1) * display
+        return {"total_count": len(self.laws), "laws": self.laws[start:start + display]}
+
+    async def search_law_articles(self, law_id, use_mock_on_failure=True):
+        self.article_calls.append(law_id)
+        if law_id in self.failing_law_ids:
+            return None
+        return [
+            {"article": "1", "articleTitle": "목적", "content": f"{law_id} 법령의 목적"},
+            {"article": "2", "articleTitle": "정의", "content": f"{law_id} 법령의 정의"}
+        ]
+
+def make_laws(count, promulgation_date="20240101"):
+    return [
+        {
+            "lawId": f"{i:06d}",
+            "lawName": f"테스트법{i}",
+            "lawType": "법률",
+            "promulgationDate": promulgation_date,
+            "enforcementDate": "20240701",
+            "link": ""
+        }
+        for i in range(1, count + 1)
+    ]
+
+def test_law_sync_incremental(session_factory_for):
+    """최초 전체 동기화 후 변경된 법령만 다시 조회하는지 확인"""
+    session_factory = session_factory_for([Law.__table__, LawArticle.__table__])
+    checkpoint_path = os.path.join(tempfile.mkdtemp(), "law_sync.json")
+
+    laws = make_laws(5)
+    fake = FakeLawDataService(laws)
+    service = LawSyncService(session_factory, fake, concurrency=2, checkpoint_path=checkpoint_path, page_size=2)
+
+    print("=== 최초 동기화 ===")
+    stats = asyncio.run(service.sync())
+    assert stats["synced"] == 5
+    assert stats["articles"] == 10
+
+    db = session_factory()
+    assert db.query(Law).count() == 5
+    assert db.query(LawArticle).count() == 10
+    db.close()
+
+    print("\n=== 증분 동기화 (변경 없음) ===")
+    fake.article_calls.clear()
+    stats = asyncio.run(service.sync())
+    assert stats["pending"] == 0
+    assert fake.article_calls == []
+
+    print("\n=== 증분 동기화 (공포일자 변경 1건) ===")
+    laws[2]["promulgationDate"] = "20250101"
+    stats = asyncio.run(service.sync())
+    assert fake.article_calls == [laws[2]["lawId"]]
+    assert stats["synced"] == 1
+
+def test_law_sync_resume_after_failure(session_factory_for):
+    """실패한 법령은 체크포인트에 남아 다음 실행에서 이어서 처리되는지 확인"""
+    session_factory = session_factory_for([Law.__table__, LawArticle.__table__])
+    checkpoint_path = os.path.join(tempfile.mkdtemp(), "law_sync.json")
+
+    laws = make_laws(3)
+    fake = FakeLawDataService(laws, failing_law_ids=[laws[1]["lawId"]])
+    service = LawSyncService(session_factory, fake, concurrency=3, checkpoint_path=checkpoint_path)
+
+    print("=== 일부 실패 동기화 ===")
+    stats = asyncio.run(service.sync())
+    assert stats["failed"] == 1
+    assert os.path.exists(checkpoint_path)
+
+    print("\n=== 이어서 동기화 ===")
+    fake.failing_law_ids.clear()
+    fake.article_calls.clear()
+    stats = asyncio.run(service.sync())
+    assert fake.article_calls == [laws[1]["lawId"]]
+    assert stats["failed"] == 0
+    assert not os.path.exists(checkpoint_path)
+
+if __name__ == "__main__":
+    from conftest import new_session_factory
+
+    test_law_sync_incremental(new_session_factory)
+    test_law_sync_resume_after_failure(new_session_factory)
+    print("\n모든 테스트 완료!")
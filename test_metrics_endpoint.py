@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import tempfile
+import time
+import tracemalloc
+
+from fastapi.testclient import TestClient
+
+from app.core.event_loop_monitor import BlockingCallDetector, monitor_event_loop_lag
+from app.core.http_metrics import RequestMetricsMiddleware
+from app.core.metrics import get_counter, get_gauge, get_histogram, render_prometheus
+from app.services.analysis_cache import AnalysisCache, get_analysis_cache, set_analysis_cache
+from conftest import capture_logs, make_law_service, make_service, start_server
+from mock_claude_server import create_app as create_claude_app
+from mock_law_api_server import LawStandInProfile, create_app as create_law_app
+
+def parse_metrics(text):
+    """Prometheus 텍스트 -> ({시계열: 값}, {이름: 종류})"""
+    samples, types = {}, {}
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            assert name not in types, f"TYPE 중복: {name}"
+            types[name] = kind
+        elif line and not line.startswith("#"):
+            series, value = line.rsplit(" ", 1)
+            samples[series] = float(value)
+    return samples, types
+
+def sample(samples, series):
+    return samples.get(series, 0.0)
+
+def test_render_prometheus():
+    """HELP/TYPE는 이름별로 한 번, 레이블 값 이스케이프, 히스토그램 구간은 누적 개수"""
+    get_counter("lawmate_test_events_total", "테스트 이벤트 수", {"kind": 'say "hi"\n'}).inc(3)
+    get_gauge("lawmate_test_level", "테스트 값").set(0.25)
+    histogram = get_histogram("lawmate_test_seconds", "테스트 시간", labels={"step": "a"}, buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value)
+
+    text = render_prometheus()
+    samples, types = parse_metrics(text)
+    assert types["lawmate_test_events_total"] == "counter" and types["lawmate_test_seconds"] == "histogram"
+    assert text.count("# HELP lawmate_test_seconds ") == 1
+    assert samples['lawmate_test_events_total{kind="say \\"hi\\"\\n"}'] == 3
+    assert samples["lawmate_test_level"] == 0.25
+    assert samples['lawmate_test_seconds_bucket{step="a",le="0.1"}'] == 1
+    assert samples['lawmate_test_seconds_bucket{step="a",le="1"}'] == 2
+    assert samples['lawmate_test_seconds_bucket{step="a",le="+Inf"}'] == samples['lawmate_test_seconds_count{step="a"}'] == 3
+    assert samples['lawmate_test_seconds_sum{step="a"}'] == 5.55
+
+def test_route_metrics_endpoint():
+    """경로 템플릿별 요청 수/처리 시간, 캐시 적중률, DB 연결 풀 상태가 /metrics에 나타나는지 확인"""
+    from app.main import app
+
+    original_cache = get_analysis_cache()
+    with tempfile.TemporaryDirectory() as directory:
+        cache = AnalysisCache(f"{directory}/cache.sqlite3", ttl_seconds=60, max_entries=10)
+        set_analysis_cache(cache)
+        try:
+            cache.get("model", "임대차 보증금")
+            cache.set("model", "임대차 보증금", {"keywords": ["임대차"]})
+            cache.get("model", "임대차 보증금")
+            client = TestClient(app)
+            before, _ = parse_metrics(client.get("/metrics").text)
+            for _ in range(3):
+                assert client.get("/").status_code == 200
+            assert client.get("/api/v1/cases/123").status_code == 401
+            assert client.get("/no/such/path/1").status_code == 404
+            response = client.get("/metrics")
+        finally:
+            set_analysis_cache(original_cache)
+            cache.close()
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples, types = parse_metrics(response.text)
+    root = 'lawmate_http_requests_total{method="GET",route="/",status="2xx"}'
+    assert samples[root] - sample(before, root) == 3
+    case = '{method="GET",route="/api/v1/cases/{case_id}"'
+    assert samples[f"lawmate_http_requests_total{case},status=\"4xx\"}}"] >= 1
+    assert samples[f"lawmate_http_request_seconds_count{case}}}"] >= 1
+    assert samples['lawmate_http_requests_total{method="GET",route="unmatched",status="4xx"}'] >= 1
+    assert not any("/api/v1/cases/123" in series or "/no/such" in series for series in samples)
+    assert types["lawmate_http_request_seconds"] == "histogram"
+    assert 0 < samples['lawmate_cache_hit_ratio{cache="analysis"}'] < 1
+    assert "lawmate_db_pool_size" in samples and "lawmate_db_pool_checked_out" in samples
+
+def test_upstream_metrics():
+    """Claude/국가법령정보 API 호출 수가 결과 분류(ok, html_error, timeout, network)별로 기록되는지 확인"""
+    law_app = create_law_app(profile=LawStandInProfile(html_error_rate=1.0))
+    law_server, law_url = start_server(law_app)
+    claude_server, claude_url = start_server(create_claude_app())
+    before, _ = parse_metrics(render_prometheus())
+    try:
+        law_service = make_law_service(law_url)
+        assert asyncio.run(law_service.list_current_laws()) is None
+
+        law_app.state.profile.html_error_rate = 0.0
+        law_app.state.profile.timeout_rate = 1.0
+        law_app.state.profile.timeout_seconds = 0.5
+        law_service.timeout = 0.1
+        assert asyncio.run(law_service.list_current_laws()) is None
+
+        law_app.state.profile.timeout_rate = 0.0
+        assert asyncio.run(law_service.list_current_laws())
+
+        assert asyncio.run(make_service(claude_url).summarize_legal_info([], []))
+        try:
+            asyncio.run(make_service("http://127.0.0.1:9/v1/messages").summarize_legal_info([], []))
+            assert False, "연결할 수 없는 주소로 호출 성공"
+        except Exception as e:
+            assert "네트워크 오류" in str(e)
+    finally:
+        law_server.should_exit = True
+        claude_server.should_exit = True
+
+    samples, _ = parse_metrics(render_prometheus())
+
+    def delta(service, endpoint, outcome):
+        series = f'lawmate_upstream_requests_total{{endpoint="{endpoint}",outcome="{outcome}",service="{service}"}}'
+        return sample(samples, series) - sample(before, series)
+
+    retries = law_service.max_retries
+    assert delta("law_api", "lawSearch", "html_error") == retries
+    assert delta("law_api", "lawSearch", "timeout") == retries
+    assert delta("law_api", "lawSearch", "ok") == 1
+    assert delta("claude", "messages", "ok") == 1
+    assert delta("claude", "messages", "network") == 1
+    count = 'lawmate_upstream_request_seconds_count{endpoint="lawSearch",service="law_api"}'
+    assert sample(samples, count) - sample(before, count) == 2 * retries + 1
+
+def test_event_loop_lag():
+    """루프를 막는 동기 호출이 있으면 이벤트 루프 지연으로 기록"""
+    async def main():
+        monitor = asyncio.create_task(monitor_event_loop_lag(0.01))
+        await asyncio.sleep(0.05)
+        time.sleep(0.2)  # 루프를 막는 동기 호출
+        await asyncio.sleep(0.05)
+        monitor.cancel()
+
+    asyncio.run(main())
+    samples, _ = parse_metrics(render_prometheus())
+    assert samples['lawmate_event_loop_lag_seconds_bucket{le="0.1"}'] < samples["lawmate_event_loop_lag_seconds_count"]
+    assert samples["lawmate_event_loop_lag_seconds_sum"] >= 0.15
+
+def hash_password_inline():
+    time.sleep(0.15)  # async 엔드포인트 안의 bcrypt 해시처럼 루프를 막는 동기 호출
+
+def test_blocking_call_detector():
+    """기준 시간보다 오래 루프를 막은 호출만 위치별로 기록하고, 디버그 모드면 스택을 로그로 남김"""
+    async def main():
+        detector = BlockingCallDetector(asyncio.get_running_loop(), 0.05, log_stacks=True).start()
+        for _ in range(20):
+            await asyncio.sleep(0.01)  # 막지 않는 작업
+        hash_password_inline()
+        await asyncio.sleep(0.1)
+        await asyncio.to_thread(detector.stop)
+
+    blocked = get_histogram("lawmate_event_loop_blocked_seconds")
+    before = blocked.count
+    with capture_logs(logging.WARNING) as logs:
+        asyncio.run(main())
+
+    assert blocked.count - before == 1
+    samples, types = parse_metrics(render_prometheus())
+    assert types["lawmate_event_loop_blocked_total"] == "counter"
+    sites = [series for series in samples if series.startswith("lawmate_event_loop_blocked_total{")]
+    site = next(series for series in sites if "hash_password_inline (test_metrics_endpoint.py:" in series)
+    assert samples[site] == 1, sites
+
+    warnings = [entry for entry in logs.entries() if entry["logger"] == "app.core.event_loop_monitor"]
+    assert len(warnings) == 1
+    fields = warnings[0]["fields"]
+    assert fields["duration_ms"] >= 100
+    assert fields["stack"][0] == "event-loop" and fields["stack"][-1].startswith("hash_password_inline ")
+    assert any(frame.startswith("main ") for frame in fields["stack"])
+
+def test_hot_path_memory():
+    """경로별 지표 객체를 만든 후에는 요청을 처리해도 지표 기록으로 메모리가 늘지 않음"""
+    route = type("Route", (), {"path": "/api/v1/bench/{item_id}"})()
+
+    async def endpoint(scope, receive, send):
+        scope["route"] = route
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        pass
+
+    middleware = RequestMetricsMiddleware(endpoint)
+    scope = {"type": "http", "method": "GET"}
+
+    async def requests(count):
+        for _ in range(count):
+            await middleware(scope, None, send)
+
+    asyncio.run(requests(10))
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        asyncio.run(requests(5000))
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert current - start < 4096, current - start
+    assert get_histogram("lawmate_http_request_seconds", labels={"method": "GET", "route": "/api/v1/bench/{item_id}"}).count == 5010
+
+if __name__ == "__main__":
+    test_render_prometheus()
+    test_route_metrics_endpoint()
+    test_upstream_metrics()
+    test_event_loop_lag()
+    test_blocking_call_detector()
+    test_hot_path_memory()
+    print("\n모든 테스트 완료!")
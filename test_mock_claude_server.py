@@ -0,0 +1,118 @@
+import asyncio
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.services.claude_scheduler import ClaudeScheduler, set_claude_scheduler
+from conftest import make_service, start_server
+from mock_claude_server import CONSULTATION_RESPONSE, StandInProfile, create_app
+
+HEADERS = {"x-api-key": "test-key", "anthropic-version": "2023-06-01"}
+
+def request_body(question, **extra):
+    body = {"model": "claude-3-7-sonnet-20250219", "max_tokens": 1000, "messages": [{"role": "user", "content": question}]}
+    body.update(extra)
+    return body
+
+def test_deterministic_responses():
+    """같은 seed면 같은 요청 순서에 같은 응답/오류를 돌려주는지 확인"""
+    profile = StandInProfile(rate_limit_rate=0.3, server_error_rate=0.2, seed=3)
+    outcomes = []
+    for _ in range(2):
+        client = TestClient(create_app(profile=profile))
+        run = []
+        for i in range(20):
+            response = client.post("/v1/messages", headers=HEADERS, json=request_body(f"질문 {i % 5}"))
+            run.append((response.status_code, response.text))
+        outcomes.append(run)
+    assert outcomes[0] == outcomes[1]
+    statuses = {status for status, _ in outcomes[0]}
+    assert 200 in statuses and 429 in statuses and statuses & {500, 529}
+
+def test_error_injection():
+    client = TestClient(create_app(profile=StandInProfile(rate_limit_rate=1.0, retry_after=2.5)))
+    response = client.post("/v1/messages", headers=HEADERS, json=request_body("질문"))
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "2.5"
+    assert response.json()["error"]["type"] == "rate_limit_error"
+
+    client = TestClient(create_app(profile=StandInProfile(server_error_rate=1.0)))
+    types = {client.post("/v1/messages", headers=HEADERS, json=request_body(f"질문 {i}")).json()["error"]["type"] for i in range(20)}
+    assert types == {"api_error", "overloaded_error"}
+    assert client.get("/mock/stats").json()["server_errors"] == 20
+
+def test_latency_and_token_rate():
+    """첫 토큰 지연 + 출력 토큰 수 / 생성 속도만큼 걸리고, max_tokens를 넘는 답변은 잘리는지 확인"""
+    profile = StandInProfile(latency="fixed:0.1", tokens_per_second=1000, consultation_tokens=200)
+    client = TestClient(create_app(profile=profile))
+
+    started = time.perf_counter()
+    message = client.post("/v1/messages", headers=HEADERS, json=request_body("질문")).json()
+    elapsed = time.perf_counter() - started
+    assert message["usage"]["output_tokens"] >= 200
+    assert elapsed >= 0.1 + message["usage"]["output_tokens"] / 1000
+    assert message["stop_reason"] == "end_turn"
+
+    truncated = client.post("/v1/messages", headers=HEADERS, json=request_body("질문", max_tokens=50)).json()
+    assert truncated["stop_reason"] == "max_tokens"
+    assert truncated["usage"]["output_tokens"] <= 50
+
+def test_streaming():
+    """stream=true 요청은 SSE 이벤트로 응답하고, text_delta를 이어 붙이면 일반 응답과 같은지 확인"""
+    client = TestClient(create_app(profile=StandInProfile(consultation_tokens=100)))
+    message = client.post("/v1/messages", headers=HEADERS, json=request_body("질문")).json()
+
+    response = client.post("/v1/messages", headers=HEADERS, json=request_body("질문", stream=True))
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        event_line, data_line = block.split("\n")
+        events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+
+    names = [name for name, _ in events]
+    assert names[:3] == ["message_start", "content_block_start", "ping"]
+    assert names[-3:] == ["content_block_stop", "message_delta", "message_stop"]
+    text = "".join(data["delta"]["text"] for name, data in events if name == "content_block_delta")
+    assert text == message["content"][0]["text"]
+    assert text.startswith(CONSULTATION_RESPONSE)
+    assert events[-2][1]["usage"]["output_tokens"] == message["usage"]["output_tokens"]
+
+def test_claude_service_against_stand_in():
+    """ClaudeService가 대역 서버의 429 응답을 재시도해 모두 성공하고, 응답 대기 시간 초과는 오류로 처리하는지 확인"""
+    app = create_app(profile=StandInProfile(rate_limit_rate=0.3, retry_after=0.01, seed=1))
+    server, url = start_server(app)
+    original_timeout = settings.CLAUDE_TIMEOUT_SECONDS
+    set_claude_scheduler(ClaudeScheduler(initial_limit=8, max_limit=8))
+    try:
+        service = make_service(url)
+
+        async def main():
+            return await asyncio.gather(*(service._call_claude_api(f"질문 {i}", "consultation") for i in range(10)))
+
+        answers = asyncio.run(main())
+        assert all(answer == CONSULTATION_RESPONSE for answer in answers)
+        stats = app.state.stats
+        assert stats["rate_limited"] > 0 and stats["succeeded"] == 10
+        assert stats["requests"] == 10 + stats["rate_limited"]
+
+        app.state.profile.latency = "fixed:0.5"
+        settings.CLAUDE_TIMEOUT_SECONDS = 0.1
+        try:
+            asyncio.run(service._call_claude_api("느린 질문", "consultation"))
+            assert False, "응답 대기 시간 초과가 오류로 처리되지 않음"
+        except Exception as e:
+            assert "네트워크 오류" in str(e)
+    finally:
+        settings.CLAUDE_TIMEOUT_SECONDS = original_timeout
+        set_claude_scheduler(None)
+        server.should_exit = True
+
+if __name__ == "__main__":
+    test_deterministic_responses()
+    test_error_injection()
+    test_latency_and_token_rate()
+    test_streaming()
+    test_claude_service_against_stand_in()
+    print("\n모든 테스트 완료!")
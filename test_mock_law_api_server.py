@@ -0,0 +1,103 @@
+import asyncio
+import tempfile
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.services.law_data_service import LawDataService
+from mock_law_api_server import FixtureStore, LawStandInProfile, create_app, fixture_key
+from conftest import make_law_service, start_server
+
+RECORDED_LAWS = """<?xml version="1.0" encoding="UTF-8"?><LawSearch><totalCnt>1</totalCnt><page>1</page>
+<law id="1"><법령일련번호>248613</법령일련번호><법령명>주택임대차보호법</법령명><공포일자>20230404</공포일자>
+<법종구분>법률</법종구분><lawId>001683</lawId><현행연혁>현행</현행연혁></law></LawSearch>"""
+
+def test_synthetic_corpus():
+    """합성 말뭉치로 법령 목록/조문/상세, 판례 목록이 서비스 파서에서 그대로 읽히는지 확인"""
+    app = create_app(profile=LawStandInProfile(corpus_laws=250, articles_per_law=12, corpus_precedents=300))
+    server, url = start_server(app)
+    try:
+        service = make_law_service(url)
+        assert service.law_search_url.startswith("http://127.0.0.1:")
+
+        async def main():
+            pages = [await service.list_current_laws(page=page, display=100) for page in (1, 2, 3)]
+            articles = await service.search_law_articles(pages[0]["laws"][0]["lawId"], use_mock_on_failure=False)
+            detail = await service.get_law_detail(pages[0]["laws"][1]["mst"])
+            article = await service.get_law_detail(pages[0]["laws"][1]["mst"], jo="000300")
+            precedents = await service.search_precedents(sort="ddes", display=50, use_mock_on_failure=False)
+            supreme = await service.search_precedents(court="대법원", display=100, use_mock_on_failure=False)
+            return pages, articles, detail, article, precedents, supreme
+
+        pages, articles, detail, article, precedents, supreme = asyncio.run(main())
+    finally:
+        server.should_exit = True
+
+    assert all(page["total_count"] == 250 for page in pages)
+    laws = [law for page in pages for law in page["laws"]]
+    assert len(laws) == 250 and len({law["lawId"] for law in laws}) == 250
+    assert len(articles) == 12 and articles[0]["lawName"] == laws[0]["lawName"]
+    assert detail["법령명_한글"] == laws[1]["lawName"] and len(detail["조문"]) == 12
+    assert [item["조문번호"] for item in article["조문"]] == ["3"]
+    dates = [precedent["decisionDate"] for precedent in precedents]
+    assert len(dates) == 50 and dates == sorted(dates, reverse=True)
+    assert supreme and all(precedent["court"] == "대법원" for precedent in supreme)
+    assert app.state.stats["synthetic"] == app.state.stats["requests"]
+
+def test_deterministic_corpus():
+    """같은 seed면 같은 XML, 다른 seed면 다른 말뭉치"""
+    params = {"target": "prec", "type": "XML", "display": 20, "sort": "ddes"}
+    first, second, other = (
+        TestClient(create_app(profile=LawStandInProfile(seed=seed))).get("/DRF/lawSearch.do", params=params).text
+        for seed in (1, 1, 2)
+    )
+    assert first == second and first != other
+
+def test_replay_fixtures():
+    """기록한 XML은 기관코드와 파라미터 순서에 관계없이 그대로 응답"""
+    with tempfile.TemporaryDirectory() as directory:
+        FixtureStore(directory).save(
+            fixture_key("lawSearch.do", {"OC": "recorder", "target": "law", "type": "XML", "display": 10, "query": "임대차"}),
+            RECORDED_LAWS
+        )
+        app = create_app(directory)
+        client = TestClient(app)
+        response = client.get("/DRF/lawSearch.do", params={"query": "임대차", "display": "10", "target": "law", "OC": "other"})
+        assert response.text == RECORDED_LAWS
+        assert response.headers["content-type"].startswith("text/xml")
+        assert LawDataService()._parse_law_xml(response.text)[0]["mst"] == "248613"
+
+        # 기록이 없는 요청은 합성 말뭉치로 응답
+        client.get("/DRF/lawSearch.do", params={"query": "근로기준", "display": "10", "target": "law"})
+        assert app.state.stats["replayed"] == 1 and app.state.stats["synthetic"] == 1
+
+def test_html_errors_and_timeouts():
+    """HTML 오류 페이지는 재시도 후 실패, 응답이 없으면 응답 대기 시간 초과로 실패하는지 확인"""
+    app = create_app(profile=LawStandInProfile(html_error_rate=1.0))
+    server, url = start_server(app)
+    try:
+        service = make_law_service(url)
+        assert asyncio.run(service.search_law_articles("000001", use_mock_on_failure=False)) is None
+        assert app.state.stats["html_errors"] == service.max_retries
+
+        app.state.profile.html_error_rate = 0.0
+        app.state.profile.timeout_rate = 1.0
+        app.state.profile.timeout_seconds = 0.5
+        service.timeout = 0.1
+        assert asyncio.run(service.list_current_laws()) is None
+        assert app.state.stats["timeouts"] == service.max_retries
+
+        # 일부만 실패하면 재시도로 성공
+        app.state.profile.timeout_rate = 0.0
+        app.state.profile.html_error_rate = 0.5
+        results = [asyncio.run(service.list_current_laws(page=page)) for page in range(1, 11)]
+        assert sum(result is not None for result in results) >= 8
+    finally:
+        server.should_exit = True
+
+if __name__ == "__main__":
+    test_synthetic_corpus()
+    test_deterministic_corpus()
+    test_replay_fixtures()
+    test_html_errors_and_timeouts()
+    print("\n모든 테스트 완료!")
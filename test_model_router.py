@@ -0,0 +1,145 @@
+import asyncio
+import time
+
+import httpx
+
+import app.services.claude_service as claude_module
+from app.core.config import settings
+from app.core.metrics import get_histogram
+from app.services.claude_scheduler import ClaudeScheduler, set_claude_scheduler
+from app.services.claude_service import ClaudeService
+from app.services.model_router import ModelRouter, route_for, set_model_router
+from app.services.prompt_builder import max_tokens_for
+
+def test_routes():
+    """키워드 분석은 가장 큰 모델을 쓰지 않고, 호출 종류별 max_tokens가 라우팅 설정을 따르는지 확인"""
+    router = ModelRouter()
+    model, max_tokens = router.select("analyze")
+    assert model == settings.CLAUDE_MODEL_ROUTES["analyze"]["model"]
+    assert model != settings.CLAUDE_MODEL_ROUTES["consultation"]["model"]
+    assert max_tokens == max_tokens_for("analyze") == settings.CLAUDE_MODEL_ROUTES["analyze"]["max_tokens"]
+    assert route_for("unknown") == settings.CLAUDE_MODEL_ROUTES["default"]
+
+def test_fallback_on_slow_p95():
+    """기본 모델의 p95가 SLO를 넘으면 대체 모델로 바꾸고, 전환 기간이 지나면 기본 모델로 돌아오는지 확인"""
+    route = route_for("consultation")
+    router = ModelRouter(window=10, min_samples=5, fallback_seconds=0.1)
+
+    for _ in range(4):
+        router.record("consultation", route["model"], route["slo_p95_seconds"] + 1)
+    assert router.select("consultation")[0] == route["model"]  # 기록이 min_samples보다 적으면 전환하지 않음
+
+    router.record("consultation", route["model"], route["slo_p95_seconds"] + 1)
+    assert router.select("consultation")[0] == route["fallback_model"]
+
+    # 대체 모델의 지연 시간은 기본 모델 평가에 쓰지 않음
+    router.record("consultation", route["fallback_model"], 1.0)
+    assert router.p95("consultation") is None
+
+    time.sleep(0.15)
+    assert router.select("consultation")[0] == route["model"]
+
+    # 대체 모델이 없는 호출 종류는 느려도 바꾸지 않음
+    analyze = route_for("analyze")
+    for _ in range(5):
+        router.record("analyze", analyze["model"], 1000.0)
+    assert router.select("analyze")[0] == analyze["model"]
+
+    histogram = get_histogram("lawmate_claude_route_seconds", labels={"call_type": "consultation", "model": route["fallback_model"]})
+    assert histogram.count >= 1
+
+def test_request_uses_route():
+    """Claude 요청 본문의 model/max_tokens가 라우터가 고른 값인지 확인"""
+    set_claude_scheduler(ClaudeScheduler(initial_limit=4))
+    set_model_router(ModelRouter())
+    bodies = []
+
+    class FakeResponse:
+        status_code = 200
+        headers = {}
+        text = ""
+
+        def json(self):
+            return {"content": [{"text": "답변"}], "usage": {"input_tokens": 10, "output_tokens": 2}}
+
+    class FakeClient:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args):
+            return False
+
+        async def post(self, url, headers=None, json=None, timeout=None):
+            bodies.append(json)
+            return FakeResponse()
+
+    original = claude_module.httpx.AsyncClient
+    claude_module.httpx.AsyncClient = FakeClient
+    try:
+        service = ClaudeService()
+        asyncio.run(service._call_claude_api("설명", "analyze"))
+        asyncio.run(service._call_claude_api("질문", "consultation"))
+    finally:
+        claude_module.httpx.AsyncClient = original
+        set_claude_scheduler(None)
+        set_model_router(None)
+
+    assert bodies[0]["model"] == route_for("analyze")["model"]
+    assert bodies[0]["max_tokens"] == route_for("analyze")["max_tokens"]
+    assert bodies[1]["model"] == route_for("consultation")["model"]
+    assert bodies[1]["max_tokens"] == route_for("consultation")["max_tokens"]
+
+def test_fallback_on_failures():
+    """기본 모델이 시간 초과/과부하(529)로 응답하지 못해도 실패한 호출을 기록해 대체 모델로 전환하는지 확인"""
+    route = route_for("consultation")
+    set_claude_scheduler(ClaudeScheduler(initial_limit=4))
+    models = []
+
+    class OverloadedResponse:
+        status_code = 529
+        headers = {"retry-after": "0", "content-type": "application/json"}
+        text = '{"type": "error", "error": {"type": "overloaded_error"}}'
+
+    def make_client(outcome):
+        class FakeClient:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *args):
+                return False
+
+            async def post(self, url, headers=None, json=None, timeout=None):
+                models.append(json["model"])
+                if outcome == "timeout":
+                    raise httpx.ReadTimeout("timed out")
+                return OverloadedResponse()
+        return FakeClient
+
+    original = claude_module.httpx.AsyncClient
+    try:
+        for outcome in ("timeout", "overloaded"):
+            router = ModelRouter(window=10, min_samples=3, fallback_seconds=60)
+            set_model_router(router)
+            claude_module.httpx.AsyncClient = make_client(outcome)
+            service = ClaudeService()
+            for _ in range(3):
+                failed = False
+                try:
+                    asyncio.run(service._call_claude_api("질문", "consultation"))
+                except Exception:
+                    failed = True
+                assert failed, outcome
+            assert router.select("consultation")[0] == route["fallback_model"], outcome
+    finally:
+        claude_module.httpx.AsyncClient = original
+        set_claude_scheduler(None)
+        set_model_router(None)
+
+    assert models[0] == route["model"]
+
+if __name__ == "__main__":
+    test_routes()
+    test_fallback_on_slow_p95()
+    test_request_uses_route()
+    test_fallback_on_failures()
+    print("\n모든 테스트 완료!")
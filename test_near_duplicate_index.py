@@ -0,0 +1,68 @@
+import asyncio
+
+from app.core.config import settings
+from app.db.models import ACase, ACaseLaw
+from app.services.legal_consultation_service import LegalConsultationService
+from app.services.near_duplicate_index import NearDuplicateIndex, set_near_duplicate_index
+from conftest import DESCRIPTION, DIFFERENT, StubClaudeService, make_session
+
+PARAPHRASE = "2년  전세 계약이 지난달에 끝났는데, 집주인이 보증금 3억원을 돌려주지 않고 있어요! 어떻게 해야 하나요"
+
+def test_near_duplicate_query():
+    """띄어쓰기/문장부호/어미만 다른 설명은 찾고, 다른 쟁점의 설명은 찾지 않는지 확인"""
+    index = NearDuplicateIndex(threshold=0.6)
+    index.add(1, DESCRIPTION)
+    index.add(2, DIFFERENT)
+
+    match = index.query(PARAPHRASE)
+    print(f"유사 사례: {match}")
+    assert match is not None and match[0] == 1
+    assert index.query(PARAPHRASE, exclude=1) is None
+    assert index.query("층간소음 때문에 잠을 못 자고 있습니다.") is None
+
+    # 설명이 바뀐 사례는 교체, 삭제한 사례는 더 이상 찾지 않음
+    index.add(1, "중고거래 사이트에서 노트북을 샀는데 물건이 오지 않습니다.")
+    assert index.query(PARAPHRASE) is None
+    index.remove(2)
+    assert len(index) == 1 and index.query(DIFFERENT) is None
+
+def test_process_consultation_reuses_analysis():
+    """비슷한 사례가 이미 분석되어 있으면 Claude 분석을 호출하지 않고 결과를 재사용하는지 확인"""
+    db = make_session()
+    for case_id, description in [(1, DESCRIPTION), (2, PARAPHRASE), (3, DIFFERENT), (4, PARAPHRASE + " 도와주세요.")]:
+        db.add(ACase(aCase_id=case_id, user_id=1, aCase_type="일반", description=description))
+    db.commit()
+
+    set_near_duplicate_index(NearDuplicateIndex(threshold=0.6))
+    service = LegalConsultationService(use_mock_data=True)
+    service.claude_service = StubClaudeService()
+    original_reuse_retrieval = settings.NEAR_DUPLICATE_REUSE_RETRIEVAL
+    try:
+        first = asyncio.run(service.process_consultation(db, 1, DESCRIPTION))
+        assert first["reused_case_id"] is None
+        assert service.claude_service.analyze_calls == 1
+
+        second = asyncio.run(service.process_consultation(db, 2, PARAPHRASE))
+        assert second["reused_case_id"] == 1
+        assert second["keywords"] == first["keywords"]
+        assert service.claude_service.analyze_calls == 1
+
+        third = asyncio.run(service.process_consultation(db, 3, DIFFERENT))
+        assert third["reused_case_id"] is None
+        assert service.claude_service.analyze_calls == 2
+
+        # 검색 결과 재사용: 기존 사례와 연결된 조문/판례를 새 사례에 연결
+        settings.NEAR_DUPLICATE_REUSE_RETRIEVAL = True
+        service.law_data_service._get_mock_laws = lambda: (_ for _ in ()).throw(AssertionError("법령 검색을 다시 실행함"))
+        fourth = asyncio.run(service.process_consultation(db, 4, PARAPHRASE + " 도와주세요."))
+        assert fourth["reused_case_id"] in (1, 2)
+        assert fourth["laws"] and all(law in first["laws"] for law in fourth["laws"])
+        assert db.query(ACaseLaw).filter(ACaseLaw.aCase_id == 4).count() > 0
+    finally:
+        settings.NEAR_DUPLICATE_REUSE_RETRIEVAL = original_reuse_retrieval
+        set_near_duplicate_index(None)
+
+if __name__ == "__main__":
+    test_near_duplicate_query()
+    test_process_consultation_reuses_analysis()
+    print("\n모든 테스트 완료!")
@@ -0,0 +1,228 @@
+import asyncio
+import os
+import tempfile
+import threading
+
+from app.core.config import settings
+from app.db.models import Precedent
+from app.services.law_data_service import LawDataService
+from app.services.precedent_ingest_service import PrecedentIngestService
+
+class FakeLawDataService:
+    """선고일자 내림차순으로 정렬된 고정 판례 목록을 페이지 단위로 반환하는 테스트용 서비스"""
+
+    def __init__(self, precedents, details=False, missing_details=()):
+        self.precedents = precedents
+        self.requested_pages = []
+        self.details = details  # False면 본문 조회 실패 (목록 정보만 저장)
+        self.missing_details = set(missing_details)  # 본문 조회에 실패하는 판례일련번호
+        self.requested_details = []
+
+    async def search_precedents(self, page=1, display=20, sort=None, use_mock_on_failure=True, **kwargs):
+        self.requested_pages.append(page)
+        ordered = sorted(self.precedents, key=lambda p: p["decisionDate"], reverse=True)
+        start = (page - 1) * display
+        return ordered[start:start + display]
+
+    async def fetch_precedent_detail(self, precedent_id):
+        self.requested_details.append(precedent_id)
+        if not self.details or precedent_id in self.missing_details:
+            return None
+        return {"판시사항": f"보증금 반환 의무 {precedent_id}", "판결요지": "임대인은 보증금을 반환하여야 한다.", "판례내용": "판결 본문"}
+
+def make_precedent(serial, decision_date, case_number=None):
+    return {
+        "precedentId": str(serial),
+        "caseName": f"테스트 사건 {serial}",
+        "caseNumber": case_number or f"2024다{serial}",
+        "decisionDate": decision_date,
+        "court": "대법원",
+        "link": ""
+    }
+
+def test_precedent_ingest_incremental(session_factory_for):
+    """최초 전체 수집 후 워터마크 이후의 새 판례만 저장되는지 확인"""
+    session_factory = session_factory_for([Precedent.__table__])
+    checkpoint_path = os.path.join(tempfile.mkdtemp(), "precedent_ingest.json")
+
+    # 2023년 1월부터 하루 간격 판례 25건 (같은 사건번호 1건 포함)
+    precedents = [make_precedent(1000 + i, f"202301{i + 1:02d}") for i in range(25)]
+    precedents.append(make_precedent(2000, "20230105", case_number=precedents[4]["caseNumber"]))
+
+    fake = FakeLawDataService(precedents)
+    service = PrecedentIngestService(
+        session_factory, fake, concurrency=2, checkpoint_path=checkpoint_path, page_size=10, lookback_days=3
+    )
+
+    print("=== 최초 판례 수집 ===")
+    stats = asyncio.run(service.ingest())
+    assert stats["completed"]
+    assert stats["inserted"] == 25  # 사건번호 중복 1건 제외
+    assert stats["watermark"] == {"serial": 2000, "decision_date": "20230125"}
+
+    db = session_factory()
+    assert db.query(Precedent).count() == 25
+    db.close()
+
+    print("\n=== 증분 판례 수집 ===")
+    precedents.extend(make_precedent(3000 + i, f"202303{i + 1:02d}") for i in range(5))
+    fake.requested_pages.clear()
+    stats = asyncio.run(service.ingest())
+    assert stats["inserted"] == 5
+    # 워터마크 이전 판례가 나오는 첫 번째 페이지 묶음에서 조회 중단
+    assert fake.requested_pages == [1, 2]
+
+def test_precedent_ingest_resume(session_factory_for):
+    """최대 페이지 수로 중단된 수집이 다음 실행에서 이어지는지 확인"""
+    session_factory = session_factory_for([Precedent.__table__])
+    checkpoint_path = os.path.join(tempfile.mkdtemp(), "precedent_ingest.json")
+
+    precedents = [make_precedent(1000 + i, f"202301{i + 1:02d}") for i in range(25)]
+    fake = FakeLawDataService(precedents)
+    service = PrecedentIngestService(session_factory, fake, concurrency=1, checkpoint_path=checkpoint_path, page_size=10)
+
+    stats = asyncio.run(service.ingest(max_pages=1))
+    assert not stats["completed"]
+    assert stats["inserted"] == 10
+
+    fake.requested_pages.clear()
+    stats = asyncio.run(service.ingest())
+    assert stats["completed"]
+    assert fake.requested_pages == [2, 3]
+    assert stats["inserted"] == 15
+
+def test_precedent_ingest_dotted_dates(session_factory_for):
+    """실제 판례 목록 API처럼 선고일자가 YYYY.MM.DD 형식이어도 워터마크 이전에서 조회를 멈추는지 확인"""
+    session_factory = session_factory_for([Precedent.__table__])
+    checkpoint_path = os.path.join(tempfile.mkdtemp(), "precedent_ingest.json")
+
+    precedents = [make_precedent(1000 + i, f"2023.01.{i + 1:02d}") for i in range(25)]
+    fake = FakeLawDataService(precedents)
+    service = PrecedentIngestService(
+        session_factory, fake, concurrency=2, checkpoint_path=checkpoint_path, page_size=10, lookback_days=3
+    )
+
+    stats = asyncio.run(service.ingest())
+    assert stats["completed"] and stats["inserted"] == 25
+    assert stats["watermark"] == {"serial": 1024, "decision_date": "20230125"}
+
+    precedents.extend(make_precedent(3000 + i, f"2023.03.{i + 1:02d}") for i in range(5))
+    fake.requested_pages.clear()
+    stats = asyncio.run(service.ingest())
+    assert stats["inserted"] == 5
+    assert fake.requested_pages == [1, 2]  # 전체 목록을 다시 조회하지 않음
+    assert stats["watermark"]["decision_date"] == "20230305"
+
+def test_precedent_ingest_parse_failure(session_factory_for):
+    """XML 파싱 실패는 마지막 페이지로 보지 않고 체크포인트를 바꾸지 않는지 확인"""
+    assert LawDataService()._parse_precedent_list_xml("<PrecSearch><prec>") is None
+    assert LawDataService()._parse_precedent_list_xml("점검 중입니다") is None
+
+    class BrokenPageService(FakeLawDataService):
+        async def search_precedents(self, page=1, **kwargs):
+            if page == 2:
+                self.requested_pages.append(page)
+                return None  # use_mock_on_failure=False일 때 파싱 실패 응답
+            return await super().search_precedents(page=page, **kwargs)
+
+    session_factory = session_factory_for([Precedent.__table__])
+    checkpoint_path = os.path.join(tempfile.mkdtemp(), "precedent_ingest.json")
+    precedents = [make_precedent(1000 + i, f"202301{i + 1:02d}") for i in range(25)]
+    service = PrecedentIngestService(
+        session_factory, BrokenPageService(precedents), concurrency=2, checkpoint_path=checkpoint_path, page_size=10
+    )
+
+    stats = asyncio.run(service.ingest())
+    assert not stats["completed"] and stats["inserted"] == 0
+    assert stats["watermark"] == {}
+    assert service.checkpoint.load() == {}
+
+def test_precedent_ingest_details(session_factory_for):
+    """목록 API에 없는 판시사항/판결요지를 본문 API로 채우고, 실패한 판례는 다음 실행에서 다시 조회하는지 확인"""
+    from app.services.precedent_ranker import PrecedentRanker
+
+    session_factory = session_factory_for([Precedent.__table__])
+    checkpoint_path = os.path.join(tempfile.mkdtemp(), "precedent_ingest.json")
+    precedents = [make_precedent(1000 + i, f"202301{i + 1:02d}") for i in range(5)]
+    fake = FakeLawDataService(precedents, details=True, missing_details={"1003"})
+    service = PrecedentIngestService(session_factory, fake, concurrency=2, checkpoint_path=checkpoint_path, page_size=10)
+
+    # 서버 전체에서 공유하는 판례 검색기/의미 검색 색인을 테스트 DB로 바꾸지 않도록 다시 생성하지 않음
+    original = (settings.PRECEDENT_LOCAL_SEARCH, settings.SEMANTIC_SEARCH)
+    settings.PRECEDENT_LOCAL_SEARCH, settings.SEMANTIC_SEARCH = False, False
+    try:
+        stats = asyncio.run(service.ingest())
+        assert stats["inserted"] == 5 and stats["details"] == 4
+        db = session_factory()
+        holdings = {row.precedent_serial: row.holding for row in db.query(Precedent).all()}
+        db.close()
+        assert holdings["1001"] == "보증금 반환 의무 1001" and not holdings["1003"]
+
+        # 본문 조회가 복구되면 다음 실행에서 빈 판례만 다시 조회
+        fake.missing_details.clear()
+        fake.requested_details.clear()
+        stats = asyncio.run(service.ingest())
+    finally:
+        settings.PRECEDENT_LOCAL_SEARCH, settings.SEMANTIC_SEARCH = original
+    assert stats["inserted"] == 0 and stats["details"] == 1
+    assert fake.requested_details == ["1003"]
+
+    db = session_factory()
+    rows = [(row.precedent_id, row.case_name, row.holding, row.summary) for row in db.query(Precedent).all()]
+    db.close()
+    assert all(holding and summary for _, _, holding, summary in rows)
+    ranker = PrecedentRanker().build(rows)
+    assert ranker.search("보증금 반환")["total"] == 5  # 사건명에 없는 검색어도 판시사항/판결요지로 검색됨
+
+def test_precedent_ingest_db_off_loop(session_factory_for):
+    """서버 안에서 수집해도 요청 처리를 막지 않도록 DB 조회/저장은 이벤트 루프 스레드 밖에서 실행되는지 확인"""
+    session_factory = session_factory_for([Precedent.__table__])
+    session_threads = []
+
+    def recording_session_factory():
+        session_threads.append(threading.get_ident())
+        return session_factory()
+
+    precedents = [make_precedent(1000 + i, f"202301{i + 1:02d}") for i in range(5)]
+    fake = FakeLawDataService(precedents, details=True, missing_details={"1003"})
+    service = PrecedentIngestService(
+        recording_session_factory, fake, concurrency=2,
+        checkpoint_path=os.path.join(tempfile.mkdtemp(), "precedent_ingest.json"), page_size=10
+    )
+
+    original = (settings.PRECEDENT_LOCAL_SEARCH, settings.SEMANTIC_SEARCH)
+    settings.PRECEDENT_LOCAL_SEARCH, settings.SEMANTIC_SEARCH = False, False
+    try:
+        stats = asyncio.run(service.ingest())
+    finally:
+        settings.PRECEDENT_LOCAL_SEARCH, settings.SEMANTIC_SEARCH = original
+    assert stats["inserted"] == 5 and stats["details"] == 4
+    # 새 판례 조회, 일괄 저장, 본문 재조회 대상 조회, 재조회 결과 저장
+    assert len(session_threads) == 4
+    assert threading.get_ident() not in session_threads
+
+def test_fetch_precedent_detail():
+    """국가법령정보 대역 서버의 판례 본문 API에서 판시사항/판결요지를 조회하고, 없는 판례는 None인지 확인"""
+    from conftest import make_law_service, start_server
+    from mock_law_api_server import create_app as create_law_app
+
+    server, url = start_server(create_law_app())
+    try:
+        service = make_law_service(url)
+        detail = asyncio.run(service.fetch_precedent_detail("300001"))
+        assert detail["판시사항"] and detail["판결요지"]
+        assert asyncio.run(service.fetch_precedent_detail("1")) is None
+    finally:
+        server.should_exit = True
+
+if __name__ == "__main__":
+    from conftest import new_session_factory
+
+    test_precedent_ingest_incremental(new_session_factory)
+    test_precedent_ingest_resume(new_session_factory)
+    test_precedent_ingest_dotted_dates(new_session_factory)
+    test_precedent_ingest_parse_failure(new_session_factory)
+    test_precedent_ingest_details(new_session_factory)
+    test_precedent_ingest_db_off_loop(new_session_factory)
+    test_fetch_precedent_detail()
+    print("\n모든 테스트 완료!")
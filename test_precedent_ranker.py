@@ -0,0 +1,66 @@
+from app.db.models import Precedent
+from app.services.precedent_ranker import PrecedentRanker, rebuild_precedent_ranker, get_precedent_ranker
+
+ROWS = [
+    (1, "임대차보증금반환", "임대인이 임차인에게 보증금을 반환할 의무가 있는지 여부", "임대차 종료 시 임대인은 보증금을 반환하여야 한다."),
+    (2, "손해배상(기)", "임대인의 수선의무 위반으로 인한 손해배상 범위", "임차인이 입은 손해는 통상의 손해에 한한다."),
+    (3, "부당해고구제재심판정취소", "정당한 이유 없는 해고의 효력", "사용자가 근로자를 해고하려면 정당한 이유가 있어야 한다."),
+    (4, "퇴직금", "퇴직금 산정의 기초가 되는 평균임금", "퇴직금은 평균임금을 기준으로 산정한다."),
+    (5, "건물명도", None, "임대차 계약이 해지된 경우 임차인은 건물을 명도하여야 한다."),
+]
+
+def test_rank_order():
+    """사건명 / 판시사항에 검색어가 있는 판례가 먼저 나오는지 확인"""
+    ranker = PrecedentRanker().build(ROWS)
+
+    results = ranker.search("보증금 반환")["results"]
+    print(f"검색 결과: {results}")
+    assert results[0][0] == 1
+
+    results = ranker.search("부당해고")["results"]
+    assert results[0][0] == 3
+
+    # 사건명에 나온 경우가 판결요지에만 나온 경우보다 높은 점수
+    results = dict(ranker.search("퇴직금 임금")["results"])
+    assert max(results, key=results.get) == 4
+
+    assert ranker.search("전세사기")["results"] == []
+
+def test_paging_and_cache():
+    """페이지 단위 결과와 검색어 캐시 확인"""
+    ranker = PrecedentRanker(cache_size=2).build(ROWS)
+
+    first = ranker.search("임대차 임차인", page=1, display=2)
+    second = ranker.search("임차인 임대차", page=2, display=2)
+    assert first["total"] == second["total"] == 3
+    assert len(first["results"]) == 2 and len(second["results"]) == 1
+    assert not {pid for pid, _ in first["results"]} & {pid for pid, _ in second["results"]}
+    assert ranker.cache_hits == 1 and ranker.cache_misses == 1
+
+    ranker.search("해고")
+    ranker.search("퇴직금")
+    assert len(ranker._cache) == 2
+
+def test_rebuild_from_db(session_factory_for):
+    """DB에 저장된 판례로 전역 검색기 생성 확인"""
+    session_factory = session_factory_for([Precedent.__table__])
+
+    db = session_factory()
+    for precedent_id, case_name, holding, summary in ROWS:
+        db.add(Precedent(precedent_id=precedent_id, case_number=f"2024다{precedent_id}",
+                         case_name=case_name, holding=holding, summary=summary))
+    db.commit()
+    db.close()
+
+    ranker = rebuild_precedent_ranker(session_factory)
+    assert get_precedent_ranker() is ranker
+    assert ranker.document_count == 5
+    assert ranker.search("건물 명도")["results"][0][0] == 5
+
+if __name__ == "__main__":
+    from conftest import new_session_factory
+
+    test_rank_order()
+    test_paging_and_cache()
+    test_rebuild_from_db(new_session_factory)
+    print("\n모든 테스트 완료!")
@@ -0,0 +1,161 @@
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.endpoints.auth import get_current_user
+from app.core.config import settings
+from app.core.profiling import BackgroundProfiler, RequestProfilingMiddleware, read_folded, write_folded
+
+ADMIN = SimpleNamespace(email="admin@lawmate.com")
+USER = SimpleNamespace(email="user@example.com")
+
+def busy_search(seconds):
+    """프로파일에 나타나야 하는 CPU 작업"""
+    total = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+def make_app():
+    app = FastAPI()
+
+    @app.get("/search")
+    async def search():
+        return {"total": busy_search(0.15)}
+
+    app.add_middleware(RequestProfilingMiddleware, dependency_overrides_provider=app)
+    return app
+
+def profiler_threads():
+    return [thread for thread in threading.enumerate() if thread.name == "lawmate-profiler"]
+
+class profile_dir:
+    """PROFILE_DIR를 임시 디렉터리로 바꿈"""
+
+    def __enter__(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.original = settings.PROFILE_DIR
+        settings.PROFILE_DIR = self.directory.name
+        return self.directory.name
+
+    def __exit__(self, *args):
+        settings.PROFILE_DIR = self.original
+        self.directory.cleanup()
+
+def test_not_requested():
+    """프로파일 요청이 아니면 프로파일러 스레드를 만들지 않고 파일도 남기지 않음"""
+    app = make_app()
+    with profile_dir() as directory:
+        client = TestClient(app)
+        before = len(profiler_threads())
+        response = client.get("/search")
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+        assert len(profiler_threads()) == before
+        assert os.listdir(directory) == []
+
+        # 이름이 _profile로 끝나거나 값이 1이 아닌 쿼리는 프로파일 요청이 아님
+        for query in ({"user_profile": "1"}, {"show_profile": "1"}, {"_profile": "10"}):
+            response = client.get("/search", params=query)
+            assert response.status_code == 200, query
+            assert "x-profile-id" not in response.headers
+        assert os.listdir(directory) == []
+
+def test_admin_only():
+    app = make_app()
+    with profile_dir() as directory:
+        client = TestClient(app)
+        assert client.get("/search", headers={"X-Profile": "1"}).status_code == 401
+
+        app.dependency_overrides[get_current_user] = lambda: USER
+        response = client.get("/search", params={"_profile": "1"})
+        assert response.status_code == 403
+        assert response.json() == {"detail": "Admin privileges required"}
+        assert os.listdir(directory) == []
+
+def test_request_profile():
+    """관리자 요청은 엔드포인트 실행 중 스택을 수집해 접힌 스택 파일로 저장"""
+    app = make_app()
+    app.dependency_overrides[get_current_user] = lambda: ADMIN
+    with profile_dir() as directory:
+        response = TestClient(app).get("/search", headers={"X-Profile": "1"})
+        assert response.status_code == 200
+        name = response.headers["x-profile-id"]
+        assert name.startswith("request-") and name.endswith(".folded")
+
+        counts = read_folded(os.path.join(directory, name))
+        busy = sum(count for stack, count in counts.items() if "busy_search (test_profiling.py" in stack)
+        assert busy >= 5, counts
+        # 접힌 스택은 스레드 이름에서 시작해 바깥 함수 -> 안쪽 함수 순서
+        stack = next(stack for stack in counts if "busy_search" in stack)
+        frames = stack.split(";")
+        assert frames.index(next(frame for frame in frames if frame.startswith("search "))) < frames.index(
+            next(frame for frame in frames if frame.startswith("busy_search ")))
+
+def test_profile_endpoints():
+    from app.main import app
+
+    with profile_dir() as directory:
+        write_folded(os.path.join(directory, "request-abc.folded"), Counter({"MainThread;main;search": 3}))
+        client = TestClient(app)
+        try:
+            app.dependency_overrides[get_current_user] = lambda: USER
+            assert client.get("/api/v1/admin/profiles/").status_code == 403
+
+            app.dependency_overrides[get_current_user] = lambda: ADMIN
+            profiles = client.get("/api/v1/admin/profiles/").json()["profiles"]
+            assert [profile["name"] for profile in profiles] == ["request-abc.folded"]
+
+            response = client.get("/api/v1/admin/profiles/request-abc.folded")
+            assert response.status_code == 200 and response.text == "MainThread;main;search 3\n"
+            assert client.get("/api/v1/admin/profiles/missing.folded").status_code == 404
+            assert client.get("/api/v1/admin/profiles/..%2Fapp.db").status_code in (400, 404)
+            assert client.get("/api/v1/admin/profiles/.env").status_code == 400
+        finally:
+            app.dependency_overrides.clear()
+
+def test_middleware_order():
+    """요청 지표가 가장 바깥, 요청 로그가 프로파일링보다 바깥 (프로파일링 비용도 요청 처리 시간에 포함)"""
+    from app.core.http_metrics import RequestMetricsMiddleware
+    from app.core.structured_logging import RequestLoggingMiddleware
+    from app.main import app
+
+    order = [middleware.cls for middleware in app.user_middleware]  # 바깥 -> 안쪽
+    assert order[0] is RequestMetricsMiddleware
+    assert order.index(RequestLoggingMiddleware) < order.index(RequestProfilingMiddleware)
+
+def test_background_profiler():
+    """백그라운드 샘플은 시간 단위 파일에 계속 합산"""
+    with profile_dir() as directory:
+        worker = threading.Thread(target=busy_search, args=(0.3,), name="busy-worker")
+        profiler = BackgroundProfiler(0.005, 60, directory).start()
+        worker.start()
+        worker.join()
+        profiler.stop()
+
+        files = os.listdir(directory)
+        assert len(files) == 1 and files[0].startswith("aggregate-")
+        path = os.path.join(directory, files[0])
+        first = read_folded(path)
+        assert any(stack.startswith("busy-worker;") for stack in first)
+
+        write_folded(path, Counter({"busy-worker;extra": 2}), merge=True)
+        merged = read_folded(path)
+        assert merged["busy-worker;extra"] == first["busy-worker;extra"] + 2
+        assert sum(merged.values()) == sum(first.values()) + 2
+
+if __name__ == "__main__":
+    test_not_requested()
+    test_admin_only()
+    test_request_profile()
+    test_profile_endpoints()
+    test_middleware_order()
+    test_background_profiler()
+    print("\n모든 테스트 완료!")
@@ -0,0 +1,94 @@
+import asyncio
+
+from app.core.metrics import get_histogram
+from app.services.claude_service import ClaudeService
+from app.services.prompt_builder import PromptBuilder, OMITTED_MARK, max_tokens_for
+from app.services.text_utils import estimate_tokens
+
+LONG_CONTENT = "임차인은 임차주택에 대하여 보증금반환청구소송의 확정판결에 따라서 경매를 신청할 수 있다. " * 40
+
+def test_templates_have_no_indentation():
+    """템플릿 들여쓰기가 제거되어 프롬프트 줄 앞에 공백이 없는지 확인"""
+    prompt = PromptBuilder().consultation("보증금을 돌려받지 못하고 있습니다.", [], [])
+    assert prompt.system.startswith("당신은")
+    assert prompt.text.startswith("## 사용자 문제:")
+    lines = (prompt.system + "\n" + prompt.text).split("\n")
+    assert not any(line.startswith("        ") for line in lines)
+    assert "관련 법령 정보가 없습니다." in prompt.text
+    assert prompt.call_type == "consultation"
+    assert prompt.max_tokens == max_tokens_for("consultation")
+
+def test_condense():
+    """긴 텍스트는 문장 단위로 예산 안으로 줄이고, 짧은 텍스트는 공백만 정리하는지 확인"""
+    assert PromptBuilder.condense("  짧은   조문\n내용 ", 100) == "짧은 조문 내용"
+
+    condensed = PromptBuilder.condense(LONG_CONTENT, 100)
+    print(f"줄인 텍스트: {condensed}")
+    assert estimate_tokens(condensed) <= 100
+    assert condensed.endswith(OMITTED_MARK)
+    assert condensed.startswith("임차인은")
+
+    # 문장 경계가 없는 긴 텍스트는 글자 단위로 자름
+    condensed = PromptBuilder.condense("가" * 1000, 50)
+    assert estimate_tokens(condensed) <= 50
+    assert condensed.endswith(OMITTED_MARK)
+
+def test_context_budget():
+    """항목별/전체 예산을 지키고 관련성 높은 앞 순서부터 포함하는지 확인"""
+    laws = [{"lawName": "주택임대차보호법", "article": str(n), "content": LONG_CONTENT} for n in range(20)]
+    cases = [{"caseNo": f"2024다{n}", "summary": LONG_CONTENT} for n in range(20)]
+    builder = PromptBuilder(field_budget=200, context_budget=1000)
+
+    prompt = builder.summarize(laws, cases)
+    full_tokens = estimate_tokens(LONG_CONTENT) * 40
+    print(f"프롬프트 추정 토큰 수: {prompt.estimated_tokens} (전체 포함 시 {full_tokens} 이상)")
+
+    assert prompt.estimated_tokens < 1000 + PromptBuilder().summarize([], []).estimated_tokens
+    assert "조항: 0\n" in prompt.text
+    assert "조항: 19\n" not in prompt.text
+    assert "사건번호: 2024다0\n" in prompt.text
+    assert prompt.max_tokens == max_tokens_for("summarize")
+
+def test_usage_reported():
+    """Claude 호출 시 응답의 usage 값으로 입력/출력 토큰 수가 기록되는지 확인"""
+    service = ClaudeService()
+    service.use_analysis_cache = False
+    histogram = get_histogram("lawmate_claude_output_tokens", labels={"call_type": "analyze"})
+    before = histogram.count
+
+    class FakeResponse:
+        status_code = 200
+        headers = {"content-type": "application/json"}
+
+        def json(self):
+            return {"content": [{"text": "{}"}], "usage": {"input_tokens": 321, "output_tokens": 45}}
+
+    class FakeClient:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args):
+            return False
+
+        async def post(self, url, headers=None, json=None, timeout=None):
+            assert json["max_tokens"] == max_tokens_for("analyze")
+            return FakeResponse()
+
+    import app.services.claude_service as claude_module
+    original = claude_module.httpx.AsyncClient
+    claude_module.httpx.AsyncClient = FakeClient
+    try:
+        result = asyncio.run(service.analyze_legal_issue("보증금을 돌려받지 못하고 있습니다."))
+    finally:
+        claude_module.httpx.AsyncClient = original
+
+    assert result == {}
+    assert histogram.count == before + 1
+    assert histogram.sum >= 45
+
+if __name__ == "__main__":
+    test_templates_have_no_indentation()
+    test_condense()
+    test_context_budget()
+    test_usage_reported()
+    print("\n모든 테스트 완료!")
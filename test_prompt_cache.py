@@ -0,0 +1,68 @@
+import asyncio
+
+from app.core.metrics import get_histogram
+from app.services.prompt_builder import PromptBuilder
+from conftest import make_service, start_server
+from mock_claude_server import create_app
+
+DESCRIPTION = "전세 계약이 끝났는데 집주인이 보증금을 돌려주지 않습니다."
+
+def test_static_instructions_in_system():
+    """고정 지시문은 system, 사례별 내용은 user 메시지로 분리되고 system은 호출마다 같은지 확인"""
+    builder = PromptBuilder()
+    first = builder.analyze(DESCRIPTION)
+    second = builder.analyze("해고 예고 없이 해고되었습니다.")
+    assert first.system == second.system
+    assert "legal_category" in first.system and "legal_category" not in first.text
+    assert DESCRIPTION in first.text and DESCRIPTION not in first.system
+
+    consultation = builder.consultation(DESCRIPTION, [], [])
+    assert "9. 참고 자료" in consultation.system
+    assert "9. 참고 자료" not in consultation.text
+
+def test_cache_control_request_shape():
+    """대역 서버로 요청 형식(cache_control)과 캐시 생성/읽기 토큰 기록 확인"""
+    app = create_app(min_cache_tokens=0)
+    server, url = start_server(app)
+    try:
+        service = make_service(url)
+        read_histogram = get_histogram("lawmate_claude_cache_read_tokens", labels={"call_type": "analyze"})
+        creation_histogram = get_histogram("lawmate_claude_cache_creation_tokens", labels={"call_type": "analyze"})
+        reads_before, creations_before = read_histogram.sum, creation_histogram.sum
+
+        first = asyncio.run(service.analyze_legal_issue(DESCRIPTION))
+        asyncio.run(service.analyze_legal_issue("해고 예고 없이 해고되었습니다."))
+    finally:
+        server.should_exit = True
+
+    assert first["legal_category"] == "부동산/임대차"
+    headers, body = app.state.requests[0]
+    assert headers["anthropic-version"] == "2023-06-01"
+    assert body["system"][0]["cache_control"] == {"type": "ephemeral"}
+    assert body["messages"][0]["role"] == "user"
+    assert "legal_category" not in body["messages"][0]["content"]
+
+    # 첫 호출은 캐시 생성, 두 번째 호출은 같은 앞부분을 캐시에서 읽음
+    system_tokens = creation_histogram.sum - creations_before
+    assert system_tokens > 0
+    assert read_histogram.sum - reads_before == system_tokens
+
+def test_invalid_request_rejected():
+    """대역 서버가 잘못된 요청 형식을 거부하는지 확인"""
+    app = create_app()
+    server, url = start_server(app)
+    try:
+        service = make_service(url)
+        try:
+            asyncio.run(service._call_claude_api("질문", max_tokens=-1))
+            assert False, "잘못된 max_tokens가 거부되지 않았습니다."
+        except Exception as e:
+            assert "400" in str(e) and "max_tokens" in str(e)
+    finally:
+        server.should_exit = True
+
+if __name__ == "__main__":
+    test_static_instructions_in_system()
+    test_cache_control_request_shape()
+    test_invalid_request_rejected()
+    print("\n모든 테스트 완료!")
@@ -0,0 +1,69 @@
+import numpy as np
+
+from app.db.models import Law, LawArticle, Precedent, ACaseLaw, ACasePrecedent
+from app.services.legal_consultation_service import LegalConsultationService
+from app.services.relevance_scorer import RelevanceScorer, select_relevant
+
+DESCRIPTION = "전세 계약이 끝났는데 집주인이 보증금을 돌려주지 않습니다."
+KEYWORDS = ["보증금", "반환", "임대차"]
+
+def test_keyword_scores():
+    """키워드가 많이 포함된 후보일수록 높은 점수를 받는지 확인"""
+    texts = [
+        "임차인은 보증금을 반환받을 때까지 임대차관계가 존속되는 것으로 본다.",
+        "임대차 기간이 끝난 경우 임차인은 보증금을 받을 수 있다.",
+        "사용자는 근로자에게 정당한 이유 없이 해고를 하지 못한다.",
+    ]
+    scores = RelevanceScorer().score(DESCRIPTION, KEYWORDS, texts)
+    print(f"관련성 점수: {scores}")
+
+    assert scores.dtype == np.float32
+    assert scores[0] == 100
+    assert scores[0] > scores[1] > scores[2]
+    assert scores[2] == 0
+
+def test_select_relevant():
+    """기준 점수 미만 후보 제외 및 최소 유지 개수 확인"""
+    scores = np.array([10, 80, 35, 5], dtype=np.float32)
+    assert select_relevant(scores, min_score=30) == [1, 2]
+    assert select_relevant(scores, min_score=90) == [1]
+    assert select_relevant(scores, min_score=90, min_keep=0) == []
+    assert select_relevant(np.zeros(0, dtype=np.float32), min_score=30) == []
+
+def test_relations_store_scores(session_factory_for):
+    """사례-조문 / 사례-판례 연결에 계산된 점수가 저장되고 낮은 점수는 제외되는지 확인"""
+    tables = [Law.__table__, LawArticle.__table__, Precedent.__table__, ACaseLaw.__table__, ACasePrecedent.__table__]
+    db = session_factory_for(tables)()
+
+    db.add(Law(law_id=1, law_code="000001", law_name="주택임대차보호법"))
+    db.add_all([
+        LawArticle(article_id=1, law_id=1, article_number="3", article_title="대항력 등", content="임대차는 주택의 인도와 주민등록을 마친 때에 효력이 생긴다."),
+        LawArticle(article_id=2, law_id=1, article_number="4", article_title="보증금의 회수", content="임차인은 보증금을 반환받을 때까지 임대차관계가 존속되는 것으로 본다."),
+        LawArticle(article_id=3, law_id=1, article_number="30", article_title="벌칙", content="거짓으로 신고한 자는 과태료에 처한다."),
+        Precedent(precedent_id=1, case_number="2024다1", case_name="임대차보증금반환", summary="임대인은 보증금을 반환하여야 한다."),
+        Precedent(precedent_id=2, case_number="2024도2", case_name="사기", summary="기망행위로 재물을 편취한 경우 사기죄가 성립한다."),
+    ])
+    db.commit()
+
+    service = LegalConsultationService(use_mock_data=True)
+    articles = db.query(LawArticle).order_by(LawArticle.article_id).all()
+    scores = service.relevance_scorer.score(DESCRIPTION, KEYWORDS, [f"{a.article_title} {a.content}" for a in articles])
+    selected = select_relevant(scores)
+    service._save_case_law_relations(db, 7, [(articles[i], int(round(scores[i]))) for i in selected])
+
+    relations = db.query(ACaseLaw).order_by(ACaseLaw.relevance_score.desc()).all()
+    assert relations[0].article_id == 2
+    assert 3 not in [relation.article_id for relation in relations]
+    assert all(relation.relevance_score != 80 for relation in relations)
+
+    precedents = service._link_relevant_precedents(db, 7, KEYWORDS, DESCRIPTION, db.query(Precedent).all())
+    assert [p.precedent_id for p in precedents] == [1]
+    assert db.query(ACasePrecedent).one().relevance_score > 0
+
+if __name__ == "__main__":
+    from conftest import new_session_factory
+
+    test_keyword_scores()
+    test_select_relevant()
+    test_relations_store_scores(new_session_factory)
+    print("\n모든 테스트 완료!")
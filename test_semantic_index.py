@@ -0,0 +1,61 @@
+import os
+import tempfile
+import numpy as np
+
+from app.services.semantic_index import SemanticIndex
+
+ROWS = [
+    (101, 1, "목적 이 법은 주거용 건물의 임대차에 관하여 민법에 대한 특례를 규정한다."),
+    (102, 1, "계약의 갱신 임대인은 임차인이 계약갱신을 요구할 경우 정당한 사유 없이 거절하지 못한다."),
+    (103, 1, "보증금의 회수 임차인은 보증금을 반환받을 때까지 임대차관계가 존속되는 것으로 본다."),
+    (201, 2, "해고 등의 제한 사용자는 근로자에게 정당한 이유 없이 해고를 하지 못한다."),
+    (202, 2, "퇴직급여 제도 사용자는 퇴직하는 근로자에게 퇴직급여를 지급하여야 한다."),
+    (203, 2, "임금 지급 임금은 통화로 직접 근로자에게 그 전액을 지급하여야 한다."),
+]
+
+def make_index(rows=ROWS):
+    path = os.path.join(tempfile.mkdtemp(), "law_articles")
+    return SemanticIndex.build(rows, path, hash_dim=512, dim=16, chunk_rows=2), path
+
+def test_search_top_k():
+    """의미가 가까운 조문이 먼저 나오고 임베딩이 메모리 맵으로 열리는지 확인"""
+    index, _ = make_index()
+    assert isinstance(index.embeddings, np.memmap)
+    assert index.embeddings.dtype == np.float32
+
+    hits = index.search("집주인이 보증금을 반환하지 않아요", k=3)
+    print(f"검색 결과: {hits}")
+    assert hits[0][0] == 103
+    assert len(hits) <= 3
+
+    assert index.group_scores("회사에서 해고 통보를 받았습니다").keys() >= {2}
+    assert max(index.group_scores("퇴직금 지급").items(), key=lambda item: item[1])[0] == 2
+
+def test_batch_matches_single():
+    """묶음 검색 결과가 개별 검색과 같은지 확인 (행 묶음 경계 포함)"""
+    index, _ = make_index()
+    index.BATCH_ROWS = 4
+    queries = ["보증금 반환", "해고 제한", "임금 지급"]
+    for batch_hits, query in zip(index.search_batch(queries, k=2), queries):
+        single_hits = index.search(query, k=2)
+        assert [doc_id for doc_id, _ in batch_hits] == [doc_id for doc_id, _ in single_hits]
+        assert np.allclose([score for _, score in batch_hits], [score for _, score in single_hits], atol=1e-5)
+
+def test_similarities_and_reload():
+    """ID 순서와 관계없는 유사도 계산 및 저장 파일 다시 불러오기 확인"""
+    rows = list(reversed(ROWS))
+    index, path = make_index(rows)
+    assert list(index.ids) == sorted(row[0] for row in ROWS)
+
+    scores = index.similarities("계약갱신 거절", [202, 102, 999], ["", "", "임대인은 계약갱신을 거절하지 못한다"])
+    assert scores[1] > scores[0]
+    assert scores[2] > 0
+
+    loaded = SemanticIndex.load(path)
+    assert loaded.search("퇴직급여", k=1) == index.search("퇴직급여", k=1)
+
+if __name__ == "__main__":
+    test_search_top_k()
+    test_batch_matches_single()
+    test_similarities_and_reload()
+    print("\n모든 테스트 완료!")
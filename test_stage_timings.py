@@ -0,0 +1,129 @@
+import asyncio
+import gc
+import time
+
+from fastapi.testclient import TestClient
+
+from app.api.endpoints.auth import get_current_user
+from app.core.config import settings
+from app.core.metrics import get_histogram
+from app.core.timing import STAGE_HISTOGRAM, collect_stages, current_timings, stage, timed
+from app.db.models import ACase
+from app.services.legal_consultation_service import LegalConsultationService
+from conftest import DESCRIPTION, make_law_service, make_service, make_session, start_server
+from mock_claude_server import create_app as create_claude_app
+from mock_law_api_server import LawStandInProfile, create_app as create_law_app
+
+def test_collect_stages():
+    """안쪽 모음에 기록한 단계 시간이 바깥 모음에도 기록되고, 단계별 히스토그램에 남는지 확인"""
+    before = get_histogram(STAGE_HISTOGRAM, labels={"stage": "unit_parse"}).count
+
+    @timed("unit_parse")
+    def parse():
+        time.sleep(0.01)
+
+    @timed("unit_fetch")
+    async def fetch():
+        await asyncio.sleep(0.02)
+
+    assert current_timings() is None
+    with collect_stages() as outer:
+        parse()
+        with collect_stages() as inner:
+            parse()
+            asyncio.run(fetch())
+        assert current_timings() is outer
+    assert current_timings() is None
+
+    assert outer.totals()["unit_parse"][0] == 2 and inner.totals()["unit_parse"][0] == 1
+    assert inner.totals()["unit_fetch"][1] >= 0.02
+    summary = inner.summary()
+    assert list(summary["stages"]) == ["unit_parse", "unit_fetch"]
+    assert summary["stages"]["unit_fetch"]["ms"] >= 20 and summary["total_ms"] >= 30
+
+    header = outer.server_timing()
+    names = [entry.split(";")[0] for entry in header.split(", ")]
+    assert names == ["unit_parse", "unit_fetch", "total"]
+    assert all(entry.split(";dur=")[1].replace(".", "").isdigit() for entry in header.split(", "))
+    assert get_histogram(STAGE_HISTOGRAM, labels={"stage": "unit_parse"}).count == before + 2
+
+def test_stage_recorded_on_error():
+    with collect_stages() as timings:
+        try:
+            with stage("unit_failing"):
+                raise ValueError("실패")
+        except ValueError:
+            pass
+    assert timings.totals()["unit_failing"][0] == 1
+
+def test_db_commit_stage():
+    db = make_session()
+    with collect_stages() as timings:
+        db.add(ACase(aCase_id=1, user_id=1, aCase_type="일반", description=DESCRIPTION))
+        db.commit()
+    assert timings.totals()["db_commit"][0] == 1
+
+def test_consultation_timings():
+    """상담 처리 결과와 저장된 분석 결과에 Claude/국가법령정보 API/XML 파싱/DB 커밋 단계 시간이 포함되는지 확인"""
+    claude_server, claude_url = start_server(create_claude_app())
+    law_server, law_url = start_server(create_law_app(profile=LawStandInProfile(latency="fixed:0.02")))
+    original_local_search = settings.LAW_LOCAL_SEARCH
+    settings.LAW_LOCAL_SEARCH = False
+    try:
+        db = make_session()
+        db.add(ACase(aCase_id=1, user_id=1, aCase_type="일반", description=DESCRIPTION))
+        db.commit()
+
+        service = LegalConsultationService()
+        service.claude_service = make_service(claude_url)
+        service.law_data_service = make_law_service(law_url)
+        # 단계 시간을 비교하므로 측정 중에는 GC 일시 정지(전체 테스트 실행 시 100ms 안팎)가 끼어들지 않도록 함
+        gc.collect()
+        gc.disable()
+        result = asyncio.run(service.process_consultation(db, 1, DESCRIPTION))
+    finally:
+        gc.enable()
+        settings.LAW_LOCAL_SEARCH = original_local_search
+        claude_server.should_exit = True
+        law_server.should_exit = True
+
+    stages = result["timings"]["stages"]
+    print(f"단계별 소요 시간: {result['timings']}")
+    for name in ("keywords", "law_search", "precedent_search", "consultation", "claude", "claude_queue",
+                 "law_api", "xml_parse", "db_commit"):
+        assert name in stages, name
+    assert stages["claude"]["count"] == 2
+    assert stages["law_api"]["ms"] >= 20 * stages["law_api"]["count"]
+    assert stages["law_search"]["ms"] >= stages["law_api"]["ms"] * 0.5
+
+    stored = service.get_stored_consultation(db.query(ACase).filter(ACase.aCase_id == 1).first())
+    assert stored["timings"] == result["timings"]
+
+def test_server_timing_header():
+    """요청 처리 중 기록한 단계 시간이 Server-Timing 헤더로 응답되는지 확인"""
+    from app.main import app
+
+    law_server, law_url = start_server(create_law_app())
+    original = (settings.LAW_API_BASE_URL, settings.LAW_LOCAL_SEARCH)
+    settings.LAW_API_BASE_URL = law_url.split("/v1/")[0]
+    settings.LAW_LOCAL_SEARCH = False
+    app.dependency_overrides[get_current_user] = lambda: None
+    try:
+        response = TestClient(app).get("/api/v1/laws/laws/search", params={"q": "임대차"})
+    finally:
+        settings.LAW_API_BASE_URL, settings.LAW_LOCAL_SEARCH = original
+        app.dependency_overrides.clear()
+        law_server.should_exit = True
+
+    assert response.status_code == 200 and response.json()["laws"]
+    header = response.headers["server-timing"]
+    names = [entry.split(";")[0] for entry in header.split(", ")]
+    assert names[:2] == ["law_api", "xml_parse"] and names[-1] == "total"
+
+if __name__ == "__main__":
+    test_collect_stages()
+    test_stage_recorded_on_error()
+    test_db_commit_stage()
+    test_consultation_timings()
+    test_server_timing_header()
+    print("\n모든 테스트 완료!")
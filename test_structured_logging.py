@@ -0,0 +1,174 @@
+import io
+import logging
+import os
+import queue
+import tempfile
+import time
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.api.endpoints.auth import get_current_user
+from app.core.config import settings
+from app.core import metrics
+from app.core.checkpoint import JsonCheckpoint
+from app.core.metrics import get_counter, register_collector, render_prometheus
+from app.core.structured_logging import (
+    JsonFormatter, NonBlockingQueueHandler, RequestLoggingMiddleware, redact, redact_text, setup_logging, shutdown_logging
+)
+from mock_law_api_server import create_app as create_law_app
+from conftest import capture_logs, start_server
+
+def test_redact():
+    params = {"OC": "my-oc-key", "target": "law", "query": "임대차"}
+    assert redact(params) == {"OC": "[REDACTED]", "target": "law", "query": "임대차"}
+    nested = redact({"headers": {"x-api-key": "sk-ant-api03-abc", "Authorization": "Bearer abc.def"}, "items": [{"password": "1234"}]})
+    assert nested == {"headers": {"x-api-key": "[REDACTED]", "Authorization": "[REDACTED]"}, "items": [{"password": "[REDACTED]"}]}
+
+    text = redact_text(
+        "GET https://www.law.go.kr/DRF/lawSearch.do?OC=my-oc-key&target=law "
+        "Headers: {'authorization': 'Bearer eyJhbGciOi.x.y', 'x-api-key': 'sk-ant-api03-abc'} password=hunter2"
+    )
+    for secret in ("my-oc-key", "eyJhbGciOi", "sk-ant-api03-abc", "hunter2"):
+        assert secret not in text, secret
+    assert "target=law" in text
+
+def test_non_blocking_handler():
+    """출력이 느려도 로그 기록은 기다리지 않고, 대기열이 가득 차면 버리고 개수를 셈"""
+    class SlowStream(io.StringIO):
+        def write(self, text):
+            time.sleep(0.01)
+            return super().write(text)
+
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1000))
+    output = logging.StreamHandler(SlowStream())
+    output.setFormatter(JsonFormatter())
+    listener = logging.handlers.QueueListener(handler.queue, output)
+    logger = logging.getLogger("test.non_blocking")
+    logger.propagate = False
+    logger.addHandler(handler)
+    listener.start()
+    try:
+        started = time.perf_counter()
+        for number in range(100):
+            logger.warning("느린 출력 %d", number)
+        assert time.perf_counter() - started < 0.2
+    finally:
+        listener.stop()
+        logger.removeHandler(handler)
+    assert output.stream.getvalue().count("느린 출력") == 100
+
+    dropped = get_counter("lawmate_log_records_dropped_total")
+    before = dropped.value
+    full = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    logger.addHandler(full)
+    try:
+        for _ in range(3):
+            logger.warning("버려지는 로그")
+    finally:
+        logger.removeHandler(full)
+    assert dropped.value - before == 2
+
+def test_request_id_and_access_log():
+    """요청 ID를 응답 헤더와 같은 요청에서 남긴 서비스 로그에 함께 기록하고, 헤더/쿼리의 비밀 값은 남기지 않음"""
+    from app.main import app
+
+    law_server, law_url = start_server(create_law_app())
+    original = (settings.LAW_API_BASE_URL, settings.LAW_LOCAL_SEARCH, settings.LAW_API_KEY)
+    settings.LAW_API_BASE_URL = law_url.split("/v1/")[0]
+    settings.LAW_LOCAL_SEARCH = False
+    settings.LAW_API_KEY = "my-oc-key"
+    app.dependency_overrides[get_current_user] = lambda: None
+    try:
+        with capture_logs(logging.DEBUG) as logs:
+            client = TestClient(app)
+            response = client.get("/api/v1/laws/laws/search", params={"q": "임대차", "token": "query-secret"},
+                                  headers={"X-Request-ID": "req-123", "Authorization": "Bearer header-secret"})
+            generated = client.get("/")
+            invalid = client.get("/", headers={"X-Request-ID": "bad id\t"})
+    finally:
+        settings.LAW_API_BASE_URL, settings.LAW_LOCAL_SEARCH, settings.LAW_API_KEY = original
+        app.dependency_overrides.clear()
+        law_server.should_exit = True
+
+    assert response.status_code == 200 and response.headers["x-request-id"] == "req-123"
+    assert len(generated.headers["x-request-id"]) == 16
+    assert invalid.headers["x-request-id"] != "bad id\t"
+
+    output = logs.stream.getvalue()
+    for secret in ("my-oc-key", "query-secret", "header-secret"):
+        assert secret not in output, secret
+    entries = logs.entries()
+    request_entries = [entry for entry in entries if entry.get("request_id") == "req-123"]
+    access = [entry for entry in request_entries if entry["logger"] == "app.access"]
+    assert len(access) == 1
+    assert access[0]["fields"]["route"] == "/api/v1/laws/laws/search" and access[0]["fields"]["status"] == 200
+    assert any(entry["logger"] == "app.services.law_data_service" for entry in request_entries)
+    params = next(entry for entry in request_entries if entry["message"] == "법령 검색 파라미터")
+    assert params["fields"]["params"]["OC"] == "[REDACTED]"
+
+def test_sampling():
+    """샘플링에서 빠진 요청의 INFO 로그는 버리고, 5xx 응답과 느린 요청은 항상 기록"""
+    app = FastAPI()
+    service_logger = logging.getLogger("app.services.sampling_test")
+
+    @app.get("/ok")
+    def ok():
+        service_logger.info("처리 중")
+        return {"ok": True}
+
+    @app.get("/fail")
+    def fail():
+        return JSONResponse({"detail": "실패"}, status_code=503)
+
+    @app.get("/slow")
+    def slow():
+        time.sleep(0.06)
+        return {"ok": True}
+
+    app.add_middleware(RequestLoggingMiddleware)
+    original = (settings.LOG_SAMPLE_RATE, settings.LOG_SLOW_REQUEST_MS)
+    settings.LOG_SAMPLE_RATE, settings.LOG_SLOW_REQUEST_MS = 0.0, 50.0
+    try:
+        with capture_logs() as logs:
+            client = TestClient(app)
+            for path in ("/ok", "/ok", "/fail", "/slow"):
+                client.get(path)
+            settings.LOG_SAMPLE_RATE = 1.0
+            client.get("/ok")
+    finally:
+        settings.LOG_SAMPLE_RATE, settings.LOG_SLOW_REQUEST_MS = original
+
+    entries = logs.entries()
+    levels = [(entry["level"], entry["fields"]["path"]) for entry in entries if entry["logger"] == "app.access"]
+    assert levels == [("ERROR", "/fail"), ("WARNING", "/slow"), ("INFO", "/ok")]
+    assert [entry["message"] for entry in entries if entry["logger"] == "app.services.sampling_test"] == ["처리 중"]
+
+def test_server_paths_use_logger():
+    """/metrics 수집 실패, 체크포인트 손상처럼 서버 안에서 실행되는 경고도 print가 아니라 app 로거로 기록"""
+    def broken_collector():
+        raise RuntimeError("수집 실패")
+
+    register_collector(broken_collector)
+    try:
+        with tempfile.TemporaryDirectory() as directory, capture_logs() as logs:
+            render_prometheus()
+            path = os.path.join(directory, "checkpoint.json")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("{손상")
+            assert JsonCheckpoint(path).load() == {}
+    finally:
+        metrics._collectors.remove(broken_collector)
+
+    warnings = {entry["logger"]: entry for entry in logs.entries() if entry["level"] == "WARNING"}
+    assert "broken_collector" in warnings["app.core.metrics"]["message"]
+    assert "app.core.checkpoint" in warnings
+
+if __name__ == "__main__":
+    test_redact()
+    test_non_blocking_handler()
+    test_request_id_and_access_log()
+    test_sampling()
+    test_server_paths_use_logger()
+    print("\n모든 테스트 완료!")